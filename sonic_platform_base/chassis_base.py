@@ -6,6 +6,8 @@
 """
 
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 try:
     from sonic_py_common import device_info
 except ImportError:
@@ -15,6 +17,7 @@ except ImportError:
     device_info = None
 from . import device_base
 from . import sfp_base
+from .sonic_xcvr.api.public.cdb_fw_upgrade import CdbFwUpgradeOrchestrator
 
 class ChassisBase(device_base.DeviceBase):
     """
@@ -38,6 +41,14 @@ class ChassisBase(device_base.DeviceBase):
     REBOOT_CAUSE_HARDWARE_RESET_FROM_ASIC = "Reset from ASIC"
     REBOOT_CAUSE_NON_HARDWARE = "Non-Hardware"
 
+    # Transceiver access lock granularity, see get_transceiver_lock_granularity()
+    XCVR_LOCK_GRANULARITY_CHASSIS = "chassis"
+    XCVR_LOCK_GRANULARITY_BUS = "bus"
+    XCVR_LOCK_GRANULARITY_PORT = "port"
+
+    # Default upper bound on worker threads used by collect_transceiver_dom()
+    XCVR_DOM_COLLECT_MAX_WORKERS = 8
+
     def __init__(self):
         # List of ComponentBase-derived objects representing all components
         # available on the chassis
@@ -817,6 +828,163 @@ class ChassisBase(device_base.DeviceBase):
 
         return sfp
 
+    def get_transceiver_lock_granularity(self):
+        """
+        Retrieves the granularity at which transceiver management interfaces
+        on this chassis can safely be accessed concurrently
+
+        Returns:
+            A string, one of:
+            XCVR_LOCK_GRANULARITY_CHASSIS: all transceivers share one
+                management path and must be accessed serially
+            XCVR_LOCK_GRANULARITY_BUS: transceivers on different I2C buses
+                (as reported by get_transceiver_bus_id()) may be accessed
+                concurrently, transceivers on the same bus serially
+            XCVR_LOCK_GRANULARITY_PORT: every transceiver may be accessed
+                concurrently
+        """
+        return self.XCVR_LOCK_GRANULARITY_CHASSIS
+
+    def get_transceiver_bus_id(self, index):
+        """
+        Retrieves an identifier of the I2C bus/segment (e.g. the mux channel)
+        through which the transceiver at physical port <index> is accessed.
+        Only consulted when get_transceiver_lock_granularity() returns
+        XCVR_LOCK_GRANULARITY_BUS.
+
+        Args:
+            index: An integer (>=0), the physical port index (same indexing as
+                   get_sfp()).
+
+        Returns:
+            A hashable object identifying the bus, or None if unknown. Ports
+            with an unknown bus are accessed serially with each other.
+        """
+        return None
+
+    def _group_ports_by_bus(self, ports):
+        granularity = self.get_transceiver_lock_granularity()
+        if granularity == self.XCVR_LOCK_GRANULARITY_PORT:
+            return [[port] for port in ports]
+        if granularity != self.XCVR_LOCK_GRANULARITY_BUS:
+            return [list(ports)] if ports else []
+
+        groups = {}
+        for port in ports:
+            groups.setdefault(self.get_transceiver_bus_id(port), []).append(port)
+        return list(groups.values())
+
+    def _read_transceiver_dom(self, port, fields):
+        sfp = self.get_sfp(port)
+        if sfp is None:
+            return None
+        try:
+            dom = sfp.get_transceiver_dom_real_value()
+        except Exception as e:
+            sys.stderr.write("Failed to read DOM of port {}: {}\n".format(port, e))
+            return None
+        if dom is None or fields is None:
+            return dom
+        return {key: dom[key] for key in fields if key in dom}
+
+    def collect_transceiver_dom(self, ports, fields=None, max_workers=None):
+        """
+        Retrieves the DOM real values of several transceivers in one call.
+
+        Ports are grouped according to get_transceiver_lock_granularity():
+        ports within a group are read serially, while different groups are
+        read concurrently on a bounded thread pool. With the default
+        (chassis) granularity all ports are read serially in the caller's
+        thread, which matches polling each sfp in turn.
+
+        Args:
+            ports: An iterable of physical port indices (same indexing as
+                   get_sfp()).
+            fields: An optional iterable of keys of
+                    get_transceiver_dom_real_value() to return; all keys are
+                    returned if None.
+            max_workers: An optional integer, the maximum number of groups
+                         read concurrently. Defaults to
+                         XCVR_DOM_COLLECT_MAX_WORKERS.
+
+        Returns:
+            A tuple (dom, elapsed) of dicts keyed by physical port index:
+            dom maps each port to its (filtered) DOM real value dict, or None
+            if the port has no sfp or the read failed; elapsed maps each port
+            to the time in seconds spent reading it.
+        """
+        ports = list(ports)
+        if fields is not None:
+            fields = list(fields)
+        dom = {}
+        elapsed = {}
+
+        def read_group(group):
+            for port in group:
+                start = time.monotonic()
+                dom[port] = self._read_transceiver_dom(port, fields)
+                elapsed[port] = time.monotonic() - start
+
+        groups = self._group_ports_by_bus(ports)
+        if max_workers is None:
+            max_workers = self.XCVR_DOM_COLLECT_MAX_WORKERS
+        max_workers = min(max_workers, len(groups))
+        if max_workers <= 1:
+            for group in groups:
+                read_group(group)
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for future in [executor.submit(read_group, group) for group in groups]:
+                    future.result()
+
+        return dom, elapsed
+
+    def upgrade_transceiver_firmware(self, ports, imagepath, progress_callback=None,
+                                     commit_delay=5, max_workers=None):
+        """
+        Upgrades the firmware of several CMIS transceivers through CDB.
+
+        Ports are grouped as in collect_transceiver_dom(): transceivers of a
+        group are downloaded serially, different groups concurrently. The
+        image is read once for all ports, and each module is committed at
+        least commit_delay seconds after running its new image while the
+        next ones are downloaded, see CdbFwUpgradeOrchestrator.
+
+        Args:
+            ports: An iterable of physical port indices (same indexing as
+                   get_sfp()).
+            imagepath: A string, the path of the firmware image, or a dict
+                       mapping each port to the path of its image.
+            progress_callback: An optional function(port, state) receiving
+                               the per-port phase, progress and ETA.
+            commit_delay: Seconds between running and committing the new
+                          image of a module.
+            max_workers: An optional integer, the maximum number of groups
+                         upgraded concurrently. Defaults to
+                         XCVR_DOM_COLLECT_MAX_WORKERS.
+
+        Returns:
+            A dict mapping each port to a (status, info) tuple, status being
+            True if the upgrade succeeded.
+        """
+        results = {}
+        apis = {}
+        for port in ports:
+            sfp = self.get_sfp(port)
+            api = sfp.get_xcvr_api() if sfp is not None else None
+            if api is None or not hasattr(api, 'module_fw_download'):
+                results[port] = (False, 'Module FW upgrade not supported\n')
+                continue
+            apis[port] = api
+
+        if max_workers is None:
+            max_workers = self.XCVR_DOM_COLLECT_MAX_WORKERS
+        orchestrator = CdbFwUpgradeOrchestrator(progress_callback, commit_delay=commit_delay,
+                                                max_workers=max_workers)
+        groups = [[(port, apis[port]) for port in group] for group in self._group_ports_by_bus(list(apis))]
+        results.update(orchestrator.upgrade(groups, imagepath))
+        return results
+
     def get_num_cpos(self):
         """
         Retrieves the number of CPO ports available on this chassis
@@ -77,7 +77,8 @@ class SfpBase(device_base.DeviceBase, EepromReadWriteMixin):
         # available on the SFP
         self._thermal_list = []
         self._bank = bank
-        self._xcvr_api_factory = XcvrApiFactory(self.read_eeprom, self.write_eeprom)
+        self._xcvr_api_factory = XcvrApiFactory(self.read_eeprom, self.write_eeprom,
+                                                getattr(self, 'write_eeprom_stream', None))
         self._xcvr_api = None
 
     @property
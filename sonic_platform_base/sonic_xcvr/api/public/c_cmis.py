@@ -5,6 +5,7 @@
 """
 from ...fields import consts
 from .cmis import CmisApi, CMIS_VDM_KEY_TO_DB_PREFIX_KEY_MAP, CMIS_XCVR_INFO_DEFAULT_DICT
+from .c_cmis_pm import CCmisPmApi
 import time
 import copy
 
@@ -51,6 +52,7 @@ C_CMIS_XCVR_INFO_DEFAULT_DICT.update({
 class CCmisApi(CmisApi):
     def __init__(self, xcvr_eeprom, init_cdb_fw_handler=False):
         super(CCmisApi, self).__init__(xcvr_eeprom, init_cdb_fw_handler)
+        self.pm = CCmisPmApi(xcvr_eeprom)
 
     def _get_vdm_key_to_db_prefix_map(self):
         combined_map = {**CMIS_VDM_KEY_TO_DB_PREFIX_KEY_MAP, **C_CMIS_DELTA_VDM_KEY_TO_DB_PREFIX_KEY_MAP}
@@ -214,91 +216,30 @@ class CCmisApi(CmisApi):
         RX sig power:   unit in dBm
         SOPROC: unit in krad/s
         MER:    unit in dB
+
+        Both pages are read in one pass, see CCmisPmApi.get_pm_record(). The PMs
+        are not frozen, callers freeze them around the call as needed.
+        Returns None if the PMs could not be read.
         '''
-        PM_dict = dict()
-
-        rx_bits_pm = self.xcvr_eeprom.read(consts.RX_BITS_PM)
-        rx_bits_subint_pm = self.xcvr_eeprom.read(consts.RX_BITS_SUB_INTERVAL_PM)
-        rx_corr_bits_pm = self.xcvr_eeprom.read(consts.RX_CORR_BITS_PM)
-        rx_min_corr_bits_subint_pm = self.xcvr_eeprom.read(consts.RX_MIN_CORR_BITS_SUB_INTERVAL_PM)
-        rx_max_corr_bits_subint_pm = self.xcvr_eeprom.read(consts.RX_MAX_CORR_BITS_SUB_INTERVAL_PM)
-
-        if (rx_bits_subint_pm != 0) and (rx_bits_pm != 0):
-            PM_dict['preFEC_BER_avg'] = rx_corr_bits_pm*1.0/rx_bits_pm
-            PM_dict['preFEC_BER_min'] = rx_min_corr_bits_subint_pm*1.0/rx_bits_subint_pm
-            PM_dict['preFEC_BER_max'] = rx_max_corr_bits_subint_pm*1.0/rx_bits_subint_pm
-        # when module is low power, still need these values to show 1.0
-        else:
-            PM_dict['preFEC_BER_avg'] = 1.0
-            PM_dict['preFEC_BER_min'] = 1.0
-            PM_dict['preFEC_BER_max'] = 1.0
-        rx_frames_pm = self.xcvr_eeprom.read(consts.RX_FRAMES_PM)
-        rx_frames_subint_pm = self.xcvr_eeprom.read(consts.RX_FRAMES_SUB_INTERVAL_PM)
-        rx_frames_uncorr_err_pm = self.xcvr_eeprom.read(consts.RX_FRAMES_UNCORR_ERR_PM)
-        rx_min_frames_uncorr_err_subint_pm = self.xcvr_eeprom.read(consts.RX_MIN_FRAMES_UNCORR_ERR_SUB_INTERVAL_PM)
-        rx_max_frames_uncorr_err_subint_pm = self.xcvr_eeprom.read(consts.RX_MAX_FRAMES_UNCORR_ERR_SUB_INTERVAL_PM)
-
-        if (rx_frames_subint_pm != 0) and (rx_frames_pm != 0):
-            PM_dict['preFEC_uncorr_frame_ratio_avg'] = rx_frames_uncorr_err_pm*1.0/rx_frames_subint_pm
-            PM_dict['preFEC_uncorr_frame_ratio_min'] = rx_min_frames_uncorr_err_subint_pm*1.0/rx_frames_subint_pm
-            PM_dict['preFEC_uncorr_frame_ratio_max'] = rx_max_frames_uncorr_err_subint_pm*1.0/rx_frames_subint_pm
-        # when module is low power, still need these values
-        else:
-            PM_dict['preFEC_uncorr_frame_ratio_avg'] = 0
-            PM_dict['preFEC_uncorr_frame_ratio_min'] = 0
-            PM_dict['preFEC_uncorr_frame_ratio_max'] = 0
-        PM_dict['rx_cd_avg'] = self.xcvr_eeprom.read(consts.RX_AVG_CD_PM)
-        PM_dict['rx_cd_min'] = self.xcvr_eeprom.read(consts.RX_MIN_CD_PM)
-        PM_dict['rx_cd_max'] = self.xcvr_eeprom.read(consts.RX_MAX_CD_PM)
-
-        PM_dict['rx_dgd_avg'] = self.xcvr_eeprom.read(consts.RX_AVG_DGD_PM)
-        PM_dict['rx_dgd_min'] = self.xcvr_eeprom.read(consts.RX_MIN_DGD_PM)
-        PM_dict['rx_dgd_max'] = self.xcvr_eeprom.read(consts.RX_MAX_DGD_PM)
-
-        PM_dict['rx_sopmd_avg'] = self.xcvr_eeprom.read(consts.RX_AVG_SOPMD_PM)
-        PM_dict['rx_sopmd_min'] = self.xcvr_eeprom.read(consts.RX_MIN_SOPMD_PM)
-        PM_dict['rx_sopmd_max'] = self.xcvr_eeprom.read(consts.RX_MAX_SOPMD_PM)
-
-        PM_dict['rx_pdl_avg'] = self.xcvr_eeprom.read(consts.RX_AVG_PDL_PM)
-        PM_dict['rx_pdl_min'] = self.xcvr_eeprom.read(consts.RX_MIN_PDL_PM)
-        PM_dict['rx_pdl_max'] = self.xcvr_eeprom.read(consts.RX_MAX_PDL_PM)
-
-        PM_dict['rx_osnr_avg'] = self.xcvr_eeprom.read(consts.RX_AVG_OSNR_PM)
-        PM_dict['rx_osnr_min'] = self.xcvr_eeprom.read(consts.RX_MIN_OSNR_PM)
-        PM_dict['rx_osnr_max'] = self.xcvr_eeprom.read(consts.RX_MAX_OSNR_PM)
-
-        PM_dict['rx_esnr_avg'] = self.xcvr_eeprom.read(consts.RX_AVG_ESNR_PM)
-        PM_dict['rx_esnr_min'] = self.xcvr_eeprom.read(consts.RX_MIN_ESNR_PM)
-        PM_dict['rx_esnr_max'] = self.xcvr_eeprom.read(consts.RX_MAX_ESNR_PM)
-
-        PM_dict['rx_cfo_avg'] = self.xcvr_eeprom.read(consts.RX_AVG_CFO_PM)
-        PM_dict['rx_cfo_min'] = self.xcvr_eeprom.read(consts.RX_MIN_CFO_PM)
-        PM_dict['rx_cfo_max'] = self.xcvr_eeprom.read(consts.RX_MAX_CFO_PM)
-
-        PM_dict['rx_evm_avg'] = self.xcvr_eeprom.read(consts.RX_AVG_EVM_PM)
-        PM_dict['rx_evm_min'] = self.xcvr_eeprom.read(consts.RX_MIN_EVM_PM)
-        PM_dict['rx_evm_max'] = self.xcvr_eeprom.read(consts.RX_MAX_EVM_PM)
-
-        PM_dict['tx_power_avg'] = self.xcvr_eeprom.read(consts.TX_AVG_POWER_PM)
-        PM_dict['tx_power_min'] = self.xcvr_eeprom.read(consts.TX_MIN_POWER_PM)
-        PM_dict['tx_power_max'] = self.xcvr_eeprom.read(consts.TX_MAX_POWER_PM)
-
-        PM_dict['rx_power_avg'] = self.xcvr_eeprom.read(consts.RX_AVG_POWER_PM)
-        PM_dict['rx_power_min'] = self.xcvr_eeprom.read(consts.RX_MIN_POWER_PM)
-        PM_dict['rx_power_max'] = self.xcvr_eeprom.read(consts.RX_MAX_POWER_PM)
-
-        PM_dict['rx_sigpwr_avg'] = self.xcvr_eeprom.read(consts.RX_AVG_SIG_POWER_PM)
-        PM_dict['rx_sigpwr_min'] = self.xcvr_eeprom.read(consts.RX_MIN_SIG_POWER_PM)
-        PM_dict['rx_sigpwr_max'] = self.xcvr_eeprom.read(consts.RX_MAX_SIG_POWER_PM)
-
-        PM_dict['rx_soproc_avg'] = self.xcvr_eeprom.read(consts.RX_AVG_SOPROC_PM)
-        PM_dict['rx_soproc_min'] = self.xcvr_eeprom.read(consts.RX_MIN_SOPROC_PM)
-        PM_dict['rx_soproc_max'] = self.xcvr_eeprom.read(consts.RX_MAX_SOPROC_PM)
-
-        PM_dict['rx_mer_avg'] = self.xcvr_eeprom.read(consts.RX_AVG_MER_PM)
-        PM_dict['rx_mer_min'] = self.xcvr_eeprom.read(consts.RX_MIN_MER_PM)
-        PM_dict['rx_mer_max'] = self.xcvr_eeprom.read(consts.RX_MAX_MER_PM)
-        return PM_dict
+        record = self.pm.get_pm_record(freeze_timeout=None)
+        if record is None:
+            return None
+        return record.get_pm_dict()
+
+    def get_pm_record(self, freeze_timeout=1.0):
+        '''
+        This function returns the raw PM counters of Page 34h and 35h as a
+        CCmisPmRecord, also handed to the PM sink if one is set
+        '''
+        return self.pm.get_pm_record(freeze_timeout)
+
+    def set_pm_sink(self, sink):
+        '''
+        This function sets the sink every PM record read is appended to,
+        e.g. a CCmisPmHistory keeping the last intervals for trend queries.
+        None removes it.
+        '''
+        self.pm.sink = sink
 
     def _get_xcvr_info_default_dict(self):
         return C_CMIS_XCVR_INFO_DEFAULT_DICT
@@ -473,6 +414,8 @@ class CCmisApi(CmisApi):
         """
         trans_pm = dict()
         PM_dict = self.get_pm_all()
+        if PM_dict is None:
+            return None
         trans_pm['prefec_ber_avg'] = PM_dict['preFEC_BER_avg']
         trans_pm['prefec_ber_min'] = PM_dict['preFEC_BER_min']
         trans_pm['prefec_ber_max'] = PM_dict['preFEC_BER_max']
@@ -0,0 +1,221 @@
+"""
+    c_cmis_pm.py
+
+    Implementation of APIs related to the C-CMIS performance monitors
+    (pages 34h and 35h)
+"""
+
+from ...fields import consts
+from ..xcvr_api import XcvrApi
+from .cmisVDM import CmisVdmFreeze
+from collections import deque, namedtuple
+import threading
+import time
+
+C_CMIS_PM_PAGES = (0x34, 0x35)
+C_CMIS_PM_HISTORY_SIZE = 16 # Intervals kept by a CCmisPmHistory by default
+
+# Record attribute of each PM counter, in memory map order. The attributes of
+# page 35h match the keys get_pm_all() reports them under.
+C_CMIS_PM_FIELDS = (
+    # Page 34h
+    ('rx_bits', consts.RX_BITS_PM),
+    ('rx_bits_subint', consts.RX_BITS_SUB_INTERVAL_PM),
+    ('rx_corr_bits', consts.RX_CORR_BITS_PM),
+    ('rx_min_corr_bits_subint', consts.RX_MIN_CORR_BITS_SUB_INTERVAL_PM),
+    ('rx_max_corr_bits_subint', consts.RX_MAX_CORR_BITS_SUB_INTERVAL_PM),
+    ('rx_frames', consts.RX_FRAMES_PM),
+    ('rx_frames_subint', consts.RX_FRAMES_SUB_INTERVAL_PM),
+    ('rx_frames_uncorr_err', consts.RX_FRAMES_UNCORR_ERR_PM),
+    ('rx_min_frames_uncorr_err_subint', consts.RX_MIN_FRAMES_UNCORR_ERR_SUB_INTERVAL_PM),
+    ('rx_max_frames_uncorr_err_subint', consts.RX_MAX_FRAMES_UNCORR_ERR_SUB_INTERVAL_PM),
+    # Page 35h
+    ('rx_cd_avg', consts.RX_AVG_CD_PM),
+    ('rx_cd_min', consts.RX_MIN_CD_PM),
+    ('rx_cd_max', consts.RX_MAX_CD_PM),
+    ('rx_dgd_avg', consts.RX_AVG_DGD_PM),
+    ('rx_dgd_min', consts.RX_MIN_DGD_PM),
+    ('rx_dgd_max', consts.RX_MAX_DGD_PM),
+    ('rx_sopmd_avg', consts.RX_AVG_SOPMD_PM),
+    ('rx_sopmd_min', consts.RX_MIN_SOPMD_PM),
+    ('rx_sopmd_max', consts.RX_MAX_SOPMD_PM),
+    ('rx_pdl_avg', consts.RX_AVG_PDL_PM),
+    ('rx_pdl_min', consts.RX_MIN_PDL_PM),
+    ('rx_pdl_max', consts.RX_MAX_PDL_PM),
+    ('rx_osnr_avg', consts.RX_AVG_OSNR_PM),
+    ('rx_osnr_min', consts.RX_MIN_OSNR_PM),
+    ('rx_osnr_max', consts.RX_MAX_OSNR_PM),
+    ('rx_esnr_avg', consts.RX_AVG_ESNR_PM),
+    ('rx_esnr_min', consts.RX_MIN_ESNR_PM),
+    ('rx_esnr_max', consts.RX_MAX_ESNR_PM),
+    ('rx_cfo_avg', consts.RX_AVG_CFO_PM),
+    ('rx_cfo_min', consts.RX_MIN_CFO_PM),
+    ('rx_cfo_max', consts.RX_MAX_CFO_PM),
+    ('rx_evm_avg', consts.RX_AVG_EVM_PM),
+    ('rx_evm_min', consts.RX_MIN_EVM_PM),
+    ('rx_evm_max', consts.RX_MAX_EVM_PM),
+    ('tx_power_avg', consts.TX_AVG_POWER_PM),
+    ('tx_power_min', consts.TX_MIN_POWER_PM),
+    ('tx_power_max', consts.TX_MAX_POWER_PM),
+    ('rx_power_avg', consts.RX_AVG_POWER_PM),
+    ('rx_power_min', consts.RX_MIN_POWER_PM),
+    ('rx_power_max', consts.RX_MAX_POWER_PM),
+    ('rx_sigpwr_avg', consts.RX_AVG_SIG_POWER_PM),
+    ('rx_sigpwr_min', consts.RX_MIN_SIG_POWER_PM),
+    ('rx_sigpwr_max', consts.RX_MAX_SIG_POWER_PM),
+    ('rx_soproc_avg', consts.RX_AVG_SOPROC_PM),
+    ('rx_soproc_min', consts.RX_MIN_SOPROC_PM),
+    ('rx_soproc_max', consts.RX_MAX_SOPROC_PM),
+    ('rx_mer_avg', consts.RX_AVG_MER_PM),
+    ('rx_mer_min', consts.RX_MIN_MER_PM),
+    ('rx_mer_max', consts.RX_MAX_MER_PM),
+)
+C_CMIS_LINK_PM_KEYS = tuple(name for name, _ in C_CMIS_PM_FIELDS[10:])
+
+class CCmisPmRecord(namedtuple('CCmisPmRecord', [name for name, _ in C_CMIS_PM_FIELDS] + ['frozen', 'timestamp'])):
+    """
+    The PM counters of one interval, one attribute per counter of
+    C_CMIS_PM_FIELDS, plus:
+
+    Attributes:
+        frozen: True if the counters were read while frozen
+        timestamp: time.time() at which the counters were read
+    """
+    __slots__ = ()
+
+    def get_pm_dict(self):
+        '''
+        Returns the PMs as reported by CCmisApi.get_pm_all(), with the
+        pre-FEC BER and uncorrected frame ratios computed from the counters
+        '''
+        PM_dict = dict()
+        if (self.rx_bits_subint != 0) and (self.rx_bits != 0):
+            PM_dict['preFEC_BER_avg'] = self.rx_corr_bits*1.0/self.rx_bits
+            PM_dict['preFEC_BER_min'] = self.rx_min_corr_bits_subint*1.0/self.rx_bits_subint
+            PM_dict['preFEC_BER_max'] = self.rx_max_corr_bits_subint*1.0/self.rx_bits_subint
+        # when module is low power, still need these values to show 1.0
+        else:
+            PM_dict['preFEC_BER_avg'] = 1.0
+            PM_dict['preFEC_BER_min'] = 1.0
+            PM_dict['preFEC_BER_max'] = 1.0
+
+        if (self.rx_frames_subint != 0) and (self.rx_frames != 0):
+            PM_dict['preFEC_uncorr_frame_ratio_avg'] = self.rx_frames_uncorr_err*1.0/self.rx_frames_subint
+            PM_dict['preFEC_uncorr_frame_ratio_min'] = self.rx_min_frames_uncorr_err_subint*1.0/self.rx_frames_subint
+            PM_dict['preFEC_uncorr_frame_ratio_max'] = self.rx_max_frames_uncorr_err_subint*1.0/self.rx_frames_subint
+        # when module is low power, still need these values
+        else:
+            PM_dict['preFEC_uncorr_frame_ratio_avg'] = 0
+            PM_dict['preFEC_uncorr_frame_ratio_min'] = 0
+            PM_dict['preFEC_uncorr_frame_ratio_max'] = 0
+
+        for key in C_CMIS_LINK_PM_KEYS:
+            PM_dict[key] = getattr(self, key)
+        return PM_dict
+
+    def get(self, key):
+        '''
+        Returns the value of a record attribute or of a get_pm_dict() key
+        '''
+        if key in self._fields:
+            return getattr(self, key)
+        return self.get_pm_dict()[key]
+
+class CCmisPmHistory(object):
+    """
+    PM sink keeping the records of the last maxlen intervals in a ring
+    buffer, so that trends can be queried without reading the module again
+
+    Any object with an append(record) method can be used as the sink of
+    CCmisPmApi; this one is safe to share between threads.
+    """
+    def __init__(self, maxlen=C_CMIS_PM_HISTORY_SIZE):
+        self._records = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    @property
+    def maxlen(self):
+        return self._records.maxlen
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self.get_records())
+
+    def append(self, record):
+        with self._lock:
+            self._records.append(record)
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def get_records(self, count=None):
+        '''
+        Returns the last count records, all of them if count is None, oldest first
+        '''
+        with self._lock:
+            records = list(self._records)
+        if count is not None:
+            records = records[-count:] if count > 0 else []
+        return records
+
+    def get_latest(self):
+        '''
+        Returns the most recent record, None if the history is empty
+        '''
+        with self._lock:
+            return self._records[-1] if self._records else None
+
+    def get_trend(self, key, count=None):
+        '''
+        Returns a list of (timestamp, value) of key over the last count
+        records, oldest first. key is a CCmisPmRecord attribute such as
+        'rx_osnr_avg' or a get_pm_all() key such as 'preFEC_BER_avg'.
+        '''
+        return [(record.timestamp, record.get(key)) for record in self.get_records(count)]
+
+class CCmisPmApi(CmisVdmFreeze, XcvrApi):
+    """
+    Reads all the C-CMIS PM counters as two page reads instead of one read
+    per counter, optionally feeding every record read to a sink such as a
+    CCmisPmHistory
+    """
+    def __init__(self, xcvr_eeprom, sink=None):
+        super(CCmisPmApi, self).__init__(xcvr_eeprom)
+        self.sink = sink
+
+    def get_pm_record(self, freeze_timeout=1.0):
+        '''
+        Reads pages 34h and 35h in one read each and decodes all the PM
+        counters from them.
+
+        C-CMIS PMs are frozen together with the VDM statistics, so the PMs
+        are frozen for the duration of the reads, making the counters of both
+        pages belong to the same interval, and unfrozen afterwards.
+
+        Args:
+            freeze_timeout: seconds to wait for the module to report FreezeDone;
+                            the record is still read (with frozen False) if it
+                            does not. None not to freeze the PMs, e.g. when the
+                            caller already did
+
+        Returns:
+            A CCmisPmRecord, or None if a read failed
+        '''
+        freeze = freeze_timeout is not None
+        frozen = freeze and self.freeze_vdm_stats_and_wait(freeze_timeout)
+        try:
+            with self.xcvr_eeprom.snapshot(C_CMIS_PM_PAGES):
+                values = self.xcvr_eeprom.read_many([field for _, field in C_CMIS_PM_FIELDS])
+        finally:
+            if freeze:
+                self.unfreeze_vdm_stats()
+        if any(values[field] is None for _, field in C_CMIS_PM_FIELDS):
+            return None
+        record = CCmisPmRecord(*[values[field] for _, field in C_CMIS_PM_FIELDS],
+                               frozen=frozen, timestamp=time.time())
+        if self.sink is not None:
+            self.sink.append(record)
+        return record
@@ -7,6 +7,10 @@
 from ...fields import consts
 from ...fields import cdb_consts
 from ...cdb.cdb_fw import CdbFwHandler as CdbFw
+from ...cdb.cdb_fw_checkpoint import CdbFwCheckpoint
+from ...cdb.cdb_fw_image import CdbFwImage
+from ...cdb.cdb_poll import CdbPollProfile
+import hashlib
 import time
 from sonic_py_common.syslogger import SysLogger
 
@@ -35,7 +39,10 @@ class CmisCdbFw:
             return None
 
         try:
-            return CdbFw(self.xcvr_eeprom.reader, self.xcvr_eeprom.writer, self._cdb_mem_map)
+            # CDB timings are learned per module vendor and part number
+            poll_key = "{}/{}".format(self.get_manufacturer(), self.get_model())
+            return CdbFw(self.xcvr_eeprom.reader, self.xcvr_eeprom.writer, self._cdb_mem_map,
+                         CdbPollProfile.get_shared(), poll_key, self.xcvr_eeprom.stream_writer)
         except AssertionError as err:
             log.log_error("Failed to initialize CDB firmware handler due to assertion: {}".format(err))
         except Exception as err:
@@ -228,6 +235,8 @@ class CmisCdbFw:
         txt = ''
         if self.cdb_fw_hdlr is None:
             return False, "CDB NOT supported on this module"
+        # Read before the module restarts
+        _, fingerprint = self._get_info_cache_fingerprint()
         starttime = time.time()
         result = self.cdb_fw_hdlr.run_fw_image(mode)
         if result is True:
@@ -249,6 +258,9 @@ class CmisCdbFw:
                 txt += 'Module FW run: Fail\n'
                 txt += 'FW_run_status %d\n' % fw_run_status
                 return False, txt
+        # The advertisement of the new firmware may differ
+        self.invalidate_cache()
+        self._drop_info_cache_entry(fingerprint)
         elapsedtime = time.time()-starttime
         log.log_info('Module FW run time: {:.2f} s\n'.format(elapsedtime))
         log.log_notice(txt)
@@ -265,6 +277,7 @@ class CmisCdbFw:
         txt = ''
         if self.cdb_fw_hdlr is None:
             return False, "CDB NOT supported on this module"
+        _, fingerprint = self._get_info_cache_fingerprint()
         # commit module FW (CMD 010Ah)
         starttime = time.time()
         result = self.cdb_fw_hdlr.commit_fw_image()
@@ -287,6 +300,7 @@ class CmisCdbFw:
                 txt += 'Module FW commit: Fail\n'
                 txt += 'FW_commit_status %d\n' % fw_commit_status
                 return False, txt
+        self._drop_info_cache_entry(fingerprint)
         elapsedtime = time.time()-starttime
         log.log_info('Module FW commit time: {:.2f} s\n'.format(elapsedtime))
         log.log_notice(txt)
@@ -346,11 +360,14 @@ class CmisCdbFw:
         log.log_notice('CDB host auth status: Fail- {}'.format(self.cdb_fw_hdlr.get_last_cmd_status()))
         return status
 
-    def module_fw_start_download(self, imagepath):
+    def module_fw_start_download(self, imagepath, image=None):
         """
         Start firmware download with CDB command 0101h.
         Handles password retry if the module requires authentication.
 
+        image optionally holds the content of imagepath, already read by the caller,
+        so that the file is not read again.
+
         This function returns True on success.
         Otherwise it will return False.
         """
@@ -358,12 +375,24 @@ class CmisCdbFw:
             return False, "CDB NOT supported on this module"
 
         log.log_notice('\nStart FW downloading')
+        def start_fw_download():
+            if image is None:
+                return self.cdb_fw_hdlr.start_fw_download(imagepath)
+            header_size = self.cdb_fw_hdlr.start_payload_size
+            if len(image) < header_size:
+                raise ValueError("Firmware image is too small < {} bytes for header".format(header_size))
+            return self.cdb_fw_hdlr.start_fw_download_data(len(image), bytes(image[:header_size]))
+
         try:
-            result = self.cdb_fw_hdlr.start_fw_download(imagepath)
+            result = start_fw_download()
         except FileNotFoundError:
             txt = 'Image path %s is incorrect.\n' % imagepath
             log.log_notice(txt)
             return False, txt
+        except ValueError as err:
+            txt = 'Start module FW download: {}\n'.format(err)
+            log.log_notice(txt)
+            return False, txt
 
         if result is True:
             log.log_notice('Start module FW download: Success\n')
@@ -374,7 +403,7 @@ class CmisCdbFw:
         if fw_start_status == cdb_consts.CDB_PASSWORD_ERROR_STATUS:
             log.log_notice('Start module FW download: Need to enter password\n')
             self.cdb_fw_hdlr.enter_password()
-            if self.cdb_fw_hdlr.start_fw_download(imagepath) is True:
+            if start_fw_download() is True:
                 return True, ''
             txt = 'Start module FW download: Fail after password retry\n'
             self.cdb_fw_hdlr.abort_fw_download()
@@ -387,51 +416,90 @@ class CmisCdbFw:
         log.log_notice(txt)
         return False, txt
 
-    def module_fw_write_blocks(self, imagepath, startLPLsize, maxblocksize, lplonly_flag):
+    def module_fw_write_blocks(self, imagepath, startLPLsize, maxblocksize, lplonly_flag,
+                               image=None, progress_callback=None, autopaging_flag=False, writelength=None,
+                               address=0, on_block=None):
         """
         Write firmware blocks using CDB command 0103h (LPL) or 0104h (EPL).
         Aborts the download if any block write fails.
 
+        Blocks are written from address on. If on_block is given, it is called as
+        on_block(address) once the module acknowledged the blocks up to address, and a
+        failed block write leaves the download in progress instead of aborting it.
+
+        writelength is the maximum bytes per write of the download, None if unknown.
+        If autopaging_flag is set, the EPL pages of a block are written as one sequential
+        stream in chunks of up to writelength bytes, instead of page by page.
+
+        The image is read or mapped once and shared with other downloads of the same file,
+        see CdbFwImage; image optionally holds its content, already read or mapped by the caller.
+        progress_callback, if given, is called as progress_callback(written, total, elapsed)
+        after every block, in place of logging the block.
+
         This function returns True on success.
         Otherwise it will return False.
         """
+        if image is None:
+            image = CdbFwImage.get_shared(imagepath).view
+        # The optoe write_max is set to writelength for the download, letting a
+        # command fit in a single write on modules triggered that way
+        self.cdb_fw_hdlr.set_write_max(writelength)
+        try:
+            if lplonly_flag:
+                return self._module_fw_write_blocks(memoryview(image), startLPLsize, maxblocksize, lplonly_flag,
+                                                    progress_callback, address, on_block)
+            # Auto paging only applies to the EPL writes of this download
+            self.cdb_fw_hdlr.set_epl_auto_paging(autopaging_flag, writelength)
+            try:
+                return self._module_fw_write_blocks(memoryview(image), startLPLsize, maxblocksize, lplonly_flag,
+                                                    progress_callback, address, on_block)
+            finally:
+                self.cdb_fw_hdlr.set_epl_auto_paging(False)
+        finally:
+            self.cdb_fw_hdlr.set_write_max(None)
+
+    def _module_fw_write_blocks(self, image, startLPLsize, maxblocksize, lplonly_flag, progress_callback,
+                                address=0, on_block=None):
         starttime = time.time()
         BLOCK_SIZE = cdb_consts.LPL_MAX_PAYLOAD_SIZE if lplonly_flag else maxblocksize
 
-        with open(imagepath, 'rb') as f:
-            f.seek(0, 2)
-            imagesize = f.tell()
-            f.seek(startLPLsize, 0)
-
-            address = 0
-            remaining = imagesize - startLPLsize
-            log.log_info("\nTotal size: {} start bytes: {} remaining: {}".format(imagesize, startLPLsize, remaining))
-            while remaining > 0:
-                count = min(remaining, BLOCK_SIZE)
-                data = f.read(count)
-                if lplonly_flag:
-                    result = self.cdb_fw_hdlr.write_lpl_block(address, data)
-                else:
-                    try:
-                        self.cdb_fw_hdlr.write_epl_pages(data)
-                    except AssertionError as err:
+        imagesize = len(image)
+        remaining = imagesize - startLPLsize - address
+        log.log_info("\nTotal size: {} start bytes: {} remaining: {}".format(imagesize, startLPLsize, remaining))
+        while remaining > 0:
+            count = min(remaining, BLOCK_SIZE)
+            # A memoryview slice of the image, passed down to the writer without copies
+            data = image[startLPLsize + address:startLPLsize + address + count]
+            if lplonly_flag:
+                result = self.cdb_fw_hdlr.write_lpl_block(address, data)
+            else:
+                try:
+                    self.cdb_fw_hdlr.write_epl_pages(data)
+                except AssertionError as err:
+                    if on_block is None:
                         self.cdb_fw_hdlr.abort_fw_download()
-                        txt = 'CDB download failed: {}'.format(err)
-                        log.log_error(txt)
-                        return False, txt
-                    result = self.cdb_fw_hdlr.write_epl_block(address, data)
-                if result is not True:
-                    self.cdb_fw_hdlr.abort_fw_download()
-                    fw_download_status = self.get_status_code()
-                    txt = 'CDB download failed. CDB Status: %d\n' % fw_download_status
-                    log.log_notice(txt)
+                    txt = 'CDB download failed: {}'.format(err)
+                    log.log_error(txt)
                     return False, txt
-                address += count
-                remaining -= count
-                progress = (imagesize - remaining) * 100.0 / imagesize
-                elapsedtime = time.time() - starttime
-                log.log_info('Address: {:#08x}; Count: {}; Remain: {:#08x}; Progress: {:.2f}%; Time: {:.2f}s'.format(
-                    address, count, remaining, progress, elapsedtime))
+                result = self.cdb_fw_hdlr.write_epl_block(address, data)
+            if result is not True:
+                if on_block is None:
+                    self.cdb_fw_hdlr.abort_fw_download()
+                fw_download_status = self.get_status_code()
+                txt = 'CDB download failed. CDB Status: %d\n' % fw_download_status
+                log.log_notice(txt)
+                return False, txt
+            address += count
+            remaining -= count
+            if on_block is not None:
+                on_block(address)
+            elapsedtime = time.time() - starttime
+            if progress_callback is not None:
+                progress_callback(imagesize - remaining, imagesize, elapsedtime)
+                continue
+            progress = (imagesize - remaining) * 100.0 / imagesize
+            log.log_info('Address: {:#08x}; Count: {}; Remain: {:#08x}; Progress: {:.2f}%; Time: {:.2f}s'.format(
+                address, count, remaining, progress, elapsedtime))
 
         log.log_info('Total module FW download time: {:.2f} s'.format(time.time() - starttime))
         return True, ''
@@ -455,25 +523,120 @@ class CmisCdbFw:
         log.log_notice(txt)
         return False, txt
 
-    def module_fw_download(self, startLPLsize, maxblocksize, lplonly_flag, autopaging_flag, writelength, imagepath):
+    def _get_fw_checkpoint_key(self):
+        return "{}/{}/{}".format(self.get_manufacturer(), self.get_model(), self.get_serial())
+
+    def _get_fw_download_state(self):
+        """
+        Returns the running and validity status of images A and B as a list,
+        None if the firmware info cannot be read. CMIS has no query of a partial
+        download, but a download in progress leaves the inactive image invalid
+        until it completes and the running image unchanged.
+        """
+        fw_info = self.get_module_fw_info()
+        if not fw_info['status']:
+            return None
+        _, a_running, _, a_invalid, _, b_running, _, b_invalid, _, _ = fw_info['result']
+        return [a_running, b_running, a_invalid, b_invalid]
+
+    def module_fw_download(self, startLPLsize, maxblocksize, lplonly_flag, autopaging_flag, writelength, imagepath,
+                           image=None, progress_callback=None, resume=False):
         """
         This function performs the full firmware download sequence:
         1. Start download with password retry
         2. Write firmware blocks
         3. Complete download
 
+        image and progress_callback are passed on, see module_fw_write_blocks().
+
+        If resume is set, the download is resumable: the blocks acknowledged by the module
+        are checkpointed per module and image, see CdbFwCheckpoint, and a failed download is
+        left in progress rather than aborted. A later resumable download of the same image
+        to the module skips the start and continues from the checkpoint, once the firmware
+        state of the module is checked to still be the one recorded when the download
+        started, see _get_fw_download_state(). If it is not, or the module rejects the
+        first block, the download is aborted and started over. A resumed download that
+        fails is aborted.
+
         This function returns True on success.
         Otherwise it will return False.
         """
-        success, txt = self.module_fw_start_download(imagepath)
-        if not success:
-            return False, txt
+        if self.cdb_fw_hdlr is None:
+            return False, "CDB NOT supported on this module"
+
+        on_block = None
+        address = 0
+        txt = ''
+        if resume:
+            try:
+                if image is None:
+                    image_digest = CdbFwImage.get_shared(imagepath).get_digest()
+                else:
+                    image_digest = hashlib.sha256(image).hexdigest()
+            except (IOError, OSError):
+                txt = 'Image path %s is incorrect.\n' % imagepath
+                log.log_notice(txt)
+                return False, txt
+            checkpoint = CdbFwCheckpoint.get_shared()
+            checkpoint_key = self._get_fw_checkpoint_key()
+            address = checkpoint.get(checkpoint_key, image_digest)
+            acked = [address]
+
+            def on_block(address):
+                acked[0] = address
+                checkpoint.update(checkpoint_key, image_digest, address)
+
+        if address:
+            state = self._get_fw_download_state()
+            if state is None or state != checkpoint.get_state(checkpoint_key):
+                txt = 'Module FW state {} does not match the download checkpoint, restarting\n'.format(state)
+                log.log_notice(txt)
+                self.cdb_fw_hdlr.abort_fw_download()
+                checkpoint.clear(checkpoint_key)
+                address = acked[0] = 0
+
+        if address:
+            txt = 'Resuming module FW download at address %#x\n' % address
+            log.log_notice(txt)
+            success, msg = self.module_fw_write_blocks(imagepath, startLPLsize, maxblocksize, lplonly_flag,
+                                                       image, progress_callback, autopaging_flag, writelength,
+                                                       address, on_block)
+            if not success and acked[0] == address:
+                txt += msg + 'Module FW download could not be resumed, restarting\n'
+                log.log_notice(txt)
+                self.cdb_fw_hdlr.abort_fw_download()
+                checkpoint.clear(checkpoint_key)
+                address = 0
+            elif not success:
+                # The module state is not trusted for another resume
+                txt += msg + 'Resumed module FW download failed, aborting\n'
+                log.log_notice(txt)
+                self.cdb_fw_hdlr.abort_fw_download()
+                checkpoint.clear(checkpoint_key)
+                self.cdb_fw_hdlr.save_poll_profile()
+                return False, txt
 
-        success, msg = self.module_fw_write_blocks(imagepath, startLPLsize, maxblocksize, lplonly_flag)
+        if not address:
+            success, msg = self.module_fw_start_download(imagepath, image)
+            txt += msg
+            if not success:
+                return False, txt
+            if resume:
+                checkpoint.update(checkpoint_key, image_digest, 0, save=True, state=self._get_fw_download_state())
+
+            success, msg = self.module_fw_write_blocks(imagepath, startLPLsize, maxblocksize, lplonly_flag,
+                                                       image, progress_callback, autopaging_flag, writelength,
+                                                       0, on_block)
         txt += msg
+        self.cdb_fw_hdlr.save_poll_profile()
         if not success:
+            if resume and acked[0]:
+                checkpoint.update(checkpoint_key, image_digest, acked[0], save=True)
+                txt += 'Module FW download can be resumed at address %#x\n' % acked[0]
             return False, txt
 
+        if resume:
+            checkpoint.clear(checkpoint_key)
         success, msg = self.module_fw_complete_download()
         txt += msg
         if not success:
@@ -481,19 +644,16 @@ class CmisCdbFw:
 
         return True, txt
 
-    def module_fw_upgrade(self, imagepath, timeout=5):
+    def module_fw_info_and_download(self, imagepath, image=None, progress_callback=None, resume=False):
         """
-        This function performs a full firmware upgrade:
+        This function performs the download steps of a firmware upgrade:
         1.  Get current firmware info
         2.  Check module advertised FW management features
         3.  Download firmware image
-        4.  Run the downloaded firmware
-        5.  Commit the running firmware
 
-        imagepath specifies where firmware image file is located.
-        timeout specifies the wait time in seconds after run before commit (default: 5).
+        image, progress_callback and resume are passed on, see module_fw_download().
 
-        This function returns True if upgrade successfully completes.
+        This function returns True if the image is downloaded.
         Otherwise it will return False.
         """
         result = self.get_module_fw_info()
@@ -507,7 +667,26 @@ class CmisCdbFw:
         except (ValueError, TypeError):
             return result['status'], result['info']
 
-        download_status, txt = self.module_fw_download(startLPLsize, maxblocksize, lplonly_flag, autopaging_flag, writelength, imagepath)
+        return self.module_fw_download(startLPLsize, maxblocksize, lplonly_flag, autopaging_flag, writelength,
+                                       imagepath, image=image, progress_callback=progress_callback, resume=resume)
+
+    def module_fw_upgrade(self, imagepath, timeout=5, resume=False):
+        """
+        This function performs a full firmware upgrade:
+        1.  Get current firmware info
+        2.  Check module advertised FW management features
+        3.  Download firmware image
+        4.  Run the downloaded firmware
+        5.  Commit the running firmware
+
+        imagepath specifies where firmware image file is located.
+        timeout specifies the wait time in seconds after run before commit (default: 5).
+        resume makes the download resumable, see module_fw_download().
+
+        This function returns True if upgrade successfully completes.
+        Otherwise it will return False.
+        """
+        download_status, txt = self.module_fw_info_and_download(imagepath, resume=resume)
         if not download_status:
             return False, txt
 
@@ -0,0 +1,173 @@
+"""
+    cdb_fw_upgrade.py
+
+    Firmware upgrade of many CMIS modules at once, built on the CmisCdbFw APIs.
+"""
+
+import heapq
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from sonic_py_common.syslogger import SysLogger
+from ...cdb.cdb_fw_image import CdbFwImage
+
+SYSLOG_IDENTIFIER = "CdbFwUpgrade"
+log = SysLogger(SYSLOG_IDENTIFIER)
+log.logger.propagate = False
+
+FW_UPGRADE_PHASE_QUEUED = "queued"
+FW_UPGRADE_PHASE_DOWNLOAD = "download"
+FW_UPGRADE_PHASE_RUN = "run"
+FW_UPGRADE_PHASE_COMMIT_WAIT = "commit_wait"
+FW_UPGRADE_PHASE_COMMIT = "commit"
+FW_UPGRADE_PHASE_DONE = "done"
+FW_UPGRADE_PHASE_FAILED = "failed"
+
+
+class CdbFwUpgradeOrchestrator(object):
+    """
+    Upgrades the firmware of many modules concurrently.
+
+    Modules are given in groups, typically one group per I2C bus: modules of a
+    group are downloaded one after the other, while groups are downloaded
+    concurrently on up to max_workers threads. Each image file is read once
+    and shared by all the modules it is downloaded to.
+
+    Run and commit are pipelined with the downloads: once a module runs its new
+    image, the group moves on to download the next module, and the module is
+    committed at least commit_delay seconds later, in between two downloads or
+    after the last one, instead of sleeping through commit_delay per module.
+
+    With resume, downloads are resumable, see CmisCdbFw.module_fw_download().
+
+    Progress is reported through progress_callback(port, state), called from the
+    worker threads, state being a dict with keys:
+        'phase': one of the FW_UPGRADE_PHASE_* values
+        'progress': percentage of the image downloaded
+        'eta': estimated seconds left to download the image, None if unknown
+        'info': text of the last step, the failure reason in phase 'failed'
+    """
+    def __init__(self, progress_callback=None, run_mode=0x01, commit_delay=5, max_workers=8, resume=False):
+        self.progress_callback = progress_callback
+        self.resume = resume
+        self.run_mode = run_mode
+        self.commit_delay = commit_delay
+        self.max_workers = max_workers
+        self._images = {}
+        self._images_lock = threading.Lock()
+        self.image_reads = 0
+
+    def _report(self, port, phase, progress=0.0, eta=None, info=''):
+        if self.progress_callback is None:
+            return
+        try:
+            self.progress_callback(port, {'phase': phase, 'progress': progress, 'eta': eta, 'info': info})
+        except Exception as e:
+            log.log_error("Firmware upgrade progress callback failed for port {}: {}".format(port, e))
+
+    def get_image(self, imagepath):
+        """
+        Returns a memoryview of imagepath, read once per orchestrator, see CdbFwImage
+        """
+        with self._images_lock:
+            image = self._images.get(imagepath)
+            if image is None:
+                image = CdbFwImage.get_shared(imagepath)
+                self._images[imagepath] = image
+                self.image_reads += 1
+            return image.view
+
+    def upgrade(self, groups, imagepath):
+        """
+        Download, run and commit a firmware image on several modules
+
+        Args:
+            groups: a list of lists of (port, api) tuples, api being the CmisApi of
+                    the module on port. Modules of a group are downloaded serially.
+            imagepath: path of the firmware image, or a dict mapping each port to
+                       the path of its image
+
+        Returns:
+            A dict mapping each port to a (status, info) tuple, as returned by
+            CmisCdbFw.module_fw_upgrade()
+        """
+        results = {}
+        groups = [list(group) for group in groups if group]
+        for group in groups:
+            for port, _ in group:
+                self._report(port, FW_UPGRADE_PHASE_QUEUED)
+
+        max_workers = min(self.max_workers, len(groups))
+        if max_workers <= 1:
+            for group in groups:
+                self._upgrade_group(group, imagepath, results)
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for future in [executor.submit(self._upgrade_group, group, imagepath, results)
+                               for group in groups]:
+                    future.result()
+        return results
+
+    def _upgrade_group(self, group, imagepath, results):
+        pending_commits = []
+        for port, api in group:
+            self._commit_due(pending_commits, results, wait=False)
+            path = imagepath[port] if isinstance(imagepath, dict) else imagepath
+            try:
+                success, txt = self._download_and_run(port, api, path)
+            except Exception as e:
+                success, txt = False, 'Module FW upgrade failed: {}\n'.format(e)
+            if success:
+                heapq.heappush(pending_commits, (time.monotonic() + self.commit_delay, port, api, txt))
+            else:
+                self._fail(port, txt, results)
+        self._commit_due(pending_commits, results, wait=True)
+
+    def _fail(self, port, txt, results):
+        results[port] = (False, txt)
+        log.log_notice("Port {}: module firmware upgrade failed".format(port))
+        self._report(port, FW_UPGRADE_PHASE_FAILED, info=txt)
+
+    def _download_and_run(self, port, api, imagepath):
+        try:
+            image = self.get_image(imagepath)
+        except (IOError, OSError) as e:
+            return False, 'Image path %s is incorrect: %s\n' % (imagepath, e)
+
+        def on_block(written, total, elapsed):
+            progress = written * 100.0 / total
+            eta = elapsed * (total - written) / written if written else None
+            self._report(port, FW_UPGRADE_PHASE_DOWNLOAD, progress, eta)
+
+        self._report(port, FW_UPGRADE_PHASE_DOWNLOAD)
+        success, txt = api.module_fw_info_and_download(imagepath, image=image, progress_callback=on_block,
+                                                       resume=self.resume)
+        if not success:
+            return False, txt
+
+        self._report(port, FW_UPGRADE_PHASE_RUN, 100.0, 0)
+        success, info = api.module_fw_run(mode=self.run_mode)
+        if not success:
+            return False, txt + 'Module FW run failed\n' + info
+        self._report(port, FW_UPGRADE_PHASE_COMMIT_WAIT, 100.0, 0)
+        return True, txt
+
+    def _commit_due(self, pending_commits, results, wait):
+        while pending_commits:
+            due, port, api, txt = pending_commits[0]
+            delay = due - time.monotonic()
+            if delay > 0:
+                if not wait:
+                    return
+                time.sleep(delay)
+            heapq.heappop(pending_commits)
+            self._report(port, FW_UPGRADE_PHASE_COMMIT, 100.0, 0)
+            try:
+                success, info = api.module_fw_commit()
+            except Exception as e:
+                success, info = False, '{}\n'.format(e)
+            if not success:
+                self._fail(port, txt + 'Module FW commit failed\n' + info, results)
+                continue
+            results[port] = (True, txt)
+            self._report(port, FW_UPGRADE_PHASE_DONE, 100.0, 0, txt)
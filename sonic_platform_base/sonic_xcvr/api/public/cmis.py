@@ -14,11 +14,15 @@ from ...codes.public.cmis import CmisCodes
 from ...codes.public.cdb import CdbCodes
 from ...codes.public.sff8024 import Sff8024
 from ...mem_maps.public.cmis.cdb import CdbMemMap
-from .cmisVDM import CmisVdmApi
+from .cmisVDM import CmisVdmApi, CmisVdmFreeze
+from .cmis_appl_index import CmisApplicationIndex
 import time
 import copy
 from collections import defaultdict
-from ...utils.cache import read_only_cached_api_return
+from ...utils.cache import read_only_cached_api_return, cached_api_return
+from ...utils import cache as xcvr_cache
+from ...utils.info_cache import XcvrInfoCache
+from ...async_xcvr_eeprom import AsyncXcvrEeprom
 
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
@@ -26,6 +30,34 @@ logger.addHandler(logging.NullHandler())
 VDM_FREEZE = 128
 VDM_UNFREEZE = 0
 
+# Pages prefetched by the async getters, covering every field read by their synchronous
+# counterparts (lower/upper page 00h, advertisement and thresholds, lane control and status)
+CMIS_DOM_PAGES = [0x00, 0x01, 0x02, 0x11]
+CMIS_STATUS_PAGES = [0x00, 0x01, 0x10, 0x11]
+# VDM sample pages (24h-27h), flag page (2Ch) and VDM control page (2Fh). The descriptor
+# pages (20h-23h) are only prefetched until CmisVdmApi has cached them
+CMIS_VDM_REAL_VALUE_PAGES = [0x00, 0x01, 0x24, 0x25, 0x26, 0x27, 0x2f]
+CMIS_VDM_FLAG_PAGES = [0x00, 0x01, 0x2c, 0x2f]
+
+# Bytes identifying a module and the content of its static pages, see
+# CmisApi.get_transceiver_info_fingerprint()
+CMIS_INFO_FINGERPRINT_FIELDS = (
+    consts.VENDOR_NAME_FIELD,
+    consts.VENDOR_OUI_FIELD,
+    consts.VENDOR_PART_NO_FIELD,
+    consts.VENDOR_REV_FIELD,
+    consts.VENDOR_SERIAL_NO_FIELD,
+    consts.PAGE_00H_CHECKSUM,
+    consts.ACTIVE_FW_MAJOR_REV,
+    consts.ACTIVE_FW_MINOR_REV,
+)
+CMIS_INFO_FINGERPRINT_PAGED_FIELDS = (
+    consts.INACTIVE_FW_MAJOR_REV,
+    consts.INACTIVE_FW_MINOR_REV,
+    consts.PAGE_01H_CHECKSUM,
+    consts.PAGE_02H_CHECKSUM,
+)
+
 DATAPATH_INIT_DURATION_MULTIPLIER = 10
 DATAPATH_INIT_DURATION_OVERRIDE_THRESHOLD = 1000
 
@@ -105,7 +137,7 @@ CMIS_XCVR_INFO_DEFAULT_DICT = {
         "vdm_supported": "N/A"
         }
 
-class CmisApi(CmisCdbFw, XcvrApi):
+class CmisApi(CmisCdbFw, CmisVdmFreeze, XcvrApi):
     NUM_CHANNELS = 8
     LowPwrRequestSW = 4
     LowPwrAllowRequestHW = 6
@@ -130,16 +162,44 @@ class CmisApi(CmisCdbFw, XcvrApi):
     @classmethod
     def set_cache_enabled(cls, enabled: bool):
         """
-        Set the cache_enabled flag to control read_only_cached_api_return behavior.
+        Set the cache_enabled flag to control cached_api_return behavior.
         """
         cls.cache_enabled = bool(enabled)
 
+    def invalidate_cache(self):
+        """
+        Bump the cache generation, dropping the values cached by the
+        generation-aware cached_api_return methods. Called on module reset,
+        firmware run and application change.
+        """
+        return xcvr_cache.bump_cache_generation(self)
+
+    def get_cache_stats(self):
+        """
+        Returns a dict mapping each cached method called so far to its
+        'hits' and 'misses' counts, for profiling
+        """
+        return xcvr_cache.get_cache_stats(self)
+
+    # Cross-instance cache of the static transceiver info, disabled by default
+    info_cache = None
+
+    @classmethod
+    def set_info_cache(cls, info_cache):
+        """
+        Set the XcvrInfoCache get_transceiver_info() is served from, e.g.
+        XcvrInfoCache.get_shared() to persist it across restarts. None
+        disables it.
+        """
+        cls.info_cache = info_cache
+
     def __init__(self, xcvr_eeprom, init_cdb_fw_handler=False):
         super(CmisApi, self).__init__(xcvr_eeprom)
         self.vdm = CmisVdmApi(xcvr_eeprom) if not self.is_flat_memory() else None
         self._init_cdb_fw_handler = init_cdb_fw_handler
         self._cdb_fw_hdlr = None
         self._cdb_mem_map = CdbMemMap(CdbCodes) if init_cdb_fw_handler else None
+        self._async_xcvr_eeprom = None
 
     def _get_vdm_key_to_db_prefix_map(self):
         return CMIS_VDM_KEY_TO_DB_PREFIX_KEY_MAP
@@ -202,43 +262,6 @@ class CmisApi(CmisCdbFw, XcvrApi):
 
         return True
 
-    def freeze_vdm_stats(self):
-        '''
-        This function freeze all the vdm statistics reporting registers.
-        When raised by the host, causes the module to freeze and hold all
-        reported statistics reporting registers (minimum, maximum and
-        average values)in Pages 24h-27h.
-
-        Returns True if the provision succeeds and False incase of failure.
-        '''
-        return self.xcvr_eeprom.write(consts.VDM_CONTROL, VDM_FREEZE)
-
-    def get_vdm_freeze_status(self):
-        '''
-        This function reads and returns the vdm Freeze done status.
-
-        Returns True if the vdm stats freeze is successful and False if not freeze.
-        '''
-        return self.xcvr_eeprom.read(consts.VDM_FREEZE_DONE)
-
-    def unfreeze_vdm_stats(self):
-        '''
-        This function unfreeze all the vdm statistics reporting registers.
-        When freeze is ceased by the host, releases the freeze request, allowing the
-        reported minimum, maximum and average values to update again.
-
-        Returns True if the provision succeeds and False incase of failure.
-        '''
-        return self.xcvr_eeprom.write(consts.VDM_CONTROL, VDM_UNFREEZE)
-
-    def get_vdm_unfreeze_status(self):
-        '''
-        This function reads and returns the vdm unfreeze status.
-
-        Returns True if the vdm stats unfreeze is successful and False if not unfreeze.
-        '''
-        return self.xcvr_eeprom.read(consts.VDM_UNFREEZE_DONE)
-
     @read_only_cached_api_return
     def get_manufacturer(self):
         '''
@@ -313,7 +336,7 @@ class CmisApi(CmisCdbFw, XcvrApi):
         hw_rev = [str(num) for num in [hw_major_rev, hw_minor_rev]]
         return '.'.join(hw_rev)
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_cmis_rev(self):
         '''
         This function returns the CMIS version the module complies to
@@ -359,7 +382,65 @@ class CmisApi(CmisCdbFw, XcvrApi):
     def _get_xcvr_info_default_dict(self):
         return CMIS_XCVR_INFO_DEFAULT_DICT
 
+    def get_transceiver_info_fingerprint(self):
+        '''
+        This function returns the fingerprint of the module the static
+        transceiver info is cached under: a digest of the vendor name, OUI, PN,
+        revision and SN, of the firmware revisions and of the checksums of
+        pages 00h, 01h and 02h. It is read in a handful of short reads.
+
+        Returns None if any of them could not be read
+        '''
+        fields = CMIS_INFO_FINGERPRINT_FIELDS
+        if not self.is_flat_memory():
+            fields = fields + CMIS_INFO_FINGERPRINT_PAGED_FIELDS
+        values = self.xcvr_eeprom.read_many(fields)
+        if None in values.values():
+            return None
+        return XcvrInfoCache.make_fingerprint(type(self).__name__, [values[field] for field in fields])
+
+    def _get_info_cache_fingerprint(self):
+        info_cache = self.info_cache
+        if info_cache is None:
+            return None, None
+        return info_cache, self.get_transceiver_info_fingerprint()
+
+    def _drop_info_cache_entry(self, fingerprint):
+        # A firmware run or commit may change content the fingerprint does not
+        # cover, e.g. the build number of the firmware
+        if fingerprint is not None and self.info_cache is not None:
+            self.info_cache.remove(fingerprint)
+
     def get_transceiver_info(self):
+        info_cache, fingerprint = self._get_info_cache_fingerprint()
+        xcvr_info = info_cache.get(fingerprint, 'transceiver_info') if fingerprint is not None else None
+        if xcvr_info is None:
+            xcvr_info = self._get_static_transceiver_info()
+            if xcvr_info is None:
+                return None
+            if fingerprint is not None and None not in xcvr_info.values():
+                info_cache.put(fingerprint, 'transceiver_info', xcvr_info)
+
+        # The active application is not static, it is read on every call
+        apsel_dict = self.get_active_apsel_hostlane()
+        for lane in range(1, self.NUM_CHANNELS + 1):
+            xcvr_info["%s%d" % ("active_apsel_hostlane", lane)] = \
+            apsel_dict["%s%d" % (consts.ACTIVE_APSEL_HOSTLANE, lane)]
+
+        # In normal case will get a valid value for each of the fields. If get a 'None' value
+        # means there was a failure while reading the EEPROM, either because the EEPROM was
+        # not ready yet or experiencing some other issues. It shouldn't return a dict with a
+        # wrong field value, instead should return a 'None' to indicate to XCVRD that retry is
+        # needed.
+        if None in xcvr_info.values():
+            return None
+        else:
+            return xcvr_info
+
+    def _get_static_transceiver_info(self):
+        '''
+        Returns the fields of get_transceiver_info() read from the static pages
+        '''
         admin_info = self.xcvr_eeprom.read(consts.ADMIN_INFO_FIELD)
         if admin_info is None:
             return None
@@ -390,20 +471,7 @@ class CmisApi(CmisCdbFw, XcvrApi):
             "specification_compliance": self.get_module_media_type(),
             "vdm_supported": self.is_transceiver_vdm_supported()
         })
-        apsel_dict = self.get_active_apsel_hostlane()
-        for lane in range(1, self.NUM_CHANNELS + 1):
-            xcvr_info["%s%d" % ("active_apsel_hostlane", lane)] = \
-            apsel_dict["%s%d" % (consts.ACTIVE_APSEL_HOSTLANE, lane)]
-
-        # In normal case will get a valid value for each of the fields. If get a 'None' value
-        # means there was a failure while reading the EEPROM, either because the EEPROM was
-        # not ready yet or experiencing some other issues. It shouldn't return a dict with a
-        # wrong field value, instead should return a 'None' to indicate to XCVRD that retry is
-        # needed.
-        if None in xcvr_info.values():
-            return None
-        else:
-            return xcvr_info
+        return xcvr_info
 
     def get_transceiver_info_firmware_versions(self):
         return_dict = {"active_firmware" : "N/A", "inactive_firmware" : "N/A"}
@@ -667,11 +735,11 @@ class CmisApi(CmisCdbFw, XcvrApi):
     def get_voltage_support(self):
         return not self.is_flat_memory()
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_rx_los_support(self):
         return not self.is_flat_memory() and self.xcvr_eeprom.read(consts.RX_LOS_SUPPORT)
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_tx_cdr_lol_support(self):
         return not self.is_flat_memory() and self.xcvr_eeprom.read(consts.TX_CDR_LOL_SUPPORT_FIELD)
 
@@ -711,7 +779,7 @@ class CmisApi(CmisCdbFw, XcvrApi):
             rx_los_final.append(bool(rx_los[key]))
         return rx_los_final
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_rx_cdr_lol_support(self):
         return not self.is_flat_memory() and self.xcvr_eeprom.read(consts.RX_CDR_LOL_SUPPORT_FIELD)
 
@@ -795,11 +863,11 @@ class CmisApi(CmisCdbFw, XcvrApi):
             rx_output_status_dict[key] = bool(value)
         return rx_output_status_dict
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_tx_bias_support(self):
         return not self.is_flat_memory() and self.xcvr_eeprom.read(consts.TX_BIAS_SUPPORT_FIELD)
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def _get_tx_bias_scale_raw(self):
         # The TX bias scaling exponent is a static per-module advertisement, so
         # cache it; the per-cycle get_tx_bias / threshold paths read it every
@@ -843,7 +911,7 @@ class CmisApi(CmisCdbFw, XcvrApi):
 
         return tx_power
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_tx_power_support(self):
         return not self.is_flat_memory() and self.xcvr_eeprom.read(consts.TX_POWER_SUPPORT_FIELD)
 
@@ -864,11 +932,11 @@ class CmisApi(CmisCdbFw, XcvrApi):
 
         return rx_power
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_rx_power_support(self):
         return not self.is_flat_memory() and self.xcvr_eeprom.read(consts.RX_POWER_SUPPORT_FIELD)
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_tx_fault_support(self):
         return not self.is_flat_memory() and self.xcvr_eeprom.read(consts.TX_FAULT_SUPPORT_FIELD)
 
@@ -890,7 +958,7 @@ class CmisApi(CmisCdbFw, XcvrApi):
             tx_fault_final.append(bool(tx_fault[key]))
         return tx_fault_final
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_tx_los_support(self):
         return not self.is_flat_memory() and self.xcvr_eeprom.read(consts.TX_LOS_SUPPORT_FIELD)
 
@@ -912,7 +980,7 @@ class CmisApi(CmisCdbFw, XcvrApi):
             tx_los_final.append(bool(tx_los[key]))
         return tx_los_final
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_tx_disable_support(self):
         return not self.is_flat_memory() and self.xcvr_eeprom.read(consts.TX_DISABLE_SUPPORT_FIELD)
 
@@ -955,7 +1023,7 @@ class CmisApi(CmisCdbFw, XcvrApi):
 
         return self.xcvr_eeprom.write(consts.TX_DISABLE_FIELD, channel_state)
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_rx_disable_support(self):
         return not self.is_flat_memory() and self.xcvr_eeprom.read(consts.RX_DISABLE_SUPPORT_FIELD)
 
@@ -1027,7 +1095,7 @@ class CmisApi(CmisCdbFw, XcvrApi):
     def get_transceiver_thresholds_support(self):
         return not self.is_flat_memory()
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_lpmode_support(self):
         power_class = self.xcvr_eeprom.read(consts.POWER_CLASS_FIELD)
         if power_class is None:
@@ -1044,7 +1112,7 @@ class CmisApi(CmisCdbFw, XcvrApi):
         '''
         return self.xcvr_eeprom.read(consts.MEDIA_TYPE_FIELD)
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_host_electrical_interface(self):
         '''
         This function returns module host electrical interface. Table 4-5 in SFF-8024 Rev4.6
@@ -1053,7 +1121,7 @@ class CmisApi(CmisCdbFw, XcvrApi):
             return 'N/A'
         return self.xcvr_eeprom.read(consts.HOST_ELECTRICAL_INTERFACE)
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_module_media_interface(self):
         '''
         This function returns module media electrical interface. Table 4-6 ~ 4-10 in SFF-8024 Rev4.6
@@ -1072,7 +1140,7 @@ class CmisApi(CmisCdbFw, XcvrApi):
         else:
             return 'Unknown media interface'
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def is_coherent_module(self):
         '''
         Returns True if the module follows the C-CMIS spec, False otherwise.
@@ -1099,7 +1167,7 @@ class CmisApi(CmisCdbFw, XcvrApi):
             pass
         return False
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_datapath_init_duration(self):
         '''
         This function returns the duration of datapath init
@@ -1112,7 +1180,7 @@ class CmisApi(CmisCdbFw, XcvrApi):
         value = float(duration)
         return value * DATAPATH_INIT_DURATION_MULTIPLIER if value <= DATAPATH_INIT_DURATION_OVERRIDE_THRESHOLD else value
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_datapath_deinit_duration(self):
         '''
         This function returns the duration of datapath deinit
@@ -1122,7 +1190,7 @@ class CmisApi(CmisCdbFw, XcvrApi):
         duration = self.xcvr_eeprom.read(consts.DP_PATH_DEINIT_DURATION)
         return float(duration) if duration is not None else 0
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_datapath_tx_turnon_duration(self):
         '''
         This function returns the duration of datapath tx turnon
@@ -1132,7 +1200,7 @@ class CmisApi(CmisCdbFw, XcvrApi):
         duration = self.xcvr_eeprom.read(consts.DP_TX_TURNON_DURATION)
         return float(duration) if duration is not None else 0
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_datapath_tx_turnoff_duration(self):
         '''
         This function returns the duration of datapath tx turnoff
@@ -1142,7 +1210,7 @@ class CmisApi(CmisCdbFw, XcvrApi):
         duration = self.xcvr_eeprom.read(consts.DP_TX_TURNOFF_DURATION)
         return float(duration) if duration is not None else 0
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_module_pwr_up_duration(self):
         '''
         This function returns the duration of module power up
@@ -1152,7 +1220,7 @@ class CmisApi(CmisCdbFw, XcvrApi):
         duration = self.xcvr_eeprom.read(consts.MODULE_PWRUP_DURATION)
         return float(duration) if duration is not None else 0
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_module_pwr_down_duration(self):
         '''
         This function returns the duration of module power down
@@ -1162,6 +1230,7 @@ class CmisApi(CmisCdbFw, XcvrApi):
         duration = self.xcvr_eeprom.read(consts.MODULE_PWRDN_DURATION)
         return float(duration) if duration is not None else 0
 
+    @cached_api_return()
     def get_host_lane_count(self, appl=None):
         '''
         Returns the number of host lanes.
@@ -1184,9 +1253,10 @@ class CmisApi(CmisCdbFw, XcvrApi):
             return 0
         if appl <= 0:
             return 0
-        appl_advt = self.get_application_advertisement()
-        return appl_advt[appl]['host_lane_count'] if len(appl_advt) >= appl else 0
+        appl_info = self.get_application_index().get(appl)
+        return appl_info.host_lane_count if appl_info is not None else 0
 
+    @cached_api_return()
     def get_media_lane_count(self, appl=1):
         '''
         This function returns number of media lanes for default application
@@ -1197,16 +1267,17 @@ class CmisApi(CmisCdbFw, XcvrApi):
         if (appl <= 0):
             return 0
 
-        appl_advt = self.get_application_advertisement()
-        return appl_advt[appl]['media_lane_count'] if len(appl_advt) >= appl else 0
+        appl_info = self.get_application_index().get(appl)
+        return appl_info.media_lane_count if appl_info is not None else 0
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_media_interface_technology(self):
         '''
         This function returns the media lane technology
         '''
         return self.xcvr_eeprom.read(consts.MEDIA_INTERFACE_TECH)
 
+    @cached_api_return()
     def get_host_lane_assignment_option(self, appl=1):
         '''
         This function returns the host lane that the application begins on
@@ -1217,13 +1288,14 @@ class CmisApi(CmisCdbFw, XcvrApi):
         if (appl <= 0):
             return 0
 
-        appl_advt = self.get_application_advertisement()
-        if appl not in appl_advt:
+        appl_info = self.get_application_index().get(appl)
+        if appl_info is None:
             logger.error('Application {} not found in application advertisement'.format(appl))
             return 0
 
-        return appl_advt[appl].get('host_lane_assignment_options', 0)
+        return appl_info.host_lane_assignment_options or 0
 
+    @cached_api_return()
     def get_media_lane_assignment_option(self, appl=1):
         '''
         This function returns the media lane that the application is allowed to begin on
@@ -1234,8 +1306,8 @@ class CmisApi(CmisCdbFw, XcvrApi):
         if (appl <= 0):
             return 0
 
-        appl_advt = self.get_application_advertisement()
-        return appl_advt[appl]['media_lane_assignment_options'] if len(appl_advt) >= appl else 0
+        appl_info = self.get_application_index().get(appl)
+        return appl_info.media_lane_assignment_options if appl_info is not None else 0
 
     def get_active_apsel_hostlane(self):
         '''
@@ -1409,7 +1481,7 @@ class CmisApi(CmisCdbFw, XcvrApi):
             dpinit_pending_dict[key] = bool(value)
         return dpinit_pending_dict
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_supported_power_config(self):
         '''
         This function returns the supported TX power range as a
@@ -1430,7 +1502,10 @@ class CmisApi(CmisCdbFw, XcvrApi):
         '''
         if reset:
             reset_control = reset << 3
-            return self.xcvr_eeprom.write(consts.MODULE_LEVEL_CONTROL, reset_control)
+            status = self.xcvr_eeprom.write(consts.MODULE_LEVEL_CONTROL, reset_control)
+            if status:
+                self.invalidate_cache()
+            return status
         else:
             return True
 
@@ -1515,7 +1590,7 @@ class CmisApi(CmisCdbFw, XcvrApi):
                     return True
         return False
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_diag_page_support(self):
         '''
         This function returns whether the module supports diagnostic pages,
@@ -1523,7 +1598,7 @@ class CmisApi(CmisCdbFw, XcvrApi):
         '''
         return self.xcvr_eeprom.read(consts.DIAG_PAGE_SUPPORT_ADVT_FIELD)
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_loopback_capability(self):
         '''
         This function returns the module loopback capability as advertised
@@ -1804,7 +1879,7 @@ class CmisApi(CmisCdbFw, XcvrApi):
         logger.error('Invalid loopback mode:%s, lane_mask:%#x', loopback_mode, lane_mask)
         return False
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def is_cdb_supported(self):
         '''
         This function returns whether CDB is supported, False for flat memory
@@ -1821,14 +1896,14 @@ class CmisApi(CmisCdbFw, XcvrApi):
 
         return cdb_inst == 1 or cdb_inst == 2
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def is_transceiver_vdm_supported(self):
         '''
         This function returns whether VDM is supported
         '''
         return self.vdm is not None and self.xcvr_eeprom.read(consts.VDM_SUPPORTED)
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def is_vdm_statistic_supported(self):
         '''
         This function returns whether the optic advertises any VDM statistic
@@ -1861,6 +1936,15 @@ class CmisApi(CmisCdbFw, XcvrApi):
             observable_type = self.vdm.VDM_OBSERVABLE_ALL
         return self.vdm.get_vdm_allpage(field_option, observable_type) or {}
 
+    def get_vdm_sample(self, freeze_timeout=1.0):
+        '''
+        This function returns the real values of all VDM observables as a compact
+        VdmSample, read in one freeze-aware pass. See CmisVdmApi.get_vdm_sample().
+        '''
+        if self.vdm is None:
+            return None
+        return self.vdm.get_vdm_sample(freeze_timeout)
+
     def get_module_firmware_fault_state_changed(self):
         '''
         This function returns datapath firmware fault state, module firmware fault state
@@ -1884,9 +1968,12 @@ class CmisApi(CmisCdbFw, XcvrApi):
         - Aux 3 flags
         - Custom field flags
         '''
-        module_flag_byte1 = self.xcvr_eeprom.read(consts.MODULE_FLAG_BYTE1)
-        module_flag_byte2 = self.xcvr_eeprom.read(consts.MODULE_FLAG_BYTE2)
-        module_flag_byte3 = self.xcvr_eeprom.read(consts.MODULE_FLAG_BYTE3)
+        flag_bytes = self.xcvr_eeprom.read_many([consts.MODULE_FLAG_BYTE1,
+                                                 consts.MODULE_FLAG_BYTE2,
+                                                 consts.MODULE_FLAG_BYTE3])
+        module_flag_byte1 = flag_bytes[consts.MODULE_FLAG_BYTE1]
+        module_flag_byte2 = flag_bytes[consts.MODULE_FLAG_BYTE2]
+        module_flag_byte3 = flag_bytes[consts.MODULE_FLAG_BYTE3]
         if module_flag_byte1 is None or module_flag_byte2 is None or module_flag_byte3 is None:
             return None
         voltage_high_alarm_flag = bool((module_flag_byte1 >> 4) & 0x1)
@@ -2342,6 +2429,71 @@ class CmisApi(CmisCdbFw, XcvrApi):
 
         return vdm_flags_dict
 
+    def get_async_xcvr_eeprom(self):
+        """
+        Returns:
+            The AsyncXcvrEeprom used by the *_async getters. Unless one was set with
+            set_async_xcvr_eeprom(), the synchronous reader/writer of xcvr_eeprom are
+            run on the event loop's default executor.
+        """
+        if self._async_xcvr_eeprom is None:
+            self._async_xcvr_eeprom = AsyncXcvrEeprom(self.xcvr_eeprom)
+        return self._async_xcvr_eeprom
+
+    def set_async_xcvr_eeprom(self, async_xcvr_eeprom):
+        """
+        Sets the AsyncXcvrEeprom used by the *_async getters, e.g. one wrapping a native
+        asynchronous platform reader
+        """
+        self._async_xcvr_eeprom = async_xcvr_eeprom
+
+    def _get_vdm_pages(self, pages):
+        if self.vdm is None:
+            return pages
+        return self.vdm.get_uncached_descriptor_pages() + pages
+
+    async def get_transceiver_dom_real_value_async(self):
+        """
+        Coroutine version of get_transceiver_dom_real_value()
+        """
+        return await self.get_async_xcvr_eeprom().call(CMIS_DOM_PAGES,
+                                                       self.get_transceiver_dom_real_value)
+
+    async def get_transceiver_dom_flags_async(self):
+        """
+        Coroutine version of get_transceiver_dom_flags()
+        """
+        return await self.get_async_xcvr_eeprom().call(CMIS_DOM_PAGES,
+                                                       self.get_transceiver_dom_flags)
+
+    async def get_transceiver_status_async(self):
+        """
+        Coroutine version of get_transceiver_status()
+        """
+        return await self.get_async_xcvr_eeprom().call(CMIS_STATUS_PAGES,
+                                                       self.get_transceiver_status)
+
+    async def get_transceiver_status_flags_async(self):
+        """
+        Coroutine version of get_transceiver_status_flags()
+        """
+        return await self.get_async_xcvr_eeprom().call(CMIS_DOM_PAGES,
+                                                       self.get_transceiver_status_flags)
+
+    async def get_transceiver_vdm_real_value_async(self):
+        """
+        Coroutine version of get_transceiver_vdm_real_value()
+        """
+        return await self.get_async_xcvr_eeprom().call(self._get_vdm_pages(CMIS_VDM_REAL_VALUE_PAGES),
+                                                       self.get_transceiver_vdm_real_value)
+
+    async def get_transceiver_vdm_flags_async(self):
+        """
+        Coroutine version of get_transceiver_vdm_flags()
+        """
+        return await self.get_async_xcvr_eeprom().call(self._get_vdm_pages(CMIS_VDM_FLAG_PAGES),
+                                                       self.get_transceiver_vdm_flags)
+
     def set_datapath_init(self, channel):
         """
         Put the CMIS datapath into the initialized state
@@ -2394,7 +2546,19 @@ class CmisApi(CmisCdbFw, XcvrApi):
             return None
         return [bool(datapath_deinit & (1 << lane)) for lane in range(self.NUM_CHANNELS)]
 
-    @read_only_cached_api_return
+    @cached_api_return()
+    def get_application_index(self):
+        """
+        Get the application advertisement of the CMIS transceiver, decoded
+        once into an immutable CmisApplicationIndex until the module is reset
+        or reprogrammed
+
+        Returns:
+            CmisApplicationIndex, empty if no application could be read
+        """
+        return CmisApplicationIndex(self.get_application_advertisement())
+
+    @cached_api_return()
     def get_application_advertisement(self):
         """
         Get the application advertisement of the CMIS transceiver
@@ -2513,6 +2677,7 @@ class CmisApi(CmisCdbFw, XcvrApi):
             #set EC bit
             data|= ec
             self.xcvr_eeprom.write(addr, data)
+        self.invalidate_cache()
 
     def scs_apply_datapath_init(self, channel):
         '''
@@ -2581,7 +2746,7 @@ class CmisApi(CmisCdbFw, XcvrApi):
             return None
         return tx_input_max_val
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_tx_adaptive_eq_fail_flag_supported(self):
         """
         Returns whether the TX Adaptive Input EQ Fail Flag field is supported.
@@ -2606,63 +2771,63 @@ class CmisApi(CmisCdbFw, XcvrApi):
             tx_adaptive_eq_fail_flag_val_final.append(bool(tx_adaptive_eq_fail_flag_val[key]))
         return tx_adaptive_eq_fail_flag_val_final
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_tx_cdr_supported(self):
         '''
         This function returns the supported TX CDR field
         '''
         return self.xcvr_eeprom.read(consts.TX_CDR_SUPPORT_FIELD)
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_rx_cdr_supported(self):
         '''
         This function returns the supported RX CDR field
         '''
         return self.xcvr_eeprom.read(consts.RX_CDR_SUPPORT_FIELD)
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_tx_input_eq_fixed_supported(self):
         '''
         This function returns the supported TX input eq field
         '''
         return self.xcvr_eeprom.read(consts.TX_INPUT_EQ_FIXED_MANUAL_CTRL_SUPPORT_FIELD)
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_tx_input_adaptive_eq_supported(self):
         '''
         This function returns the supported TX input adaptive eq field
         '''
         return self.xcvr_eeprom.read(consts.TX_INPUT_ADAPTIVE_EQ_SUPPORT_FIELD)
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_tx_input_recall_buf1_supported(self):
         '''
         This function returns the supported TX input recall buf1 field
         '''
         return self.xcvr_eeprom.read(consts.TX_INPUT_EQ_RECALL_BUF1_SUPPORT_FIELD)
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_tx_input_recall_buf2_supported(self):
         '''
         This function returns the supported TX input recall buf2 field
         '''
         return self.xcvr_eeprom.read(consts.TX_INPUT_EQ_RECALL_BUF2_SUPPORT_FIELD)
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_rx_ouput_amp_ctrl_supported(self):
         '''
         This function returns the supported RX output amp control field
         '''
         return self.xcvr_eeprom.read(consts.RX_OUTPUT_AMP_CTRL_SUPPORT_FIELD)
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_rx_output_eq_pre_ctrl_supported(self):
         '''
         This function returns the supported RX output eq pre control field
         '''
         return self.xcvr_eeprom.read(consts.RX_OUTPUT_EQ_PRE_CTRL_SUPPORT_FIELD)
 
-    @read_only_cached_api_return
+    @cached_api_return()
     def get_rx_output_eq_post_ctrl_supported(self):
         '''
         This function returns the supported RX output eq post control field
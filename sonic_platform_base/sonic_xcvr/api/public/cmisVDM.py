@@ -6,6 +6,7 @@
 
 from ...fields import consts
 from ..xcvr_api import XcvrApi
+from array import array
 import struct
 import time
 
@@ -16,8 +17,186 @@ VDM_SIZE = 2
 VDM_FLAG_PAGE = 0x2c
 VDM_FREEZE = 128
 VDM_UNFREEZE = 0
+VDM_START_PAGE = 0x20
+VDM_SLOTS_PER_PAGE = PAGE_SIZE // VDM_SIZE
+VDM_PAGE_STRUCT = struct.Struct('>%dH' % VDM_SLOTS_PER_PAGE)
+VDM_THRESHOLD_KINDS = ('halarm', 'lalarm', 'hwarn', 'lwarn')
+# F16 multiplier per 5-bit scale exponent, 10**(exponent-24) as computed by get_F16()
+F16_SCALES = tuple(10**(exponent - 24) for exponent in range(32))
+
+class VdmDecoder(object):
+    """
+    Decodes the U16/S16/F16 words of a VDM value or threshold page in one pass.
+
+    The page is unpacked with a single struct call and each word is decoded
+    with a precomputed (word index, format, scale) plan, giving the same
+    numbers as decoding word by word with struct.unpack('>h'/'>H') and
+    get_F16(). Plans are built from the static descriptor pages, so a decoder
+    is reused for every read of its page.
+
+    Args:
+        entries: an iterable of (word index, format, scale), format being
+                 'U16', 'S16' or 'F16'. Entries with any other format decode
+                 to None.
+    """
+    def __init__(self, entries):
+        self.entries = [(index, vdm_format if vdm_format in ('U16', 'S16', 'F16') else None, scale)
+                        for index, vdm_format, scale in entries]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def decode(self, raw_page):
+        """
+        Returns the decoded values, one per entry, None for the entries with
+        an unknown format or whose word lies beyond the end of raw_page
+        """
+        num_words = len(raw_page) // VDM_SIZE
+        if num_words == VDM_SLOTS_PER_PAGE:
+            words = VDM_PAGE_STRUCT.unpack(raw_page)
+        else:
+            words = struct.unpack_from('>%dH' % num_words, raw_page)
+        values = []
+        append = values.append
+        for index, vdm_format, scale in self.entries:
+            if vdm_format is None or index >= num_words:
+                append(None)
+                continue
+            word = words[index]
+            if vdm_format == 'F16':
+                append((word & 0x7ff) * F16_SCALES[word >> 11])
+            elif vdm_format == 'U16':
+                append(word * scale)
+            else:
+                append((word - 0x10000 if word & 0x8000 else word) * scale)
+        return values
+
+class VdmLayout(object):
+    """
+    Placement of the observables advertised by the VDM descriptor pages, in
+    descriptor order. Only descriptor pages advertising at least one known
+    observable are listed in pages. Static while the module is inserted.
+    """
+    def __init__(self):
+        # (descriptor page, first observable index, descriptor slots) per page
+        self.pages = []
+        self.type_ids = array('B')
+        self.lanes = array('B')
+        self.threshold_ids = array('B')
+        self.formats = []
+        self.scales = []
+        self.has_statistic = False
+
+    def __len__(self):
+        return len(self.type_ids)
+
+class VdmSample(object):
+    """
+    One sample of every VDM observable of a module, stored as parallel arrays
+    of (observable type ID, lane, value) rather than nested dicts.
+
+    Attributes:
+        layout: the VdmLayout the sample was read with
+        values: array of decoded values, one per observable of layout
+        frozen: True if the statistic observables were read while frozen
+        timestamp: time.time() at which the sample was taken
+    """
+    def __init__(self, layout, values, frozen=False):
+        self.layout = layout
+        self.values = values
+        self.frozen = frozen
+        self.timestamp = time.time()
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        return zip(self.layout.type_ids, self.layout.lanes, self.values)
+
+    def get(self, type_id, lane, default=None):
+        """
+        Returns the value of observable type_id on lane (1-based), or default
+        """
+        for index, (sample_type_id, sample_lane) in enumerate(zip(self.layout.type_ids, self.layout.lanes)):
+            if sample_type_id == type_id and sample_lane == lane:
+                return self.values[index]
+        return default
+
+    def changes(self, previous):
+        """
+        Returns the (observable type ID, lane, value) entries of this sample
+        whose value differs from previous, all of them if previous is None or
+        was read with a different layout
+        """
+        if previous is None or previous.layout is not self.layout:
+            return list(self)
+        layout = self.layout
+        return [(layout.type_ids[index], layout.lanes[index], value)
+                for index, (value, previous_value) in enumerate(zip(self.values, previous.values))
+                if value != previous_value]
+
+class CmisVdmFreeze:
+    """
+    Control of the VDM statistics freeze, which also freezes the C-CMIS PMs,
+    shared by the CMIS, VDM and PM APIs
+    """
+
+    def freeze_vdm_stats(self):
+        '''
+        This function freeze all the vdm statistics reporting registers.
+        When raised by the host, causes the module to freeze and hold all
+        reported statistics reporting registers (minimum, maximum and
+        average values)in Pages 24h-27h.
+
+        Returns True if the provision succeeds and False incase of failure.
+        '''
+        return self.xcvr_eeprom.write(consts.VDM_CONTROL, VDM_FREEZE)
+
+    def freeze_vdm_stats_and_wait(self, timeout=1.0):
+        '''
+        This function freezes all the vdm statistics reporting registers, see
+        freeze_vdm_stats(), and waits up to timeout seconds for the module to
+        report the freeze done.
+
+        Returns True if the statistics are frozen and False if the freeze
+        request failed or the module did not report it done in time.
+        '''
+        if not self.freeze_vdm_stats():
+            return False
+        deadline = time.time() + timeout
+        while not self.get_vdm_freeze_status():
+            if time.time() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def get_vdm_freeze_status(self):
+        '''
+        This function reads and returns the vdm Freeze done status.
+
+        Returns True if the vdm stats freeze is successful and False if not freeze.
+        '''
+        return self.xcvr_eeprom.read(consts.VDM_FREEZE_DONE)
+
+    def unfreeze_vdm_stats(self):
+        '''
+        This function unfreeze all the vdm statistics reporting registers.
+        When freeze is ceased by the host, releases the freeze request, allowing the
+        reported minimum, maximum and average values to update again.
+
+        Returns True if the provision succeeds and False incase of failure.
+        '''
+        return self.xcvr_eeprom.write(consts.VDM_CONTROL, VDM_UNFREEZE)
+
+    def get_vdm_unfreeze_status(self):
+        '''
+        This function reads and returns the vdm unfreeze status.
+
+        Returns True if the vdm stats unfreeze is successful and False if not unfreeze.
+        '''
+        return self.xcvr_eeprom.read(consts.VDM_UNFREEZE_DONE)
 
-class CmisVdmApi(XcvrApi):
+class CmisVdmApi(CmisVdmFreeze, XcvrApi):
 
     VDM_REAL_VALUE = 0x1
     VDM_THRESHOLD = 0x2
@@ -34,6 +213,13 @@ class CmisVdmApi(XcvrApi):
         # Raw VDM descriptor pages, keyed by page. Populated lazily by
         # _read_vdm_descriptor_page; recreated with the api object on OIR/reboot.
         self._vdm_descriptor = {}
+        # (descriptor, (value VdmDecoder, threshold VdmDecoder)) keyed by page
+        self._vdm_decoders = {}
+        # VdmLayout and threshold samples derived from the static descriptor and
+        # threshold pages, see get_vdm_layout() and get_vdm_threshold_sample()
+        self._vdm_layout = None
+        self._vdm_thresholds = None
+        self._last_vdm_sample = None
 
     def _read_vdm_descriptor_page(self, page):
         '''
@@ -58,6 +244,13 @@ class CmisVdmApi(XcvrApi):
             self._vdm_descriptor[page] = self.xcvr_eeprom.read_raw(offset, PAGE_SIZE)
         return self._vdm_descriptor[page]
 
+    def get_uncached_descriptor_pages(self):
+        '''
+        Returns the VDM descriptor pages (0x20-0x23) not yet cached by
+        _read_vdm_descriptor_page, e.g. for a caller prefetching VDM pages.
+        '''
+        return [page for page in range(0x20, 0x24) if not self._vdm_descriptor.get(page)]
+
     def get_F16(self, value):
         '''
         This function converts raw data to "F16" format defined in cmis.
@@ -67,6 +260,29 @@ class CmisVdmApi(XcvrApi):
         result = mantissa*10**(scale_exponent-24)
         return result
 
+    def _get_vdm_page_decoders(self, page, vdm_descriptor):
+        '''
+        Returns the VdmDecoders of the value and threshold pages of VDM
+        descriptor page, built once per (cached) descriptor. Value entries are
+        per descriptor slot, threshold entries are the high alarm, low alarm,
+        high warning and low warning words of each slot's threshold set, 4 per slot.
+        '''
+        cached = self._vdm_decoders.get(page)
+        if cached is not None and cached[0] is vdm_descriptor:
+            return cached[1]
+        VDM_TYPE_DICT = self.xcvr_eeprom.mem_map.codes.VDM_TYPE
+        value_entries = []
+        thrsh_entries = []
+        for index in range(len(vdm_descriptor) // 2):
+            vdm_info = VDM_TYPE_DICT.get(vdm_descriptor[2 * index + 1], (None, None, None))
+            vdm_format, scale = vdm_info[1], vdm_info[2]
+            value_entries.append((index, vdm_format, scale))
+            base = THRSH_SPACING // VDM_SIZE * (vdm_descriptor[2 * index] >> 4)
+            thrsh_entries.extend((base + offset, vdm_format, scale) for offset in range(4))
+        decoders = (VdmDecoder(value_entries), VdmDecoder(thrsh_entries))
+        self._vdm_decoders[page] = (vdm_descriptor, decoders)
+        return decoders
+
     def get_vdm_page(self, page, VDM_flag_page, field_option=ALL_FIELD, observable_type=VDM_OBSERVABLE_ALL):
         '''
         This function returns VDM items from a specific VDM page.
@@ -110,12 +326,14 @@ class CmisVdmApi(XcvrApi):
         vdm_thrshPage = page + 8
         vdm_Page_data = {}
         VDM_TYPE_DICT = self.xcvr_eeprom.mem_map.codes.VDM_TYPE
+        value_decoder, thrsh_decoder = self._get_vdm_page_decoders(page, vdm_descriptor)
 
         if field_option & self.VDM_REAL_VALUE:
             vdm_value_page_raw = self.xcvr_eeprom.read_raw(
                 vdm_valuePage * PAGE_SIZE + PAGE_OFFSET, PAGE_SIZE, True)
             if not vdm_value_page_raw:
                 return {}
+            vdm_values = value_decoder.decode(vdm_value_page_raw)
         else:
             vdm_value_page_raw = None
 
@@ -124,6 +342,7 @@ class CmisVdmApi(XcvrApi):
                 vdm_thrshPage * PAGE_SIZE + PAGE_OFFSET, PAGE_SIZE, True)
             if not vdm_thrsh_page_raw:
                 return {}
+            vdm_thresholds = thrsh_decoder.decode(vdm_thrsh_page_raw)
         else:
             vdm_thrsh_page_raw = None
 
@@ -146,53 +365,17 @@ class CmisVdmApi(XcvrApi):
             scale = vdm_info_dict[2]
 
             if field_option & self.VDM_REAL_VALUE:
-                value_slice = VDM_SIZE * index
-                vdm_value_raw = vdm_value_page_raw[value_slice:value_slice + VDM_SIZE]
-                if len(vdm_value_raw) < VDM_SIZE:
-                    continue
-                if vdm_format == 'S16':
-                    vdm_value = struct.unpack('>h',vdm_value_raw)[0] * scale
-                elif vdm_format == 'U16':
-                    vdm_value = struct.unpack('>H',vdm_value_raw)[0] * scale
-                elif vdm_format == 'F16':
-                    vdm_value_int = struct.unpack('>H',vdm_value_raw)[0]
-                    vdm_value = self.get_F16(vdm_value_int)
-                else:
+                vdm_value = vdm_values[index]
+                if vdm_value is None:
                     continue
             else:
                 vdm_value = None
 
             if field_option & self.VDM_THRESHOLD:
-                thrsh_slice = THRSH_SPACING * thrshID
-                vdm_thrsh_raw = vdm_thrsh_page_raw[thrsh_slice:thrsh_slice + VDM_SIZE * 4]
-                if len(vdm_thrsh_raw) < VDM_SIZE * 4:
-                    continue
-                vdm_thrsh_high_alarm_raw = vdm_thrsh_raw[0:2]
-                vdm_thrsh_low_alarm_raw = vdm_thrsh_raw[2:4]
-                vdm_thrsh_high_warn_raw = vdm_thrsh_raw[4:6]
-                vdm_thrsh_low_warn_raw = vdm_thrsh_raw[6:8]
-
-                if vdm_format == 'S16':
-                    vdm_thrsh_high_alarm = struct.unpack('>h', vdm_thrsh_high_alarm_raw)[0] * scale
-                    vdm_thrsh_low_alarm = struct.unpack('>h', vdm_thrsh_low_alarm_raw)[0] * scale
-                    vdm_thrsh_high_warn = struct.unpack('>h', vdm_thrsh_high_warn_raw)[0] * scale
-                    vdm_thrsh_low_warn = struct.unpack('>h', vdm_thrsh_low_warn_raw)[0] * scale
-                elif vdm_format == 'U16':
-                    vdm_thrsh_high_alarm = struct.unpack('>H', vdm_thrsh_high_alarm_raw)[0] * scale
-                    vdm_thrsh_low_alarm = struct.unpack('>H', vdm_thrsh_low_alarm_raw)[0] * scale
-                    vdm_thrsh_high_warn = struct.unpack('>H', vdm_thrsh_high_warn_raw)[0] * scale
-                    vdm_thrsh_low_warn = struct.unpack('>H', vdm_thrsh_low_warn_raw)[0] * scale
-                elif vdm_format == 'F16':
-                    vdm_thrsh_high_alarm_int = struct.unpack('>H', vdm_thrsh_high_alarm_raw)[0]
-                    vdm_thrsh_low_alarm_int = struct.unpack('>H', vdm_thrsh_low_alarm_raw)[0]
-                    vdm_thrsh_high_warn_int = struct.unpack('>H', vdm_thrsh_high_warn_raw)[0]
-                    vdm_thrsh_low_warn_int = struct.unpack('>H', vdm_thrsh_low_warn_raw)[0]
-                    vdm_thrsh_high_alarm = self.get_F16(vdm_thrsh_high_alarm_int)
-                    vdm_thrsh_low_alarm = self.get_F16(vdm_thrsh_low_alarm_int)
-                    vdm_thrsh_high_warn = self.get_F16(vdm_thrsh_high_warn_int)
-                    vdm_thrsh_low_warn = self.get_F16(vdm_thrsh_low_warn_int)
-                else:
+                vdm_thrsh = vdm_thresholds[4 * index:4 * index + 4]
+                if None in vdm_thrsh:
                     continue
+                vdm_thrsh_high_alarm, vdm_thrsh_low_alarm, vdm_thrsh_high_warn, vdm_thrsh_low_warn = vdm_thrsh
             else:
                 vdm_thrsh_high_alarm = None
                 vdm_thrsh_low_alarm = None
@@ -282,6 +465,124 @@ class CmisVdmApi(XcvrApi):
             vdm.update(vdm_current_page)
         return vdm
 
+    def get_vdm_layout(self):
+        '''
+        Returns the VdmLayout of the observables advertised by the module, or
+        None if VDM is not supported or the advertisement could not be read.
+        The layout is built once from the (cached) descriptor pages.
+        '''
+        if self._vdm_layout is not None:
+            return self._vdm_layout
+        if not self.xcvr_eeprom.read(consts.VDM_SUPPORTED):
+            return None
+        vdm_groups_supported_raw = self.xcvr_eeprom.read(consts.VDM_SUPPORTED_PAGE)
+        if vdm_groups_supported_raw is None:
+            return None
+
+        VDM_TYPE_DICT = self.xcvr_eeprom.mem_map.codes.VDM_TYPE
+        layout = VdmLayout()
+        for page in range(VDM_START_PAGE, VDM_START_PAGE + vdm_groups_supported_raw + 1):
+            vdm_descriptor = self._read_vdm_descriptor_page(page)
+            if not vdm_descriptor:
+                # Not cached, so that the layout is rebuilt once the page can be read
+                return None
+            slots = []
+            for index in range(VDM_SLOTS_PER_PAGE):
+                type_id = vdm_descriptor[2 * index + 1]
+                if type_id not in VDM_TYPE_DICT:
+                    continue
+                vdm_info = VDM_TYPE_DICT[type_id]
+                slots.append(index)
+                layout.type_ids.append(type_id)
+                layout.lanes.append((vdm_descriptor[2 * index] & 0xf) + 1)
+                layout.threshold_ids.append(vdm_descriptor[2 * index] >> 4)
+                layout.formats.append(vdm_info[1])
+                layout.scales.append(vdm_info[2])
+                if len(vdm_info) > 3 and vdm_info[3] == 'S':
+                    layout.has_statistic = True
+            if slots:
+                layout.pages.append((page, len(layout) - len(slots), slots))
+        self._vdm_layout = layout
+        return layout
+
+    def get_vdm_sample(self, freeze_timeout=1.0):
+        '''
+        Reads the real values of all advertised VDM observables in one pass.
+
+        Only the value pages (0x24-0x27) of descriptor pages advertising
+        observables are read, one page read each. If statistic observables are
+        advertised the statistics are frozen for the duration of the reads, so
+        that min/max/avg of all lanes belong to the same interval, and
+        unfrozen afterwards.
+
+        Args:
+            freeze_timeout: seconds to wait for the module to report FreezeDone;
+                            the sample is still read (with frozen False) if it
+                            does not
+
+        Returns:
+            A VdmSample, or None if VDM is not supported or a read failed
+        '''
+        layout = self.get_vdm_layout()
+        if layout is None:
+            return None
+        values = array('d', bytes(8 * len(layout)))
+        frozen = layout.has_statistic and self.freeze_vdm_stats_and_wait(freeze_timeout)
+        try:
+            for page, first, slots in layout.pages:
+                raw_page = self.xcvr_eeprom.read_raw((page + 4) * PAGE_SIZE + PAGE_OFFSET, PAGE_SIZE, True)
+                if not raw_page or len(raw_page) < PAGE_SIZE:
+                    return None
+                value_decoder, _ = self._get_vdm_page_decoders(page, self._vdm_descriptor[page])
+                decoded = value_decoder.decode(raw_page)
+                for position, index in enumerate(slots, first):
+                    values[position] = decoded[index] or 0.0
+        finally:
+            if layout.has_statistic:
+                self.unfreeze_vdm_stats()
+        sample = VdmSample(layout, values, frozen)
+        self._last_vdm_sample = sample
+        return sample
+
+    def get_vdm_sample_changes(self, freeze_timeout=1.0):
+        '''
+        Takes a new VDM sample and returns the (observable type ID, lane, value)
+        entries that changed since the previous call, all of them the first time.
+
+        Returns:
+            A list of tuples, or None if the sample could not be read
+        '''
+        previous = self._last_vdm_sample
+        sample = self.get_vdm_sample(freeze_timeout)
+        if sample is None:
+            return None
+        return sample.changes(previous)
+
+    def get_vdm_threshold_sample(self):
+        '''
+        Returns the VDM thresholds of all advertised observables as a dict
+        mapping 'halarm', 'lalarm', 'hwarn' and 'lwarn' to a VdmSample. The
+        threshold pages (0x28-0x2B) are static, so they are read once per
+        module insertion.
+        '''
+        if self._vdm_thresholds is not None:
+            return self._vdm_thresholds
+        layout = self.get_vdm_layout()
+        if layout is None:
+            return None
+        thresholds = {kind: array('d', bytes(8 * len(layout))) for kind in VDM_THRESHOLD_KINDS}
+        for page, first, slots in layout.pages:
+            raw_page = self.xcvr_eeprom.read_raw((page + 8) * PAGE_SIZE + PAGE_OFFSET, PAGE_SIZE, True)
+            if not raw_page or len(raw_page) < PAGE_SIZE:
+                return None
+            _, thrsh_decoder = self._get_vdm_page_decoders(page, self._vdm_descriptor[page])
+            decoded = thrsh_decoder.decode(raw_page)
+            for position, index in enumerate(slots, first):
+                for offset, kind in enumerate(VDM_THRESHOLD_KINDS):
+                    thresholds[kind][position] = decoded[4 * index + offset] or 0.0
+        self._vdm_thresholds = {kind: VdmSample(layout, values) for kind, values in thresholds.items()}
+        return self._vdm_thresholds
+
     def is_vdm_statistic_supported(self):
         '''
         Checks whether the optic advertises any VDM statistic observable types
@@ -0,0 +1,157 @@
+"""
+    cmis_appl_index.py
+
+    Immutable index of the applications advertised by a CMIS module
+"""
+
+from collections import namedtuple
+from types import MappingProxyType
+
+CMIS_MAX_HOST_LANES = 8
+
+# Host interface speed in Mbps by substring of the host electrical interface
+# ID, checked in order so that e.g. '100G' is matched before '10G'
+HOST_INTERFACE_SPEEDS = (
+    ('1.6T', 1600000),
+    ('800G', 800000),
+    ('400G', 400000),
+    ('200G', 200000),
+    ('100G', 100000),
+    ('CAUI-4', 100000),
+    ('50G', 50000),
+    ('LAUI-2', 50000),
+    ('40G', 40000),
+    ('XLAUI', 40000),
+    ('XLPPI', 40000),
+    ('25G', 25000),
+    ('10G', 10000),
+    ('SFI', 10000),
+    ('XFI', 10000),
+    ('1000BASE', 1000),
+)
+
+def get_host_interface_speed(host_interface_id):
+    """
+    Returns the speed in Mbps of a host electrical interface ID such as
+    '400GAUI-8 C2M (Annex 120E)', 0 if unknown
+    """
+    for pattern, speed in HOST_INTERFACE_SPEEDS:
+        if pattern in host_interface_id:
+            return speed
+    return 0
+
+CmisApplication = namedtuple('CmisApplication', [
+    'appsel',
+    'host_electrical_interface_id',
+    'module_media_interface_id',
+    'host_lane_count',
+    'media_lane_count',
+    'host_lane_assignment_options',
+    'media_lane_assignment_options',
+    'host_speed',
+    'host_lane_masks',
+])
+CmisApplication.__doc__ = """
+One advertised application. host_speed is in Mbps, host_lane_masks is the
+tuple of host lane bitmasks (bit 0 for host lane 1) the application can be
+configured on, derived from its lane count and assignment options.
+"""
+
+class CmisApplicationIndex(object):
+    """
+    Applications advertised by a module, indexed by AppSel code, host speed
+    and host lane mask
+
+    Built once from the dict returned by CmisApi.get_application_advertisement(),
+    so that breakout and SI configuration resolve the application of a port
+    with dict lookups instead of EEPROM reads. Instances are immutable.
+
+    Args:
+        appl_advt: dict mapping AppSel code to the application fields
+    """
+    __slots__ = ('_by_appsel', '_by_speed', '_by_lane_mask', '_by_speed_lane_mask')
+
+    def __init__(self, appl_advt):
+        by_appsel = {}
+        by_speed = {}
+        by_lane_mask = {}
+        by_speed_lane_mask = {}
+        for appsel in sorted(appl_advt):
+            fields = appl_advt[appsel]
+            host_interface = fields.get('host_electrical_interface_id')
+            host_lane_count = fields.get('host_lane_count')
+            host_lane_options = fields.get('host_lane_assignment_options')
+            host_speed = get_host_interface_speed(host_interface) if host_interface else 0
+            masks = self._get_lane_masks(host_lane_count, host_lane_options)
+            appl = CmisApplication(appsel,
+                                   host_interface,
+                                   fields.get('module_media_interface_id'),
+                                   host_lane_count,
+                                   fields.get('media_lane_count'),
+                                   host_lane_options,
+                                   fields.get('media_lane_assignment_options'),
+                                   host_speed,
+                                   masks)
+            by_appsel[appsel] = appl
+            by_speed.setdefault(host_speed, []).append(appl)
+            for mask in masks:
+                by_lane_mask.setdefault(mask, []).append(appl)
+                by_speed_lane_mask.setdefault((host_speed, mask), []).append(appl)
+        object.__setattr__(self, '_by_appsel', MappingProxyType(by_appsel))
+        object.__setattr__(self, '_by_speed', self._freeze(by_speed))
+        object.__setattr__(self, '_by_lane_mask', self._freeze(by_lane_mask))
+        object.__setattr__(self, '_by_speed_lane_mask', self._freeze(by_speed_lane_mask))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CmisApplicationIndex is immutable")
+
+    @staticmethod
+    def _freeze(index):
+        return MappingProxyType({key: tuple(appls) for key, appls in index.items()})
+
+    @staticmethod
+    def _get_lane_masks(lane_count, lane_options):
+        """
+        Returns the masks of lane_count contiguous host lanes starting at each
+        lane allowed by the lane_options bitmap
+        """
+        if not lane_count or not lane_options:
+            return ()
+        lanes = (1 << lane_count) - 1
+        return tuple(lanes << start for start in range(CMIS_MAX_HOST_LANES - lane_count + 1)
+                     if lane_options & (1 << start))
+
+    def __len__(self):
+        return len(self._by_appsel)
+
+    def __iter__(self):
+        return iter(self._by_appsel.values())
+
+    def __contains__(self, appsel):
+        return appsel in self._by_appsel
+
+    def get(self, appsel, default=None):
+        """
+        Returns the CmisApplication of AppSel code appsel, default if not advertised
+        """
+        return self._by_appsel.get(appsel, default)
+
+    def get_by_speed(self, host_speed):
+        """
+        Returns the tuple of applications of host speed host_speed (Mbps)
+        """
+        return self._by_speed.get(host_speed, ())
+
+    def get_by_lane_mask(self, lane_mask):
+        """
+        Returns the tuple of applications that can be configured on the host
+        lanes of lane_mask (bit 0 for host lane 1)
+        """
+        return self._by_lane_mask.get(lane_mask, ())
+
+    def find(self, host_speed, lane_mask):
+        """
+        Returns the tuple of applications of host speed host_speed (Mbps) that
+        can be configured on the host lanes of lane_mask, lowest AppSel first
+        """
+        return self._by_speed_lane_mask.get((host_speed, lane_mask), ())
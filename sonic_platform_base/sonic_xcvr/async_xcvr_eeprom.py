@@ -0,0 +1,174 @@
+"""
+   async_xcvr_eeprom.py
+
+   asyncio counterpart of XcvrEeprom, letting a single event loop multiplex
+   EEPROM accesses to many xcvrs instead of dedicating a thread to each
+"""
+
+import asyncio
+import struct
+from .xcvr_eeprom import EEPROM_PAGE_SIZE
+
+class ExecutorEepromAdapter(object):
+   """
+   Adapts a synchronous platform reader/writer (e.g. the read_eeprom/write_eeprom methods
+   of an SfpOptoeBase) to coroutines by running each call on an executor
+
+   Args:
+      reader: function(offset, size) returning the bytes read, or None on failure
+
+      writer: function(offset, size, data) returning True on success
+
+      executor: a concurrent.futures.Executor, or None for the event loop's default executor
+   """
+   def __init__(self, reader, writer, executor=None):
+      self._reader = reader
+      self._writer = writer
+      self.executor = executor
+
+   async def read(self, offset, size):
+      loop = asyncio.get_running_loop()
+      return await loop.run_in_executor(self.executor, self._reader, offset, size)
+
+   async def write(self, offset, size, data):
+      loop = asyncio.get_running_loop()
+      return await loop.run_in_executor(self.executor, self._writer, offset, size, data)
+
+class AsyncXcvrEeprom(object):
+   """
+   Coroutine based access to the fields of a xcvr EEPROM
+
+   Field lookup, read planning and decoding are shared with the wrapped XcvrEeprom, only
+   the reads and writes are awaited. Accesses to one xcvr are serialized, since the module
+   has a single page select, while any number of xcvrs can be accessed concurrently.
+
+   Args:
+      xcvr_eeprom: the XcvrEeprom of the xcvr
+
+      reader: coroutine function(offset, size), or None to run xcvr_eeprom.reader on executor
+
+      writer: coroutine function(offset, size, data), or None to run xcvr_eeprom.writer on
+      executor
+
+      executor: a concurrent.futures.Executor used for the synchronous reader/writer, or None
+      for the event loop's default executor
+   """
+   def __init__(self, xcvr_eeprom, reader=None, writer=None, executor=None):
+      self.xcvr_eeprom = xcvr_eeprom
+      adapter = ExecutorEepromAdapter(xcvr_eeprom.reader, xcvr_eeprom.writer, executor)
+      self.reader = reader if reader is not None else adapter.read
+      self.writer = writer if writer is not None else adapter.write
+      self._lock = None
+
+   def _get_lock(self):
+      # Created on first use so that the lock belongs to the running event loop
+      if self._lock is None:
+         self._lock = asyncio.Lock()
+      return self._lock
+
+   async def read(self, field_name):
+      """
+      Read a value from a field in EEPROM
+
+      Args:
+         field_name: a string denoting the XcvrField to read from
+
+      Returns:
+         The value of the field, if the read is successful and None otherwise
+      """
+      return (await self.read_many([field_name]))[field_name]
+
+   async def read_many(self, field_names):
+      """
+      Read values from several fields in EEPROM, see XcvrEeprom.read_many()
+
+      Args:
+         field_names: an iterable of strings denoting the XcvrFields to read from
+
+      Returns:
+         A dict mapping each field name to its value, if the read is successful and
+         None otherwise
+      """
+      field_names = list(field_names)
+      plan = self.xcvr_eeprom.plan_reads(field_names)
+      async with self._get_lock():
+         chunks = [await self.reader(offset, size) for offset, size in plan]
+      return self.xcvr_eeprom.decode_reads(field_names, plan, chunks)
+
+   async def read_raw(self, offset, size, return_raw=False):
+      """
+      Read values from a field in EEPROM in a more flexible way, see XcvrEeprom.read_raw()
+
+      Args:
+         offset: an integer indicating the offset of the starting position of the
+         EEPROM byte(s) to read from
+
+         size: an integer indicating how many bytes to read from
+
+      Returns:
+         The value(s) of the field, if the read is successful and None otherwise
+      """
+      async with self._get_lock():
+         raw_data = await self.reader(offset, size)
+      if raw_data is None:
+         return None
+      if return_raw:
+         return raw_data
+      data = struct.unpack("%dB" % size, raw_data)
+      return data[0] if size == 1 else data
+
+   async def write(self, field_name, value):
+      """
+      Write a value to a field in EEPROM
+
+      Args:
+         field_name: a string denoting the XcvrField to write to
+
+         value:
+            The value to write to the EEPROM, appropriate for the given field_name
+
+      Returns:
+         Boolean, True if the write is successful and False otherwise
+      """
+      field = self.xcvr_eeprom.mem_map.get_field(field_name)
+      offset = field.get_offset()
+      size = field.get_size()
+      async with self._get_lock():
+         if field.read_before_write():
+            encoded_data = field.encode(value, await self.reader(offset, size))
+         else:
+            encoded_data = field.encode(value)
+         return await self.writer(offset, size, encoded_data)
+
+   async def write_raw(self, offset, size, bytearray_data):
+      """
+      Write values to a field in EEPROM in a more flexible way
+
+      Returns:
+         Boolean, True if the write is successful and False otherwise
+      """
+      async with self._get_lock():
+         return await self.writer(offset, size, bytearray_data)
+
+   async def call(self, pages, func, *args, **kwargs):
+      """
+      Read pages asynchronously, then run a synchronous XcvrApi getter against them
+
+      func runs on the event loop thread inside XcvrEeprom.preloaded_snapshot(), so every
+      field it reads on pages is decoded from memory without blocking the loop. Fields
+      outside of pages still go to the synchronous reader, so pages should cover
+      everything func reads.
+
+      Args:
+         pages: an iterable of page numbers, as for XcvrEeprom.snapshot()
+
+         func: the getter to run, e.g. api.get_transceiver_dom_real_value
+
+      Returns:
+         The return value of func
+      """
+      offsets = self.xcvr_eeprom.get_snapshot_offsets(pages)
+      async with self._get_lock():
+         blocks = {offset: await self.reader(offset, EEPROM_PAGE_SIZE) for offset in offsets}
+         with self.xcvr_eeprom.preloaded_snapshot(blocks):
+            return func(*args, **kwargs)
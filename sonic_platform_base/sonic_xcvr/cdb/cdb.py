@@ -14,9 +14,23 @@ log = SysLogger(SYSLOG_IDENTIFIER)
 log.logger.propagate = False
 
 class CdbCmdHandler(XcvrEeprom):
-    def __init__(self, reader, writer, mem_map):
-        super(CdbCmdHandler, self).__init__(reader, writer, mem_map)
+    def __init__(self, reader, writer, mem_map, poll_profile=None, poll_key=None, stream_writer=None):
+        super(CdbCmdHandler, self).__init__(reader, writer, mem_map, stream_writer)
         self.last_cmd_status = None
+        # True if a command is triggered by a single write of its whole message,
+        # None until read from the module, see is_single_write_trigger()
+        self.single_write_trigger = None
+        # Maximum bytes the writer writes to the module in one transaction,
+        # None if unknown, see set_write_max()
+        self.write_max = None
+        # EPL pages are written as one sequential stream, in chunks of up to
+        # epl_write_max bytes, on modules supporting auto paging, see
+        # set_epl_auto_paging()
+        self.epl_auto_paging = False
+        self.epl_write_max = None
+        # Learned command completion times (CdbPollProfile) of modules of type poll_key
+        self.poll_profile = poll_profile
+        self.poll_key = poll_key
 
     def read_reply(self, cdb_cmd_id):
         """
@@ -28,6 +42,28 @@ class CdbCmdHandler(XcvrEeprom):
             return self.read(reply_field)
         return None
 
+    def is_single_write_trigger(self):
+        """
+        Returns True if the module advertises CdbCommandTriggerMethod 1b, i.e.
+        processes a CDB command once its whole message is written in a single
+        transaction, False if it is triggered by writing the command ID last
+        """
+        if self.single_write_trigger is None:
+            trigger_method = self.read(cdb_consts.CDB_CMD_TRIGGER_METHOD)
+            if trigger_method is None:
+                # Retry on the next command
+                return False
+            self.single_write_trigger = bool(trigger_method)
+        return self.single_write_trigger
+
+    def set_write_max(self, write_max):
+        """
+        Set the maximum bytes the writer writes to the module in one transaction,
+        e.g. the optoe write_max of the port, None if unknown. Larger writes are
+        split by the driver into transactions in ascending address order.
+        """
+        self.write_max = write_max
+
     def write_cmd(self, cdb_cmd_id, payload=None):
         """
         Write CDB command
@@ -37,7 +73,11 @@ class CdbCmdHandler(XcvrEeprom):
             bytes = cdb_cmd.encode(payload)
         else:
             bytes = cdb_cmd.encode()
-        # TODO Check the module capability CdbCommandTriggerMethod to write in single I2C transaction
+        if self.write_max is not None and self.write_max >= len(bytes) and self.is_single_write_trigger():
+            # Write the command ID, header and LPL in one transaction. A split
+            # write would reach the command ID first, triggering the command
+            # before its LPL is written.
+            return self.writer(cdb_cmd.getaddr(), len(bytes), bytes)
         # Write the bytes starting from the 3rd byte(0x9F:130)
         self.writer(cdb_cmd.getaddr() + 2, len(bytes) - 2, bytes[2:])
         # Finally write the first two CMD bytes to trigger CDB processing
@@ -55,9 +95,35 @@ class CdbCmdHandler(XcvrEeprom):
         return self.write_raw((page * cdb_consts.PAGE_SIZE) + 128, len(data), data)
 
 
-    def wait_for_cdb_status(self, timeout=None):
+    def get_poll_delay(self, cdb_cmd_id):
+        """
+        Returns the msec to wait after writing cdb_cmd_id before the first
+        status poll: the learned completion time of the command on this
+        module type, but no less than the command capture time
+        """
+        latency = None
+        if self.poll_profile is not None and cdb_cmd_id is not None:
+            latency = self.poll_profile.get(self.poll_key, cdb_cmd_id)
+        if latency is None:
+            return cdb_consts.CDB_MAX_CAPTURE_TIME
+        return max(cdb_consts.CDB_MAX_CAPTURE_TIME, int(latency))
+
+    def save_poll_profile(self):
+        """
+        Persist the learned command completion times, if any
+        """
+        if self.poll_profile is not None:
+            self.poll_profile.save()
+
+    def wait_for_cdb_status(self, timeout=None, cdb_cmd_id=None):
         """
         Wait for CDB status to be ready
+
+        The status is first polled after the delay given by get_poll_delay(),
+        then with an interval growing from CDB_POLL_MIN_INTERVAL by
+        CDB_POLL_BACKOFF up to CDB_MAX_CAPTURE_TIME. The completion time of
+        cdb_cmd_id, if given, is recorded in the poll profile.
+
         Returns False if failed to get the status
         True otherwise
         """
@@ -68,26 +134,35 @@ class CdbCmdHandler(XcvrEeprom):
 
         assert timeout > delay, "Timeout must be greater than delay"
 
+        first_delay = interval = self.get_poll_delay(cdb_cmd_id)
         while (delay < timeout):
-            time.sleep(cdb_consts.CDB_MAX_CAPTURE_TIME / 1000)
-            delay += cdb_consts.CDB_MAX_CAPTURE_TIME
+            time.sleep(interval / 1000)
+            delay += interval
 
             status = self.read(cdb_consts.CDB1_CMD_STATUS)
             if (status is None) or \
                     (True == status[cdb_consts.CDB1_IS_BUSY]):
+                interval = cdb_consts.CDB_POLL_MIN_INTERVAL if delay == first_delay else \
+                    min(interval * cdb_consts.CDB_POLL_BACKOFF, cdb_consts.CDB_MAX_CAPTURE_TIME)
                 continue
 
             if (True == status[cdb_consts.CDB1_HAS_FAILED]):
-                break
+                return [True, status]
 
-            if (False == status[cdb_consts.CDB1_IS_BUSY]) and \
-                    (False == status[cdb_consts.CDB1_HAS_FAILED]):
-                break
+            self._record_latency(cdb_cmd_id, delay, delay == first_delay)
+            return [True, status]
 
-        if delay >= timeout or status is None:
-            return [False, status]
+        return [False, status]
 
-        return [True, status]
+    def _record_latency(self, cdb_cmd_id, delay, first_poll):
+        if self.poll_profile is None or cdb_cmd_id is None:
+            return
+        if first_poll:
+            # The command completed at some point before delay: probe a
+            # shorter delay next time, the average settles just above the
+            # actual completion time
+            delay -= cdb_consts.CDB_POLL_MIN_INTERVAL
+        self.poll_profile.update(self.poll_key, cdb_cmd_id, delay)
 
     def send_cmd(self, cdb_cmd_id, payload=None, timeout=None):
         """
@@ -100,12 +175,19 @@ class CdbCmdHandler(XcvrEeprom):
             return None
 
         # Wait for the command to complete
-        ret, status = self.wait_for_cdb_status(timeout)
+        ret, status = self.wait_for_cdb_status(timeout, cdb_cmd_id)
         self.last_cmd_status = status
         if not ret:
             log.log_notice("CDB command: {} failed to complete or read status".format(cdb_cmd_id))
             return None
 
+        return self.check_cmd_status(cdb_cmd_id, status)
+
+    def check_cmd_status(self, cdb_cmd_id, status):
+        """
+        Check the CDB status read after command completion
+        Returns True if the command succeeded, False otherwise
+        """
         is_busy = status[cdb_consts.CDB1_IS_BUSY]
         if True == is_busy:
             log.log_notice("CDB command: {} is busy with status: {}".format(cdb_cmd_id, status[cdb_consts.CDB1_STATUS]))
@@ -155,6 +237,20 @@ class CdbCmdHandler(XcvrEeprom):
         # Send the CDB write firmware LPL command
         return self.send_cmd(cdb_consts.CDB_WRITE_FIRMWARE_LPL_CMD, payload, timeout=timeout)
 
+    def set_epl_auto_paging(self, auto_paging, write_max=None):
+        """
+        Enable writing EPL pages as one sequential stream, the module moving to the
+        next page once a page is full. Callers reset it once done, see CmisCdbFw.module_fw_write_blocks().
+
+        Args:
+            auto_paging: True if the module advertises AutoPagingSupport
+            write_max: maximum bytes per write, typically the module's CDB sequential
+                       write length, which the optoe write_max is also set to for the
+                       download. None to write the whole block at once.
+        """
+        self.epl_auto_paging = bool(auto_paging)
+        self.epl_write_max = write_max
+
     def write_epl_pages(self, blkdata):
         """
         Write EPL pages starting from page 0xA0
@@ -162,15 +258,37 @@ class CdbCmdHandler(XcvrEeprom):
         pages = len(blkdata) // cdb_consts.PAGE_SIZE
         assert pages <= cdb_consts.EPL_MAX_PAGES, "Data exceeds maximum number of EPL pages"
 
+        # Pages are memoryview slices of blkdata, written without copying them
+        blkview = memoryview(blkdata)
+        if self.epl_auto_paging:
+            return self._write_epl_sequential(blkview)
+
         for page in range(pages):
-            page_data = blkdata[page * cdb_consts.PAGE_SIZE : (page + 1) * cdb_consts.PAGE_SIZE]
+            page_data = blkview[page * cdb_consts.PAGE_SIZE : (page + 1) * cdb_consts.PAGE_SIZE]
             assert True == self.write_epl_page(page + cdb_consts.EPL_PAGE, page_data)
 
         # Handle any remaining data that doesn't fit into a full page
         if len(blkdata) % cdb_consts.PAGE_SIZE != 0:
-            remaining_data = blkdata[pages * cdb_consts.PAGE_SIZE:]
+            remaining_data = blkview[pages * cdb_consts.PAGE_SIZE:]
             assert True == self.write_epl_page(pages + cdb_consts.EPL_PAGE, remaining_data)
 
+    def _write_epl_sequential(self, blkview):
+        # The EPL is written from the linear offset of page 0xA0 as one sequential
+        # stream, split only at epl_write_max and not at page boundaries, a write
+        # running past the end of a page continuing on the next one. The stream
+        # writer holds the port's page select for the whole block; without one,
+        # each chunk is written on its own at its linear offset.
+        offset = cdb_consts.EPL_PAGE * cdb_consts.PAGE_SIZE + cdb_consts.PAGE_SIZE
+        if self.stream_writer is not None:
+            assert True == self.stream_writer(offset, len(blkview), blkview, self.epl_write_max), \
+                "Failed to write EPL"
+            return
+        chunk_size = self.epl_write_max or len(blkview)
+        for start in range(0, len(blkview), chunk_size):
+            chunk = blkview[start:start + chunk_size]
+            assert True == self.writer(offset + start, len(chunk), chunk), \
+                "Failed to write EPL at offset {}".format(start)
+
     def write_epl_block(self, blkaddr, blkdata, timeout=None):
         """
         Write EPL block
@@ -8,14 +8,15 @@
 from sonic_py_common.syslogger import SysLogger
 from ..fields import cdb_consts
 from .cdb import CdbCmdHandler
+from .cdb_fw_image import CdbFwImage
 
 SYSLOG_IDENTIFIER = "CdbFw"
 log = SysLogger(SYSLOG_IDENTIFIER)
 log.logger.propagate = False
 
 class CdbFwHandler(CdbCmdHandler):
-    def __init__(self, reader, writer, mem_map):
-        super(CdbFwHandler, self).__init__(reader, writer, mem_map)
+    def __init__(self, reader, writer, mem_map, poll_profile=None, poll_key=None, stream_writer=None):
+        super(CdbFwHandler, self).__init__(reader, writer, mem_map, poll_profile, poll_key, stream_writer)
         self.start_payload_size = 0
         self.is_lpl_only = False
         self.rw_length_ext = 0
@@ -89,20 +90,25 @@ class CdbFwHandler(CdbCmdHandler):
         Start firmware download
         :param imgpath: path to the firmware image
         """
-        with open(imgpath, 'rb') as fw_file:
-            fw_file.seek(0, 2)  # Move to the end of the file
-            filesize = fw_file.tell() # Get the file size
-            fw_file.seek(0, 0)  # Move back to the start of the file
-            # Read the image file header bytes
-            header_data = b''
-            if self.start_payload_size > 0:
-                header_data = fw_file.read(self.start_payload_size)
-                if len(header_data) < self.start_payload_size:
-                    raise ValueError(f"Firmware image file is too small < {self.start_payload_size} bytes for header")
+        image = CdbFwImage.get_shared(imgpath)
+        # Read the image file header bytes
+        header_data = b''
+        if self.start_payload_size > 0:
+            header_data = image.header(self.start_payload_size)
+            if len(header_data) < self.start_payload_size:
+                raise ValueError(f"Firmware image file is too small < {self.start_payload_size} bytes for header")
 
+        return self.start_fw_download_data(image.size, header_data)
+
+    def start_fw_download_data(self, imgsize, header_data):
+        """
+        Start firmware download of an image already read by the caller
+        :param imgsize: size of the firmware image in bytes
+        :param header_data: the first start_payload_size bytes of the image
+        """
         # Verify the header with the module
         payload = {
-            "imgsize" : filesize,
+            "imgsize" : imgsize,
             "imghdr" : header_data
         }
 
@@ -116,43 +122,28 @@ class CdbFwHandler(CdbCmdHandler):
         :param imgpath: path to the firmware image
         """
         try:
-            with open(imgpath, 'rb') as fw_file:
-                # Step 1. Read the initial payload (header)
-                # TODO Skip the header using fseek
-                header_data = None
-                if self.start_payload_size > 0:
-                    header_data = fw_file.read(self.start_payload_size)
-                    if len(header_data) < self.start_payload_size:
-                        raise ValueError(f"Firmware image file is too small: expected at least {self.start_payload_size} bytes for header")
-
-                # 2 Read and write firmware data in chunks, handling partial chunks
-                blkaddr = 0
-                while True:
-                    # Read a chunk of data up to self.rw_length_ext bytes
-                    blkdata = fw_file.read(self.rw_length_ext)
-
-                    # Exit loop if no more data
-                    if not blkdata:
-                        break
-
-                    # TODO Handle LPL only supported case
-                    # TODO Handle auto paging for EPL
-                    # Write the block data to the EPL
-                    if self.is_lpl_only:
-                        if True != self.write_lpl_block(blkaddr, blkdata, timeout=self.timeout_write):
-                            log.log_error("Failed to write LPL block at address {}".format(blkaddr))
-                            return False, blkaddr
-                    else:
-                        # For EPL, write the data in pages
-                        self.write_epl_pages(blkdata)
-                        if True != self.write_epl_block(blkaddr, blkdata, timeout=self.timeout_write):
-                            log.log_error("Failed to write EPL block at address {}".format(blkaddr))
-                            return False, blkaddr
-
-                    # Update address for next chunk by the actual number of bytes written
-                    blkaddr += len(blkdata)
-
-                return True, blkaddr  # Return success and total bytes written
+            # Step 1. Map the image, the header is skipped rather than read
+            image = CdbFwImage.get_shared(imgpath)
+            if image.size < self.start_payload_size:
+                raise ValueError(f"Firmware image file is too small: expected at least {self.start_payload_size} bytes for header")
+
+            # 2 Write firmware data in chunks of up to self.rw_length_ext bytes, handling partial chunks.
+            # Each chunk is a memoryview of the shared image, passed down to the writer without copies.
+            for blkaddr, blkdata in image.blocks(self.start_payload_size, self.rw_length_ext):
+                # Write the block data to the EPL, sequentially if auto paging is enabled
+                if self.is_lpl_only:
+                    if True != self.write_lpl_block(blkaddr, blkdata, timeout=self.timeout_write):
+                        log.log_error("Failed to write LPL block at address {}".format(blkaddr))
+                        return False, blkaddr
+                else:
+                    # For EPL, write the data in pages
+                    self.write_epl_pages(blkdata)
+                    if True != self.write_epl_block(blkaddr, blkdata, timeout=self.timeout_write):
+                        log.log_error("Failed to write EPL block at address {}".format(blkaddr))
+                        return False, blkaddr
+
+            self.save_poll_profile()
+            return True, image.size - self.start_payload_size  # Return success and total bytes written
 
         except FileNotFoundError:
             log.log_error("Firmware image file not found: {}".format(imgpath))
@@ -0,0 +1,135 @@
+"""
+   cdb_fw_checkpoint.py
+
+   Checkpoints of interrupted firmware downloads, letting a retry resume
+   from the last block the module acknowledged
+"""
+
+import json
+import os
+import threading
+import time
+
+from sonic_py_common.syslogger import SysLogger
+
+SYSLOG_IDENTIFIER = "CdbFwCheckpoint"
+log = SysLogger(SYSLOG_IDENTIFIER)
+log.logger.propagate = False
+
+CDB_FW_CHECKPOINT_FILE = "/var/cache/sonic/cdb_fw_checkpoint.json"
+CDB_FW_CHECKPOINT_INTERVAL = 10 # Seconds between two saves of a download's progress
+
+class CdbFwCheckpoint(object):
+    """
+    Address following the last acknowledged firmware block, per module and
+    image, persisted to a JSON file
+
+    Modules are identified by a key, typically "<vendor>/<part number>/<serial>",
+    and images by their digest. A module has at most one checkpoint: a
+    checkpoint of another image replaces it. A checkpoint also keeps the
+    firmware state the module reported once the download started, for the
+    resume to be checked against the module.
+
+    Args:
+        path: JSON file the checkpoints are kept in
+        interval: minimum seconds between two saves by update()
+    """
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path=CDB_FW_CHECKPOINT_FILE, interval=CDB_FW_CHECKPOINT_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._checkpoints = None
+        self._last_save = {}
+
+    @classmethod
+    def get_shared(cls):
+        """
+        Returns the checkpoints shared by all the modules of the process,
+        kept in CDB_FW_CHECKPOINT_FILE
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def _load(self):
+        if self._checkpoints is not None:
+            return self._checkpoints
+        self._checkpoints = {}
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            self._checkpoints = {key: {'image': str(entry['image']), 'address': int(entry['address']),
+                                       'state': entry.get('state')}
+                                 for key, entry in data.items()}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, KeyError, AttributeError) as e:
+            log.log_notice("Failed to load firmware download checkpoints {}: {}".format(self.path, e))
+        return self._checkpoints
+
+    def _save(self):
+        tmp_path = "{}.{}.tmp".format(self.path, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(self._checkpoints, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            log.log_notice("Failed to save firmware download checkpoints {}: {}".format(self.path, e))
+            return False
+        return True
+
+    def get(self, module_key, image_digest):
+        """
+        Returns the address to resume the download of image_digest to the
+        module at, 0 if there is no checkpoint of this image
+        """
+        with self._lock:
+            entry = self._load().get(module_key)
+            if entry is None or entry['image'] != image_digest:
+                return 0
+            return entry['address']
+
+    def get_state(self, module_key):
+        """
+        Returns the firmware state recorded with the checkpoint of the
+        module, None if there is none
+        """
+        with self._lock:
+            entry = self._load().get(module_key)
+            return None if entry is None else entry.get('state')
+
+    def update(self, module_key, image_digest, address, save=False, state=None):
+        """
+        Records that the module acknowledged the blocks of image_digest up to
+        address, and its firmware state if given, else the state already
+        recorded for the image; the file is written if save is set or the
+        last save is older than interval seconds
+        """
+        with self._lock:
+            checkpoints = self._load()
+            if state is None:
+                entry = checkpoints.get(module_key)
+                if entry is not None and entry['image'] == image_digest:
+                    state = entry.get('state')
+            checkpoints[module_key] = {'image': image_digest, 'address': address, 'state': state}
+            now = time.monotonic()
+            if not save and now - self._last_save.get(module_key, 0) < self.interval:
+                return True
+            self._last_save[module_key] = now
+            return self._save()
+
+    def clear(self, module_key):
+        """
+        Removes the checkpoint of the module, once its download completed or
+        is restarted from scratch
+        """
+        with self._lock:
+            self._last_save.pop(module_key, None)
+            if self._load().pop(module_key, None) is None:
+                return True
+            return self._save()
@@ -0,0 +1,109 @@
+"""
+   cdb_fw_image.py
+
+   Firmware image, shared by the CDB downloads of all modules upgrading the
+   same file
+"""
+
+import hashlib
+import mmap
+import os
+import threading
+from collections import OrderedDict
+
+class CdbFwImage(object):
+    """
+    Read-only firmware image file
+
+    Images of up to MAX_READ_SIZE bytes are read into memory once, larger
+    ones are memory-mapped. Blocks are memoryview slices of the image, so
+    downloading it does not copy it block by block. Touching the mapping of
+    a file truncated in place raises SIGBUS, which is why images of the usual
+    sizes are not mapped: rewriting their file while it is downloaded only
+    leaves the download with the image as it was read. Updates of mapped
+    images must replace the file (e.g. by rename).
+
+    Args:
+        path: path of the image file
+    """
+    # Most recently used shared images, see get_shared()
+    SHARED_MAX = 4
+    # Largest image read into memory rather than mapped
+    MAX_READ_SIZE = 64 * 1024 * 1024
+    _shared = OrderedDict()
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path):
+        self.path = path
+        self._mmap = None
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_size > self.MAX_READ_SIZE:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                data = self._mmap
+            else:
+                data = f.read()
+        self.size = len(data)
+        self.key = self._get_key(path, stat)
+        self.view = memoryview(data)
+        self._digest = None
+
+    @staticmethod
+    def _get_key(path, stat):
+        return (os.path.realpath(path), stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    @classmethod
+    def get_shared(cls, path):
+        """
+        Returns a CdbFwImage of path, reading or mapping the file only once
+        for all callers as long as it is not modified or replaced. The last
+        SHARED_MAX images are kept.
+        """
+        key = cls._get_key(path, os.stat(path))
+        with cls._shared_lock:
+            image = cls._shared.get(key)
+            if image is None:
+                image = cls(path)
+                cls._shared[image.key] = image
+                while len(cls._shared) > cls.SHARED_MAX:
+                    cls._shared.popitem(last=False)
+            else:
+                cls._shared.move_to_end(key)
+            return image
+
+    @classmethod
+    def clear_shared(cls):
+        """
+        Drops the shared images; each image is released once its last
+        user is gone
+        """
+        with cls._shared_lock:
+            cls._shared.clear()
+
+    def __len__(self):
+        return self.size
+
+    def get_digest(self):
+        """
+        Returns the SHA-256 hex digest of the image, computed once
+        """
+        if self._digest is None:
+            self._digest = hashlib.sha256(self.view).hexdigest()
+        return self._digest
+
+    def header(self, size):
+        """
+        Returns the first size bytes of the image as bytes
+        """
+        return bytes(self.view[:size])
+
+    def blocks(self, start, block_size):
+        """
+        Yields (address, data) of the image past its first start bytes, in
+        blocks of at most block_size bytes, address counting from start and
+        data being a memoryview into the image
+        """
+        if start >= self.size:
+            return
+        for offset in range(start, self.size, block_size):
+            yield offset - start, self.view[offset:offset + block_size]
@@ -0,0 +1,123 @@
+"""
+   cdb_poll.py
+
+   Learned CDB command completion times, used to schedule the status polls
+   of CdbCmdHandler.wait_for_cdb_status()
+"""
+
+import json
+import os
+import threading
+
+from sonic_py_common.syslogger import SysLogger
+
+SYSLOG_IDENTIFIER = "CdbPoll"
+log = SysLogger(SYSLOG_IDENTIFIER)
+log.logger.propagate = False
+
+CDB_POLL_PROFILE_FILE = "/var/cache/sonic/cdb_poll_profile.json"
+CDB_POLL_EWMA_WEIGHT = 0.25 # Weight of a new latency sample in the average
+
+class CdbPollProfile(object):
+    """
+    Exponentially weighted moving average of CDB command completion times,
+    in msec, per module type and command ID
+
+    Module types are identified by a key, typically "<vendor>/<part number>",
+    as modules of a type share their firmware and hence their CDB timings.
+
+    Args:
+        path: JSON file the profile is loaded from and saved to, None to keep
+              it in memory only
+        weight: weight of a new sample in the average, between 0 and 1
+    """
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path=None, weight=CDB_POLL_EWMA_WEIGHT):
+        assert 0 < weight <= 1, "weight must be between 0 and 1"
+        self.path = path
+        self.weight = weight
+        self._latencies = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if path is not None:
+            self.load()
+
+    @classmethod
+    def get_shared(cls):
+        """
+        Returns the profile shared by all the modules of the process,
+        persisted to CDB_POLL_PROFILE_FILE
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(CDB_POLL_PROFILE_FILE)
+            return cls._shared
+
+    def get(self, key, cdb_cmd_id):
+        """
+        Returns the average completion time in msec of cdb_cmd_id on modules
+        of type key, None if unknown
+        """
+        return self._latencies.get(key, {}).get(cdb_cmd_id)
+
+    def update(self, key, cdb_cmd_id, latency):
+        """
+        Adds a completion time sample in msec of cdb_cmd_id on a module of
+        type key, returning the new average
+        """
+        with self._lock:
+            latencies = self._latencies.setdefault(key, {})
+            average = latencies.get(cdb_cmd_id)
+            if average is None:
+                average = float(latency)
+            else:
+                average += self.weight * (latency - average)
+            latencies[cdb_cmd_id] = average
+            self._dirty = True
+            return average
+
+    def load(self):
+        """
+        Loads the profile from its file, if any; returns False if it could
+        not be read
+        """
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            latencies = {key: {int(cdb_cmd_id): float(latency) for cdb_cmd_id, latency in cmds.items()}
+                         for key, cmds in data.items()}
+        except FileNotFoundError:
+            return True
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            log.log_notice("Failed to load CDB poll profile {}: {}".format(self.path, e))
+            return False
+        with self._lock:
+            self._latencies = latencies
+            self._dirty = False
+        return True
+
+    def save(self):
+        """
+        Saves the profile to its file if it changed since last loaded or
+        saved; returns False if it could not be written
+        """
+        with self._lock:
+            if self.path is None or not self._dirty:
+                return True
+            data = {key: {str(cdb_cmd_id): latency for cdb_cmd_id, latency in cmds.items()}
+                    for key, cmds in self._latencies.items()}
+            self._dirty = False
+        tmp_path = "{}.{}.tmp".format(self.path, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            log.log_notice("Failed to save CDB poll profile {}: {}".format(self.path, e))
+            with self._lock:
+                self._dirty = True
+            return False
+        return True
@@ -0,0 +1,304 @@
+"""
+   cdb_scheduler.py
+
+   Background CDB command scheduler, letting a single thread drive the CDB
+   of many modules concurrently
+"""
+
+import bisect
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from ..fields import cdb_consts
+from .cdb import log
+
+class CdbLatencyHistogram(object):
+    """
+    Histogram of CDB command completion latencies, in msec
+
+    counts[i] is the number of latencies <= buckets[i] (and > buckets[i-1]),
+    the last count holds the latencies above the last bucket
+    """
+    BUCKETS = (10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000)
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, latency):
+        self.counts[bisect.bisect_left(self.buckets, latency)] += 1
+        self.count += 1
+        self.total += latency
+        self.max = max(self.max, latency)
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def percentile(self, percent):
+        """
+        Returns the upper bound of the bucket holding the given percentile,
+        the max latency if it lies above the last bucket, None if empty
+        """
+        if not self.count:
+            return None
+        rank = self.count * percent / 100.0
+        seen = 0
+        for bucket, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bucket
+        return self.max
+
+    def to_dict(self):
+        """
+        Returns the bucket counts keyed by upper bound, 'inf' for the last one
+        """
+        bounds = [str(bucket) for bucket in self.buckets] + ['inf']
+        return dict(zip(bounds, self.counts))
+
+class _CdbPendingCmd(object):
+    __slots__ = ('handler', 'cdb_cmd_id', 'payload', 'timeout', 'future',
+                 'start', 'deadline', 'next_poll', 'interval', 'status')
+
+    def __init__(self, handler, cdb_cmd_id, payload, timeout, future):
+        self.handler = handler
+        self.cdb_cmd_id = cdb_cmd_id
+        self.payload = payload
+        self.timeout = timeout
+        self.future = future
+        self.start = None
+        self.deadline = None
+        self.next_poll = None
+        self.interval = None
+        self.status = None
+
+class CdbScheduler(object):
+    """
+    Runs CDB commands of many modules from one thread
+
+    Commands are queued per module (CdbCmdHandler) and run one at a time on
+    each module, in submission order, while commands on different modules
+    overlap. Instead of sleeping through the command, the scheduler writes it,
+    then polls CDB1_CMD_STATUS: first after capture_time, then with an interval
+    growing from poll_min by backoff up to poll_max, so short commands complete
+    sooner than with CdbCmdHandler.wait_for_cdb_status() and long ones are
+    polled no more often than before.
+
+    Each submitted command completes a concurrent.futures.Future, with the
+    same result as CdbCmdHandler.send_cmd(): True on success, False if the
+    command failed and None if it could not be written or timed out. Command
+    latencies are recorded in a CdbLatencyHistogram per command ID.
+
+    The scheduler is driven either by its own thread, see start(), or by
+    calling poll() from the caller's thread, never both. A handler must not
+    be used directly while it has commands in the scheduler.
+
+    Args:
+        capture_time: msec between writing a command and its first status poll
+        poll_min: msec between the first two status polls
+        poll_max: maximum msec between status polls
+        backoff: poll interval multiplier while the command is busy
+    """
+    def __init__(self, capture_time=cdb_consts.CDB_MAX_CAPTURE_TIME, poll_min=cdb_consts.CDB_POLL_MIN_INTERVAL,
+                 poll_max=cdb_consts.CDB_MAX_CAPTURE_TIME, backoff=cdb_consts.CDB_POLL_BACKOFF):
+        assert 0 < poll_min <= poll_max, "poll_min must be between 0 and poll_max"
+        self.capture_time = capture_time
+        self.poll_min = poll_min
+        self.poll_max = poll_max
+        self.backoff = backoff
+        self._cond = threading.Condition()
+        self._queues = {}
+        self._active = {}
+        self._histograms = {}
+        self._thread = None
+        self._stopping = False
+        self._wakeup = False
+
+    def submit(self, handler, cdb_cmd_id, payload=None, timeout=None, callback=None):
+        """
+        Queue a CDB command on a module
+
+        Args:
+            handler: the CdbCmdHandler of the module
+            cdb_cmd_id: the CDB command ID
+            payload: the command payload, as for CdbCmdHandler.send_cmd()
+            timeout: msec to wait for completion, measured from when the command
+                     is written, None for the default CDB timeout
+            callback: function(future) called on completion, from the thread
+                      driving the scheduler
+
+        Returns:
+            A concurrent.futures.Future of the send_cmd() result
+        """
+        if timeout is None:
+            timeout = cdb_consts.CDB_MAX_ACCESS_HOLD_OFF_PERIOD + cdb_consts.CDB_TIMEOUT_SAFETY_MARGIN
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+        with self._cond:
+            self._queues.setdefault(handler, deque()).append(
+                _CdbPendingCmd(handler, cdb_cmd_id, payload, timeout, future))
+            self._wakeup = True
+            self._cond.notify()
+        return future
+
+    def get_pending_count(self, handler=None):
+        """
+        Returns the number of queued or running commands, of handler's module
+        only if given
+        """
+        with self._cond:
+            if handler is not None:
+                return len(self._queues.get(handler, ())) + (handler in self._active)
+            return sum(len(queue) for queue in self._queues.values()) + len(self._active)
+
+    def get_latency_histogram(self, cdb_cmd_id):
+        """
+        Returns the CdbLatencyHistogram of the completed cdb_cmd_id commands,
+        None if none completed
+        """
+        return self._histograms.get(cdb_cmd_id)
+
+    def get_latency_histograms(self):
+        """
+        Returns a dict of CdbLatencyHistogram keyed by CDB command ID
+        """
+        return dict(self._histograms)
+
+    def poll(self):
+        """
+        Write the commands due to start and poll the status of running ones
+
+        Returns:
+            Seconds until the next call is due, None if no command is pending
+        """
+        with self._cond:
+            for handler, queue in list(self._queues.items()):
+                if handler not in self._active:
+                    self._active[handler] = queue.popleft()
+                if not queue:
+                    del self._queues[handler]
+            active = list(self._active.values())
+
+        done = []
+        for cmd in active:
+            now = time.monotonic()
+            try:
+                if cmd.start is None:
+                    finished = self._start_cmd(cmd, now)
+                elif cmd.next_poll <= now:
+                    finished = self._poll_cmd(cmd, now)
+                else:
+                    finished = False
+            except Exception as e:
+                log.log_error("CDB command: {} raised {}".format(cmd.cdb_cmd_id, e))
+                cmd.future.set_exception(e)
+                finished = True
+            if finished:
+                done.append(cmd)
+
+        with self._cond:
+            for cmd in done:
+                del self._active[cmd.handler]
+            if self._queues:
+                return 0
+            if not self._active:
+                return None
+            return max(0, min(cmd.next_poll for cmd in self._active.values()) - time.monotonic())
+
+    def _start_cmd(self, cmd, now):
+        if not cmd.future.set_running_or_notify_cancel():
+            return True
+        cmd.handler.last_cmd_status = None
+        if True != cmd.handler.write_cmd(cmd.cdb_cmd_id, cmd.payload):
+            log.log_notice("Failed to write CDB command: {}".format(cmd.cdb_cmd_id))
+            cmd.future.set_result(None)
+            return True
+        cmd.start = now
+        cmd.deadline = now + cmd.timeout / 1000
+        cmd.next_poll = now + self.capture_time / 1000
+        cmd.interval = self.poll_min
+        return False
+
+    def _poll_cmd(self, cmd, now):
+        status = cmd.handler.read(cdb_consts.CDB1_CMD_STATUS)
+        cmd.status = status
+        now = time.monotonic()
+        if status is None or True == status[cdb_consts.CDB1_IS_BUSY]:
+            if now >= cmd.deadline:
+                cmd.handler.last_cmd_status = status
+                log.log_notice("CDB command: {} failed to complete or read status".format(cmd.cdb_cmd_id))
+                cmd.future.set_result(None)
+                return True
+            cmd.next_poll = min(now + cmd.interval / 1000, cmd.deadline)
+            cmd.interval = min(cmd.interval * self.backoff, self.poll_max)
+            return False
+
+        histogram = self._histograms.get(cmd.cdb_cmd_id)
+        if histogram is None:
+            histogram = self._histograms[cmd.cdb_cmd_id] = CdbLatencyHistogram()
+        histogram.record((now - cmd.start) * 1000)
+        cmd.handler.last_cmd_status = status
+        cmd.future.set_result(cmd.handler.check_cmd_status(cmd.cdb_cmd_id, status))
+        return True
+
+    def start(self):
+        """
+        Start driving the scheduler from a background thread
+
+        Returns:
+            True if the thread runs, False if the thread of a previous stop()
+            that timed out is still running
+        """
+        with self._cond:
+            if self._thread is not None:
+                if self._thread.is_alive():
+                    if self._stopping:
+                        log.log_warning("CDB scheduler thread still stopping, not restarted")
+                        return False
+                    return True
+                self._thread = None
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="CdbScheduler")
+            self._thread.daemon = True
+            self._thread.start()
+            return True
+
+    def stop(self, timeout=None):
+        """
+        Stop the background thread. Commands left pending stay queued, to be
+        run by poll() or after start()
+
+        Returns:
+            True if the thread stopped within timeout seconds
+        """
+        with self._cond:
+            thread = self._thread
+            if thread is None:
+                return True
+            self._stopping = True
+            self._cond.notify()
+        thread.join(timeout)
+        with self._cond:
+            if thread.is_alive():
+                return False
+            if self._thread is thread:
+                self._thread = None
+            return True
+
+    def _run(self):
+        while True:
+            wait = self.poll()
+            with self._cond:
+                if self._stopping:
+                    return
+                if not self._wakeup:
+                    self._cond.wait(wait)
+                self._wakeup = False
+                if self._stopping:
+                    return
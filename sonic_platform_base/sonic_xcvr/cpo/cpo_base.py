@@ -28,7 +28,7 @@ class CpoApiFactory(ABC):
         self._device = device
 
     def _create_api(self, codes_class, mem_map_class, api_class):
-        mem_map = mem_map_class(codes_class, self._device.bank)
+        mem_map = mem_map_class.get_shared(codes_class, bank=self._device.bank)
         eeprom = XcvrEeprom(self._device.read_eeprom, self._device.write_eeprom, mem_map)
         return api_class(eeprom)
 
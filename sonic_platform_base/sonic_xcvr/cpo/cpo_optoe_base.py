@@ -3,7 +3,11 @@ from sonic_platform_base.sonic_xcvr.cpo.oe import OeBase
 from sonic_platform_base.sonic_xcvr.cpo.elsfp import ElsfpBase
 
 class OptoeOeBase(OeBase, OptoeEepromReadWriteMixin):
-    pass
+    def remove_api(self):
+        super().remove_api()
+        self.close_eeprom()
 
 class OptoeElsfpBase(ElsfpBase, OptoeEepromReadWriteMixin):
-    pass
+    def remove_api(self):
+        super().remove_api()
+        self.close_eeprom()
@@ -8,6 +8,10 @@ CDB1_HAS_FAILED = "Cdb1HasFailed"
 CDB1_CMD_STATUS_FIELD = "Cdb1CmdStatus"
 CDB1_COMMAND_RESULT ="Cdb1CommandResult"
 
+# CDB Advertisement
+CDB_ADVERTISEMENT = "CdbAdvertisement"
+CDB_CMD_TRIGGER_METHOD = "CdbCommandTriggerMethod"
+
 
 #Firmware Info
 CDB1_FIRMWARE_INFO = "Cdb1FirmwareInfo"
@@ -56,6 +60,7 @@ LPL_PAGE = 0x9F
 EPL_PAGE = 0xA0
 EPL_MAX_PAGES = 16
 PAGE_SIZE = 128
+PAGE_SELECT_OFFSET = 127
 CDB_LPL_CMD_START_OFFSET = 128
 RPL_DATA_START_OFFSET = 136
 LPL_MAX_PAYLOAD_SIZE = 116
@@ -65,6 +70,8 @@ CDB_MAX_ACCESS_HOLD_OFF_PERIOD = 4960 # tCDBF msec
 CDB_MAX_CAPTURE_TIME = 100 # tCDBC msec
 CDB_RUN_FIRMWARE_CMD_TIMEOUT = 15000 # Delay to switch to new firmware in msec
 CDB_TIMEOUT_SAFETY_MARGIN = 5000 # Safety margin for timeouts in msec
+CDB_POLL_MIN_INTERVAL = 10 # msec, first status poll interval after capture
+CDB_POLL_BACKOFF = 2 # Poll interval multiplier while the command is busy
 
 #CDB Commands
 CDB_CMD_ID_LEN = 2
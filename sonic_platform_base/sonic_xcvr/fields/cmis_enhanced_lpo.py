@@ -1,5 +1,3 @@
-import struct
-
 from .xcvr_field import NumberRegField
 
 
@@ -11,13 +9,13 @@ class _LpoScaledNumberRegField(NumberRegField):
         self.precision = kwargs.get("precision", 3)
 
     def decode(self, raw_data, **decoded_deps):
-        value = struct.unpack(self.format, raw_data)[0] * self.factor
+        value = self._struct.unpack(raw_data)[0] * self.factor
         return float("{:.{}f}".format(value, self.precision))
 
 
 class _LpoLowerNibbleScaledRegField(_LpoScaledNumberRegField):
     def decode(self, raw_data, **decoded_deps):
-        value = (struct.unpack(self.format, raw_data)[0] & 0x0F) * self.factor
+        value = (self._struct.unpack(raw_data)[0] & 0x0F) * self.factor
         return float("{:.{}f}".format(value, self.precision))
 
 
@@ -43,7 +41,7 @@ class LpoOmaAccuracyField(_LpoLowerNibbleScaledRegField):
 
 class LpoLaneFlagRegField(NumberRegField):
     def decode(self, raw_data, **decoded_deps):
-        value = struct.unpack(self.format, raw_data)[0]
+        value = self._struct.unpack(raw_data)[0]
         decoded = {}
         for lane in range(1, 9):
             decoded["{}{}".format(self.name, lane)] = bool((value >> (lane - 1)) & 1)
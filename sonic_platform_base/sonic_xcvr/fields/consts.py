@@ -184,6 +184,10 @@ MODULE_PWRDN_DURATION = "ModulePowerDownDuration"
 DP_TX_TURNON_DURATION = "DPTxTurnOnDuration"
 DP_TX_TURNOFF_DURATION = "DPTxTurnOffDuration"
 BANKS_SUPPORTED_FIELD = "BanksSupported"
+PAGE_CHECKSUMS_FIELD = "PageChecksums"
+PAGE_00H_CHECKSUM = "Page00hChecksum"
+PAGE_01H_CHECKSUM = "Page01hChecksum"
+PAGE_02H_CHECKSUM = "Page02hChecksum"
 
 # DOM
 TRANS_DOM_FIELD = "TransceiverDom"
@@ -6,6 +6,19 @@
 
 import struct
 
+# Compiled struct.Struct objects keyed by format string, shared by every field (and thus
+# every memory map instance) using the same format
+_STRUCTS = {}
+
+def get_struct(fmt):
+    """
+    Return: a precompiled struct.Struct for fmt
+    """
+    compiled = _STRUCTS.get(fmt)
+    if compiled is None:
+        compiled = _STRUCTS[fmt] = struct.Struct(fmt)
+    return compiled
+
 class XcvrField(object):
     """
     Base class for representing fields in xcvr memory maps.
@@ -149,6 +162,8 @@ class RegField(XcvrField):
         self.size = kwargs.get("size", 1)
         self.start_bitpos = self.size * 8 - 1 # max bitpos
         self._update_bit_offsets()
+        # Child fields are fixed at construction, so the mask only needs computing once
+        self._bitmask = self.get_bitmask()
 
     def _update_bit_offsets(self):
         for field in self.fields:
@@ -179,6 +194,7 @@ class NumberRegField(RegField):
         self.scale = kwargs.get("scale")
         self.format = kwargs.get("format", "B")
         self.bitdecode = kwargs.get("bitdecode", False)
+        self._struct = get_struct(self.format)
 
     def decode(self, raw_data, **decoded_deps):
         if self.bitdecode:
@@ -186,11 +202,9 @@ class NumberRegField(RegField):
             for field in self.fields:
                 decoded[field.name] = field.decode(raw_data, **decoded_deps)
         else:
-            decoded = struct.unpack(self.format, raw_data)[0]
-            mask = self.get_bitmask()
-            if mask is not None:
-                decoded &= mask
-                decoded >>= self.start_bitpos
+            decoded = self._struct.unpack(raw_data)[0]
+            if self._bitmask is not None:
+                decoded = (decoded & self._bitmask) >> self.start_bitpos
             if self.scale is not None:
                 return decoded / self.scale
         return decoded
@@ -198,8 +212,8 @@ class NumberRegField(RegField):
     def encode(self, val, raw_state=None):
         assert not self.ro
         if self.scale is not None:
-            return bytearray(struct.pack(self.format, int(val * self.scale)))
-        return bytearray(struct.pack(self.format, val))
+            return bytearray(self._struct.pack(int(val * self.scale)))
+        return bytearray(self._struct.pack(val))
 
 class FixedNumberRegField(NumberRegField):
     """
@@ -225,9 +239,10 @@ class StringRegField(RegField):
         super(StringRegField, self).__init__(name, offset, *fields, **kwargs)
         self.encoding = kwargs.get("encoding", "ascii")
         self.format = kwargs.get("format", ">%ds" % self.size)
+        self._struct = get_struct(self.format)
 
     def decode(self, raw_data, **decoded_deps):
-        return struct.unpack(self.format, raw_data)[0].decode(self.encoding, 'ignore')
+        return self._struct.unpack(raw_data)[0].decode(self.encoding, 'ignore')
 
 class CodeRegField(RegField):
     """
@@ -237,13 +252,12 @@ class CodeRegField(RegField):
         super(CodeRegField, self).__init__(name, offset, *fields, **kwargs)
         self.code_dict = code_dict
         self.format = kwargs.get("format", "B")
+        self._struct = get_struct(self.format)
 
     def decode(self, raw_data, **decoded_deps):
-        code = struct.unpack(self.format, raw_data)[0]
-        mask = self.get_bitmask()
-        if mask is not None:
-            code &= mask
-            code >>= self.start_bitpos
+        code = self._struct.unpack(raw_data)[0]
+        if self._bitmask is not None:
+            code = (code & self._bitmask) >> self.start_bitpos
         return self.code_dict.get(code, "Unknown")
 
 class HexRegField(RegField):
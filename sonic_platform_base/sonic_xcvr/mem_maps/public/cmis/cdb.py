@@ -2,7 +2,7 @@
 from ....fields import cdb_consts
 from ...xcvr_mem_map import XcvrMemMap
 
-from .pages import CdbAdminStatusPage, CdbLplMessagePage
+from .pages import CdbAdminStatusPage, CdbAdvertisingPage, CdbLplMessagePage
 
 import struct
 
@@ -15,9 +15,11 @@ class CdbMemMap(XcvrMemMap):
 
         # Register CDB-specific fields via page classes (same scheme as CmisMemMap):
         #   page 00h - CDB1 status byte
+        #   page 01h - CDB command trigger method
         #   page 9Fh - LPL message area (firmware info, mgmt features, query status)
         self.add_pages(
             CdbAdminStatusPage(codes),
+            CdbAdvertisingPage(codes),
             CdbLplMessagePage(codes),
         )
 
@@ -6,6 +6,7 @@
 
 from ...xcvr_mem_map import XcvrMemMap
 from .pages import (
+    CmisPage,
     CmisAdministrativeLowerPage,
     CmisAdministrativeUpperPage,
     CmisAdvertisingPage,
@@ -49,6 +50,16 @@ class CmisFlatMemMap(XcvrMemMap):
         """Returns the bank number (read-only)."""
         return self._bank
 
+    def get_page_offsets(self, page, page_size=128):
+        """Linear offsets of the blocks making up `page` in this map's bank.
+
+        Page 00h covers both the lower memory and upper page 00h.
+        """
+        offsets = [CmisPage.linear_offset(page, self._bank, page_size, page_size)]
+        if page == 0:
+            offsets.insert(0, 0)
+        return offsets
+
 class CmisMemMap(CmisFlatMemMap):
     def __init__(self, codes, bank=0):
         super(CmisMemMap, self).__init__(codes, bank=bank)
@@ -21,6 +21,7 @@ from .consts import (
 from .page00_lower import CmisAdministrativeLowerPage
 from .page00_upper import CmisAdministrativeUpperPage
 from .page00_cdb import CdbAdminStatusPage
+from .page01_cdb import CdbAdvertisingPage
 from .page01 import CmisAdvertisingPage
 from .page02 import CmisThresholdsPage
 from .page04 import CCmisModuleConfigSupportPage
@@ -50,6 +51,7 @@ __all__ = [
     'CmisAdministrativeLowerPage',
     'CmisAdministrativeUpperPage',
     'CdbAdminStatusPage',
+    'CdbAdvertisingPage',
     'CmisAdvertisingPage',
     'CmisThresholdsPage',
     'CCmisModuleConfigSupportPage',
@@ -48,3 +48,8 @@ class CmisAdministrativeUpperPage(CmisPage):
             CodeRegField(consts.MEDIA_INTERFACE_TECH, self.getaddr(212), codes.MEDIA_INTERFACE_TECH),
         ]
 
+        # PAGE_CHECKSUMS_FIELD (partial - checksum of bytes 128-221)
+        self.fields[consts.PAGE_CHECKSUMS_FIELD] = [
+            NumberRegField(consts.PAGE_00H_CHECKSUM, self.getaddr(222), size=1),
+        ]
+
@@ -177,3 +177,7 @@ class CmisAdvertisingPage(CmisPage):
             NumberRegField(consts.CDB_SEQ_WRITE_LENGTH_EXT, self.getaddr(164), size=1),
         ]
 
+        # PAGE_CHECKSUMS_FIELD (partial - checksum of bytes 130-254)
+        self.fields[consts.PAGE_CHECKSUMS_FIELD] = [
+            NumberRegField(consts.PAGE_01H_CHECKSUM, self.getaddr(255), size=1),
+        ]
@@ -0,0 +1,22 @@
+"""
+    page01_cdb.py
+
+    CDB-side fields on CMIS Page 01h: CDB capabilities advertised by the module.
+"""
+
+from .page import CmisPage
+from .....fields.xcvr_field import NumberRegField, RegBitField
+from .....fields import cdb_consts
+
+
+class CdbAdvertisingPage(CmisPage):
+    """Page 01h fields relevant to CDB: the CDB command trigger method."""
+
+    def __init__(self, codes):
+        super().__init__(codes, page=0x01, bank=0)
+
+        self.fields[cdb_consts.CDB_ADVERTISEMENT] = [
+            NumberRegField(cdb_consts.CDB_CMD_TRIGGER_METHOD, self.getaddr(166),
+                RegBitField("Bit5", 5)
+            ),
+        ]
@@ -49,3 +49,8 @@ class CmisThresholdsPage(CmisPage):
             NumberRegField(consts.AUX3_HIGH_WARN, self.getaddr(164), format=">h", size=2),
             NumberRegField(consts.AUX3_LOW_WARN, self.getaddr(166), format=">h", size=2),
         ]
+
+        # PAGE_CHECKSUMS_FIELD (partial - checksum of bytes 128-254)
+        self.fields[consts.PAGE_CHECKSUMS_FIELD] = [
+            NumberRegField(consts.PAGE_02H_CHECKSUM, self.getaddr(255), size=1),
+        ]
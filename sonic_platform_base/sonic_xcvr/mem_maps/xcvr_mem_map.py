@@ -4,22 +4,92 @@
    Base class for representing xcvr memory maps in SONiC
 """
 
+import threading
 from  ..fields.xcvr_field import XcvrField
 
 class XcvrMemMap(object):
+   # Interned memory maps keyed by (map class, codes class, constructor args), see get_shared()
+   _shared_maps = {}
+   _shared_maps_lock = threading.Lock()
+
    def __init__(self, codes):
       self.codes = codes
       self._fields = None
+      self._field_table = None
+
+   def __setattr__(self, name, value):
+      if self.__dict__.get('_frozen', False):
+         raise AttributeError("%s is shared between ports and cannot be modified" % type(self).__name__)
+      super(XcvrMemMap, self).__setattr__(name, value)
+
+   @classmethod
+   def get_shared(cls, codes, *args, **kwargs):
+      """
+      Return an instance of this memory map shared by every caller passing the same arguments
+
+      A memory map only describes the layout of a module's EEPROM, so every port using the
+      same (map class, codes class, bank) can share one instance and its compiled field table
+      instead of rebuilding all pages and fields on each API creation (e.g. after every OIR).
+      Shared instances are compiled up front and frozen against modification.
+
+      Args:
+         codes: the XcvrCodes class for the memory map
+         args, kwargs: remaining constructor arguments (e.g. bank)
+
+      Returns:
+         An instance of cls
+      """
+      key = (cls, codes, args, tuple(sorted(kwargs.items())))
+      mem_map = XcvrMemMap._shared_maps.get(key)
+      if mem_map is None:
+         with XcvrMemMap._shared_maps_lock:
+            mem_map = XcvrMemMap._shared_maps.get(key)
+            if mem_map is None:
+               mem_map = cls(codes, *args, **kwargs)
+               mem_map._compile()
+               mem_map._frozen = True
+               XcvrMemMap._shared_maps[key] = mem_map
+      return mem_map
    
    def _get_all_fields(self):
       if self._fields is None:
-         self._fields = {}
-         for key in dir(self):
-            attr = getattr(self, key)
-            if isinstance(attr, XcvrField):
-               self._fields[attr.name] = attr
-               self._fields.update(attr.get_fields())
+         self._compile()
       return self._fields
 
+   def _compile(self):
+      """
+      Build the field lookup table and the flat offset-sorted field table.
+
+      Fields are only ever attached to the instance, so walking vars() (in dir() order, so
+      that duplicate nested names resolve as before) avoids resolving every class attribute.
+      Per-field decode state (struct.Struct, bitmask) is precomputed by the fields themselves
+      at construction.
+      """
+      fields = {}
+      attrs = vars(self)
+      for key in sorted(attrs):
+         attr = attrs[key]
+         if isinstance(attr, XcvrField):
+            fields[attr.name] = attr
+            fields.update(attr.get_fields())
+      self._fields = fields
+      self._field_table = sorted(fields.values(), key=lambda field: field.get_offset() or 0)
+
    def get_field(self, field_name):
       return self._get_all_fields()[field_name]
+
+   def get_field_table(self):
+      """
+      Return: list of every field in the memory map, sorted by offset
+      """
+      self._get_all_fields()
+      return self._field_table
+
+   def get_page_offsets(self, page, page_size=128):
+      """
+      Return: list of linear offsets of the page_size blocks that make up page. Page 0
+      covers both the lower memory and upper page 00h.
+      """
+      if page == 0:
+         return [0, page_size]
+      return [page * page_size + page_size]
@@ -1,3 +1,5 @@
+import os
+import threading
 from sonic_platform_base.sonic_xcvr.eeprom_rw import EepromReadWriteMixin
 from abc import ABC, abstractmethod
 
@@ -5,6 +7,9 @@ SFP_OPTOE_PAGE_SELECT_OFFSET = 127
 SFP_OPTOE_UPPER_PAGE0_OFFSET = 128
 SFP_OPTOE_PAGE_SIZE = 128
 
+# Guards lazy creation of the per-port fd locks
+_optoe_fd_lock_init = threading.Lock()
+
 class OptoeEepromReadWriteMixin(EepromReadWriteMixin, ABC):
     @abstractmethod
     def get_eeprom_path(self) -> str:
@@ -42,30 +47,135 @@ class OptoeEepromReadWriteMixin(EepromReadWriteMixin, ABC):
             pass
 
     def set_page0(self):
-        self.write_eeprom(SFP_OPTOE_PAGE_SELECT_OFFSET, 1, bytearray([0x00]))
+        return self.write_eeprom(SFP_OPTOE_PAGE_SELECT_OFFSET, 1, bytearray([0x00]))
 
     def get_optoe_current_page(self):
         return self.read_eeprom(SFP_OPTOE_PAGE_SELECT_OFFSET, 1)[0]
 
+    def _get_optoe_fd_lock(self):
+        lock = getattr(self, '_optoe_fd_lock', None)
+        if lock is None:
+            with _optoe_fd_lock_init:
+                lock = getattr(self, '_optoe_fd_lock', None)
+                if lock is None:
+                    lock = self._optoe_fd_lock = threading.Lock()
+        return lock
+
+    def _get_optoe_fd(self):
+        """
+        Returns the fd of the eeprom sysfs file, opened on first use and kept open until
+        close_eeprom() (called on OIR through remove_xcvr_api()). Must be called with the
+        fd lock held.
+        """
+        path = self.get_eeprom_path()
+        fd = getattr(self, '_optoe_fd', None)
+        if fd is not None and self._optoe_fd_path == path:
+            return fd
+        if fd is not None:
+            # The eeprom path changed
+            self._close_optoe_fd()
+        try:
+            fd = os.open(path, os.O_RDWR)
+        except PermissionError:
+            # Read-only access, e.g. an unprivileged CLI; writes then fail with EBADF
+            fd = os.open(path, os.O_RDONLY)
+        self._optoe_fd = fd
+        self._optoe_fd_path = path
+        return fd
+
+    def _close_optoe_fd(self):
+        fd = getattr(self, '_optoe_fd', None)
+        self._optoe_fd = None
+        self._optoe_page = None
+        if fd is not None:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def close_eeprom(self):
+        """
+        Closes the persistent eeprom fd and forgets the cached page select, so that the
+        next access reopens the file. Called when the module is removed or replaced.
+        """
+        with self._get_optoe_fd_lock():
+            self._close_optoe_fd()
+
+    def _update_optoe_page(self, offset, num_bytes, write_buffer=None):
+        """
+        Track the page select register of the module. The optoe driver selects the page
+        for any access beyond upper page 0 and is expected to restore page 0 afterwards,
+        which is exactly what read_eeprom() cannot assume, so such an access makes the
+        page unknown again.
+        """
+        if offset >= SFP_OPTOE_UPPER_PAGE0_OFFSET + SFP_OPTOE_PAGE_SIZE:
+            self._optoe_page = None
+        elif write_buffer is not None and offset <= SFP_OPTOE_PAGE_SELECT_OFFSET < offset + num_bytes:
+            self._optoe_page = write_buffer[SFP_OPTOE_PAGE_SELECT_OFFSET - offset]
+
     def read_eeprom(self, offset, num_bytes):
+        if offset >= SFP_OPTOE_UPPER_PAGE0_OFFSET and \
+            offset < (SFP_OPTOE_UPPER_PAGE0_OFFSET+SFP_OPTOE_PAGE_SIZE) and \
+                getattr(self, '_optoe_page', None) != 0:
+            # Restoring the page to 0 helps in cases where the optoe driver failed to restore
+            # the page when say the module was busy with CDB command processing. The check
+            # is skipped while page 0 is known to be selected.
+            try:
+                if self.get_optoe_current_page() == 0 or self.set_page0():
+                    self._optoe_page = 0
+            except TypeError:
+                # get_optoe_current_page() failed to read the page select byte
+                pass
         try:
-            with open(self.get_eeprom_path(), mode='rb', buffering=0) as f:
-                if offset >= SFP_OPTOE_UPPER_PAGE0_OFFSET  and \
-                    offset < (SFP_OPTOE_UPPER_PAGE0_OFFSET+SFP_OPTOE_PAGE_SIZE) and \
-                        self.get_optoe_current_page() != 0:
-                    # Restoring the page to 0 helps in cases where the optoe driver failed to restore
-                    # the page when say the module was busy with CDB command processing
-                   self.set_page0()
-                f.seek(offset)
-                return bytearray(f.read(num_bytes))
+            with self._get_optoe_fd_lock():
+                data = os.pread(self._get_optoe_fd(), num_bytes, offset)
+                self._update_optoe_page(offset, num_bytes)
         except (OSError, IOError):
+            self.close_eeprom()
             return None
+        return bytearray(data)
+
+    @staticmethod
+    def _get_write_data(write_buffer, num_bytes):
+        # Buffers (bytes, bytearray, memoryview e.g. of a mapped firmware image) are
+        # written as is, other sequences of byte values are converted
+        try:
+            data = memoryview(write_buffer)
+        except TypeError:
+            return bytes(write_buffer[0:num_bytes])
+        return data if len(data) == num_bytes else data[0:num_bytes]
 
     def write_eeprom(self, offset, num_bytes, write_buffer):
         try:
-            with open(self.get_eeprom_path(), mode='r+b', buffering=0) as f:
-                f.seek(offset)
-                f.write(write_buffer[0:num_bytes])
+            with self._get_optoe_fd_lock():
+                os.pwrite(self._get_optoe_fd(), self._get_write_data(write_buffer, num_bytes), offset)
+                self._update_optoe_page(offset, num_bytes, write_buffer)
+        except (OSError, IOError):
+            self.close_eeprom()
+            return False
+        return True
+
+    def write_eeprom_stream(self, offset, num_bytes, write_buffer, write_max=None):
+        """
+        Writes num_bytes from the linear offset as one sequential stream, split only into
+        writes of up to write_max bytes (the optoe write_max, see set_optoe_write_max()),
+        not at page boundaries: on a module with auto paging, a write running past the
+        end of a page continues on the next one. The fd lock is held for the whole
+        stream, so that no other access of the port changes the page select in between,
+        e.g. while writing the CDB EPL pages.
+
+        Returns:
+            a Boolean, true if the whole stream was written and false if it was not.
+        """
+        data = self._get_write_data(write_buffer, num_bytes)
+        write_max = write_max or num_bytes
+        try:
+            with self._get_optoe_fd_lock():
+                fd = self._get_optoe_fd()
+                for start in range(0, num_bytes, write_max):
+                    os.pwrite(fd, data[start:start + write_max], offset + start)
+                self._update_optoe_page(offset, num_bytes, data)
         except (OSError, IOError):
+            self.close_eeprom()
             return False
         return True
@@ -326,6 +326,11 @@ class SfpOptoeBase(SfpBase, OptoeEepromReadWriteMixin):
     def set_power(self, mode):
         raise NotImplementedError
 
+    def remove_xcvr_api(self):
+        super().remove_xcvr_api()
+        # The module was removed or replaced, drop the eeprom fd and cached page select
+        self.close_eeprom()
+
     def refresh_xcvr_api(self):
         super().refresh_xcvr_api()
 
@@ -1,19 +1,91 @@
 from collections import abc
+import functools
 import os
+import time
 
-def read_only_cached_api_return(func):
-    """Cache until func() returns a non-None, non-empty collections cache_value."""
-    cache_name = f'_{func.__name__}_cache'
-    def wrapper(self):
-        if not self.cache_enabled:
-            return func(self)
-        if not hasattr(self, cache_name):
-            cache_value = func(self)
-            setattr(self, cache_name, cache_value)
-        else:
-            cache_value = getattr(self, cache_name)
-            if cache_value is None or (isinstance(cache_value, abc.Iterable) and not cache_value):
-                cache_value = func(self)
-                setattr(self, cache_name, cache_value)
-        return cache_value
-    return wrapper
+def _is_cacheable(value):
+    """Return: True unless value is None or an empty collection."""
+    return value is not None and not (isinstance(value, abc.Iterable) and not value)
+
+def _count(obj, name, hit):
+    stats = obj.__dict__.get('_cache_stats')
+    if stats is None:
+        stats = obj._cache_stats = {}
+    counters = stats.get(name)
+    if counters is None:
+        counters = stats[name] = [0, 0]
+    counters[0 if hit else 1] += 1
+
+def cached_api_return(ttl=None, generation=True):
+    """
+    Cache the return value of an API method per instance and arguments.
+
+    Values are only kept once func() returns a non-None, non-empty collection value.
+    Entries of a method are held in the instance attribute '_<method name>_cache',
+    deleting it clears them. Calls with unhashable arguments are not cached. Caching
+    is bypassed while the instance's cache_enabled is False.
+
+    Args:
+        ttl: seconds an entry stays valid, None for no expiry
+        generation: if True, entries are invalidated by bump_cache_generation(), for
+                    values that may change on module reset, firmware run or
+                    application change
+    """
+    def decorator(func):
+        name = func.__name__
+        cache_name = f'_{name}_cache'
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not self.cache_enabled:
+                return func(self, *args, **kwargs)
+            key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+            try:
+                hash(key)
+            except TypeError:
+                return func(self, *args, **kwargs)
+            cache = self.__dict__.get(cache_name)
+            if cache is None:
+                cache = {}
+                setattr(self, cache_name, cache)
+            current_generation = self.__dict__.get('_cache_generation', 0) if generation else 0
+            entry = cache.get(key)
+            if entry is not None:
+                value, entry_generation, expiry = entry
+                if entry_generation == current_generation and (expiry is None or time.monotonic() < expiry):
+                    _count(self, name, hit=True)
+                    return value
+            _count(self, name, hit=False)
+            value = func(self, *args, **kwargs)
+            if _is_cacheable(value):
+                cache[key] = (value, current_generation, None if ttl is None else time.monotonic() + ttl)
+            else:
+                cache.pop(key, None)
+            return value
+        wrapper.cache_ttl = ttl
+        wrapper.cache_generation = generation
+        return wrapper
+    return decorator
+
+# Cache until func() returns a non-None, non-empty collections cache_value.
+read_only_cached_api_return = cached_api_return(generation=False)
+
+def bump_cache_generation(obj):
+    """
+    Invalidate the entries of obj cached by generation-aware methods.
+
+    Return: the new generation
+    """
+    obj._cache_generation = obj.__dict__.get('_cache_generation', 0) + 1
+    return obj._cache_generation
+
+def get_cache_stats(obj):
+    """
+    Return: dict mapping the name of each cached method of obj called so far to a
+    dict of its 'hits' and 'misses' counts
+    """
+    stats = obj.__dict__.get('_cache_stats') or {}
+    return {name: {'hits': hits, 'misses': misses} for name, (hits, misses) in stats.items()}
+
+def reset_cache_stats(obj):
+    """Reset the hit/miss counters of obj."""
+    obj.__dict__.pop('_cache_stats', None)
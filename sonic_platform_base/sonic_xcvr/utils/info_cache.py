@@ -0,0 +1,141 @@
+"""
+   info_cache.py
+
+   Content-addressed cache of static transceiver info, persisted to a file so
+   that it survives daemon restarts
+"""
+
+from collections import OrderedDict
+import copy
+import hashlib
+import json
+import os
+import threading
+
+from sonic_py_common.syslogger import SysLogger
+
+SYSLOG_IDENTIFIER = "XcvrInfoCache"
+log = SysLogger(SYSLOG_IDENTIFIER)
+log.logger.propagate = False
+
+XCVR_INFO_CACHE_FILE = "/var/cache/sonic/xcvr_info_cache.json"
+XCVR_INFO_CACHE_MAX_ENTRIES = 512
+
+class XcvrInfoCache(object):
+    """
+    Values derived from the static pages of transceivers, keyed by the
+    fingerprint of the module they were read from and persisted to a JSON file
+
+    A fingerprint is a digest of the bytes identifying a module and the
+    content of its static pages, typically vendor name, part number, serial
+    number, firmware revisions and page checksums, see make_fingerprint().
+    Modules of identical content share their fingerprint and hence their
+    entries. The least recently stored fingerprints are dropped beyond
+    max_entries.
+
+    Args:
+        path: JSON file the cache is loaded from and saved to, None to keep it
+              in memory only
+        max_entries: maximum number of fingerprints kept
+    """
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path=None, max_entries=XCVR_INFO_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        if path is not None:
+            self.load()
+
+    @classmethod
+    def get_shared(cls):
+        """
+        Returns the cache shared by all the modules of the process, persisted
+        to XCVR_INFO_CACHE_FILE
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(XCVR_INFO_CACHE_FILE)
+            return cls._shared
+
+    @staticmethod
+    def make_fingerprint(*values):
+        """
+        Returns the fingerprint of a module from the values read from its
+        identification and checksum bytes
+        """
+        data = json.dumps(values, sort_keys=True, default=str)
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def get(self, fingerprint, name):
+        """
+        Returns a copy of the value stored as name for fingerprint, None if
+        there is none
+        """
+        with self._lock:
+            value = self._entries.get(fingerprint, {}).get(name)
+            return copy.deepcopy(value)
+
+    def put(self, fingerprint, name, value, save=True):
+        """
+        Stores a copy of value as name for fingerprint, saving the cache to
+        its file if save is set; returns False if it could not be written
+        """
+        with self._lock:
+            entry = self._entries.pop(fingerprint, {})
+            entry[name] = copy.deepcopy(value)
+            self._entries[fingerprint] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if not save or self.path is None:
+                return True
+            try:
+                data = json.dumps(self._entries, indent=1)
+            except (TypeError, ValueError) as e:
+                log.log_notice("Failed to serialize transceiver info cache: {}".format(e))
+                entry.pop(name)
+                return False
+            return self._save(data)
+
+    def remove(self, fingerprint, save=True):
+        """
+        Drops the entries of fingerprint, saving the cache to its file if save
+        is set; returns False if it could not be written
+        """
+        with self._lock:
+            if self._entries.pop(fingerprint, None) is None or not save or self.path is None:
+                return True
+            data = json.dumps(self._entries, indent=1)
+            return self._save(data)
+
+    def load(self):
+        """
+        Loads the cache from its file, if any; returns False if it could not
+        be read
+        """
+        try:
+            with open(self.path) as f:
+                data = json.load(f, object_pairs_hook=OrderedDict)
+            entries = OrderedDict((str(fingerprint), dict(entry)) for fingerprint, entry in data.items())
+        except FileNotFoundError:
+            return True
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            log.log_notice("Failed to load transceiver info cache {}: {}".format(self.path, e))
+            return False
+        with self._lock:
+            self._entries = entries
+        return True
+
+    def _save(self, data):
+        tmp_path = "{}.{}.tmp".format(self.path, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            log.log_notice("Failed to save transceiver info cache {}: {}".format(self.path, e))
+            return False
+        return True
@@ -49,9 +49,10 @@ EOP_800G_VENDOR_PN_LIST = ["EOLD-168HG-02-41", "EOLD-138HG-02-41"]
 HISENSE_2X100G_VENDOR_PN = r"DEF8504-2C\d{2}-MB3$"
 
 class XcvrApiFactory(object):
-    def __init__(self, reader, writer):
+    def __init__(self, reader, writer, stream_writer=None):
         self.reader = reader
         self.writer = writer
+        self.stream_writer = stream_writer
         self.lower_memory_info = ModuleEepromLowerMemoryInfo(self.reader)
 
     def _create_cmis_api(self, bank=0):
@@ -60,23 +61,23 @@ class XcvrApiFactory(object):
         vendor_pn = self.lower_memory_info.get_vendor_part_num()
 
         if vendor_name == 'Credo' and vendor_pn in CREDO_800G_AEC_VENDOR_PN_LIST:
-            xcvr_eeprom = XcvrEeprom(self.reader, self.writer, CredoAec800gMemMap(CredoAec800gCodes, bank=bank))
+            xcvr_eeprom = XcvrEeprom(self.reader, self.writer, CredoAec800gMemMap.get_shared(CredoAec800gCodes, bank=bank), self.stream_writer)
             api = CredoAec800gApi(xcvr_eeprom, init_cdb_fw_handler=True)
         elif ('INNOLIGHT' in vendor_name and vendor_pn in INL_800G_VENDOR_PN_LIST) or \
              ('EOPTOLINK' in vendor_name and vendor_pn in EOP_800G_VENDOR_PN_LIST):
-            xcvr_eeprom = XcvrEeprom(self.reader, self.writer, CmisMemMap(CmisCodes, bank=bank))
+            xcvr_eeprom = XcvrEeprom(self.reader, self.writer, CmisMemMap.get_shared(CmisCodes, bank=bank), self.stream_writer)
             api = CmisFr800gApi(xcvr_eeprom, init_cdb_fw_handler=True)
         elif vendor_name == 'Hisense' and vendor_pn is not None and re.match(HISENSE_2X100G_VENDOR_PN, vendor_pn):
-            xcvr_eeprom = XcvrEeprom(self.reader, self.writer, CmisMemMap(CmisCodes, bank=bank))
+            xcvr_eeprom = XcvrEeprom(self.reader, self.writer, CmisMemMap.get_shared(CmisCodes, bank=bank), self.stream_writer)
             api = CmisAocSingleBankApi(xcvr_eeprom, init_cdb_fw_handler=True)
         elif vendor_pn in ARISTA_ENHANCED_LPO_PN_LIST:
-            xcvr_eeprom = XcvrEeprom(self.reader, self.writer, CmisEnhancedLpoMemMap(CmisCodes, bank=bank))
+            xcvr_eeprom = XcvrEeprom(self.reader, self.writer, CmisEnhancedLpoMemMap.get_shared(CmisCodes, bank=bank), self.stream_writer)
             api = CmisEnhancedLpoApi(xcvr_eeprom, init_cdb_fw_handler=True)
         else:
-            xcvr_eeprom = XcvrEeprom(self.reader, self.writer, CmisMemMap(CmisCodes, bank=bank))
+            xcvr_eeprom = XcvrEeprom(self.reader, self.writer, CmisMemMap.get_shared(CmisCodes, bank=bank), self.stream_writer)
             api = CmisApi(xcvr_eeprom, init_cdb_fw_handler=True)
             if api.is_coherent_module():
-                xcvr_eeprom = XcvrEeprom(self.reader, self.writer, CCmisMemMap(CmisCodes, bank=bank))
+                xcvr_eeprom = XcvrEeprom(self.reader, self.writer, CCmisMemMap.get_shared(CmisCodes, bank=bank), self.stream_writer)
                 api = CCmisApi(xcvr_eeprom, init_cdb_fw_handler=True)
         return api
 
@@ -92,8 +93,8 @@ class XcvrApiFactory(object):
 
     def _create_api(self, codes_class, mem_map_class, api_class):
         codes = codes_class
-        mem_map = mem_map_class(codes)
-        xcvr_eeprom = XcvrEeprom(self.reader, self.writer, mem_map)
+        mem_map = mem_map_class.get_shared(codes)
+        xcvr_eeprom = XcvrEeprom(self.reader, self.writer, mem_map, self.stream_writer)
         return api_class(xcvr_eeprom)
 
     def create_xcvr_api(self, bank=0):
@@ -5,12 +5,25 @@
 """
 
 import struct
+import threading
+from bisect import bisect_right
+from contextlib import contextmanager
+from .fields.xcvr_field import RegGroupField
+
+# Size of a page in the linear EEPROM address space. Reads are never coalesced
+# across a page boundary since the module needs a page select for each page.
+EEPROM_PAGE_SIZE = 128
 
 class XcvrEeprom(object):
-   def __init__(self, reader, writer, mem_map):
+   def __init__(self, reader, writer, mem_map, stream_writer=None):
       self.reader = reader
       self.writer = writer
       self.mem_map = mem_map
+      # Optional writer of a sequential stream split only at a given write_max,
+      # called as stream_writer(offset, num_bytes, write_buffer, write_max), see
+      # OptoeEepromReadWriteMixin.write_eeprom_stream()
+      self.stream_writer = stream_writer
+      self._snapshot_state = threading.local()
 
    def read(self, field_name):
       """
@@ -22,13 +35,132 @@ class XcvrEeprom(object):
       Returns:
          The value of the field, if the read is successful and None otherwise
       """
-      field = self.mem_map.get_field(field_name)
-      raw_data = self.reader(field.get_offset(), field.get_size())
-      if raw_data:
-         deps = field.get_deps()
-         decoded_deps = {dep: self.read(dep) for dep in deps}
-         return field.decode(raw_data, **decoded_deps)
-      return None
+      return self._read_fields([field_name])[field_name]
+
+   def read_many(self, field_names):
+      """
+      Read values from several fields in EEPROM using as few reader calls as possible
+
+      The byte ranges of the requested fields (and of the fields they depend on) are
+      merged per page into contiguous reads, see plan_reads(). Every field is then
+      decoded from the merged buffers.
+
+      Args:
+         field_names: an iterable of strings denoting the XcvrFields to read from
+
+      Returns:
+         A dict mapping each field name to its value, if the read is successful and
+         None otherwise
+      """
+      return self._read_fields(list(field_names))
+
+   def _read_fields(self, field_names):
+      """
+      Return: dict mapping each of field_names to its decoded value (or None)
+      """
+      plan = self.plan_reads(field_names)
+      chunks = [self._read_chunk(start, size) for start, size in plan]
+      return self.decode_reads(field_names, plan, chunks)
+
+   def decode_reads(self, field_names, plan, chunks):
+      """
+      Decode fields from data read according to a plan
+
+      Args:
+         field_names: an iterable of strings denoting the XcvrFields to decode
+
+         plan: the list of (offset, size) tuples returned by plan_reads() for field_names
+
+         chunks: the data read for each entry of plan, None for a failed read
+
+      Returns:
+         A dict mapping each field name to its value, or None if its data was not read
+      """
+      chunk_starts = [start for start, _ in plan]
+      decoded = {}
+      def decode(field_name):
+         if field_name not in decoded:
+            field = self.mem_map.get_field(field_name)
+            raw_data = self._extract(field, chunk_starts, chunks)
+            if raw_data:
+               decoded_deps = {dep: decode(dep) for dep in field.get_deps()}
+               decoded[field_name] = field.decode(raw_data, **decoded_deps)
+            else:
+               decoded[field_name] = None
+         return decoded[field_name]
+
+      return {field_name: decode(field_name) for field_name in field_names}
+
+   def plan_reads(self, field_names):
+      """
+      Compute the reads needed to fetch a set of fields and the fields they depend on
+
+      Args:
+         field_names: an iterable of strings denoting XcvrFields
+
+      Returns:
+         A list of (offset, size) tuples sorted by offset. Overlapping or adjacent
+         byte ranges within the same page are merged into a single read.
+      """
+      spans = sorted(span for field_name in self._get_dep_closure(field_names)
+                     for span in self._get_spans(self.mem_map.get_field(field_name)))
+      plan = []
+      for start, end in spans:
+         if plan and start <= plan[-1][1] and \
+               start // EEPROM_PAGE_SIZE == plan[-1][0] // EEPROM_PAGE_SIZE:
+            plan[-1][1] = max(plan[-1][1], end)
+         else:
+            plan.append([start, end])
+      return [(start, end - start) for start, end in plan]
+
+   def _get_dep_closure(self, field_names):
+      """
+      Return: field_names followed by every field they (transitively) depend on
+      """
+      closure = []
+      pending = list(field_names)
+      while pending:
+         field_name = pending.pop()
+         if field_name not in closure:
+            closure.append(field_name)
+            pending.extend(self.mem_map.get_field(field_name).get_deps())
+      return closure
+
+   def _get_spans(self, field):
+      """
+      Return: list of [start, end) byte ranges that must be read to decode field
+
+      A RegGroupField spanning several pages (e.g. ADVERTISING_FIELD) is split into
+      the spans of its members so that the pages in between are not read.
+      """
+      start = field.get_offset()
+      end = start + field.get_size()
+      if isinstance(field, RegGroupField) and \
+            start // EEPROM_PAGE_SIZE != (end - 1) // EEPROM_PAGE_SIZE:
+         return [span for member in field.fields for span in self._get_spans(member)]
+      return [(start, end)]
+
+   def _extract(self, field, chunk_starts, chunks):
+      """
+      Return: the raw bytes of field sliced out of the chunks read for a plan, or
+      None if any of the chunks covering it failed to be read
+      """
+      start = field.get_offset()
+      spans = self._get_spans(field)
+      raw_data = bytearray(field.get_size()) if len(spans) > 1 else None
+      for span_start, span_end in spans:
+         idx = bisect_right(chunk_starts, span_start) - 1
+         chunk = chunks[idx]
+         if not chunk:
+            return None
+         chunk_offset = span_start - chunk_starts[idx]
+         data = chunk[chunk_offset:chunk_offset + span_end - span_start]
+         if raw_data is None:
+            return data
+         if len(data) != span_end - span_start:
+            return None
+         raw_data[span_start - start:span_end - start] = data
+      return raw_data
 
    def read_raw(self, offset, size, return_raw = False):
       """
@@ -42,7 +174,7 @@ class XcvrEeprom(object):
       Returns:
          The value(s) of the field, if the read is successful and None otherwise
       """
-      raw_data = self.reader(offset, size)
+      raw_data = self._read_chunk(offset, size)
       if raw_data is None:
          return None
       if return_raw:
@@ -69,10 +201,10 @@ class XcvrEeprom(object):
       """
       field = self.mem_map.get_field(field_name)
       if field.read_before_write():
-         encoded_data = field.encode(value, self.reader(field.get_offset(), field.get_size()))
+         encoded_data = field.encode(value, self._read_chunk(field.get_offset(), field.get_size()))
       else:
          encoded_data = field.encode(value)
-      return self.writer(field.get_offset(), field.get_size(), encoded_data)
+      return self._write_chunk(field.get_offset(), field.get_size(), encoded_data)
 
    def write_raw(self, offset, size, bytearray_data):
       """
@@ -89,4 +221,97 @@ class XcvrEeprom(object):
       Returns:
          Boolean, True if the write is successful and False otherwise
       """
-      return self.writer(offset, size, bytearray_data)
\ No newline at end of file
+      return self._write_chunk(offset, size, bytearray_data)
+
+   @contextmanager
+   def snapshot(self, pages):
+      """
+      Serve reads from an in-memory copy of pages for the duration of the context
+
+      Each page is read once as a whole block on entry. Every field or raw read that falls
+      within a snapshotted block is then served from memory instead of the reader, so
+      latched (clear-on-read) flags on those pages are read from the module exactly once
+      no matter how many getters look at them. Writes go through to the module and are
+      also applied to the snapshot. Snapshots are per thread and may be nested.
+
+      Args:
+         pages: an iterable of page numbers, resolved to blocks by the memory map's
+         get_page_offsets()
+
+      Example:
+         with xcvr_eeprom.snapshot(pages=[0x00, 0x11]):
+            dom = api.get_transceiver_dom_real_value()
+            flags = api.get_transceiver_dom_flags()
+      """
+      blocks = {}
+      for offset in self.get_snapshot_offsets(pages):
+         blocks[offset] = self.reader(offset, EEPROM_PAGE_SIZE)
+      with self.preloaded_snapshot(blocks):
+         yield self
+
+   def get_snapshot_offsets(self, pages):
+      """
+      Return: offsets of the EEPROM_PAGE_SIZE blocks that snapshot(pages) needs to read,
+      leaving out blocks already held by an enclosing snapshot
+      """
+      outer = self._get_snapshot() or {}
+      offsets = []
+      for page in pages:
+         for offset in self.mem_map.get_page_offsets(page, EEPROM_PAGE_SIZE):
+            if offset // EEPROM_PAGE_SIZE not in outer and offset not in offsets:
+               offsets.append(offset)
+      return offsets
+
+   @contextmanager
+   def preloaded_snapshot(self, blocks):
+      """
+      Same as snapshot(), but with blocks that have already been read by the caller
+      (e.g. asynchronously, see AsyncXcvrEeprom.call())
+
+      Args:
+         blocks: a dict mapping the offsets returned by get_snapshot_offsets() to the
+         data read there, None for a failed read
+      """
+      outer = self._get_snapshot()
+      snapshot_blocks = dict(outer) if outer else {}
+      for offset, data in blocks.items():
+         # A failed block read is left to the reader on each access rather than cached
+         if data and len(data) == EEPROM_PAGE_SIZE:
+            snapshot_blocks[offset // EEPROM_PAGE_SIZE] = bytearray(data)
+      self._snapshot_state.blocks = snapshot_blocks
+      try:
+         yield self
+      finally:
+         self._snapshot_state.blocks = outer
+
+   def _get_snapshot(self):
+      """
+      Return: dict mapping block index to the snapshotted block, or None outside a snapshot
+      """
+      return getattr(self._snapshot_state, 'blocks', None)
+
+   def _read_chunk(self, offset, size):
+      """
+      Read size bytes at offset, from the active snapshot if it covers the range
+      """
+      blocks = self._get_snapshot()
+      if blocks:
+         block_idx = offset // EEPROM_PAGE_SIZE
+         block = blocks.get(block_idx)
+         if block is not None and (offset + size - 1) // EEPROM_PAGE_SIZE == block_idx:
+            start = offset - block_idx * EEPROM_PAGE_SIZE
+            return block[start:start + size]
+      return self.reader(offset, size)
+
+   def _write_chunk(self, offset, size, data):
+      """
+      Write size bytes at offset and keep the active snapshot coherent with the module
+      """
+      result = self.writer(offset, size, data)
+      blocks = self._get_snapshot()
+      if result and blocks:
+         for pos in range(offset, offset + min(size, len(data))):
+            block = blocks.get(pos // EEPROM_PAGE_SIZE)
+            if block is not None:
+               block[pos % EEPROM_PAGE_SIZE] = data[pos - offset]
+      return result
\ No newline at end of file
@@ -0,0 +1,223 @@
+#
+# cmd_scheduler.py
+#
+#   shared scheduler polling the status of the MCU commands of all the
+#   Broadcom Y cables of a process
+#
+
+import heapq
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as CmdTimeoutError
+
+# Poll interval bounds in seconds, the interval doubles after each poll
+CMD_POLL_INTERVAL_MIN = 0.0005
+CMD_POLL_INTERVAL_MAX = 0.016
+
+# Seconds a bus worker waits for new commands before its thread exits
+CMD_WORKER_IDLE_TIMEOUT = 10.0
+
+# Seconds callers wait for a future beyond the command timeout, covering a
+# poll stuck on its bus
+CMD_RESULT_GRACE = 0.5
+
+# Number of latency samples kept per port and command
+CMD_LATENCY_SAMPLES = 256
+
+
+class _CmdPollJob(object):
+    def __init__(self, poll, deadline, future, interval):
+        self.poll = poll
+        self.deadline = deadline
+        self.future = future
+        self.interval = interval
+
+
+class _CmdPollWorker(object):
+    """
+    Polls the commands submitted for one bus from a thread of its own, started
+    on demand and exiting once idle for idle_timeout seconds
+    """
+
+    def __init__(self, bus, interval_max, idle_timeout):
+        self.bus = bus
+        self.interval_max = interval_max
+        self.idle_timeout = idle_timeout
+        self._cond = threading.Condition()
+        self._jobs = []
+        self._seq = 0
+        self._thread = None
+
+    def submit(self, job):
+        with self._cond:
+            self._push(time.monotonic(), job)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="ycable-cmd-{}".format(self.bus))
+                self._thread.daemon = True
+                self._thread.start()
+            self._cond.notify()
+
+    def is_alive(self):
+        with self._cond:
+            return self._thread is not None
+
+    def _push(self, when, job):
+        self._seq += 1
+        heapq.heappush(self._jobs, (when, self._seq, job))
+
+    def _next_job(self):
+        with self._cond:
+            while True:
+                if self._jobs:
+                    delay = self._jobs[0][0] - time.monotonic()
+                    if delay <= 0:
+                        return heapq.heappop(self._jobs)[2]
+                    self._cond.wait(delay)
+                elif not self._cond.wait(self.idle_timeout) and not self._jobs:
+                    self._thread = None
+                    return None
+
+    def _run(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            try:
+                done, value = job.poll()
+            except Exception as e:
+                job.future.set_exception(e)
+                continue
+            if done:
+                job.future.set_result(value)
+                continue
+
+            now = time.monotonic()
+            if now >= job.deadline:
+                job.future.set_exception(CmdTimeoutError())
+                continue
+            when = min(now + job.interval, job.deadline)
+            job.interval = min(job.interval * 2, self.interval_max)
+            with self._cond:
+                self._push(when, job)
+
+
+class CableCmdScheduler(object):
+    """
+    Polls the completion of submitted cable commands, from one worker per bus
+
+    A command is submitted as a poll function once its request is written to
+    the MCU. The worker of its bus calls poll() right away, then with an
+    exponential backoff between interval_min and interval_max, until it returns
+    (True, value) or the timeout expires. The returned Future then resolves to
+    value, or raises CmdTimeoutError on timeout and the exception raised by
+    poll() if any. Callers wait on their future instead of spinning on the
+    status register, so many ports do not compete for the GIL, while a slow or
+    stuck bus only delays the commands of its own cables.
+
+    The scheduler also keeps the latest command latencies per port, see
+    record_latency() and get_latency_stats().
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, latency_samples=CMD_LATENCY_SAMPLES, interval_min=CMD_POLL_INTERVAL_MIN,
+                 interval_max=CMD_POLL_INTERVAL_MAX, idle_timeout=CMD_WORKER_IDLE_TIMEOUT):
+        self.interval_min = interval_min
+        self.interval_max = interval_max
+        self.idle_timeout = idle_timeout
+        self._workers_lock = threading.Lock()
+        self._workers = {}
+        self._latency_lock = threading.Lock()
+        self._latency_samples = latency_samples
+        self._latencies = {}
+
+    @classmethod
+    def get_shared(cls):
+        """
+        Returns the scheduler shared by all the cables of the process
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def submit(self, poll, timeout, bus=None):
+        """
+        Schedules poll() until it reports completion or timeout seconds elapse
+
+        Args:
+            poll:
+                callable returning a tuple (done, value)
+            timeout:
+                a float, seconds after which the command is timed out
+            bus:
+                the I2C bus (any hashable) of the cable, whose worker polls
+                the command
+
+        Returns:
+            a Future, resolving to the value returned along with done == True
+        """
+        future = Future()
+        future.set_running_or_notify_cancel()
+        job = _CmdPollJob(poll, time.monotonic() + timeout, future, self.interval_min)
+        with self._workers_lock:
+            worker = self._workers.get(bus)
+            if worker is None:
+                worker = self._workers[bus] = _CmdPollWorker(bus, self.interval_max, self.idle_timeout)
+        worker.submit(job)
+        return future
+
+    def get_active_buses(self):
+        """
+        Returns the buses whose worker thread is running
+        """
+        with self._workers_lock:
+            workers = list(self._workers.values())
+        return [worker.bus for worker in workers if worker.is_alive()]
+
+    def record_latency(self, port, name, seconds):
+        """
+        Records the latency of command name on port
+        """
+        with self._latency_lock:
+            samples = self._latencies.get((port, name))
+            if samples is None:
+                samples = self._latencies[(port, name)] = deque(maxlen=self._latency_samples)
+            samples.append(seconds)
+
+    def get_latency_stats(self, port, percentiles=(50, 90, 99)):
+        """
+        Returns the latency statistics of the commands recorded for port
+
+        Returns:
+            a dict mapping each command name to a dict with the number of
+            samples 'count', the 'max' latency and a 'p<N>' latency per
+            requested percentile, latencies in milliseconds
+        """
+        with self._latency_lock:
+            latencies = {name: sorted(samples) for (sample_port, name), samples in self._latencies.items()
+                         if sample_port == port}
+        stats = {}
+        for name, samples in latencies.items():
+            count = len(samples)
+            entry = {'count': count, 'max': samples[-1] * 1000}
+            for percentile in percentiles:
+                # nearest-rank percentile
+                rank = max(1, -(-percentile * count // 100))
+                entry['p{}'.format(percentile)] = samples[min(rank, count) - 1] * 1000
+            stats[name] = entry
+        return stats
+
+    def clear_latency_stats(self, port):
+        """
+        Drops the latencies recorded for port
+        """
+        with self._latency_lock:
+            for key in [key for key in self._latencies if key[0] == port]:
+                del self._latencies[key]
+
+
+def get_cmd_scheduler():
+    return CableCmdScheduler.get_shared()
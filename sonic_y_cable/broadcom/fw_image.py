@@ -0,0 +1,146 @@
+#
+# fw_image.py
+#
+#   index of the images of a Broadcom Y cable firmware bundle
+#
+
+import os
+import struct
+import threading
+from collections import OrderedDict, namedtuple
+
+# Images of a bundle, in file order
+FW_IMAGE_TOR_BANK1 = 0
+FW_IMAGE_TOR_BANK2 = 1
+FW_IMAGE_NIC_BANK1 = 2
+FW_IMAGE_NIC_BANK2 = 3
+FW_IMAGE_MUX_CHIP = 4
+FW_IMAGE_COUNT = 5
+
+# Image header: image size, fw version minor/major, api version minor/major,
+# image crc32, compression, compressed size, compressed crc32, add size,
+# add crc32 and header crc32
+FW_IMAGE_HEADER = struct.Struct('I4H7I')
+FW_IMAGE_HEADER_SIZE = 0x28
+
+# Number of bundles kept indexed
+FW_IMAGE_INDEX_CACHE_SIZE = 4
+
+class FwImageHeader(namedtuple('FwImageHeader', [
+        'image_size',
+        'fw_version_minor',
+        'fw_version_major',
+        'api_version_minor',
+        'api_version_major',
+        'image_crc32',
+        'compression',
+        'compressed_size',
+        'compressed_crc32',
+        'add_size',
+        'add_crc32',
+        'header_crc32'])):
+    __slots__ = ()
+
+    @property
+    def payload_size(self):
+        """
+        Size of the payload following the header, the compressed size if the
+        low byte of compression is set, as sent in the transfer compression
+        header, else the image size
+        """
+        return self.compressed_size if self.compression & 0xFF else self.image_size
+
+
+class FwImageIndex(object):
+    """
+    Headers and payloads of the images of a firmware bundle
+
+    The bundle is read once and its image headers parsed. Payloads are
+    exposed as memoryviews of 32-bit words over the bundle, so that any
+    number of cables can be upgraded from the same bundle without copying
+    it. The bundle is read rather than memory mapped, a mapping would fault
+    if the file were rewritten in place. Use get_fw_image_index() to share
+    the index of a file.
+
+    Args:
+        fwfile: path of the firmware bundle
+    """
+
+    def __init__(self, fwfile):
+        self.fwfile = fwfile
+        with open(fwfile, 'rb') as f:
+            self._data = f.read()
+        self._view = memoryview(self._data)
+        self._headers = []
+        self._images = {}
+
+        offset = 0
+        while len(self._headers) < FW_IMAGE_COUNT and offset + FW_IMAGE_HEADER_SIZE <= len(self._data):
+            header = FwImageHeader(*FW_IMAGE_HEADER.unpack_from(self._data, offset))
+            self._headers.append((offset, header))
+            # the header location of the next image follows the payload
+            offset += FW_IMAGE_HEADER_SIZE + header.payload_size
+
+    def __len__(self):
+        return len(self._headers)
+
+    def get_header(self, image):
+        """
+        Returns the FwImageHeader of image (one of FW_IMAGE_*), None if the
+        bundle does not hold it
+        """
+        if image >= len(self._headers):
+            return None
+        return self._headers[image][1]
+
+    def get_image(self, image, min_size=0):
+        """
+        Returns the payload of image (one of FW_IMAGE_*) as a sequence of
+        32-bit words, None if the bundle does not hold it
+
+        The payload is a view of the bundle, unless it is truncated or shorter
+        than min_size bytes, in which case it is zero padded in a copy.
+        """
+        if image >= len(self._headers):
+            return None
+        words = self._images.get((image, min_size))
+        if words is None:
+            offset, header = self._headers[image]
+            size = header.payload_size
+            start = offset + FW_IMAGE_HEADER_SIZE
+            end = start + (size + 3) // 4 * 4
+            if end <= len(self._data) and end - start >= min_size:
+                words = self._view[start:end].cast('I')
+            else:
+                data = bytearray(max(end - start, (min_size + 3) // 4 * 4))
+                available = self._view[start:min(start + size, len(self._data))]
+                data[:len(available)] = available
+                words = memoryview(data).cast('I')
+            self._images[(image, min_size)] = words
+        return words
+
+
+_index_cache = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+
+def get_fw_image_index(fwfile):
+    """
+    Returns the FwImageIndex of fwfile, shared until the file is modified or
+    replaced, None if it can not be read
+    """
+    try:
+        stat = os.stat(fwfile)
+        key = (os.path.realpath(fwfile), stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        with _index_cache_lock:
+            index = _index_cache.get(key)
+            if index is None:
+                index = FwImageIndex(fwfile)
+                _index_cache[key] = index
+                while len(_index_cache) > FW_IMAGE_INDEX_CACHE_SIZE:
+                    _index_cache.popitem(last=False)
+            else:
+                _index_cache.move_to_end(key)
+            return index
+    except (OSError, ValueError):
+        return None
@@ -6,6 +6,8 @@
 #
 #from y_cable_base import YCableBase
 from sonic_y_cable.y_cable_base import YCableBase
+from sonic_y_cable.broadcom.cmd_scheduler import get_cmd_scheduler, CmdTimeoutError, CMD_RESULT_GRACE
+from sonic_y_cable.broadcom.fw_image import get_fw_image_index, FW_IMAGE_TOR_BANK1, FW_IMAGE_NIC_BANK1, FW_IMAGE_MUX_CHIP
 
 try:
     import time
@@ -349,6 +351,7 @@ class YCable(YCableBase):
     CABLE_MODE_100G = 100000
 
     PORT_LOCK_TIMEOUT = 30  # in seconds
+    TOGGLE_CMD_TIMEOUT_MS = 1000
 
     # Rollback states
     PERFORM_ROLLBACK = 1
@@ -385,6 +388,7 @@ class YCable(YCableBase):
     QSFP28_UP0_168_SN_1 = 0x000000c4
     QSFP28_UP0_DATE_CODE = 0x000000d4
     QSFP28_UP0_224_SPECIFIC_1_RSV = 0x000000e0
+    QSFP_BRCM_FAST_CMD = 0x00000020
     QSFP_BRCM_CABLE_CMD = 0x00000013
     QSFP_BRCM_CABLE_CTRL_CMD_STS = 0x00000014
     QSFP_VEN_FE_130_BRCM_DATA_LENGHT_LSB = 0x00007f82
@@ -666,6 +670,8 @@ class YCable(YCableBase):
         self.fp_lock = PortLock(port)
         self.dl_lock = PortLock(port)
         self.ev_lock = PortLock(port)
+        # I2C bus of the cable, see set_i2c_bus()
+        self.i2c_bus = None
 
         # add functions for CLI execution
         self.init_cli_functions()
@@ -1029,20 +1035,10 @@ class YCable(YCableBase):
                             return self.ERROR_WR_EEPROM_FAILED, None
 
                         # poll command status for 100ms
-                        start = time.monotonic_ns()
-                        ms_elapsed = 0
-                        while (ms_elapsed < 100):
-                            sta = 0
-                            curr_offset = self.QSFP_BRCM_CABLE_CTRL_CMD_STS
-                            result = self.platform_chassis.get_sfp(self.port).read_eeprom(curr_offset, 1)
-                            if result is None:
-                                return self.EEPROM_ERROR, None
-                            sta = result[0]
-
-                            if (sta & 0x01) == 0x0:
-                                break
-                            ms_elapsed = (time.monotonic_ns()//1000000) - (start//1000000)
-                        else:
+                        sta, timed_out = self.__poll_cmd_sts(lambda sta: (sta & 0x01) == 0x0, 100)
+                        if sta is None:
+                            return self.EEPROM_ERROR, None
+                        if timed_out:
                             self.log(self.LOG_ERROR, "CMD_REQ/STS both are stuck at 1")
                             return self.ERROR_CMD_STS_CHECK_FAILED, None
                         ts = self.log_timestamp(ts, "resetting cmd to 0 done (error logic)")
@@ -1099,30 +1095,17 @@ class YCable(YCableBase):
                         ts = self.log_timestamp(ts, "write command request to 1 done")
 
                         error = 0
-                        start = time.monotonic_ns()
-                        ms_elapsed = 0
-                        while (ms_elapsed < 500):
-                            sta = 0
-                            curr_offset = self.QSFP_BRCM_CABLE_CTRL_CMD_STS
-                            result = self.platform_chassis.get_sfp(self.port).read_eeprom(curr_offset, 1)
-                            if result is None:
-                                return self.EEPROM_ERROR, None
-                            sta = result[0]
-
-                            if (sta & 0x7F) == 0x11:
-                                rd = True
-                                break
-
-                            if (sta & 0x7F) == 0x31:
-                                #rd = True
-                                error = 1
-                                self.log(self.LOG_ERROR, "ERROR: NIC command failed")
-                                break
-
-                            ms_elapsed = (time.monotonic_ns()//1000000) - (start//1000000)
-                        else:
+                        sta, timed_out = self.__poll_cmd_sts(lambda sta: (sta & 0x7F) in (0x11, 0x31), 500)
+                        if sta is None:
+                            return self.EEPROM_ERROR, None
+                        if timed_out:
                             self.log(self.LOG_ERROR, "CMD_STS never read as 0x11 or 0x31. reg_value: {}".format(hex(sta)))
                             ret_val = self.ERROR_CMD_PROCESSING_FAILED
+                        elif (sta & 0x7F) == 0x11:
+                            rd = True
+                        else:
+                            error = 1
+                            self.log(self.LOG_ERROR, "ERROR: NIC command failed")
                         ts = self.log_timestamp(ts, "polling for status done")
 
                         # read response data
@@ -1146,20 +1129,10 @@ class YCable(YCableBase):
                         ts = self.log_timestamp(ts, "write command request to 0 done")
 
                         # wait  for MCU response to be pulled down
-                        start = time.monotonic_ns()
-                        ms_elapsed = 0
-                        while (ms_elapsed < 2000):
-                            sta = 0
-                            curr_offset = self.QSFP_BRCM_CABLE_CTRL_CMD_STS
-                            result = self.platform_chassis.get_sfp(self.port).read_eeprom(curr_offset, 1)
-                            if result is None:
-                                return self.EEPROM_ERROR, None
-                            sta = result[0]
-
-                            if (sta & 0x01) == 0x0:
-                                break
-                            ms_elapsed = (time.monotonic_ns()//1000000) - (start//1000000)
-                        else:
+                        sta, timed_out = self.__poll_cmd_sts(lambda sta: (sta & 0x01) == 0x0, 2000)
+                        if sta is None:
+                            return self.EEPROM_ERROR, None
+                        if timed_out:
                             ret_val = self.ERROR_MCU_NOT_RELEASED
                         self.log_timestamp(ts, "poll for MCU response to be puled down - done")
 
@@ -1179,6 +1152,143 @@ class YCable(YCableBase):
         self.log_timestamp(start_ts, "__cable_cmd_execute() completed")
         return ret_val, cmd_rsp_body
 
+    def __poll_cmd_sts(self, done, timeout_ms):
+        """
+            Internal function, polls the cable command status register from the
+            shared command scheduler until done(status) or timeout_ms elapse
+
+            Args:
+                done:
+                    callable returning True once the status value completes the wait
+                timeout_ms:
+                    an integer, the poll timeout in milliseconds
+
+            Returns:
+                an integer, the last status read, None if a read failed
+                a boolean, True if timed out
+        """
+
+        sfp = self.platform_chassis.get_sfp(self.port)
+        last_sta = [0]
+
+        def poll():
+            result = sfp.read_eeprom(self.QSFP_BRCM_CABLE_CTRL_CMD_STS, 1)
+            if result is None:
+                return True, None
+            last_sta[0] = result[0]
+            return done(result[0]), result[0]
+
+        future = self.__submit_cmd_poll(poll, timeout_ms / 1000.0)
+        try:
+            return future.result(timeout_ms / 1000.0 + CMD_RESULT_GRACE), False
+        except CmdTimeoutError:
+            return last_sta[0], True
+
+    def __submit_cmd_poll(self, poll, timeout_s):
+        """
+            Internal function, submits a command status poll to the worker of the
+            cable's I2C bus in the shared command scheduler
+        """
+
+        bus = ('port', self.port) if self.i2c_bus is None else self.i2c_bus
+        return get_cmd_scheduler().submit(poll, timeout_s, bus)
+
+    def __toggle_mux(self, fast_cmd, name):
+        """
+            Internal function, requests a mux toggle through the fast command
+            register and waits for the MCU to clear the request bit
+
+            Args:
+                fast_cmd:
+                    an integer, the fast command bit, 0x2 for TOR A and 0x4 for TOR B
+                name:
+                    a string, the calling API name for logs and latency statistics
+
+            Returns:
+                a Boolean, True if the toggle succeeded and False if it did not succeed.
+        """
+
+        start_ts = datetime.utcnow()
+        ts = self.log_timestamp(start_ts, "{}() start".format(name))
+        start = time.monotonic()
+
+        fast_command = bytearray(30)
+        with self.fp_lock.acquire_timeout(self.PORT_LOCK_TIMEOUT) as result:
+            if result:
+                fast_command[0] = fast_cmd
+                sfp = self.platform_chassis.get_sfp(self.port)
+                result = sfp.write_eeprom(self.QSFP_BRCM_FAST_CMD, 1, fast_command)
+                if result is False:
+                    self.log(self.LOG_ERROR, "{} write eeprom failed".format(name))
+                    return self.EEPROM_ERROR
+
+                def poll():
+                    # read 32 and 33
+                    status = sfp.read_eeprom(self.QSFP_BRCM_FAST_CMD, 2)
+                    if status is None:
+                        return True, None
+                    return status[0] & fast_cmd == 0, status
+
+                timeout_s = self.TOGGLE_CMD_TIMEOUT_MS / 1000.0
+                future = self.__submit_cmd_poll(poll, timeout_s)
+                try:
+                    status = future.result(timeout_s + CMD_RESULT_GRACE)
+                except CmdTimeoutError:
+                    status = None
+                    cmd_ok = False
+                else:
+                    if status is None:
+                        self.log(self.LOG_ERROR, "{} read eeprom failed".format(name))
+                        return self.EEPROM_ERROR
+                    if status[1] == 0xFF:
+                        self.log(self.LOG_ERROR, "ERROR: NIC not available")
+                        cmd_ok = False
+                    else:
+                        cmd_ok = True
+            else:
+                self.log(self.LOG_ERROR, "FP Port lock timed-out!")
+                return self.ERROR_PORT_LOCK_TIMEOUT
+
+        get_cmd_scheduler().record_latency(self.port, name, time.monotonic() - start)
+        self.log_timestamp(ts, "{}() completed".format(name))
+
+        return cmd_ok
+
+    def set_i2c_bus(self, bus):
+        """
+        This API sets the I2C bus the cable is on. The command status polls of the
+        cables on a bus are done by one worker of the shared command scheduler, so
+        that a slow or stuck bus does not delay the commands of other buses.
+        By default each cable is considered on a bus of its own.
+
+        Args:
+            bus:
+                the I2C bus (any hashable, e.g. the bus number), None for a bus
+                of its own
+
+        Returns:
+            None
+        """
+
+        self.i2c_bus = bus
+
+    def get_cmd_latency_stats(self):
+        """
+        This API returns the latency statistics of the mux toggles done on this
+        port, over the last toggles recorded by the shared command scheduler.
+        The port on which this API is called for can be referred using self.port.
+
+        Args:
+            None
+
+        Returns:
+            a dict, mapping each toggle API name ("toggle_mux_to_tor_a",
+            "toggle_mux_to_tor_b") called on the port to a dict of its sample
+            'count', 'max', 'p50', 'p90' and 'p99' latencies in milliseconds
+        """
+
+        return get_cmd_scheduler().get_latency_stats(self.port)
+
     def __validate_read_data(self, result, size, message):
         '''
         This API specifically used to validate the register read value
@@ -1452,41 +1562,11 @@ class YCable(YCableBase):
             a Boolean, True if the toggle succeeded and False if it did not succeed.
         """
 
-        start_ts = datetime.utcnow()
-        ts = self.log_timestamp(start_ts, "toggle_mux_to_tor_a() start")
-
-        fast_command = bytearray(30)
-        with self.fp_lock.acquire_timeout(self.PORT_LOCK_TIMEOUT) as result:
-            if result:
-                fast_command[0] = 0x2
-                result = self.platform_chassis.get_sfp(self.port).write_eeprom(32, 1, fast_command)
-                if result is False:
-                    self.log(self.LOG_ERROR, "toggle_mux_to_tor_a write eeprom failed")
-                    return self.EEPROM_ERROR
+        cmd_ok = self.__toggle_mux(0x2, "toggle_mux_to_tor_a")
 
-                cmd_ok = False
-                for _ in range(0, 500):
-                    # read 32 and 33
-                    status = self.platform_chassis.get_sfp(self.port).read_eeprom(32, 2)
-                    if status is None:
-                        self.log(self.LOG_ERROR, "toggle_mux_to_tor_a read eeprom failed")
-                        return self.EEPROM_ERROR
-
-                    if status[0] & 0x2 == 0:
-                        if status[1] == 0xFF:
-                            self.log(self.LOG_ERROR, "ERROR: NIC not available")
-                        else:
-                            cmd_ok = True
-                        break
-            else:
-                self.log(self.LOG_ERROR, "FP Port lock timed-out!")
-                return self.ERROR_PORT_LOCK_TIMEOUT
-
-        self.log_timestamp(ts, "toggle_mux_to_tor_a() completed")
-
-        if cmd_ok == True:
+        if cmd_ok is True:
             self.log(self.LOG_INFO, "Toggle mux to torA succeeded")
-        else:
+        elif cmd_ok is False:
             self.log(self.LOG_ERROR, "ERROR: polling timed-out. Cmd_ok not received!")
 
         return cmd_ok
@@ -1508,41 +1588,11 @@ class YCable(YCableBase):
             a Boolean, True if the toggle succeeded and False if it did not succeed.
         """
 
-        start_ts = datetime.utcnow()
-        ts = self.log_timestamp(start_ts, "toggle_mux_to_tor_b() start")
-
-        fast_command = bytearray(30)
-        with self.fp_lock.acquire_timeout(self.PORT_LOCK_TIMEOUT) as result:
-            if result:
-                fast_command[0] = 0x4
-                result = self.platform_chassis.get_sfp(self.port).write_eeprom(32, 1, fast_command)
-                if result is False:
-                    self.log(self.LOG_ERROR, "toggle_mux_to_tor_b write eeprom failed")
-                    return self.EEPROM_ERROR
+        cmd_ok = self.__toggle_mux(0x4, "toggle_mux_to_tor_b")
 
-                cmd_ok = False
-                for _ in range(0, 500):
-                    # read 32 and 33
-                    status = self.platform_chassis.get_sfp(self.port).read_eeprom(32, 2)
-                    if status is None:
-                        self.log(self.LOG_ERROR, "toggle_mux_to_tor_b read eeprom failed")
-                        return self.EEPROM_ERROR
-
-                    if status[0] & 0x4 == 0:
-                        if status[1] == 0xFF:
-                            self.log(self.LOG_ERROR, "ERROR: NIC not available")
-                        else:
-                            cmd_ok = True
-                        break
-            else:
-                self.log(self.LOG_ERROR, "FP Port lock timed-out!")
-                return self.ERROR_PORT_LOCK_TIMEOUT
-
-        self.log_timestamp(ts, "toggle_mux_to_tor_b() completed")
-
-        if cmd_ok == True:
+        if cmd_ok is True:
             self.log(self.LOG_INFO, "Toggle mux to torB succeeded")
-        else:
+        elif cmd_ok is False:
             self.log(self.LOG_ERROR, "ERROR: polling timed-out. Cmd_ok not received!")
 
         return cmd_ok
@@ -2571,297 +2621,65 @@ class YCable(YCableBase):
             return ret_val
 
     def parse_image(self, upgrade_head, destination, fwfile):
-
-        File_seek = 0
-        image_compressed = 0
-        image_offset = 0
-        fw_up_buff = array.array('I', [])
+        """
+            Fills upgrade_head with the header and payload of the image of fwfile
+            to download to destination, selecting the bank other than the current
+            bank of the destination MCU. The bundle is parsed once and shared by
+            all the cables and destinations, image_ptr is a view of it.
+        """
 
         if (os.path.isfile(fwfile) != True):
             self.log(self.LOG_ERROR, "ERROR : Fwfile {} is not present".format(fwfile))
             return self.RR_ERROR
 
         self.log(self.LOG_DEBUG, "parse_image for destination {} fwfile {}".format(destination, fwfile))
-        for i in range(self.MUX_FW_IMG_SIZE):
-            fw_up_buff.append(0)
-
-        file1 = open(fwfile, 'rb')
-        if file1 is None:
+        image_index = get_fw_image_index(fwfile)
+        if image_index is None:
             self.log(self.LOG_ERROR, "File {} failed to open".format(fwfile))
             return self.RR_ERROR
 
         if (destination == self.TOR_MCU_SELF) or (destination == self.TOR_MCU_PEER):
-            # Check TOR current bank to find which TOR image to download
-            self.log(self.LOG_DEBUG, "Check TOR current bank to find which TOR image to download")
-            upgrade_head.cable_up_info.destination = destination
-            if (self.cable_fw_get_status(upgrade_head.cable_up_info, True) != self.RR_SUCCESS):
-                file1.close()
-                return self.RR_ERROR
-            if upgrade_head.cable_up_info.status_info.current_bank == 1:
-                # Select TOR bank 2 image
-                # First read TOR bank 1 image header to find header location of TOR bank2 image header
-                self.log(self.LOG_INFO, "First read TOR bank 1 image header to find header location of TOR bank2 image header")
-                file1.seek(image_offset + 0x10)
-                image_compressed = struct.unpack('I', file1.read(4))[0]
-                if image_compressed:
-                    # Read compressed image size
-                    File_seek = struct.unpack('I', file1.read(4))[0]
-                    file1.seek(image_offset)
-                else:
-                    # Read image size
-                    file1.seek(image_offset)
-                    File_seek = struct.unpack('I', file1.read(4))[0]
-                # Next set TOR bank2 image header location
-                File_seek += (image_offset + 0x28)
-            else:
-                File_seek = image_offset
-            # Parse TOR image now
-            self.log(self.LOG_INFO, "Parse TOR image now")
-            file1.seek(File_seek)
-            upgrade_head.cable_up_info.image_info.image_size = struct.unpack('I', file1.read(4))[0]
-
-            fw_version_array = array.array('I', [])
-            for i in range(self.FW_IMG_INFO_SIZE):
-                if i < 4:
-                    byte_val = file1.read(2)
-                    fw_version_array.append(0)
-                    fw_version_array[i] = struct.unpack('H', byte_val)[0]
-                else:
-                    byte_val = file1.read(4)
-                    fw_version_array.append(0)
-                    fw_version_array[i] = struct.unpack('I', byte_val)[0]
-                    break
-
-            upgrade_head.compression = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.compressed_size = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.compressed_crc32 = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.add_size = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.add_crc32 = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.header_crc32 = struct.unpack('I', file1.read(4))[0]
-
-            for i in range(upgrade_head.cable_up_info.image_info.image_size):
-                byte_val = file1.read(4)
-                if len(byte_val) == 4:
-                    fw_up_buff[i] = struct.unpack('I', byte_val)[0]
-
-            upgrade_head.cable_up_info.image_info.image_fw_version.image_version_major = fw_version_array[1]
-            upgrade_head.cable_up_info.image_info.image_fw_version.image_version_minor = fw_version_array[0]
-            upgrade_head.cable_up_info.image_info.image_api_version.image_version_minor = fw_version_array[2]
-            upgrade_head.cable_up_info.image_info.image_api_version.image_version_major = fw_version_array[3]
-            upgrade_head.cable_up_info.image_info.image_crc32 = fw_version_array[4]
-            upgrade_head.cable_up_info.image_info.image_ptr = fw_up_buff
-
-            if destination == self.TOR_MCU_SELF:
-                upgrade_head.cable_up_info.destination = self.TOR_MCU_SELF
-            else:
-                upgrade_head.cable_up_info.destination = self.TOR_MCU_PEER
-
+            bank1_image = FW_IMAGE_TOR_BANK1
         elif destination == self.NIC_MCU:
-            # Parse NIC image
-            self.log(self.LOG_INFO, "Parse NIC image")
-            # Seek to location of NIC bank1 image
-            file1.seek(0x10)
-            image_compressed = struct.unpack('I', file1.read(4))[0]
-            if image_compressed:
-                # Read compressed image size
-                image_offset = struct.unpack('I', file1.read(4))[0]
-                file1.seek(0)
-            else:
-                # Read image size
-                file1.seek(0)
-                image_offset = struct.unpack('I', file1.read(4))[0]
-
-            image_offset += 0x28
-            # Seek to TOR bank2 image
-            file1.seek(image_offset)
-            # Read TOR bank 2 image header to find header location of NIC bank1 image header
-            file1.seek((image_offset + 0x10))
-            image_compressed = struct.unpack('I', file1.read(4))[0]
-            if image_compressed:
-                # Read compressed image size
-                File_seek = struct.unpack('I', file1.read(4))[0]
-                file1.seek(image_offset)
-            else:
-                # Read image size
-                file1.seek(image_offset)
-                File_seek = struct.unpack('I', file1.read(4))[0]
-
-            # Seek to NIC bank1 image
-            File_seek += (image_offset + 0x28)
-            file1.seek(File_seek)
-            image_offset = File_seek
+            bank1_image = FW_IMAGE_NIC_BANK1
+        elif destination == self.MUX_CHIP:
+            bank1_image = None
+        else:
+            return self.RR_ERROR
 
-            # Check NIC current bank to find which NIC image to download
+        if bank1_image is None:
+            image = FW_IMAGE_MUX_CHIP
+        else:
+            # Check current bank to find which image to download
             upgrade_head.cable_up_info.destination = destination
             if (self.cable_fw_get_status(upgrade_head.cable_up_info, True) != self.RR_SUCCESS):
-                file1.close()
                 return self.RR_ERROR
-
             if upgrade_head.cable_up_info.status_info.current_bank == 1:
-                # Select NIC bank 2 image
-                # First read NIC bank 1 image header to find header location of NIC bank2 image header
-                file1.seek((image_offset + 0x10))
-                image_compressed = struct.unpack('I', file1.read(4))[0]
-
-                if image_compressed:
-                    # Read compressed image size
-                    File_seek = struct.unpack('I', file1.read(4))[0]
-                    file1.seek(image_offset)
-                else:
-                    # Read image size
-                    file1.seek(image_offset)
-                    File_seek = struct.unpack('I', file1.read(4))[0]
-
-                # Next set NIC bank2 image header location
-                File_seek += (image_offset + 0x28)
-            else:
-                File_seek = image_offset
-
-            file1.seek(File_seek)
-            upgrade_head.cable_up_info.image_info.image_size = struct.unpack('I', file1.read(4))[0]
-
-            fw_version_array = array.array('I', [])
-            for i in range(self.FW_IMG_INFO_SIZE):
-                if i < 4:
-                    byte_val = file1.read(2)
-                    fw_version_array.append(0)
-                    fw_version_array[i] = struct.unpack('H', byte_val)[0]
-                else:
-                    byte_val = file1.read(4)
-                    fw_version_array.append(0)
-                    fw_version_array[i] = struct.unpack('I', byte_val)[0]
-                    break
-
-            upgrade_head.compression = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.compressed_size = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.compressed_crc32 = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.add_size = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.add_crc32 = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.header_crc32 = struct.unpack('I', file1.read(4))[0]
-
-            upgrade_head.cable_up_info.destination = self.NIC_MCU
-
-            for i in range(upgrade_head.cable_up_info.image_info.image_size):
-                byte_val = file1.read(4)
-                if len(byte_val) == 4:
-                    fw_up_buff[i] = struct.unpack('I', byte_val)[0]
-
-            upgrade_head.cable_up_info.image_info.image_fw_version.image_version_major = fw_version_array[1]
-            upgrade_head.cable_up_info.image_info.image_fw_version.image_version_minor = fw_version_array[0]
-            upgrade_head.cable_up_info.image_info.image_api_version.image_version_minor = fw_version_array[2]
-            upgrade_head.cable_up_info.image_info.image_api_version.image_version_major = fw_version_array[3]
-            upgrade_head.cable_up_info.image_info.image_crc32 = fw_version_array[4]
-            upgrade_head.cable_up_info.image_info.image_ptr = fw_up_buff
-            upgrade_head.cable_up_info.destination = self.NIC_MCU
-
-        elif destination == self.MUX_CHIP:
-            # Parse MUX CHIP image
-            # Seek to location of NIC bank1 image
-            file1.seek(0x10)
-            image_compressed = struct.unpack('I', file1.read(4))[0]
-            if image_compressed:
-                # Read compressed image size
-                image_offset = struct.unpack('I', file1.read(4))[0]
-                file1.seek(0)
-            else:
-                # Read image size
-                file1.seek(0)
-                image_offset = struct.unpack('I', file1.read(4))[0]
-
-            image_offset += 0x28
-            # Seek to TOR bank2 image
-            file1.seek(image_offset)
-
-            # Read TOR bank 2 image header to find header location of NIC bank1 image header
-            file1.seek(image_offset + 0x10)
-            image_compressed = struct.unpack('I', file1.read(4))[0]
-
-            if image_compressed:
-                # Read compressed image size
-                File_seek = struct.unpack('I', file1.read(4))[0]
-                file1.seek(image_offset)
-            else:
-                # Read image size
-                file1.seek(image_offset)
-                File_seek = struct.unpack('I', file1.read(4))[0]
-
-            # Seek to NIC bank1 image
-            File_seek += (image_offset + 0x28)
-            file1.seek(File_seek)
-            image_offset = File_seek
-
-            # Read NIC bank 1 image header to find header location of N
-            file1.seek(image_offset + 0x10)
-            image_compressed = struct.unpack('I', file1.read(4))[0]
-            if image_compressed:
-                # Read compressed image size
-                File_seek = struct.unpack('I', file1.read(4))[0]
-                file1.seek(image_offset)
-            else:
-                # Read image size
-                file1.seek(image_offset)
-                File_seek = struct.unpack('I', file1.read(4))[0]
-
-            # Next set NIC bank2 image header location
-            File_seek += (image_offset + 0x28)
-            image_offset = File_seek
-
-            file1.seek(File_seek + 0x10)
-            image_compressed = struct.unpack('I', file1.read(4))[0]
-
-            if image_compressed:
-                # Read compressed image size
-                File_seek = struct.unpack('I', file1.read(4))[0]
-                file1.seek(image_offset)
+                image = bank1_image + 1
             else:
-                # Read image size
-                file1.seek(image_offset)
-                File_seek = struct.unpack('I', file1.read(4))[0]
-
-            File_seek += (image_offset + 0x28)
-            file1.seek(File_seek)
-            #image_offset = File_seek
-
-            upgrade_head.cable_up_info.image_info.image_size = struct.unpack('I', file1.read(4))[0]
-
-            fw_version_array = array.array('I', [])
-            for i in range(self.FW_IMG_INFO_SIZE):
-                if i < 4:
-                    byte_val = file1.read(2)
-                    fw_version_array.append(0)
-                    fw_version_array[i] = struct.unpack('H', byte_val)[0]
-                else:
-                    byte_val = file1.read(4)
-                    fw_version_array.append(0)
-                    fw_version_array[i] = struct.unpack('I', byte_val)[0]
-                    break
-
-            upgrade_head.compression = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.compressed_size = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.compressed_crc32 = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.add_size = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.add_crc32 = struct.unpack('I', file1.read(4))[0]
-            upgrade_head.header_crc32 = struct.unpack('I', file1.read(4))[0]
+                image = bank1_image
 
-            upgrade_head.cable_up_info.destination = self.MUX_CHIP
-
-            for i in range(upgrade_head.cable_up_info.image_info.image_size):
-                byte_val = file1.read(4)
-                if len(byte_val) == 4:
-                    fw_up_buff[i] = struct.unpack('I', byte_val)[0]
-
-            upgrade_head.cable_up_info.image_info.image_fw_version.image_version_major = fw_version_array[1]
-            upgrade_head.cable_up_info.image_info.image_fw_version.image_version_minor = fw_version_array[0]
-            upgrade_head.cable_up_info.image_info.image_api_version.image_version_minor = fw_version_array[2]
-            upgrade_head.cable_up_info.image_info.image_api_version.image_version_major = fw_version_array[3]
-            upgrade_head.cable_up_info.image_info.image_crc32 = fw_version_array[4]
-            upgrade_head.cable_up_info.image_info.image_ptr = fw_up_buff
-
-        else:
-            file1.close()
+        header = image_index.get_header(image)
+        if header is None:
+            self.log(self.LOG_ERROR, "ERROR : Fwfile {} has no image {} for destination {}".format(fwfile, image, destination))
             return self.RR_ERROR
 
-        file1.close()
+        upgrade_head.cable_up_info.image_info.image_size = header.image_size
+        upgrade_head.compression = header.compression
+        upgrade_head.compressed_size = header.compressed_size
+        upgrade_head.compressed_crc32 = header.compressed_crc32
+        upgrade_head.add_size = header.add_size
+        upgrade_head.add_crc32 = header.add_crc32
+        upgrade_head.header_crc32 = header.header_crc32
+
+        upgrade_head.cable_up_info.image_info.image_fw_version.image_version_major = header.fw_version_major
+        upgrade_head.cable_up_info.image_info.image_fw_version.image_version_minor = header.fw_version_minor
+        upgrade_head.cable_up_info.image_info.image_api_version.image_version_minor = header.api_version_minor
+        upgrade_head.cable_up_info.image_info.image_api_version.image_version_major = header.api_version_major
+        upgrade_head.cable_up_info.image_info.image_crc32 = header.image_crc32
+        upgrade_head.cable_up_info.image_info.image_ptr = image_index.get_image(image, 2 * self.FW_UP_PACKET_SIZE)
+        upgrade_head.cable_up_info.destination = destination
+
         return self.RR_SUCCESS
 
     def __cable_fw_mcu_reset(self, upgrade_info):
@@ -8,6 +8,7 @@ import math
 import time
 import struct
 import threading
+from collections import namedtuple
 from contextlib import contextmanager
 
 from ctypes import c_int8
@@ -18,6 +19,10 @@ try:
 except ImportError as e:
     pass
 
+# serdes tcm/register access of a VSC batch, see YCable.vsc_batch()
+VscOp = namedtuple('VscOp', ['opcode', 'addr', 'data'])
+VscOp.__new__.__defaults__ = (0,)
+
 class RLocker():
     ACQUIRE_LOCK_TIMEOUT = 15
 
@@ -291,7 +296,10 @@ class YCable(YCableBase):
         ret = self.platform_chassis.get_sfp(self.port).write_eeprom(linear_addr, len, ba)
 
         if (ret == False):
-            self.log_error('Write Failed!  page:%2X byte:%2X value:%2X' % (page, byte, value))
+            if len == 1:
+                self.log_error('Write Failed!  page:%2X byte:%2X value:%2X' % (page, byte, value))
+            else:
+                self.log_error('Write Failed!  page:%2X byte:%2X len:%d value:%s' % (page, byte, len, ba.hex()))
 
         return ret
 
@@ -316,17 +324,8 @@ class YCable(YCableBase):
                     self.write_mmap(YCable.MIS_PAGE_VSC, idx, vsc_req_form[idx])
             self.write_mmap(YCable.MIS_PAGE_VSC, YCable.VSC_BYTE_OPCODE, vsc_req_form[YCable.VSC_BYTE_OPCODE])
 
-            while True:
-                done = self.read_mmap(YCable.MIS_PAGE_VSC, YCable.VSC_BYTE_OPCODE)
-                if done == 0:
-                    break
-
-                time.sleep(0.005)
-                timeout -= 1
-
-                if timeout == 0:
-                    self.log_error("wait vsc status value timeout")
-                    return YCable.MCU_EC_WAIT_VSC_STATUS_TIMEOUT
+            if not self.__wait_vsc_done(timeout):
+                return YCable.MCU_EC_WAIT_VSC_STATUS_TIMEOUT
 
             status = self.read_mmap(YCable.MIS_PAGE_VSC, YCable.VSC_BYTE_STATUS)
         else:
@@ -335,6 +334,97 @@ class YCable(YCableBase):
 
         return status
 
+    def __wait_vsc_done(self, timeout):
+        """
+        Polls the VSC opcode byte until the MCU clears it, timeout in units of 5ms.
+        Returns True if the command is done, False on timeout.
+        """
+        while True:
+            done = self.read_mmap(YCable.MIS_PAGE_VSC, YCable.VSC_BYTE_OPCODE)
+            if done == 0:
+                return True
+
+            time.sleep(0.005)
+            timeout -= 1
+
+            if timeout == 0:
+                self.log_error("wait vsc status value timeout")
+                return False
+
+    def __vsc_access(self, opcode, addr, data=0, timeout=1200):
+        """
+        Sends a tcm/register access VSC cmd in as few eeprom transactions as the MCU allows:
+        the address and data bytes in one block write, the opcode byte which starts the command,
+        the polls of the opcode byte, then the status and response bytes in one block read.
+
+        Returns:
+            a tuple, the status code of the vsc command and the bytearray of the response
+            bytes 129 (status) to 137 (data3), None if it could not be read
+        """
+        request = bytearray(struct.pack('<II', addr & 0xFFFFFFFF, data & 0xFFFFFFFF))
+        if self.write_mmap(YCable.MIS_PAGE_VSC, YCable.VSC_BYTE_ADDR0, request, len(request)) is False:
+            return YCable.MCU_EC_UNDEFINED_ERROR, None
+        if self.write_mmap(YCable.MIS_PAGE_VSC, YCable.VSC_BYTE_OPCODE, opcode) is False:
+            return YCable.MCU_EC_UNDEFINED_ERROR, None
+
+        if not self.__wait_vsc_done(timeout):
+            return YCable.MCU_EC_WAIT_VSC_STATUS_TIMEOUT, None
+
+        response = self.read_mmap(YCable.MIS_PAGE_VSC, YCable.VSC_BYTE_STATUS, YCable.VSC_BYTE_DATA3 - YCable.VSC_BYTE_STATUS + 1)
+        if not isinstance(response, (bytes, bytearray)):
+            return YCable.MCU_EC_UNDEFINED_ERROR, None
+
+        return response[0], response
+
+    def __vsc_batch(self, ops):
+        results = []
+        for op in ops:
+            status, response = self.__vsc_access(op.opcode, op.addr, op.data)
+            if op.opcode in (YCable.VSC_OPCODE_TCM_READ, YCable.VSC_OPCODE_REG_READ):
+                if status != YCable.MCU_EC_NO_ERROR:
+                    self.log_error('%s read addr[%04X]  error[%04X]' % (
+                        'tcm' if op.opcode == YCable.VSC_OPCODE_TCM_READ else 'reg', op.addr, status))
+                    results.append(-1)
+                elif op.opcode == YCable.VSC_OPCODE_TCM_READ:
+                    results.append(struct.unpack_from('<I', response, YCable.VSC_BYTE_DATA0 - YCable.VSC_BYTE_STATUS)[0])
+                else:
+                    results.append(struct.unpack_from('<H', response, YCable.VSC_BYTE_DATA0 - YCable.VSC_BYTE_STATUS)[0])
+            else:
+                if status != YCable.MCU_EC_NO_ERROR:
+                    self.log_error('%s write addr[%04X] data[%04X] error[%04X]' % (
+                        'tcm' if op.opcode == YCable.VSC_OPCODE_TCM_WRITE else 'reg', op.addr, op.data, status))
+                results.append(status == YCable.MCU_EC_NO_ERROR)
+        return results
+
+    def vsc_batch(self, ops):
+        """
+        This API executes a batch of serdes tcm/register accesses via VSC cmd in order, under a
+        single acquisition of the cable lock. Each access takes one block write of its address and
+        data, the opcode write, the status polls and one block read of its status and response.
+
+        Args:
+             ops:
+                 a list of VscOp(opcode, addr, data), with opcode one of VSC_OPCODE_TCM_READ,
+                 VSC_OPCODE_TCM_WRITE, VSC_OPCODE_REG_READ and VSC_OPCODE_REG_WRITE, data is only
+                 used by writes
+
+        Returns:
+            a list, with for each access in order the data read, -1 if the read failed, or
+            True if the write succeeded and False if it did not succeed.
+            EEPROM_ERROR if the batch could not be executed
+        """
+
+        if self.platform_chassis is not None:
+            with self.rlock.acquire_timeout(RLocker.ACQUIRE_LOCK_TIMEOUT) as lock_status:
+                if lock_status:
+                    return self.__vsc_batch(ops)
+                else:
+                    self.log_error('acquire lock timeout, failed to execute vsc batch')
+                    return YCable.EEPROM_ERROR
+        else:
+            self.log_error("platform_chassis is not loaded, failed to execute vsc batch")
+            return YCable.EEPROM_ERROR
+
     def fw_cmd(self, cmd, detail1):
         """
         This API sends the firmware command to the serdes chip via VSC cmd
@@ -411,21 +501,7 @@ class YCable(YCableBase):
             an Integer, return data of tcm address
         """
 
-        vsc_req_form = [None] * (YCable.VSC_CMD_ATTRIBUTE_LENGTH)
-        vsc_req_form[YCable.VSC_BYTE_OPCODE] = YCable.VSC_OPCODE_TCM_READ
-        vsc_req_form[130]  = (addr >>  0) & 0xFF
-        vsc_req_form[131]  = (addr >>  8) & 0xFF
-        vsc_req_form[132]  = (addr >> 16) & 0xFF
-        vsc_req_form[133]  = (addr >> 24) & 0xFF
-        status = self.send_vsc(vsc_req_form)
-        if status != YCable.MCU_EC_NO_ERROR:
-            self.log_error('tcm read addr[%04X]  error[%04X]' % (addr, status))
-            return -1
-
-        data = (self.read_mmap(YCable.MIS_PAGE_VSC, 134) | (self.read_mmap(YCable.MIS_PAGE_VSC, 135) << 8) |
-               (self.read_mmap(YCable.MIS_PAGE_VSC, 136) << 16) | (self.read_mmap(YCable.MIS_PAGE_VSC, 137) << 24))
-
-        return data
+        return self.__vsc_batch([VscOp(YCable.VSC_OPCODE_TCM_READ, addr)])[0]
 
     def tcm_write(self, addr, data):
         """
@@ -442,23 +518,7 @@ class YCable(YCableBase):
             a boolean, True if the tcm write succeeded and False if it did not succeed.
         """
 
-        vsc_req_form = [None] * (YCable.VSC_CMD_ATTRIBUTE_LENGTH)
-        vsc_req_form[YCable.VSC_BYTE_OPCODE] = YCable.VSC_OPCODE_TCM_WRITE
-        vsc_req_form[130]  = (addr >>  0) & 0xFF
-        vsc_req_form[131]  = (addr >>  8) & 0xFF
-        vsc_req_form[132]  = (addr >> 16) & 0xFF
-        vsc_req_form[133]  = (addr >> 24) & 0xFF
-        vsc_req_form[134]  = (data >>  0) & 0xFF
-        vsc_req_form[135]  = (data >>  8) & 0xFF
-        vsc_req_form[136]  = (data >> 16) & 0xFF
-        vsc_req_form[137]  = (data >> 24) & 0xFF
-
-        status = self.send_vsc(vsc_req_form)
-        if status != YCable.MCU_EC_NO_ERROR:
-            self.log_error('tcm read addr[%04X] data[%04X] error[%04X]' % (addr, data, status))
-            return False
-
-        return True
+        return self.__vsc_batch([VscOp(YCable.VSC_OPCODE_TCM_WRITE, addr, data)])[0]
 
     def tcm_read_atomic(self, addr):
         """
@@ -471,30 +531,11 @@ class YCable(YCableBase):
             an Integer, return data of tcm address
         """
 
-        if self.platform_chassis is not None:
-            with self.rlock.acquire_timeout(RLocker.ACQUIRE_LOCK_TIMEOUT) as lock_status:
-                if lock_status:
-                    vsc_req_form = [None] * (YCable.VSC_CMD_ATTRIBUTE_LENGTH)
-                    vsc_req_form[YCable.VSC_BYTE_OPCODE] = YCable.VSC_OPCODE_TCM_READ
-                    vsc_req_form[130]  = (addr >>  0) & 0xFF
-                    vsc_req_form[131]  = (addr >>  8) & 0xFF
-                    vsc_req_form[132]  = (addr >> 16) & 0xFF
-                    vsc_req_form[133]  = (addr >> 24) & 0xFF
-                    status = self.send_vsc(vsc_req_form)
-                    if status != YCable.MCU_EC_NO_ERROR:
-                        self.log_error('tcm read addr[%04X]  error[%04X]' % (addr, status))
-                        return -1
-
-                    data = (self.read_mmap(YCable.MIS_PAGE_VSC, 134) | (self.read_mmap(YCable.MIS_PAGE_VSC, 135) << 8) |
-                        (self.read_mmap(YCable.MIS_PAGE_VSC, 136) << 16) | (self.read_mmap(YCable.MIS_PAGE_VSC, 137) << 24))
-                else:
-                    self.log_error('acquire lock timeout, failed to read serdes tcm register')
-                    return YCable.EEPROM_ERROR
-        else:
-            self.log_error("platform_chassis is not loaded, failed to read serdes tcm register")
+        result = self.vsc_batch([VscOp(YCable.VSC_OPCODE_TCM_READ, addr)])
+        if result == YCable.EEPROM_ERROR:
             return YCable.EEPROM_ERROR
 
-        return data
+        return result[0]
 
     def tcm_write_atomic(self, addr, data):
         """
@@ -511,32 +552,11 @@ class YCable(YCableBase):
             a boolean, True if the tcm write succeeded and False if it did not succeed.
         """
 
-        if self.platform_chassis is not None:
-            with self.rlock.acquire_timeout(RLocker.ACQUIRE_LOCK_TIMEOUT) as lock_status:
-                if lock_status:
-                    vsc_req_form = [None] * (YCable.VSC_CMD_ATTRIBUTE_LENGTH)
-                    vsc_req_form[YCable.VSC_BYTE_OPCODE] = YCable.VSC_OPCODE_TCM_WRITE
-                    vsc_req_form[130]  = (addr >>  0) & 0xFF
-                    vsc_req_form[131]  = (addr >>  8) & 0xFF
-                    vsc_req_form[132]  = (addr >> 16) & 0xFF
-                    vsc_req_form[133]  = (addr >> 24) & 0xFF
-                    vsc_req_form[134]  = (data >>  0) & 0xFF
-                    vsc_req_form[135]  = (data >>  8) & 0xFF
-                    vsc_req_form[136]  = (data >> 16) & 0xFF
-                    vsc_req_form[137]  = (data >> 24) & 0xFF
-
-                    status = self.send_vsc(vsc_req_form)
-                    if status != YCable.MCU_EC_NO_ERROR:
-                        self.log_error('tcm read addr[%04X] data[%04X] error[%04X]' % (addr, data, status))
-                        return False
-                else:
-                    self.log_error('acquire lock timeout, failed to write serdes tcm register')
-                    return YCable.EEPROM_ERROR
-        else:
-            self.log_error("platform_chassis is not loaded, failed to write serdes tcm register")
+        result = self.vsc_batch([VscOp(YCable.VSC_OPCODE_TCM_WRITE, addr, data)])
+        if result == YCable.EEPROM_ERROR:
             return YCable.EEPROM_ERROR
 
-        return True
+        return result[0]
 
     def reg_read(self, addr):
         """
@@ -549,18 +569,7 @@ class YCable(YCableBase):
             an Integer, return data of the register
         """
 
-        vsc_req_form = [None] * (YCable.VSC_CMD_ATTRIBUTE_LENGTH)
-        vsc_req_form[YCable.VSC_BYTE_OPCODE] = YCable.VSC_OPCODE_REG_READ
-        vsc_req_form[130]  = (addr >>  0) & 0xFF
-        vsc_req_form[131]  = (addr >>  8) & 0xFF
-        vsc_req_form[132]  = (addr >> 16) & 0xFF
-        vsc_req_form[133]  = (addr >> 24) & 0xFF
-        status = self.send_vsc(vsc_req_form)
-        if status != YCable.MCU_EC_NO_ERROR:
-            self.log_error('reg read addr[%04X]  error[%04X]' % (addr, status))
-            return -1
-
-        return self.read_mmap(YCable.MIS_PAGE_VSC, 134) | (self.read_mmap(YCable.MIS_PAGE_VSC, 135) << 8)
+        return self.__vsc_batch([VscOp(YCable.VSC_OPCODE_REG_READ, addr)])[0]
 
     def reg_write(self, addr, data):
         """
@@ -577,19 +586,7 @@ class YCable(YCableBase):
             a boolean, True if the register write succeeded and False if it did not succeed.
         """
 
-        vsc_req_form = [None] * (YCable.VSC_CMD_ATTRIBUTE_LENGTH)
-        vsc_req_form[YCable.VSC_BYTE_OPCODE] = YCable.VSC_OPCODE_REG_WRITE
-        vsc_req_form[130]  = (addr >>  0) & 0xFF
-        vsc_req_form[131]  = (addr >>  8) & 0xFF
-        vsc_req_form[134]  = (data >>  0) & 0xFF
-        vsc_req_form[135]  = (data >>  8) & 0xFF
-
-        status = self.send_vsc(vsc_req_form)
-        if status != YCable.MCU_EC_NO_ERROR:
-            self.log_error('reg write addr[%04X] data[%04X] error[%04X]' % (addr, data, status))
-            return False
-
-        return True
+        return self.__vsc_batch([VscOp(YCable.VSC_OPCODE_REG_WRITE, addr, data)])[0]
 
     def reg_read_atomic(self, addr):
         """
@@ -602,28 +599,12 @@ class YCable(YCableBase):
             an Integer, return data of the register
         """
 
-        if self.platform_chassis is not None:
-            with self.rlock.acquire_timeout(RLocker.ACQUIRE_LOCK_TIMEOUT) as lock_status:
-                if lock_status:
-                    vsc_req_form = [None] * (YCable.VSC_CMD_ATTRIBUTE_LENGTH)
-                    vsc_req_form[YCable.VSC_BYTE_OPCODE] = YCable.VSC_OPCODE_REG_READ
-                    vsc_req_form[130]  = (addr >>  0) & 0xFF
-                    vsc_req_form[131]  = (addr >>  8) & 0xFF
-                    vsc_req_form[132]  = (addr >> 16) & 0xFF
-                    vsc_req_form[133]  = (addr >> 24) & 0xFF
-                    status = self.send_vsc(vsc_req_form)
-                    if status != YCable.MCU_EC_NO_ERROR:
-                        self.log_error('reg read addr[%04X]  error[%04X]' % (addr, status))
-                        return YCable.EEPROM_ERROR
-
-                    return self.read_mmap(YCable.MIS_PAGE_VSC, 134) | (self.read_mmap(YCable.MIS_PAGE_VSC, 135) << 8)
-                else:
-                    self.log_error('acquire lock timeout, failed to read serdes register')
-                    return YCable.EEPROM_ERROR
-        else:
-            self.log_error("platform_chassis is not loaded, failed to read serdes register")
+        result = self.vsc_batch([VscOp(YCable.VSC_OPCODE_REG_READ, addr)])
+        if result == YCable.EEPROM_ERROR:
             return YCable.EEPROM_ERROR
-        
+
+        return result[0]
+
     def reg_write_atomic(self, addr, data):
         """
         This API writes the serdes register in atomic method
@@ -639,28 +620,11 @@ class YCable(YCableBase):
             an Integer, 0 if the register write succeeded.
         """
 
-        if self.platform_chassis is not None:
-            with self.rlock.acquire_timeout(RLocker.ACQUIRE_LOCK_TIMEOUT) as lock_status:
-                if lock_status:
-                    vsc_req_form = [None] * (YCable.VSC_CMD_ATTRIBUTE_LENGTH)
-                    vsc_req_form[YCable.VSC_BYTE_OPCODE] = YCable.VSC_OPCODE_REG_WRITE
-                    vsc_req_form[130]  = (addr >>  0) & 0xFF
-                    vsc_req_form[131]  = (addr >>  8) & 0xFF
-                    vsc_req_form[134]  = (data >>  0) & 0xFF
-                    vsc_req_form[135]  = (data >>  8) & 0xFF
-
-                    status = self.send_vsc(vsc_req_form)
-                    if status != YCable.MCU_EC_NO_ERROR:
-                        self.log_error('reg write addr[%04X] data[%04X] error[%04X]' % (addr, data, status))
-                        return YCable.EEPROM_ERROR
-                else:
-                    self.log_error('acquire lock timeout, failed to write serdes register')
-                    return YCable.EEPROM_ERROR
-        else:
-            self.log_error("platform_chassis is not loaded, failed to write serdes register")
+        result = self.vsc_batch([VscOp(YCable.VSC_OPCODE_REG_WRITE, addr, data)])
+        if result == YCable.EEPROM_ERROR or not result[0]:
             return YCable.EEPROM_ERROR
 
-        return 0        
+        return 0
 
     def toggle_mux_to_tor_a(self):
         """
@@ -990,15 +954,14 @@ class YCable(YCableBase):
                         elif time_diff >= YCable.EYE_TIMEOUT_SECS:
                             return YCable.EEPROM_TIMEOUT_ERROR
 
-                    idx = 0
-                    for lane in range(YCable.MAX_NUM_LANES):
-                        curr_offset = YCable.OFFSET_LANE_1_EYE_RESULT
-                        msb_result = self.platform_chassis.get_sfp(self.port).read_eeprom(curr_offset + idx, 1)
-                        lsb_result = self.platform_chassis.get_sfp(self.port).read_eeprom(curr_offset + idx + 1, 1)
+                    curr_offset = YCable.OFFSET_LANE_1_EYE_RESULT
+                    lane_results = self.platform_chassis.get_sfp(self.port).read_eeprom(curr_offset, 2 * YCable.MAX_NUM_LANES)
+                    if lane_results is None:
+                        return YCable.EEPROM_ERROR
 
-                        lane_result = (msb_result[0] << 8 | lsb_result[0])
+                    for lane in range(YCable.MAX_NUM_LANES):
+                        lane_result = (lane_results[2 * lane] << 8 | lane_results[2 * lane + 1])
                         eye_result.append(lane_result)
-                        idx += 2
                 else:
                     self.log_error('acquire lock timeout, failed to get eye height')
                     return YCable.EEPROM_ERROR
@@ -1306,16 +1269,14 @@ class YCable(YCableBase):
         result = []
 
         if self.platform_chassis is not None:
-            pre1 = self.platform_chassis.get_sfp(self.port).read_eeprom(curr_offset + (target)*20 + (lane-1)*5, 1)
-            result.append(c_int8(pre1[0]).value)
-            pre2 = self.platform_chassis.get_sfp(self.port).read_eeprom(curr_offset + (target)*20 + (lane-1)*5 + 1, 1)
-            result.append(c_int8(pre2[0]).value)
-            main = self.platform_chassis.get_sfp(self.port).read_eeprom(curr_offset + (target)*20 + (lane-1)*5 + 2, 1)
-            result.append(c_int8(main[0]).value)
-            post1 = self.platform_chassis.get_sfp(self.port).read_eeprom(curr_offset + (target)*20 + (lane-1)*5 + 3, 1)
-            result.append(c_int8(post1[0]).value)
-            post2 = self.platform_chassis.get_sfp(self.port).read_eeprom(curr_offset + (target)*20 + (lane-1)*5 + 4, 1)
-            result.append(c_int8(post2[0]).value)
+            # pre one, pre two, main, post one and post two cursors
+            cursors = self.platform_chassis.get_sfp(self.port).read_eeprom(curr_offset + (target)*20 + (lane-1)*5, 5)
+            if cursors is None:
+                self.log_error("failed to read target cursor values")
+                return YCable.EEPROM_ERROR
+
+            for cursor in cursors:
+                result.append(c_int8(cursor).value)
         else:
             self.log_error("platform_chassis is not loaded, failed to get target cursor values")
             return YCable.EEPROM_ERROR
@@ -1347,14 +1308,11 @@ class YCable(YCableBase):
                      , False if cursor values setting is not successful
         """
         curr_offset = YCable.OFFSET_NIC_CURSOR_VALUES
-        idx = 0
         if self.platform_chassis is not None:
-            for data in cursor_values:
-                data = data & 0xFF
-                buffer = bytearray([data])
+            buffer = bytearray([data & 0xFF for data in cursor_values])
+            if len(buffer) > 0:
                 self.platform_chassis.get_sfp(self.port).write_eeprom(
-                    curr_offset + (target)*20 + (lane-1)*5 + idx, 1, buffer)
-                idx += 1
+                    curr_offset + (target)*20 + (lane-1)*5, len(buffer), buffer)
         else:
             self.log_error("platform_chassis is not loaded, failed to get target cursor values")
             return YCable.EEPROM_ERROR
@@ -2638,17 +2596,20 @@ class YCable(YCableBase):
 
                     base = (quad << 20) + 0xa0000
                     Rx = (ch * 35) + 0x40
-                    pcs_stats['Rx Frames OK']         = self.tcm_read(base + 4 * (Rx + 6))
-                    pcs_stats['Rx Chk SEQ Errs']      = self.tcm_read(base + 4 * (Rx + 7))
-                    pcs_stats['Rx Alignment Errs']    = self.tcm_read(base + 4 * (Rx + 2))
-                    pcs_stats['Rx In Errs']           = self.tcm_read(base + 4 * (Rx + 9))
-                    pcs_stats['Rx FrameTooLong Errs'] = self.tcm_read(base + 4 * (Rx + 4))
-                    pcs_stats['Rx Octets OK']         = self.tcm_read(base + 4 * (Rx + 1))
-
                     Tx = (ch * 26) + 0xC
-                    pcs_stats['Tx Frames OK'] = self.tcm_read(base + 4 * (Tx + 3))
-                    pcs_stats['Tx Out Errs']  = self.tcm_read(base + 4 * (Tx + 5))
-                    pcs_stats['Tx Octets OK'] = self.tcm_read(base + 4 * (Tx + 1))
+                    counters = [('Rx Frames OK',         Rx + 6),
+                                ('Rx Chk SEQ Errs',      Rx + 7),
+                                ('Rx Alignment Errs',    Rx + 2),
+                                ('Rx In Errs',           Rx + 9),
+                                ('Rx FrameTooLong Errs', Rx + 4),
+                                ('Rx Octets OK',         Rx + 1),
+                                ('Tx Frames OK',         Tx + 3),
+                                ('Tx Out Errs',          Tx + 5),
+                                ('Tx Octets OK',         Tx + 1)]
+
+                    values = self.__vsc_batch([VscOp(YCable.VSC_OPCODE_TCM_READ, base + 4 * reg) for _, reg in counters])
+                    for (name, _), value in zip(counters, values):
+                        pcs_stats[name] = value
                 else:
                     self.log_error('acquire lock timeout, failed to get pcs statisics')
                     return YCable.EEPROM_ERROR
@@ -2693,41 +2654,29 @@ class YCable(YCableBase):
 
                     base = (quad << 20) + 0xA2800
 
-                    self.tcm_write(base + (3 << 2), 0x10000000 | (1 << ch))
-
-                    lsb = self.tcm_read(base + (8 << 2))
-                    msb = self.tcm_read(base + (0 << 2))
-                    fec_stats['Total recevied CW'] = (msb << 32) | lsb
-
-                    lsb = self.tcm_read(base + (9 << 2))
-                    msb = self.tcm_read(base + (0 << 2))
-                    fec_stats['Total correct CW'] = (msb << 32) | lsb
-
-                    lsb = self.tcm_read(base + (10 << 2))
-                    msb = self.tcm_read(base + (0 << 2))
-                    fec_stats['Total corrected CW'] = (msb << 32) | lsb
-
-                    fec_stats['Total uncorrectable CW'] = self.tcm_read(base + (11 << 2))
-
-                    lsb = self.tcm_read(base + (12 << 2))
-                    msb = self.tcm_read(base + ( 0 << 2))
-                    fec_stats['Corrected CW ( 1 sym err)'] = (msb << 32) | lsb
-                    lsb = self.tcm_read(base + (13 << 2))
-                    msb = self.tcm_read(base + ( 0 << 2))
-                    fec_stats['Corrected CW ( 2 sym err)'] = (msb << 32) | lsb
-                    fec_stats['Corrected CW ( 3 sym err)'] = self.tcm_read(base + (14 << 2))
-                    fec_stats['Corrected CW ( 4 sym err)'] = self.tcm_read(base + (15 << 2))
-                    fec_stats['Corrected CW ( 5 sym err)'] = self.tcm_read(base + (16 << 2))
-                    fec_stats['Corrected CW ( 6 sym err)'] = self.tcm_read(base + (17 << 2))
-                    fec_stats['Corrected CW ( 7 sym err)'] = self.tcm_read(base + (18 << 2))
-                    fec_stats['Corrected CW ( 8 sym err)'] = self.tcm_read(base + (19 << 2))
-                    fec_stats['Corrected CW ( 9 sym err)'] = self.tcm_read(base + (20 << 2))
-                    fec_stats['Corrected CW (10 sym err)'] = self.tcm_read(base + (21 << 2))
-                    fec_stats['Corrected CW (11 sym err)'] = self.tcm_read(base + (22 << 2))
-                    fec_stats['Corrected CW (12 sym err)'] = self.tcm_read(base + (23 << 2))
-                    fec_stats['Corrected CW (13 sym err)'] = self.tcm_read(base + (24 << 2))
-                    fec_stats['Corrected CW (14 sym err)'] = self.tcm_read(base + (25 << 2))
-                    fec_stats['Corrected CW (15 sym err)'] = self.tcm_read(base + (26 << 2))
+                    # reading a 64-bit counter latches its msb, read back at offset 0
+                    counters = [('Total recevied CW',          8, True),
+                                ('Total correct CW',           9, True),
+                                ('Total corrected CW',        10, True),
+                                ('Total uncorrectable CW',    11, False),
+                                ('Corrected CW ( 1 sym err)', 12, True),
+                                ('Corrected CW ( 2 sym err)', 13, True)]
+                    counters += [('Corrected CW (%2d sym err)' % (reg - 11), reg, False) for reg in range(14, 27)]
+
+                    ops = [VscOp(YCable.VSC_OPCODE_TCM_WRITE, base + (3 << 2), 0x10000000 | (1 << ch))]
+                    for _, reg, wide in counters:
+                        ops.append(VscOp(YCable.VSC_OPCODE_TCM_READ, base + (reg << 2)))
+                        if wide:
+                            ops.append(VscOp(YCable.VSC_OPCODE_TCM_READ, base + (0 << 2)))
+
+                    values = iter(self.__vsc_batch(ops)[1:])
+                    for name, _, wide in counters:
+                        lsb = next(values)
+                        if wide:
+                            msb = next(values)
+                            fec_stats[name] = (msb << 32) | lsb
+                        else:
+                            fec_stats[name] = lsb
                 else:
                     self.log_error('acquire lock timeout, failed to get fec statisics')
                     return YCable.EEPROM_ERROR
@@ -2847,24 +2796,30 @@ class YCable(YCableBase):
         if self.platform_chassis is not None:
             with self.rlock.acquire_timeout(RLocker.ACQUIRE_LOCK_TIMEOUT) as lock_status:
                 if lock_status:
-                    an_sm = 0
                     if target == YCableBase.TARGET_NIC:
-                        an_sm = self.reg_read(0x0048)
+                        an_sm_addr = 0x0048
                         lanes=[0,4]
                     elif target == YCableBase.TARGET_TOR_A:
-                        an_sm = self.reg_read(0x5448)
+                        an_sm_addr = 0x5448
                         lanes=[12,16]
                     elif target == YCableBase.TARGET_TOR_B:
-                        an_sm = self.reg_read(0x5C48)
+                        an_sm_addr = 0x5C48
                         lanes=[20,24]
                     else:
                         self.log_error("get anlt stats: unsupported target")
+                        return anlt_stat
 
-                    anlt_stat['AN_StateMachine'] = an_sm
+                    ops = [VscOp(YCable.VSC_OPCODE_REG_READ, an_sm_addr)]
+                    for ln in range(lanes[0], lanes[1]):
+                        ops.append(VscOp(YCable.VSC_OPCODE_REG_READ, 0xB3 | 0x200 * ln))
+                        ops.append(VscOp(YCable.VSC_OPCODE_REG_READ, 0xB4 | 0x200 * ln))
+                    values = self.__vsc_batch(ops)
 
-                    for idx, ln in enumerate(range(lanes[0], lanes[1])):
-                        lt_tx1 = self.reg_read(0xB3 | 0x200 * ln)
-                        lt_tx2 = self.reg_read(0xB4 | 0x200 * ln)
+                    anlt_stat['AN_StateMachine'] = values[0]
+
+                    for idx in range(lanes[1] - lanes[0]):
+                        lt_tx1 = values[1 + 2 * idx]
+                        lt_tx2 = values[2 + 2 * idx]
                         anlt_stat['LT_TX_lane%d' % idx] = [(lt_tx1 >> 8) & 0xFF, lt_tx1 & 0xFF, (lt_tx2 >> 8) & 0xFF, lt_tx2 & 0xFF]
                 else:
                     self.log_error('acquire lock timeout, failed to get anlt stat')
@@ -3201,14 +3156,14 @@ class YCable(YCableBase):
                 elif time_diff >= YCable.BER_TIMEOUT_SECS:
                     return YCable.EEPROM_TIMEOUT_ERROR
 
-            idx = 0
             curr_offset = YCable.OFFSET_LANE_1_BER_RESULT
+            lane_results = self.platform_chassis.get_sfp(self.port).read_eeprom(curr_offset, 2 * YCable.MAX_NUM_LANES)
+            if lane_results is None:
+                return YCable.EEPROM_ERROR
+
             for lane in range(YCable.MAX_NUM_LANES):
-                msb_result = self.platform_chassis.get_sfp(self.port).read_eeprom(curr_offset+idx, 1)
-                lsb_result = self.platform_chassis.get_sfp(self.port).read_eeprom(curr_offset+1+idx, 1)
-                lane_result = msb_result[0] * math.pow(10, (lsb_result[0]-24))
+                lane_result = lane_results[2 * lane] * math.pow(10, (lane_results[2 * lane + 1]-24))
                 ber_result.append(lane_result)
-                idx += 2
         else:
             self.log_error("platform_chassis is not loaded, failed to get ber info")
             return YCable.EEPROM_ERROR
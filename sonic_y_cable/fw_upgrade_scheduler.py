@@ -0,0 +1,266 @@
+"""
+    fw_upgrade_scheduler.py
+
+    Scheduler upgrading the firmware of many Y-Cables in parallel through the
+    vendor-agnostic download_firmware/activate_firmware/rollback_firmware APIs
+    of YCableBase.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from sonic_y_cable.y_cable_base import YCableBase
+
+# Default durations used by estimate() when the caller does not provide any,
+# in seconds, from observed upgrades of the supported cables
+FW_DOWNLOAD_ESTIMATE_SECS = 240
+FW_ACTIVATE_ESTIMATE_SECS = 30
+
+FW_UPGRADE_MAX_WORKERS = 16
+FW_UPGRADE_MAX_PER_BUS = 1
+
+# Phases of an upgrade
+FW_PHASE_DOWNLOAD = "download"
+FW_PHASE_ACTIVATE = "activate"
+FW_PHASE_ROLLBACK = "rollback"
+
+FW_PHASE_FAILURES = {
+    FW_PHASE_DOWNLOAD: YCableBase.FIRMWARE_DOWNLOAD_FAILURE,
+    FW_PHASE_ACTIVATE: YCableBase.FIRMWARE_ACTIVATE_FAILURE,
+    FW_PHASE_ROLLBACK: YCableBase.FIRMWARE_ROLLBACK_FAILURE,
+}
+
+# Kinds of progress events
+FW_EVENT_START = "start"
+FW_EVENT_DONE = "done"
+FW_EVENT_SKIPPED = "skipped"
+
+
+class _FwUpgradeJob(object):
+    def __init__(self, cable, fwfile, bus):
+        self.cable = cable
+        self.fwfile = fwfile
+        self.bus = bus
+        self.results = {}
+
+
+class YCableFwUpgradeScheduler(object):
+    """
+    Downloads and activates firmware on many Y-Cables concurrently
+
+    All the downloads run first, at most max_per_bus at a time on each I2C
+    bus and max_workers at a time overall: a cable is only handed to a worker
+    once its bus has a free slot, round robin over the buses, so that workers
+    never wait on a busy bus. Activations then run with the same
+    bounds, in two waves for peer-ToR hitless ordering: first the cables for
+    which this ToR is standby (the mux points to the peer ToR), then those for
+    which it is active, so that the cables carrying traffic through this ToR
+    are activated last. peer_barrier, if set, is called between the waves, for
+    instance to wait for the peer ToR to reach the same point. Cables whose
+    download failed are not activated, cables whose activation failed are
+    rolled back if rollback_on_failure is set.
+
+    Progress is reported by calling event_callback with a dict holding the
+    'event' kind (FW_EVENT_*), the 'phase' (FW_PHASE_*), the 'port', the
+    'result' code and 'elapsed' seconds when done, an 'error' string if the
+    vendor API raised, and the 'completed' and 'total' counts of the phase.
+
+    Args:
+        max_workers: maximum number of cables upgraded at a time
+        max_per_bus: maximum number of cables upgraded at a time on a bus
+        hitless: passed to activate_firmware
+        rollback_on_failure: roll back cables whose activation failed
+        event_callback: function called with each progress event
+        peer_barrier: function called between the standby and active waves
+    """
+
+    def __init__(self, max_workers=FW_UPGRADE_MAX_WORKERS, max_per_bus=FW_UPGRADE_MAX_PER_BUS,
+                 hitless=True, rollback_on_failure=False, event_callback=None, peer_barrier=None):
+        self.max_workers = max_workers
+        self.max_per_bus = max_per_bus
+        self.hitless = hitless
+        self.rollback_on_failure = rollback_on_failure
+        self.event_callback = event_callback
+        self.peer_barrier = peer_barrier
+        self._jobs = []
+        self._progress_lock = threading.Lock()
+        self._completed = 0
+        self._total = 0
+
+    def add(self, cable, fwfile, bus=None):
+        """
+        Adds a cable to upgrade
+
+        Args:
+            cable: a YCableBase instance
+            fwfile: a string, the path of the firmware file of the cable
+            bus: the I2C bus (any hashable) of the cable, None to consider
+                 the cable on a bus of its own
+        """
+        bus = ('port', cable.port) if bus is None else bus
+        self._jobs.append(_FwUpgradeJob(cable, fwfile, bus))
+
+    def estimate(self, get_durations=None):
+        """
+        Dry run, estimates the duration of run() without accessing the cables
+
+        Args:
+            get_durations: function returning a tuple of the (download,
+                           activate) durations in seconds of a cable, None for
+                           FW_DOWNLOAD_ESTIMATE_SECS and FW_ACTIVATE_ESTIMATE_SECS
+
+        Returns:
+            a dict of the estimated 'download', 'activate' and 'total' seconds
+            of the scheduled upgrade, and of the 'sequential' seconds it would
+            take one cable after the other
+        """
+        durations = [get_durations(job.cable) if get_durations is not None
+                     else (FW_DOWNLOAD_ESTIMATE_SECS, FW_ACTIVATE_ESTIMATE_SECS) for job in self._jobs]
+        download = self._simulate([(job.bus, d[0]) for job, d in zip(self._jobs, durations)])
+        activate = self._simulate([(job.bus, d[1]) for job, d in zip(self._jobs, durations)])
+        return {
+            FW_PHASE_DOWNLOAD: download,
+            FW_PHASE_ACTIVATE: activate,
+            'total': download + activate,
+            'sequential': sum(d[0] + d[1] for d in durations),
+        }
+
+    def _simulate(self, tasks):
+        # replays the dispatch of run() with the task durations
+        queues = self._queue_by_bus(tasks, key=lambda task: task[0])
+        busy = {}
+        running = []
+        seq = itertools.count()
+        now = 0.0
+        while queues or running:
+            for bus, (_, duration) in self._dispatch(queues, busy, len(running)):
+                heapq.heappush(running, (now + duration, next(seq), bus))
+            now, _, bus = heapq.heappop(running)
+            busy[bus] -= 1
+        return now
+
+    @staticmethod
+    def _queue_by_bus(items, key):
+        queues = OrderedDict()
+        for item in items:
+            queues.setdefault(key(item), deque()).append(item)
+        return queues
+
+    def _dispatch(self, queues, busy, running):
+        # pops the items to start now that running items are in progress and
+        # busy holds the count of items in progress per bus, round robin over
+        # the buses with a free slot
+        started = []
+        while running + len(started) < self.max_workers:
+            bus = next((bus for bus in queues if busy.get(bus, 0) < self.max_per_bus), None)
+            if bus is None:
+                break
+            item = queues[bus].popleft()
+            if queues[bus]:
+                queues.move_to_end(bus)
+            else:
+                del queues[bus]
+            busy[bus] = busy.get(bus, 0) + 1
+            started.append((bus, item))
+        return started
+
+    def run(self):
+        """
+        Upgrades the added cables
+
+        Returns:
+            a dict mapping each port to a dict of the result code of each
+            phase run on its cable, FW_PHASE_DOWNLOAD, FW_PHASE_ACTIVATE and
+            FW_PHASE_ROLLBACK
+        """
+        jobs = list(self._jobs)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(jobs)))) as executor:
+            self._run_phase(executor, FW_PHASE_DOWNLOAD, jobs)
+            downloaded = [job for job in jobs
+                          if job.results.get(FW_PHASE_DOWNLOAD) == YCableBase.FIRMWARE_DOWNLOAD_SUCCESS]
+            for job in jobs:
+                if job not in downloaded:
+                    self._emit(FW_EVENT_SKIPPED, FW_PHASE_ACTIVATE, job)
+
+            standby, active = [], []
+            for job in downloaded:
+                (active if self._is_active_side(job.cable) else standby).append(job)
+            self._run_phase(executor, FW_PHASE_ACTIVATE, standby, len(downloaded))
+            if self.peer_barrier is not None:
+                self.peer_barrier()
+            self._run_phase(executor, FW_PHASE_ACTIVATE, active, len(downloaded), len(standby))
+
+            if self.rollback_on_failure:
+                failed = [job for job in downloaded
+                          if job.results.get(FW_PHASE_ACTIVATE) != YCableBase.FIRMWARE_ACTIVATE_SUCCESS]
+                self._run_phase(executor, FW_PHASE_ROLLBACK, failed)
+
+        return {job.cable.port: dict(job.results) for job in jobs}
+
+    @staticmethod
+    def _is_active_side(cable):
+        try:
+            read_side = cable.get_read_side()
+            return read_side != YCableBase.TARGET_UNKNOWN and cable.get_mux_direction() == read_side
+        except Exception:
+            # unknown, activate it with the active cables, last
+            return True
+
+    def _run_phase(self, executor, phase, jobs, total=None, completed=0):
+        with self._progress_lock:
+            self._total = len(jobs) if total is None else total
+            self._completed = completed
+        queues = self._queue_by_bus(jobs, key=lambda job: job.bus)
+        busy = {}
+        running = {}
+        while queues or running:
+            for bus, job in self._dispatch(queues, busy, len(running)):
+                running[executor.submit(self._run_job, phase, job)] = bus
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                busy[running.pop(future)] -= 1
+                future.result()
+
+    def _run_job(self, phase, job):
+        cable = job.cable
+        self._emit(FW_EVENT_START, phase, job)
+        start = time.monotonic()
+        error = None
+        try:
+            if phase == FW_PHASE_DOWNLOAD:
+                result = cable.download_firmware(job.fwfile)
+            elif phase == FW_PHASE_ACTIVATE:
+                result = cable.activate_firmware(job.fwfile, self.hitless)
+            else:
+                result = cable.rollback_firmware(job.fwfile)
+        except Exception as e:
+            error = repr(e)
+            result = FW_PHASE_FAILURES[phase]
+            cable.log_error("Firmware {} failed on port {}: {}".format(phase, cable.port, error))
+        job.results[phase] = result
+        self._emit(FW_EVENT_DONE, phase, job, result, time.monotonic() - start, error)
+
+    def _emit(self, kind, phase, job, result=None, elapsed=None, error=None):
+        with self._progress_lock:
+            if kind == FW_EVENT_DONE:
+                self._completed += 1
+            event = {
+                'event': kind,
+                'phase': phase,
+                'port': job.cable.port,
+                'completed': self._completed,
+                'total': self._total,
+                'timestamp': time.time(),
+            }
+        if kind == FW_EVENT_DONE:
+            event['result'] = result
+            event['elapsed'] = elapsed
+            if error is not None:
+                event['error'] = error
+        if self.event_callback is not None:
+            self.event_callback(event)
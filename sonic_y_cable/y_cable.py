@@ -8,6 +8,7 @@ try:
     import math
     import time
     import struct
+    from concurrent.futures import ThreadPoolExecutor
     from ctypes import c_int8
 
     from sonic_py_common import logger
@@ -54,6 +55,14 @@ OFFSET_NIC_TEMPERATURE = 727
 OFFSET_NIC_VOLTAGE = 729
 OFFSET_ENABLE_AUTO_SWITCH = 651
 
+# block of upper page 0x04 holding the mux, link, side, switching mode and
+# switch count registers, read at once by get_mux_state_bulk
+OFFSET_MUX_STATE_BLOCK = OFFSET_DETERMINE_CABLE_READ_SIDE
+MUX_STATE_BLOCK_SIZE = OFFSET_AUTO_SWITCH_COUNT + 4 - OFFSET_MUX_STATE_BLOCK
+
+# default number of threads get_mux_state_bulk reads ports from
+MUX_STATE_BULK_MAX_WORKERS = 8
+
 # definitions of targets for getting the cursor
 # equalization parameters from the register spec
 # the name of the target denotes which side cursor
@@ -1528,3 +1537,135 @@ def get_switching_mode(physical_port):
         return SWITCHING_MODE_AUTO
     else:
         return SWITCHING_MODE_MANUAL
+
+
+def _decode_mux_state(block):
+    """
+    Decodes the registers of a block read at OFFSET_MUX_STATE_BLOCK, with the
+    same values as the single register APIs
+    """
+
+    def reg(offset):
+        return block[offset - OFFSET_MUX_STATE_BLOCK]
+
+    def count(offset):
+        return struct.unpack(">I", bytes(block[offset - OFFSET_MUX_STATE_BLOCK:offset - OFFSET_MUX_STATE_BLOCK + 4]))[0]
+
+    read_side = reg(OFFSET_DETERMINE_CABLE_READ_SIDE)
+    if (read_side >> 2) & 0x01:
+        read_side = 1
+    elif (read_side >> 1) & 0x01:
+        read_side = 2
+    elif read_side & 0x01:
+        read_side = 0
+    else:
+        read_side = -1
+
+    mux_direction = reg(OFFSET_MUX_DIRECTION)
+    if mux_direction & 0x01:
+        mux_direction = 1
+    elif mux_direction == 0:
+        mux_direction = 2
+    else:
+        mux_direction = -1
+
+    active_tor = reg(OFFSET_ACTIVE_TOR_INDICATOR)
+    if (active_tor >> 1) & 0x01:
+        active_tor = 2
+    elif active_tor & 0x01:
+        active_tor = 1
+    elif active_tor == 0:
+        active_tor = 0
+    else:
+        active_tor = -1
+
+    link_active = reg(OFFSET_CHECK_LINK_ACTIVE)
+
+    return {
+        "read_side": read_side,
+        "mux_direction": mux_direction,
+        "active_linked_tor_side": active_tor,
+        "link_active_nic": bool(link_active & 0x01),
+        "link_active_torA": bool((link_active >> 2) & 0x01),
+        "link_active_torB": bool((link_active >> 1) & 0x01),
+        "switching_mode": SWITCHING_MODE_AUTO if reg(OFFSET_ENABLE_AUTO_SWITCH) == 1 else SWITCHING_MODE_MANUAL,
+        "switch_count_manual": count(OFFSET_MANUAL_SWITCH_COUNT),
+        "switch_count_auto": count(OFFSET_AUTO_SWITCH_COUNT),
+    }
+
+
+def _read_mux_state(physical_port):
+
+    result = platform_chassis.get_sfp(physical_port).read_eeprom(OFFSET_MUX_STATE_BLOCK, MUX_STATE_BLOCK_SIZE)
+    if y_cable_validate_read_data(result, MUX_STATE_BLOCK_SIZE, physical_port, "mux state") == EEPROM_READ_DATA_INVALID:
+        return EEPROM_ERROR
+
+    return _decode_mux_state(result)
+
+
+@hook_y_cable_simulator
+def get_mux_state_bulk(physical_ports, get_i2c_segment=None, max_workers=MUX_STATE_BULK_MAX_WORKERS):
+    """
+    This API specifically returns the mux, link and side status of many Y cables at once.
+    For each port, API reads the upper page 4 registers from offset 128 to 148 in a single
+    eeprom read and decodes all of them from that buffer, instead of one read per register
+    as done by check_read_side, check_mux_direction, check_active_linked_tor_side,
+    check_if_link_is_active_for_NIC/torA/torB, get_switching_mode and get_switch_count.
+
+    Ports are read in parallel from a thread pool. Ports of the same I2C segment are read
+    one after the other by the same thread, as they share their bus.
+
+    Args:
+         physical_ports:
+             a list of Integers, the actual physical ports connected to Y cables
+         get_i2c_segment:
+             a function returning the I2C segment (any hashable) of a physical port,
+             None to consider every port on its own segment
+         max_workers:
+             an Integer, the maximum number of threads reading ports
+
+    Returns:
+        a dict, mapping each port to a dict of
+            "read_side": same value as check_read_side
+            "mux_direction": same value as check_mux_direction
+            "active_linked_tor_side": same value as check_active_linked_tor_side
+            "link_active_nic": same value as check_if_link_is_active_for_NIC
+            "link_active_torA": same value as check_if_link_is_active_for_torA
+            "link_active_torB": same value as check_if_link_is_active_for_torB
+            "switching_mode": same value as get_switching_mode
+            "switch_count_manual": same value as get_switch_count(port, "manual")
+            "switch_count_auto": same value as get_switch_count(port, "auto")
+        or to -1 if reading the port failed
+        , -1 if the platform chassis is not loaded
+    """
+
+    if platform_chassis is None:
+        helper_logger.log_error("platform_chassis is not loaded, failed to get mux state")
+        return -1
+
+    segments = {}
+    for physical_port in physical_ports:
+        segment = get_i2c_segment(physical_port) if get_i2c_segment is not None else physical_port
+        segments.setdefault(segment, []).append(physical_port)
+
+    def read_segment(ports):
+        states = {}
+        for physical_port in ports:
+            try:
+                states[physical_port] = _read_mux_state(physical_port)
+            except Exception as e:
+                helper_logger.log_error("Error: failed to read mux state for port {}: {}".format(physical_port, repr(e)))
+                states[physical_port] = EEPROM_ERROR
+        return states
+
+    mux_states = {}
+    if len(segments) <= 1 or max_workers <= 1:
+        for ports in segments.values():
+            mux_states.update(read_segment(ports))
+        return mux_states
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(segments))) as executor:
+        for states in executor.map(read_segment, segments.values()):
+            mux_states.update(states)
+
+    return mux_states
@@ -1,5 +1,7 @@
 import builtins
 import importlib
+import threading
+import time
 
 import pytest
 from unittest import mock
@@ -288,3 +290,81 @@ class TestChassisBase:
 
         assert chassis.get_num_sfps() == 2
         assert chassis.get_num_cpos() == 0
+
+    def _make_dom_chassis(self, granularity, num_ports=8, delay=0.02):
+        chassis = ChassisBase()
+        state = {'active': {}, 'max_active': {}, 'max_total': 0}
+        lock = threading.Lock()
+
+        def make_sfp(port):
+            bus = port % 2
+            def read_dom():
+                with lock:
+                    state['active'][bus] = state['active'].get(bus, 0) + 1
+                    state['max_active'][bus] = max(state['max_active'].get(bus, 0),
+                                                   state['active'][bus])
+                    state['max_total'] = max(state['max_total'], sum(state['active'].values()))
+                time.sleep(delay)
+                with lock:
+                    state['active'][bus] -= 1
+                return {'temperature': 30.0 + port, 'voltage': 3.3}
+            sfp = mock.MagicMock()
+            sfp.get_transceiver_dom_real_value.side_effect = read_dom
+            return sfp
+
+        chassis._sfp_list = [make_sfp(port) for port in range(num_ports)]
+        chassis.get_transceiver_lock_granularity = mock.MagicMock(return_value=granularity)
+        chassis.get_transceiver_bus_id = lambda port: port % 2
+        return chassis, state
+
+    def test_transceiver_lock_granularity_defaults(self):
+        chassis = ChassisBase()
+        assert chassis.get_transceiver_lock_granularity() == ChassisBase.XCVR_LOCK_GRANULARITY_CHASSIS
+        assert chassis.get_transceiver_bus_id(0) is None
+
+    def test_collect_transceiver_dom_serial_by_default(self):
+        chassis, state = self._make_dom_chassis(ChassisBase.XCVR_LOCK_GRANULARITY_CHASSIS, delay=0)
+        dom, elapsed = chassis.collect_transceiver_dom(range(8))
+        assert dom == {port: {'temperature': 30.0 + port, 'voltage': 3.3} for port in range(8)}
+        assert set(elapsed) == set(range(8))
+        assert state['max_total'] == 1
+
+    def test_collect_transceiver_dom_per_bus(self):
+        chassis, state = self._make_dom_chassis(ChassisBase.XCVR_LOCK_GRANULARITY_BUS)
+        dom, elapsed = chassis.collect_transceiver_dom(range(8), fields=['temperature'])
+        assert dom == {port: {'temperature': 30.0 + port} for port in range(8)}
+        assert all(t >= 0.02 for t in elapsed.values())
+        assert state['max_active'] == {0: 1, 1: 1}
+        assert state['max_total'] == 2
+
+    def test_collect_transceiver_dom_per_port(self):
+        chassis, state = self._make_dom_chassis(ChassisBase.XCVR_LOCK_GRANULARITY_PORT)
+        chassis.collect_transceiver_dom(range(8), max_workers=4)
+        assert 1 < state['max_total'] <= 4
+
+    def test_collect_transceiver_dom_failures(self):
+        chassis, _ = self._make_dom_chassis(ChassisBase.XCVR_LOCK_GRANULARITY_PORT, num_ports=2)
+        chassis._sfp_list[1].get_transceiver_dom_real_value.side_effect = Exception("i2c error")
+        dom, elapsed = chassis.collect_transceiver_dom([0, 1, 5])
+        assert dom[0] is not None
+        assert dom[1] is None
+        assert dom[5] is None
+        assert set(elapsed) == {0, 1, 5}
+
+    def test_upgrade_transceiver_firmware_groups_by_bus(self):
+        chassis, _ = self._make_dom_chassis(ChassisBase.XCVR_LOCK_GRANULARITY_BUS, num_ports=4)
+        chassis._sfp_list[3].get_xcvr_api.return_value = None
+        progress = mock.MagicMock()
+        with mock.patch.object(chassis_base, 'CdbFwUpgradeOrchestrator') as orchestrator_cls:
+            orchestrator = orchestrator_cls.return_value
+            orchestrator.upgrade.return_value = {0: (True, ''), 1: (True, ''), 2: (False, 'fail')}
+            results = chassis.upgrade_transceiver_firmware(range(5), '/tmp/fw.bin', progress, commit_delay=2)
+        orchestrator_cls.assert_called_once_with(progress, commit_delay=2,
+                                                 max_workers=ChassisBase.XCVR_DOM_COLLECT_MAX_WORKERS)
+        groups, imagepath = orchestrator.upgrade.call_args[0]
+        assert imagepath == '/tmp/fw.bin'
+        assert [[port for port, _ in group] for group in groups] == [[0, 2], [1]]
+        assert groups[0][0][1] is chassis._sfp_list[0].get_xcvr_api.return_value
+        assert results[2] == (False, 'fail')
+        assert results[3][0] is False
+        assert results[4][0] is False
@@ -0,0 +1,134 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from sonic_platform_base.sonic_xcvr.api.public.cmis import CmisApi
+from sonic_platform_base.sonic_xcvr.async_xcvr_eeprom import AsyncXcvrEeprom
+from sonic_platform_base.sonic_xcvr.codes.public.cmis import CmisCodes
+from sonic_platform_base.sonic_xcvr.fields import consts
+from sonic_platform_base.sonic_xcvr.mem_maps.public.cmis import CmisMemMap
+from sonic_platform_base.sonic_xcvr.mem_maps.public.cmis.pages import CmisPage
+
+from .test_xcvr_eeprom import CountingEeprom
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def make_module():
+    mem = CountingEeprom(CmisMemMap(CmisCodes))
+    for i in range(len(mem.memory)):
+        mem.memory[i] = (i * 7 + 3) & 0xff
+    # Paged memory, module temperature 25C
+    mem.memory[2] = 0x00
+    mem.memory[14:16] = bytes([0x19, 0x00])
+    return mem
+
+
+class TestAsyncXcvrEeprom(object):
+    def test_read_matches_sync(self):
+        mem = make_module()
+        async_eeprom = AsyncXcvrEeprom(mem.eeprom)
+        fields = [consts.TEMPERATURE_FIELD, consts.ADMIN_INFO_FIELD, consts.TX_POWER_FIELD]
+        expected = mem.eeprom.read_many(fields)
+        assert run(async_eeprom.read_many(fields)) == expected
+        assert run(async_eeprom.read(consts.TEMPERATURE_FIELD)) == 25.0
+        assert run(async_eeprom.read_raw(14, 2)) == (0x19, 0x00)
+        assert run(async_eeprom.read_raw(14, 1)) == 0x19
+
+    def test_write(self):
+        mem = make_module()
+        async_eeprom = AsyncXcvrEeprom(mem.eeprom, executor=ThreadPoolExecutor(max_workers=1))
+        rx_disable = mem.eeprom.mem_map.get_field(consts.RX_DISABLE_FIELD).get_offset()
+        mem.memory[rx_disable] = 0x01
+        # Read-modify-write of a single bit
+        assert run(async_eeprom.write("%s_%d" % (consts.RX_DISABLE_FIELD, 3), True))
+        assert mem.memory[rx_disable] == 0x05
+        assert run(async_eeprom.write_raw(rx_disable, 1, bytearray([0x00])))
+        assert mem.memory[rx_disable] == 0x00
+
+    def test_native_async_reader(self):
+        mem = make_module()
+        calls = []
+
+        async def reader(offset, size):
+            calls.append((offset, size))
+            await asyncio.sleep(0)
+            return bytes(mem.memory[offset:offset + size])
+
+        async_eeprom = AsyncXcvrEeprom(mem.eeprom, reader=reader)
+        assert run(async_eeprom.read(consts.TEMPERATURE_FIELD)) == 25.0
+        assert calls == [(14, 2)]
+        assert mem.reads == []
+
+    def test_ports_run_concurrently(self):
+        active = {'now': 0, 'max': 0}
+        per_port = {}
+
+        def make(port):
+            mem = make_module()
+            async def reader(offset, size):
+                active['now'] += 1
+                per_port[port] = per_port.get(port, 0) + 1
+                active['max'] = max(active['max'], active['now'])
+                assert per_port[port] == 1
+                await asyncio.sleep(0.01)
+                per_port[port] -= 1
+                active['now'] -= 1
+                return mem._reader(offset, size)
+            return AsyncXcvrEeprom(mem.eeprom, reader=reader)
+
+        eeproms = [make(port) for port in range(4)]
+
+        async def poll():
+            return await asyncio.gather(*(eeprom.read_raw(14, 1) for eeprom in eeproms * 2))
+
+        assert run(poll()) == [0x19] * 8
+        assert active['max'] == 4
+
+    def test_call_serves_getter_from_prefetched_pages(self):
+        mem = make_module()
+        async_eeprom = AsyncXcvrEeprom(mem.eeprom)
+        pages = [0x00, 0x11]
+        result = run(async_eeprom.call(pages, mem.eeprom.read_many,
+                                       [consts.TEMPERATURE_FIELD, consts.TX_POWER_FIELD]))
+        assert mem.reads == [(0, 128), (128, 128), (CmisPage.linear_offset(0x11, 0, 128), 128)]
+        assert result[consts.TEMPERATURE_FIELD] == 25.0
+
+
+class TestCmisApiAsync(object):
+    def test_dom_real_value_async(self):
+        mem = make_module()
+        api = CmisApi(mem.eeprom)
+        expected = api.get_transceiver_dom_real_value()
+        mem.reads = []
+        assert run(api.get_transceiver_dom_real_value_async()) == expected
+        # Every field was decoded from the prefetched pages
+        assert all(size == 128 for _, size in mem.reads)
+
+    def test_status_async(self):
+        mem = make_module()
+        api = CmisApi(mem.eeprom)
+        assert run(api.get_transceiver_status_async()) == api.get_transceiver_status()
+        assert run(api.get_transceiver_status_flags_async()) == api.get_transceiver_status_flags()
+        assert run(api.get_transceiver_dom_flags_async()) == api.get_transceiver_dom_flags()
+
+    def test_vdm_async_prefetches_descriptors_once(self):
+        mem = make_module()
+        api = CmisApi(mem.eeprom)
+        assert api.vdm.get_uncached_descriptor_pages() == [0x20, 0x21, 0x22, 0x23]
+        expected = api.get_transceiver_vdm_real_value()
+        assert api.vdm.get_uncached_descriptor_pages() == []
+        mem.reads = []
+        assert run(api.get_transceiver_vdm_real_value_async()) == expected
+        descriptor_offsets = {page * 128 + 128 for page in range(0x20, 0x24)}
+        assert not descriptor_offsets & {offset for offset, _ in mem.reads}
+
+    def test_set_async_xcvr_eeprom(self):
+        mem = make_module()
+        api = CmisApi(mem.eeprom)
+        default = api.get_async_xcvr_eeprom()
+        assert api.get_async_xcvr_eeprom() is default
+        custom = AsyncXcvrEeprom(mem.eeprom)
+        api.set_async_xcvr_eeprom(custom)
+        assert api.get_async_xcvr_eeprom() is custom
@@ -0,0 +1,143 @@
+import pytest
+
+from sonic_platform_base.sonic_xcvr.api.public.c_cmis import CCmisApi
+from sonic_platform_base.sonic_xcvr.api.public.c_cmis_pm import CCmisPmApi, CCmisPmHistory, CCmisPmRecord, \
+    C_CMIS_PM_FIELDS, C_CMIS_PM_PAGES
+from sonic_platform_base.sonic_xcvr.api.public.cmisVDM import VDM_FREEZE, VDM_UNFREEZE
+from sonic_platform_base.sonic_xcvr.codes.public.cmis import CmisCodes
+from sonic_platform_base.sonic_xcvr.fields import consts
+from sonic_platform_base.sonic_xcvr.mem_maps.public.cmis.c_cmis import CCmisMemMap
+
+from .test_xcvr_eeprom import CountingEeprom
+
+PM_VALUES = {
+    consts.RX_BITS_PM: 1000000, consts.RX_BITS_SUB_INTERVAL_PM: 10000,
+    consts.RX_CORR_BITS_PM: 1000, consts.RX_MIN_CORR_BITS_SUB_INTERVAL_PM: 8,
+    consts.RX_MAX_CORR_BITS_SUB_INTERVAL_PM: 12,
+    consts.RX_FRAMES_PM: 10000, consts.RX_FRAMES_SUB_INTERVAL_PM: 100,
+    consts.RX_FRAMES_UNCORR_ERR_PM: 4, consts.RX_MIN_FRAMES_UNCORR_ERR_SUB_INTERVAL_PM: 1,
+    consts.RX_MAX_FRAMES_UNCORR_ERR_SUB_INTERVAL_PM: 2,
+    consts.RX_AVG_CD_PM: 1400, consts.RX_MIN_CD_PM: -1300, consts.RX_MAX_CD_PM: 1500,
+    consts.RX_AVG_DGD_PM: 7.0, consts.RX_AVG_OSNR_PM: 28.5, consts.RX_MIN_CFO_PM: -150,
+    consts.TX_AVG_POWER_PM: -10.25, consts.RX_MAX_MER_PM: 12.5,
+}
+
+
+class TestCCmisPm(object):
+    """PM engine against an in-memory C-CMIS module reporting FreezeDone as
+    soon as the freeze is requested"""
+
+    def setup_method(self, method):
+        self.mem = CountingEeprom(CCmisMemMap(CmisCodes))
+        self.mem_map = self.mem.eeprom.mem_map
+        for field_name, value in PM_VALUES.items():
+            self.set_field(field_name, value)
+        self.control_writes = []
+        writer = self.mem._writer
+        freeze_done = self.mem_map.get_field(consts.VDM_FREEZE_DONE)
+        control = self.mem_map.get_field(consts.VDM_CONTROL).get_offset()
+        def pm_writer(offset, size, data):
+            if offset == control:
+                self.control_writes.append(data[0])
+                if data[0] == VDM_FREEZE:
+                    self.mem.memory[freeze_done.get_offset()] |= 1 << (freeze_done.bitpos % 8)
+                else:
+                    self.mem.memory[freeze_done.get_offset()] &= ~(1 << (freeze_done.bitpos % 8))
+            return writer(offset, size, data)
+        self.mem.eeprom.writer = pm_writer
+
+    def set_field(self, field_name, value):
+        field = self.mem_map.get_field(field_name)
+        offset = field.get_offset()
+        if field.scale is not None:
+            value = int(value * field.scale)
+        self.mem.memory[offset:offset + field.get_size()] = field._struct.pack(value)
+
+    def page_reads(self):
+        page_offsets = [self.mem_map.get_page_offsets(page)[0] for page in C_CMIS_PM_PAGES]
+        return [read for read in self.mem.reads if read[0] in page_offsets]
+
+    def test_record_read_in_two_page_reads(self):
+        api = CCmisPmApi(self.mem.eeprom)
+        record = api.get_pm_record()
+        assert record.frozen
+        assert self.control_writes == [VDM_FREEZE, VDM_UNFREEZE]
+        assert self.page_reads() == [(0x34 * 128 + 128, 128), (0x35 * 128 + 128, 128)]
+        # Besides the two pages, only the FreezeDone byte is read
+        assert len(self.mem.reads) == 3
+        assert record.rx_bits == 1000000
+        assert record.rx_cd_min == -1300
+        assert record.rx_dgd_avg == 7.0
+        assert record.rx_osnr_avg == 28.5
+        assert record.rx_cfo_min == -150
+        assert record.tx_power_avg == -10.25
+        assert record.rx_mer_max == 12.5
+        assert record.rx_pdl_avg == 0
+
+    def test_record_matches_field_reads(self):
+        record = CCmisPmApi(self.mem.eeprom).get_pm_record(freeze_timeout=None)
+        assert self.control_writes == []
+        assert not record.frozen
+        for name, field_name in C_CMIS_PM_FIELDS:
+            assert getattr(record, name) == self.mem.eeprom.read(field_name)
+
+    def test_pm_dict(self):
+        pm = CCmisApi(self.mem.eeprom).get_pm_all()
+        assert self.control_writes == []
+        assert pm['preFEC_BER_avg'] == 0.001
+        assert pm['preFEC_BER_min'] == 0.0008
+        assert pm['preFEC_BER_max'] == 0.0012
+        assert pm['preFEC_uncorr_frame_ratio_avg'] == 0.04
+        assert pm['preFEC_uncorr_frame_ratio_min'] == 0.01
+        assert pm['preFEC_uncorr_frame_ratio_max'] == 0.02
+        assert pm['rx_osnr_avg'] == 28.5
+        assert len(pm) == 45
+
+    def test_pm_dict_low_power(self):
+        self.set_field(consts.RX_BITS_PM, 0)
+        self.set_field(consts.RX_FRAMES_SUB_INTERVAL_PM, 0)
+        pm = CCmisPmApi(self.mem.eeprom).get_pm_record().get_pm_dict()
+        assert pm['preFEC_BER_avg'] == pm['preFEC_BER_min'] == pm['preFEC_BER_max'] == 1.0
+        assert pm['preFEC_uncorr_frame_ratio_avg'] == 0
+        assert pm['preFEC_uncorr_frame_ratio_max'] == 0
+
+    def test_read_failure(self):
+        self.mem.eeprom.reader = lambda offset, size: None
+        history = CCmisPmHistory()
+        api = CCmisPmApi(self.mem.eeprom, history)
+        assert api.get_pm_record() is None
+        assert len(history) == 0
+        # The PMs are unfrozen even though the reads failed
+        assert self.control_writes == [VDM_FREEZE, VDM_UNFREEZE]
+
+    def test_history_trend(self):
+        history = CCmisPmHistory(maxlen=3)
+        api = CCmisApi(self.mem.eeprom)
+        api.set_pm_sink(history)
+        for osnr in (20.0, 21.0, 22.0, 23.0):
+            self.set_field(consts.RX_AVG_OSNR_PM, osnr)
+            api.get_pm_all()
+        assert len(history) == history.maxlen == 3
+        reads = len(self.mem.reads)
+        assert [value for _, value in history.get_trend('rx_osnr_avg')] == [21.0, 22.0, 23.0]
+        assert [value for _, value in history.get_trend('preFEC_BER_avg', 2)] == [0.001, 0.001]
+        assert history.get_trend('rx_osnr_avg', 0) == []
+        assert history.get_latest().rx_osnr_avg == 23.0
+        timestamps = [timestamp for timestamp, _ in history.get_trend('rx_osnr_avg')]
+        assert timestamps == sorted(timestamps)
+        # Trends are served from the ring buffer
+        assert len(self.mem.reads) == reads
+
+        api.set_pm_sink(None)
+        api.get_pm_all()
+        assert len(history) == 3
+        history.clear()
+        assert history.get_latest() is None
+
+    def test_record_get(self):
+        record = CCmisPmApi(self.mem.eeprom).get_pm_record()
+        assert isinstance(record, CCmisPmRecord)
+        assert record.get('rx_bits') == 1000000
+        assert record.get('preFEC_BER_avg') == 0.001
+        with pytest.raises(KeyError):
+            record.get('unknown')
@@ -2,6 +2,7 @@ from mock import MagicMock
 from mock import patch
 import pytest
 from sonic_platform_base.sonic_xcvr.api.public.c_cmis import CCmisApi, C_CMIS_XCVR_INFO_DEFAULT_DICT
+from sonic_platform_base.sonic_xcvr.api.public.c_cmis_pm import C_CMIS_PM_FIELDS
 from sonic_platform_base.sonic_xcvr.mem_maps.public.cmis.c_cmis import CCmisMemMap
 from sonic_platform_base.sonic_xcvr.xcvr_eeprom import XcvrEeprom
 from sonic_platform_base.sonic_xcvr.codes.public.cmis import CmisCodes
@@ -173,10 +174,20 @@ class TestCCmis(object):
         )
     ])
     def test_get_pm_all(self, mock_response, expected):
-        self.api.xcvr_eeprom.read = MagicMock()
-        self.api.xcvr_eeprom.read.side_effect = mock_response
+        self.api.xcvr_eeprom.write = MagicMock()
+        self.api.xcvr_eeprom.read_many = MagicMock()
+        self.api.xcvr_eeprom.read_many.return_value = dict(zip([field for _, field in C_CMIS_PM_FIELDS], mock_response))
         result = self.api.get_pm_all()
         assert result == expected
+        # Callers own the VDM freeze window
+        self.api.xcvr_eeprom.write.assert_not_called()
+
+    def test_get_pm_all_read_failure(self):
+        self.api.xcvr_eeprom.read_many = MagicMock()
+        self.api.xcvr_eeprom.read_many.return_value = dict.fromkeys([field for _, field in C_CMIS_PM_FIELDS])
+        assert self.api.get_pm_all() is None
+        self.api.get_pm_all = MagicMock(return_value=None)
+        assert self.api.get_transceiver_pm() is None
 
     @pytest.mark.parametrize("mock_response, expected",[
         (
@@ -579,6 +590,16 @@ class TestCCmis(object):
         result = self.api.freeze_vdm_stats()
         assert result == expected
 
+    @pytest.mark.parametrize("write_response, freeze_done, expected", [
+        (False, [1], False),
+        (True, [0, 0, 1], True),
+        (True, [0], False),
+    ])
+    def test_freeze_vdm_stats_and_wait(self, write_response, freeze_done, expected):
+        self.api.xcvr_eeprom.write = MagicMock(return_value=write_response)
+        self.api.xcvr_eeprom.read = MagicMock(side_effect=lambda field: freeze_done.pop(0) if freeze_done else 0)
+        assert self.api.freeze_vdm_stats_and_wait(0.05) == expected
+
     @pytest.mark.parametrize("mock_response, expected", [
         (0, 0),
         (1, 1),
@@ -9,9 +9,25 @@ from sonic_platform_base.sonic_xcvr.mem_maps.public.cmis.cdb import (
     CdbRunFirmwareDownload, CdbCommitFirmwareDownload,
     CdbWriteLplBlock, CdbWriteEplBlock, CdbEnterPassword
 )
+from sonic_platform_base.sonic_xcvr.codes.public.cdb import CdbCodes
 from sonic_platform_base.sonic_xcvr.fields import cdb_consts
 from sonic_platform_base.sonic_xcvr.cdb.cdb import CdbCmdHandler
+from sonic_platform_base.sonic_xcvr.api.public.cmis import CmisApi
+from sonic_platform_base.sonic_xcvr.codes.public.cmis import CmisCodes
+from sonic_platform_base.sonic_xcvr.mem_maps.public.cmis import CmisMemMap
+from sonic_platform_base.sonic_xcvr.xcvr_eeprom import XcvrEeprom
 from sonic_platform_base.sonic_xcvr.mem_maps.public.cmis.pages.page import CmisPage
+from sonic_platform_base.sonic_xcvr import optoe_eeprom_rw
+from sonic_platform_base.sonic_xcvr.sfp_optoe_base import SfpOptoeBase
+
+
+class FakeOptoeSfp(SfpOptoeBase):
+    def __init__(self, path):
+        SfpOptoeBase.__init__(self)
+        self.path = path
+
+    def get_eeprom_path(self):
+        return self.path
 
 
 class MockCodes:
@@ -632,7 +648,7 @@ class TestCdbCmdHandler:
         
         assert result == True
         self.handler.write_cmd.assert_called_once_with(cmd_id, payload)
-        self.handler.wait_for_cdb_status.assert_called_once_with(None)
+        self.handler.wait_for_cdb_status.assert_called_once_with(None, cmd_id)
     
     def test_send_cmd_no_payload(self):
         """Test send_cmd without payload"""
@@ -665,7 +681,7 @@ class TestCdbCmdHandler:
         result = self.handler.send_cmd(cmd_id, timeout=timeout)
         
         assert result == True
-        self.handler.wait_for_cdb_status.assert_called_once_with(timeout)
+        self.handler.wait_for_cdb_status.assert_called_once_with(timeout, cmd_id)
     
     def test_send_cmd_write_failure(self):
         """Test send_cmd when write_cmd fails"""
@@ -933,4 +949,254 @@ class TestCdbEnterPassword:
         encoded = cmd.encode({"password": 0x00001011})
         lpl_data = encoded[8:]
         assert len(lpl_data) == 4
-        assert struct.unpack(">I", lpl_data)[0] == 0x00001011
\ No newline at end of file
+        assert struct.unpack(">I", lpl_data)[0] == 0x00001011
+
+class FakeTriggerModule:
+    """
+    Module recording the writer calls, with the given CdbCommandTriggerMethod.
+    Writes are split into transactions of up to write_max bytes in ascending
+    address order like optoe does, write_max being made known to the handler
+    if known_write_max is set.
+    """
+
+    TRIGGER_METHOD_OFFSET = 0x01 * 128 + 166
+
+    def __init__(self, single_write_trigger, write_max=256, known_write_max=True):
+        self.trigger_method = 0x20 if single_write_trigger else 0
+        self.write_max = write_max
+        self.writes = []
+        self.transactions = []
+        self.trigger_method_reads = 0
+        self.handler = CdbCmdHandler(self.read, self.write, CdbMemMap(CdbCodes))
+        if known_write_max:
+            self.handler.set_write_max(write_max)
+        self.handler.wait_for_cdb_status = MagicMock(return_value=[True, {
+            cdb_consts.CDB1_IS_BUSY: False,
+            cdb_consts.CDB1_HAS_FAILED: False,
+            cdb_consts.CDB1_STATUS: 0x1
+        }])
+
+    def read(self, offset, size):
+        assert offset == self.TRIGGER_METHOD_OFFSET
+        self.trigger_method_reads += 1
+        return bytearray([self.trigger_method])
+
+    def write(self, offset, size, data):
+        assert size == len(data)
+        self.writes.append((offset, bytes(data)))
+        for start in range(0, size, self.write_max):
+            self.transactions.append((offset + start, bytes(data[start:start + self.write_max])))
+        return True
+
+
+class TestCdbCmdTrigger:
+    """Test cases for the CDB command trigger methods"""
+
+    LPL_ADDR = cdb_consts.LPL_PAGE * cdb_consts.PAGE_SIZE + cdb_consts.CDB_LPL_CMD_START_OFFSET
+
+    def test_trigger_by_cmd_id(self):
+        module = FakeTriggerModule(single_write_trigger=False)
+        assert module.handler.write_lpl_block(0x100, b'\xAA' * 16) is True
+        assert len(module.writes) == 2
+        (offset1, data1), (offset2, data2) = module.writes
+        # Command ID written last
+        assert offset1 == self.LPL_ADDR + 2
+        assert offset2 == self.LPL_ADDR
+        assert data2 == struct.pack(">H", cdb_consts.CDB_WRITE_FIRMWARE_LPL_CMD)
+        assert data1.endswith(b'\xAA' * 16)
+
+    def test_single_write_trigger(self):
+        module = FakeTriggerModule(single_write_trigger=True)
+        assert module.handler.write_lpl_block(0x100, b'\xAA' * 16) is True
+        assert len(module.writes) == 1
+        offset, data = module.writes[0]
+        assert offset == self.LPL_ADDR
+        assert data[:2] == struct.pack(">H", cdb_consts.CDB_WRITE_FIRMWARE_LPL_CMD)
+        assert data[8:] == struct.pack(">I", 0x100) + b'\xAA' * 16
+
+    def test_single_write_trigger_split_write(self):
+        cmd_id = struct.pack(">H", cdb_consts.CDB_WRITE_FIRMWARE_LPL_CMD)
+        for known_write_max in (False, True):
+            # The message does not fit in a transaction of the transport
+            module = FakeTriggerModule(single_write_trigger=True, write_max=32,
+                                       known_write_max=known_write_max)
+            assert module.handler.write_lpl_block(0x100, b'\xAA' * 116) is True
+            assert len(module.writes) == 2
+            assert len(module.transactions) > 2
+            # The command ID bytes go out in the last transaction
+            assert module.transactions[-1] == (self.LPL_ADDR, cmd_id)
+            assert all(offset > self.LPL_ADDR + 1 for offset, _ in module.transactions[:-1])
+
+    def test_single_write_trigger_unknown_write_max(self):
+        module = FakeTriggerModule(single_write_trigger=True, known_write_max=False)
+        assert module.handler.write_lpl_block(0x100, b'\xAA' * 16) is True
+        assert len(module.writes) == 2
+        assert module.writes[-1][0] == self.LPL_ADDR
+
+    def test_firmware_download_writer_calls(self):
+        blocks = 32
+        calls = {}
+        for single_write_trigger in (False, True):
+            module = FakeTriggerModule(single_write_trigger)
+            for block in range(blocks):
+                assert module.handler.write_lpl_block(block * 116, b'\x55' * 116) is True
+            calls[single_write_trigger] = len(module.writes)
+            # The trigger method is read once per module
+            assert module.trigger_method_reads == 1
+        assert calls == {False: 2 * blocks, True: blocks}
+
+    def test_epl_block_writer_calls(self):
+        for single_write_trigger, cmd_writes in ((False, 2), (True, 1)):
+            module = FakeTriggerModule(single_write_trigger)
+            module.handler.write_raw = MagicMock(return_value=True)
+            module.handler.write_epl_pages(b'\x55' * 2048)
+            assert module.handler.write_epl_block(0, b'\x55' * 2048) is True
+            assert module.handler.write_raw.call_count == 16
+            assert len(module.writes) == cmd_writes
+
+    @pytest.mark.parametrize("lplonly_flag, blocks", [(True, 9), (False, 1)])
+    def test_download_write_max(self, lplonly_flag, blocks):
+        # The write_max is set by the download from the module's write length
+        module = FakeTriggerModule(single_write_trigger=True, known_write_max=False)
+        api = CmisApi(XcvrEeprom(MagicMock(return_value=None), MagicMock(), CmisMemMap(CmisCodes)))
+        api._cdb_fw_hdlr = module.handler
+        api._init_cdb_fw_handler = True
+        image = bytes(range(256)) * 4
+
+        assert api.module_fw_write_blocks(None, 0, 1024, lplonly_flag, image=image, writelength=256) == (True, '')
+        cmd_writes = [offset for offset, _ in module.writes if offset in (self.LPL_ADDR, self.LPL_ADDR + 2)]
+        # A single write per command
+        assert cmd_writes == [self.LPL_ADDR] * blocks
+        assert module.handler.write_max is None
+
+        module.writes = []
+        assert api.module_fw_write_blocks(None, 0, 1024, lplonly_flag, image=image) == (True, '')
+        cmd_writes = [offset for offset, _ in module.writes if offset in (self.LPL_ADDR, self.LPL_ADDR + 2)]
+        assert cmd_writes == [self.LPL_ADDR + 2, self.LPL_ADDR] * blocks
+
+    def test_trigger_method_read_failure(self):
+        module = FakeTriggerModule(single_write_trigger=True)
+        module.read = MagicMock(return_value=None)
+        module.handler.reader = module.read
+        assert module.handler.write_lpl_block(0, b'\x00') is True
+        assert len(module.writes) == 2
+        # Read again on the next command
+        assert module.handler.single_write_trigger is None
+
+
+class FakeAutoPagingModule:
+    """
+    Module with auto paging behind an optoe port: a write at a linear offset
+    selects its page, runs past the end of a page onto the next one, and page
+    0 is restored afterwards. Records each transaction and whether the port's
+    fd lock was held for it.
+    """
+
+    def __init__(self, path):
+        self.pages = {}
+        self.page_select = 0
+        self.transactions = []
+        self.sfp = FakeOptoeSfp(path)
+
+    def pwrite(self, fd, data, offset):
+        assert offset >= 2 * cdb_consts.PAGE_SIZE
+        self.transactions.append((offset, len(data), self.sfp._get_optoe_fd_lock().locked()))
+        self.page_select = offset // cdb_consts.PAGE_SIZE - 1
+        byte = cdb_consts.PAGE_SIZE + offset % cdb_consts.PAGE_SIZE
+        for value in bytes(data):
+            self.pages.setdefault(self.page_select, bytearray(cdb_consts.PAGE_SIZE))[byte - cdb_consts.PAGE_SIZE] = value
+            byte += 1
+            if byte == 2 * cdb_consts.PAGE_SIZE:
+                self.page_select += 1
+                byte = cdb_consts.PAGE_SIZE
+        self.page_select = 0
+        return len(data)
+
+
+class TestCdbEplAutoPaging:
+    """Test cases for sequential EPL writes on auto paging modules"""
+
+    EPL_ADDR = cdb_consts.EPL_PAGE * cdb_consts.PAGE_SIZE + cdb_consts.PAGE_SIZE
+
+    def setup_method(self):
+        self.writer = MagicMock(return_value=True)
+        self.handler = CdbCmdHandler(MagicMock(), self.writer, MagicMock())
+
+    def writes(self):
+        return [(offset, bytes(data)) for (offset, size, data), _ in self.writer.call_args_list
+                if size == len(data)]
+
+    def written(self):
+        data = b''
+        for offset, chunk in self.writes():
+            assert offset == self.EPL_ADDR + len(data)
+            data += chunk
+        return data
+
+    def test_page_by_page(self):
+        blkdata = bytes(range(256)) * 8
+        self.handler.write_epl_pages(blkdata)
+        assert self.writer.call_count == 16
+        assert self.written() == blkdata
+
+    def test_sequential_write(self):
+        blkdata = bytes(range(256)) * 8
+        self.handler.set_epl_auto_paging(True)
+        self.handler.write_epl_pages(blkdata)
+        # One write of the whole block, no page select
+        assert self.writes() == [(self.EPL_ADDR, blkdata)]
+
+    def test_sequential_write_chunked(self):
+        blkdata = bytes(range(256)) * 7 + b'\x01' * 100
+        self.handler.set_epl_auto_paging(True, write_max=48)
+        self.handler.write_epl_pages(blkdata)
+        # Split at write_max only, across the page boundaries
+        assert [len(chunk) for _, chunk in self.writes()] == [48] * 39 + [20]
+        assert self.written() == blkdata
+
+    def test_sequential_write_failure(self):
+        self.writer.return_value = False
+        self.handler.set_epl_auto_paging(True, write_max=512)
+        with pytest.raises(AssertionError):
+            self.handler.write_epl_pages(b'\x00' * 1024)
+        assert self.writer.call_count == 1
+
+    @pytest.mark.parametrize("write_max", [None, 48, 128, 200])
+    def test_stream_lands_on_epl_pages(self, tmp_path, write_max):
+        eeprom = tmp_path / 'eeprom'
+        eeprom.write_bytes(bytes(256))
+        module = FakeAutoPagingModule(str(eeprom))
+        handler = CdbCmdHandler(MagicMock(), self.writer, MagicMock(),
+                                stream_writer=module.sfp.write_eeprom_stream)
+        blkdata = bytes((i * 7) & 0xFF for i in range(cdb_consts.EPL_MAX_PAGES * cdb_consts.PAGE_SIZE))
+        handler.set_epl_auto_paging(True, write_max)
+
+        with patch.object(optoe_eeprom_rw.os, 'pwrite', side_effect=module.pwrite):
+            handler.write_epl_pages(blkdata)
+        module.sfp.close_eeprom()
+
+        assert sorted(module.pages) == list(range(cdb_consts.EPL_PAGE, cdb_consts.EPL_PAGE + 16))
+        for page in range(16):
+            assert module.pages[cdb_consts.EPL_PAGE + page] == \
+                blkdata[page * cdb_consts.PAGE_SIZE:(page + 1) * cdb_consts.PAGE_SIZE]
+        # Consecutive transactions of up to write_max bytes, all under the port's lock
+        offset = self.EPL_ADDR
+        for start, size, locked in module.transactions:
+            assert start == offset and locked
+            assert size == min(write_max or len(blkdata), self.EPL_ADDR + len(blkdata) - offset)
+            offset += size
+        assert offset == self.EPL_ADDR + len(blkdata)
+        assert module.page_select == 0
+        self.writer.assert_not_called()
+
+    def test_stream_write_failure(self, tmp_path):
+        eeprom = tmp_path / 'eeprom'
+        eeprom.write_bytes(bytes(256))
+        sfp = FakeOptoeSfp(str(eeprom))
+        handler = CdbCmdHandler(MagicMock(), self.writer, MagicMock(), stream_writer=sfp.write_eeprom_stream)
+        handler.set_epl_auto_paging(True, 128)
+        with patch.object(optoe_eeprom_rw.os, 'pwrite', side_effect=OSError("bus error")):
+            with pytest.raises(AssertionError):
+                handler.write_epl_pages(b'\x00' * 1024)
+        # The fd is closed and the page select unknown
+        assert sfp._optoe_fd is None and sfp._optoe_page is None
@@ -1,10 +1,16 @@
 # test_cdb_fw.py
 import pytest
-from mock import MagicMock, patch, mock_open, call
+from mock import MagicMock, patch, call
 #from unittest.mock import patch, mock_open, call
 from sonic_platform_base.sonic_xcvr.cdb.cdb_fw import CdbFwHandler
 from sonic_platform_base.sonic_xcvr.fields import cdb_consts
 
+def write_image(tmp_path, data):
+    """Write a firmware image file, returning its path"""
+    imgpath = tmp_path / "firmware.bin"
+    imgpath.write_bytes(data)
+    return str(imgpath)
+
 class TestCdbFwHandler:
     """Test cases for CdbFwHandler class"""
     
@@ -152,20 +158,15 @@ class TestCdbFwHandler:
         assert result == False
         self.handler.send_cmd.assert_called_once_with(cdb_consts.CDB_GET_FIRMWARE_INFO_CMD)
     
-    @patch("builtins.open", new_callable=mock_open, read_data=b"A" * 512)
-    def test_start_fw_download_success(self, mock_file):
+    def test_start_fw_download_success(self, tmp_path):
         """Test successful start_fw_download"""
         self.handler.start_payload_size = 128
         self.handler.send_cmd = MagicMock(return_value=True)
+        imgpath = write_image(tmp_path, b"A" * 512)
         
-        # Mock the file operations
-        mock_file.return_value.seek.return_value = None
-        mock_file.return_value.tell.return_value = 512  # Mock file size
-        
-        result = self.handler.start_fw_download("/path/to/firmware.bin")
+        result = self.handler.start_fw_download(imgpath)
         
         assert result == True
-        mock_file.assert_called_once_with("/path/to/firmware.bin", 'rb')
         self.handler.send_cmd.assert_called_once()
         
         # Verify payload
@@ -174,17 +175,13 @@ class TestCdbFwHandler:
         assert payload["imgsize"] == 512
         assert payload["imghdr"] == b"A" * 128
         
-    @patch("builtins.open", new_callable=mock_open, read_data=b"A" * 512)
-    def test_start_fw_download_no_header(self, mock_file):
+    def test_start_fw_download_no_header(self, tmp_path):
         """Test start_fw_download with no header required"""
         self.handler.start_payload_size = 0
         self.handler.send_cmd = MagicMock(return_value=True)
+        imgpath = write_image(tmp_path, b"A" * 512)
         
-        # Mock the file operations
-        mock_file.return_value.seek.return_value = None
-        mock_file.return_value.tell.return_value = 512  # Mock file size
-        
-        result = self.handler.start_fw_download("/path/to/firmware.bin")
+        result = self.handler.start_fw_download(imgpath)
         
         assert result == True
         # Verify payload has None for header
@@ -193,17 +190,13 @@ class TestCdbFwHandler:
         assert payload["imgsize"] == 512
         assert payload["imghdr"] == b''    
     
-    @patch("builtins.open", new_callable=mock_open, read_data=b"A" * 50)
-    def test_start_fw_download_file_too_small(self, mock_file):
+    def test_start_fw_download_file_too_small(self, tmp_path):
         """Test start_fw_download with file too small for header"""
         self.handler.start_payload_size = 128
-        
-        # Mock the file operations
-        mock_file.return_value.seek.return_value = None
-        mock_file.return_value.tell.return_value = 50  # Mock file size
+        imgpath = write_image(tmp_path, b"A" * 50)
         
         with pytest.raises(ValueError, match="Firmware image file is too small"):
-            self.handler.start_fw_download("/path/to/firmware.bin")
+            self.handler.start_fw_download(imgpath)
     
     def test_run_fw_image_default_params(self):
         """Test run_fw_image with default parameters"""
@@ -262,38 +255,24 @@ class TestCdbFwHandler:
         self.handler.send_cmd.assert_called_once_with(cdb_consts.CDB_ABORT_FIRMWARE_DOWNLOAD_CMD,
                             timeout=self.handler.timeout_abort)
     
-    @patch("builtins.open", new_callable=mock_open)
-    def test_download_fw_image_lpl_success(self, mock_file):
+    def test_download_fw_image_lpl_success(self, tmp_path):
         """Test successful download_fw_image with LPL only"""
-        # Setup file content
-        file_data = b"H" * 128 + b"D" * 1024  # Header + Data
-        mock_file.return_value.read.side_effect = [
-            b"H" * 128,  # Header read
-            b"D" * 1024,  # First data chunk
-            b""  # EOF
-        ]
+        imgpath = write_image(tmp_path, b"H" * 128 + b"D" * 1024)  # Header + Data
         
         self.handler.start_payload_size = 128
         self.handler.rw_length_ext = 1024
         self.handler.is_lpl_only = True
         self.handler.write_lpl_block = MagicMock(return_value=True)
         
-        result, bytes_written = self.handler.download_fw_image("/path/to/firmware.bin")
+        result, bytes_written = self.handler.download_fw_image(imgpath)
         
         assert result == True
         assert bytes_written == 1024
         self.handler.write_lpl_block.assert_called_once_with(0, b"D" * 1024, timeout=self.handler.timeout_write)
     
-    @patch("builtins.open", new_callable=mock_open)
-    def test_download_fw_image_epl_success(self, mock_file):
+    def test_download_fw_image_epl_success(self, tmp_path):
         """Test successful download_fw_image with EPL"""
-        # Setup file content
-        mock_file.return_value.read.side_effect = [
-            b"H" * 256,  # Header read
-            b"D" * 2048,  # First data chunk
-            b"E" * 1024,  # Second data chunk
-            b""  # EOF
-        ]
+        imgpath = write_image(tmp_path, b"H" * 256 + b"D" * 2048 + b"E" * 1024)
         
         self.handler.start_payload_size = 256
         self.handler.rw_length_ext = 2048
@@ -301,7 +280,7 @@ class TestCdbFwHandler:
         self.handler.write_epl_pages = MagicMock(return_value=True)
         self.handler.write_epl_block = MagicMock(return_value=True)
         
-        result, bytes_written = self.handler.download_fw_image("/path/to/firmware.bin")
+        result, bytes_written = self.handler.download_fw_image(imgpath)
         
         assert result == True
         assert bytes_written == 3072  # 2048 + 1024
@@ -313,31 +292,23 @@ class TestCdbFwHandler:
         assert calls[0] == call(0, b"D" * 2048, timeout=self.handler.timeout_write)
         assert calls[1] == call(2048, b"E" * 1024, timeout=self.handler.timeout_write)
     
-    @patch("builtins.open", new_callable=mock_open)
-    def test_download_fw_image_no_header(self, mock_file):
+    def test_download_fw_image_no_header(self, tmp_path):
         """Test download_fw_image with no header required"""
-        mock_file.return_value.read.side_effect = [
-            b"D" * 512,  # Data chunk
-            b""  # EOF
-        ]
+        imgpath = write_image(tmp_path, b"D" * 512)
         
         self.handler.start_payload_size = 0
         self.handler.rw_length_ext = 1024
         self.handler.is_lpl_only = True
         self.handler.write_lpl_block = MagicMock(return_value=True)
         
-        result, bytes_written = self.handler.download_fw_image("/path/to/firmware.bin")
+        result, bytes_written = self.handler.download_fw_image(imgpath)
         
         assert result == True
         assert bytes_written == 512
     
-    @patch("builtins.open", new_callable=mock_open)
-    def test_download_fw_image_epl_write_failure(self, mock_file):
+    def test_download_fw_image_epl_write_failure(self, tmp_path):
         """Test download_fw_image with EPL write failure"""
-        mock_file.return_value.read.side_effect = [
-            b"H" * 128,  # Header
-            b"D" * 1024,  # Data
-        ]
+        imgpath = write_image(tmp_path, b"H" * 128 + b"D" * 1024)
         
         self.handler.start_payload_size = 128
         self.handler.rw_length_ext = 1024
@@ -345,59 +316,54 @@ class TestCdbFwHandler:
         self.handler.write_epl_pages = MagicMock(return_value=True)
         self.handler.write_epl_block = MagicMock(return_value=False)
         
-        result, bytes_written = self.handler.download_fw_image("/path/to/firmware.bin")
+        result, bytes_written = self.handler.download_fw_image(imgpath)
         
         assert result == False
         assert bytes_written == 0
     
-    def test_download_fw_image_file_not_found(self):
+    def test_download_fw_image_file_not_found(self, tmp_path):
         """Test download_fw_image with file not found"""
-        with patch("builtins.open", side_effect=FileNotFoundError()):
-            result, bytes_written = self.handler.download_fw_image("/nonexistent/file.bin")
-            
-            assert result == False
-            assert bytes_written == 0
+        result, bytes_written = self.handler.download_fw_image(str(tmp_path / "missing.bin"))
+        
+        assert result == False
+        assert bytes_written == 0
     
-    @patch("builtins.open", new_callable=mock_open, read_data=b"A" * 50)
-    def test_download_fw_image_file_too_small(self, mock_file):
+    def test_download_fw_image_file_too_small(self, tmp_path):
         """Test download_fw_image with file too small for header"""
         self.handler.start_payload_size = 128
+        imgpath = write_image(tmp_path, b"A" * 50)
         
-        result, bytes_written = self.handler.download_fw_image("/path/to/firmware.bin")
+        result, bytes_written = self.handler.download_fw_image(imgpath)
         
         assert result == False
         assert bytes_written == 0
     
-    @patch("builtins.open", new_callable=mock_open)
-    def test_download_fw_image_generic_exception(self, mock_file):
+    def test_download_fw_image_generic_exception(self, tmp_path):
         """Test download_fw_image with generic exception"""
-        mock_file.return_value.read.side_effect = Exception("Test exception")
+        imgpath = write_image(tmp_path, b"D" * 512)
+        self.handler.start_payload_size = 0
+        self.handler.rw_length_ext = 512
+        self.handler.is_lpl_only = True
+        self.handler.write_lpl_block = MagicMock(side_effect=Exception("Test exception"))
         self.handler.abort_fw_download = MagicMock(return_value=True)
         
-        result, bytes_written = self.handler.download_fw_image("/path/to/firmware.bin")
+        result, bytes_written = self.handler.download_fw_image(imgpath)
         
         assert result == False
         assert bytes_written == 0
         self.handler.abort_fw_download.assert_called_once()
     
-    @patch("builtins.open", new_callable=mock_open)
-    def test_download_fw_image_multiple_chunks(self, mock_file):
+    def test_download_fw_image_multiple_chunks(self, tmp_path):
         """Test download_fw_image with multiple data chunks"""
-        # Setup multiple chunks
-        mock_file.return_value.read.side_effect = [
-            b"H" * 64,   # Header
-            b"A" * 512,  # Chunk 1
-            b"B" * 512,  # Chunk 2
-            b"C" * 256,  # Chunk 3 (partial)
-            b""          # EOF
-        ]
+        # Header, then chunks 1 and 2 and a partial chunk 3
+        imgpath = write_image(tmp_path, b"H" * 64 + b"A" * 512 + b"B" * 512 + b"C" * 256)
         
         self.handler.start_payload_size = 64
         self.handler.rw_length_ext = 512
         self.handler.is_lpl_only = True
         self.handler.write_lpl_block = MagicMock(return_value=True)
         
-        result, bytes_written = self.handler.download_fw_image("/path/to/firmware.bin")
+        result, bytes_written = self.handler.download_fw_image(imgpath)
         
         assert result == True
         assert bytes_written == 1280  # 512 + 512 + 256
@@ -409,33 +375,30 @@ class TestCdbFwHandler:
         assert calls[1] == call(512, b"B" * 512, timeout=self.handler.timeout_write)
         assert calls[2] == call(1024, b"C" * 256, timeout=self.handler.timeout_write)
     
-    def test_download_fw_image_empty_file_with_header(self):
+    def test_download_fw_image_empty_file_with_header(self, tmp_path):
         """Test download_fw_image with empty file when header is required"""
-        with patch("builtins.open", mock_open(read_data=b"")):
-            self.handler.start_payload_size = 128
-            
-            result, bytes_written = self.handler.download_fw_image("/path/to/empty.bin")
-            
-            assert result == False
-            assert bytes_written == 0
+        self.handler.start_payload_size = 128
+        
+        result, bytes_written = self.handler.download_fw_image(write_image(tmp_path, b""))
+        
+        assert result == False
+        assert bytes_written == 0
     
-    def test_download_fw_image_empty_file_no_header(self):
+    def test_download_fw_image_empty_file_no_header(self, tmp_path):
         """Test download_fw_image with empty file when no header required"""
-        with patch("builtins.open", mock_open(read_data=b"")):
-            self.handler.start_payload_size = 0
-            
-            result, bytes_written = self.handler.download_fw_image("/path/to/empty.bin")
-            
-            assert result == True
-            assert bytes_written == 0
+        self.handler.start_payload_size = 0
+        
+        result, bytes_written = self.handler.download_fw_image(write_image(tmp_path, b""))
+        
+        assert result == True
+        assert bytes_written == 0
 
 
 # Integration tests
 class TestCdbFwHandlerIntegration:
     """Integration tests for CdbFwHandler"""
     
-    @patch("builtins.open", new_callable=mock_open)
-    def test_full_firmware_update_flow_lpl(self, mock_file):
+    def test_full_firmware_update_flow_lpl(self, tmp_path):
         """Test complete firmware update flow with LPL"""
         # Setup
         reader = MagicMock()
@@ -451,23 +414,15 @@ class TestCdbFwHandlerIntegration:
             }):
                 handler = CdbFwHandler(reader, writer, mem_map)
         
-        # Setup file content and operations for start_fw_download
-        mock_file.return_value.read.side_effect = [
-            b"H" * 64,   # Header for start
-            b"H" * 64,   # Header for download
-            b"D" * 248,  # Data chunk
-            b""          # EOF
-        ]
-        mock_file.return_value.seek.return_value = None
-        mock_file.return_value.tell.return_value = 312  # 64 + 248
+        imgpath = write_image(tmp_path, b"H" * 64 + b"D" * 248)
         
         # Mock methods
         handler.send_cmd = MagicMock(return_value=True)
         handler.write_lpl_block = MagicMock(return_value=True)
         
         # Execute full flow
-        assert handler.start_fw_download("/path/to/fw.bin") == True
-        result, bytes_written = handler.download_fw_image("/path/to/fw.bin")
+        assert handler.start_fw_download(imgpath) == True
+        result, bytes_written = handler.download_fw_image(imgpath)
         print(f"Download result: {result}, Bytes written: {bytes_written}")
         assert handler.complete_fw_download() == True
         assert handler.run_fw_image() == True
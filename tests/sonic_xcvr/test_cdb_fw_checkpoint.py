@@ -0,0 +1,198 @@
+import hashlib
+
+import pytest
+from mock import MagicMock, patch
+
+from sonic_platform_base.sonic_xcvr.api.public.cmis import CmisApi
+from sonic_platform_base.sonic_xcvr.cdb.cdb_fw_checkpoint import CdbFwCheckpoint
+from sonic_platform_base.sonic_xcvr.codes.public.cmis import CmisCodes
+from sonic_platform_base.sonic_xcvr.fields import cdb_consts
+from sonic_platform_base.sonic_xcvr.mem_maps.public.cmis import CmisMemMap
+from sonic_platform_base.sonic_xcvr.xcvr_eeprom import XcvrEeprom
+
+MODULE_KEY = 'VENDOR/PN-1/SN1'
+BLOCK_SIZE = cdb_consts.LPL_MAX_PAYLOAD_SIZE
+IMAGE = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    checkpoint = CdbFwCheckpoint(str(tmp_path / 'checkpoint.json'))
+    with patch.object(CdbFwCheckpoint, '_shared', checkpoint):
+        yield checkpoint
+
+
+@pytest.fixture
+def imagepath(tmp_path):
+    path = tmp_path / 'fw.bin'
+    path.write_bytes(IMAGE)
+    return str(path)
+
+
+class FlakyFwHandler(object):
+    """CdbFwHandler stand-in failing the LPL block writes at the given addresses"""
+    def __init__(self, fail_at=(), resumable=True):
+        self.fail_at = set(fail_at)
+        self.resumable = resumable
+        self.in_progress = False
+        self.written = {}
+        self.starts = 0
+        self.aborts = 0
+        self.start_payload_size = 0
+        self.running_b = False
+        self.write_max = None
+
+    def set_write_max(self, write_max):
+        self.write_max = write_max
+
+    def start_fw_download(self, imagepath):
+        self.starts += 1
+        self.in_progress = True
+        self.written = {}
+        return True
+
+    def write_lpl_block(self, blkaddr, blkdata, timeout=None):
+        if blkaddr in self.fail_at or not self.in_progress:
+            self.fail_at.discard(blkaddr)
+            if not self.resumable:
+                self.in_progress = False
+            return False
+        self.written[blkaddr] = bytes(blkdata)
+        return True
+
+    def abort_fw_download(self):
+        self.aborts += 1
+        self.in_progress = False
+        return True
+
+    def complete_fw_download(self):
+        return self.in_progress
+
+    def get_firmware_info(self):
+        return {cdb_consts.CDB1_FIRMWARE_STATUS: {
+            cdb_consts.CDB1_BANKA_OPER_STATUS: not self.running_b,
+            cdb_consts.CDB1_BANKA_VALID_STATUS: False,
+            cdb_consts.CDB1_BANKB_OPER_STATUS: self.running_b,
+            cdb_consts.CDB1_BANKB_VALID_STATUS: self.in_progress,
+        }}
+
+    def get_cmd_status_code(self):
+        return {cdb_consts.CDB1_IS_BUSY: False, cdb_consts.CDB1_HAS_FAILED: True, cdb_consts.CDB1_STATUS: 0x7}
+
+    def save_poll_profile(self):
+        pass
+
+    def image(self):
+        return b''.join(self.written[address] for address in sorted(self.written))
+
+
+def make_api(handler):
+    api = CmisApi(XcvrEeprom(MagicMock(return_value=None), MagicMock(), CmisMemMap(CmisCodes)))
+    api._cdb_fw_hdlr = handler
+    api._init_cdb_fw_handler = True
+    api._get_fw_checkpoint_key = MagicMock(return_value=MODULE_KEY)
+    return api
+
+
+def download(api, imagepath, resume=True):
+    return api.module_fw_download(0, BLOCK_SIZE, True, False, 8, imagepath, resume=resume)
+
+
+class TestCdbFwCheckpoint(object):
+    def test_update_get_clear(self, tmp_path):
+        path = str(tmp_path / 'cache' / 'checkpoint.json')
+        checkpoint = CdbFwCheckpoint(path, interval=3600)
+        assert checkpoint.get(MODULE_KEY, 'digest') == 0
+        assert checkpoint.update(MODULE_KEY, 'digest', 0x100, save=True)
+        # Not saved before interval elapsed, kept in memory
+        checkpoint.update(MODULE_KEY, 'digest', 0x200)
+        assert checkpoint.get(MODULE_KEY, 'digest') == 0x200
+        assert CdbFwCheckpoint(path).get(MODULE_KEY, 'digest') == 0x100
+        assert checkpoint.get(MODULE_KEY, 'other digest') == 0
+
+        checkpoint.clear(MODULE_KEY)
+        assert CdbFwCheckpoint(path).get(MODULE_KEY, 'digest') == 0
+
+    def test_corrupted_file(self, tmp_path):
+        path = tmp_path / 'checkpoint.json'
+        path.write_text('{"key": 1}')
+        assert CdbFwCheckpoint(str(path)).get('key', 'digest') == 0
+
+
+class TestResumableDownload(object):
+    def test_resume_after_failure(self, checkpoint, imagepath):
+        handler = FlakyFwHandler(fail_at=[3 * BLOCK_SIZE])
+        api = make_api(handler)
+
+        status, txt = download(api, imagepath)
+        assert not status
+        assert handler.aborts == 0
+        digest = hashlib.sha256(IMAGE).hexdigest()
+        assert checkpoint.get(MODULE_KEY, digest) == 3 * BLOCK_SIZE
+        assert CdbFwCheckpoint(checkpoint.path).get(MODULE_KEY, digest) == 3 * BLOCK_SIZE
+
+        status, txt = download(api, imagepath)
+        assert status, txt
+        assert 'Resuming' in txt
+        assert handler.starts == 1
+        assert handler.image() == IMAGE
+        assert checkpoint.get(MODULE_KEY, digest) == 0
+
+    def test_restart_when_module_lost_download(self, checkpoint, imagepath):
+        handler = FlakyFwHandler(fail_at=[3 * BLOCK_SIZE], resumable=False)
+        api = make_api(handler)
+        assert not download(api, imagepath)[0]
+
+        status, txt = download(api, imagepath)
+        assert status, txt
+        assert 'restarting' in txt
+        assert handler.starts == 2
+        assert handler.aborts == 1
+        assert handler.image() == IMAGE
+
+    def test_restart_when_module_state_changed(self, checkpoint, imagepath):
+        handler = FlakyFwHandler(fail_at=[3 * BLOCK_SIZE])
+        api = make_api(handler)
+        assert not download(api, imagepath)[0]
+        assert checkpoint.get_state(MODULE_KEY) == [1, 0, 0, 1]
+
+        # The module rebooted to the other image meanwhile
+        handler.running_b = True
+        status, txt = download(api, imagepath)
+        assert status, txt
+        assert 'does not match' in txt
+        assert 'Resuming' not in txt
+        assert handler.starts == 2
+        assert handler.aborts == 1
+        assert handler.image() == IMAGE
+
+    def test_resumed_failure_aborted(self, checkpoint, imagepath):
+        handler = FlakyFwHandler(fail_at=[3 * BLOCK_SIZE, 5 * BLOCK_SIZE])
+        api = make_api(handler)
+        assert not download(api, imagepath)[0]
+
+        status, txt = download(api, imagepath)
+        assert not status
+        assert 'aborting' in txt
+        assert handler.starts == 1
+        assert handler.aborts == 1
+        assert checkpoint.get(MODULE_KEY, hashlib.sha256(IMAGE).hexdigest()) == 0
+
+        status, txt = download(api, imagepath)
+        assert status, txt
+        assert handler.starts == 2
+        assert handler.image() == IMAGE
+
+    def test_other_image_downloaded_from_start(self, checkpoint, imagepath):
+        checkpoint.update(MODULE_KEY, 'other digest', 3 * BLOCK_SIZE)
+        handler = FlakyFwHandler()
+        status, _ = download(make_api(handler), imagepath)
+        assert status
+        assert handler.starts == 1
+        assert handler.image() == IMAGE
+
+    def test_not_resumable_by_default(self, checkpoint, imagepath):
+        handler = FlakyFwHandler(fail_at=[3 * BLOCK_SIZE])
+        assert not download(make_api(handler), imagepath, resume=False)[0]
+        assert handler.aborts == 1
+        assert checkpoint.get(MODULE_KEY, hashlib.sha256(IMAGE).hexdigest()) == 0
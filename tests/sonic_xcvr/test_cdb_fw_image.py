@@ -0,0 +1,88 @@
+import os
+
+import pytest
+from mock import patch
+
+from sonic_platform_base.sonic_xcvr.cdb.cdb_fw_image import CdbFwImage
+
+
+@pytest.fixture(autouse=True)
+def clear_shared():
+    CdbFwImage.clear_shared()
+    yield
+    CdbFwImage.clear_shared()
+
+
+class TestCdbFwImage(object):
+    def test_header_and_blocks(self, tmp_path):
+        path = tmp_path / 'fw.bin'
+        path.write_bytes(b'H' * 4 + b'A' * 8 + b'B' * 8 + b'C' * 3)
+        image = CdbFwImage(str(path))
+        assert len(image) == 23
+        assert image.header(4) == b'H' * 4
+        assert isinstance(image.header(4), bytes)
+        blocks = list(image.blocks(4, 8))
+        assert [address for address, _ in blocks] == [0, 8, 16]
+        assert [bytes(data) for _, data in blocks] == [b'A' * 8, b'B' * 8, b'C' * 3]
+        assert all(isinstance(data, memoryview) for _, data in blocks)
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / 'empty.bin'
+        path.write_bytes(b'')
+        image = CdbFwImage(str(path))
+        assert len(image) == 0
+        assert image.header(0) == b''
+        assert list(image.blocks(0, 8)) == []
+
+    def test_shared_mapping(self, tmp_path):
+        path = tmp_path / 'fw.bin'
+        path.write_bytes(b'1' * 16)
+        image = CdbFwImage.get_shared(str(path))
+        assert CdbFwImage.get_shared(str(path)) is image
+
+        # Replacing the file maps the new image, the old mapping stays valid
+        new_path = tmp_path / 'fw.bin.new'
+        new_path.write_bytes(b'2' * 32)
+        os.replace(str(new_path), str(path))
+        new_image = CdbFwImage.get_shared(str(path))
+        assert new_image is not image
+        assert bytes(new_image.view) == b'2' * 32
+        assert bytes(image.view) == b'1' * 16
+
+    def test_rewritten_in_place(self, tmp_path):
+        path = tmp_path / 'fw.bin'
+        path.write_bytes(b'1' * 16)
+        image = CdbFwImage.get_shared(str(path))
+        assert image._mmap is None
+
+        # Truncating the file keeps the image as read, a new one is read
+        with open(str(path), 'r+b') as f:
+            f.truncate(4)
+        assert bytes(image.view) == b'1' * 16
+        assert [bytes(data) for _, data in image.blocks(0, 8)] == [b'1' * 8, b'1' * 8]
+        assert bytes(CdbFwImage.get_shared(str(path)).view) == b'1' * 4
+
+    def test_large_image_mapped(self, tmp_path):
+        path = tmp_path / 'fw.bin'
+        path.write_bytes(b'H' * 4 + b'A' * 8)
+        with patch.object(CdbFwImage, 'MAX_READ_SIZE', 8):
+            image = CdbFwImage(str(path))
+        assert image._mmap is not None
+        assert len(image) == 12
+        assert image.header(4) == b'H' * 4
+        assert [bytes(data) for _, data in image.blocks(4, 8)] == [b'A' * 8]
+
+    def test_shared_lru(self, tmp_path):
+        paths = []
+        for i in range(CdbFwImage.SHARED_MAX + 1):
+            path = tmp_path / ('fw%d.bin' % i)
+            path.write_bytes(bytes([i]) * 4)
+            paths.append(str(path))
+        first = CdbFwImage.get_shared(paths[0])
+        for path in paths[1:]:
+            CdbFwImage.get_shared(path)
+        assert CdbFwImage.get_shared(paths[0]) is not first
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            CdbFwImage.get_shared(str(tmp_path / 'missing.bin'))
@@ -0,0 +1,170 @@
+import threading
+
+import pytest
+from mock import patch
+
+from sonic_platform_base.sonic_xcvr.api.public.cdb_fw import CmisCdbFw
+from sonic_platform_base.sonic_xcvr.api.public.cdb_fw_upgrade import CdbFwUpgradeOrchestrator, \
+    FW_UPGRADE_PHASE_DOWNLOAD, FW_UPGRADE_PHASE_DONE, FW_UPGRADE_PHASE_FAILED, FW_UPGRADE_PHASE_QUEUED
+
+
+class FakeClock(object):
+    """time.monotonic()/time.sleep() of the orchestrator, advanced by the fake modules"""
+    def __init__(self):
+        self.now = 0.0
+        self.lock = threading.Lock()
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        with self.lock:
+            self.now += seconds
+
+
+class FakeFwApi(object):
+    """CmisCdbFw stand-in recording the upgrade steps of one module"""
+    def __init__(self, port, bus, events, clock, download_time=2, run_ok=True, commit_ok=True,
+                 on_download=None):
+        self.port = port
+        self.bus = bus
+        self.events = events
+        self.clock = clock
+        self.download_time = download_time
+        self.run_ok = run_ok
+        self.commit_ok = commit_ok
+        self.on_download = on_download
+        self.images = []
+
+    def get_module_fw_info(self):
+        return {'status': True, 'info': '', 'result': (None,) * 10}
+
+    def get_module_fw_mgmt_feature(self):
+        return {'status': True, 'info': '', 'feature': (4, 8, True, False, 8)}
+
+    module_fw_info_and_download = CmisCdbFw.module_fw_info_and_download
+
+    def module_fw_download(self, startLPLsize, maxblocksize, lplonly_flag, autopaging_flag, writelength,
+                           imagepath, image=None, progress_callback=None, resume=False):
+        self.events.append(('download', self.port, self.bus, self.clock.now))
+        self.images.append(image)
+        if self.on_download is not None:
+            self.on_download(self)
+        for written in (8, 16):
+            self.clock.sleep(self.download_time / 2)
+            progress_callback(written, 16, self.download_time * written / 16)
+        self.events.append(('downloaded', self.port, self.bus, self.clock.now))
+        return True, 'downloaded\n'
+
+    def module_fw_run(self, mode=0x01):
+        self.events.append(('run', self.port, self.bus, self.clock.now))
+        return self.run_ok, 'run\n'
+
+    def module_fw_commit(self):
+        self.events.append(('commit', self.port, self.bus, self.clock.now))
+        return self.commit_ok, 'commit\n'
+
+
+@pytest.fixture
+def clock():
+    fake_clock = FakeClock()
+    with patch('sonic_platform_base.sonic_xcvr.api.public.cdb_fw_upgrade.time', fake_clock):
+        yield fake_clock
+
+
+def make_image(tmp_path):
+    path = tmp_path / 'fw.bin'
+    path.write_bytes(bytes(range(16)))
+    return str(path)
+
+
+class TestCdbFwUpgradeOrchestrator(object):
+    def test_upgrade_groups_concurrently_and_reads_image_once(self, tmp_path, clock):
+        imagepath = make_image(tmp_path)
+        events = []
+        active = {}
+        lock = threading.Lock()
+        # Each bus's first download waits for the other bus's, so serial groups would time out
+        both_buses = threading.Barrier(2, timeout=5)
+
+        def on_download(api):
+            with lock:
+                assert not active.get(api.bus)
+                active[api.bus] = True
+            if api.port < 2:
+                both_buses.wait()
+            with lock:
+                active[api.bus] = False
+
+        apis = [FakeFwApi(port, port % 2, events, clock, on_download=on_download) for port in range(6)]
+        groups = [[(api.port, api) for api in apis if api.bus == bus] for bus in (0, 1)]
+        orchestrator = CdbFwUpgradeOrchestrator(commit_delay=1)
+        results = orchestrator.upgrade(groups, imagepath)
+
+        assert results == {port: (True, 'downloaded\n') for port in range(6)}
+        assert orchestrator.image_reads == 1
+        assert all(api.images == [bytes(range(16))] for api in apis)
+        assert all(api.images[0] is apis[0].images[0] for api in apis)
+
+    def test_commit_pipelined_with_next_download(self, clock):
+        events = []
+        apis = [FakeFwApi(port, 0, events, clock, download_time=5) for port in range(3)]
+        orchestrator = CdbFwUpgradeOrchestrator(commit_delay=3)
+        with patch.object(orchestrator, 'get_image', return_value=b'image'):
+            results = orchestrator.upgrade([[(api.port, api) for api in apis]], '/tmp/fw.bin')
+        assert all(status for status, _ in results.values())
+        order = [(event, port) for event, port, _, _ in events if event in ('download', 'commit')]
+        # Port 0 is committed once its commit_delay elapsed during port 1's download
+        assert order == [('download', 0), ('download', 1), ('commit', 0), ('download', 2),
+                         ('commit', 1), ('commit', 2)]
+        times = {(event, port): t for event, port, _, t in events}
+        assert all(times[('commit', port)] - times[('run', port)] >= 3 for port in range(3))
+        # 3 downloads + one commit_delay, instead of 3 x (download + commit_delay)
+        assert clock.now == 18
+
+    def test_progress_and_failures(self, clock):
+        events = []
+        apis = [FakeFwApi(0, 0, events, clock), FakeFwApi(1, 0, events, clock, run_ok=False),
+                FakeFwApi(2, 0, events, clock, commit_ok=False)]
+        states = {}
+        lock = threading.Lock()
+
+        def progress(port, state):
+            with lock:
+                states.setdefault(port, []).append(dict(state))
+
+        orchestrator = CdbFwUpgradeOrchestrator(progress_callback=progress, commit_delay=0)
+        with patch.object(orchestrator, 'get_image', return_value=b'image'):
+            results = orchestrator.upgrade([[(api.port, api) for api in apis]], '/tmp/fw.bin')
+        assert results[0] == (True, 'downloaded\n')
+        assert results[1][0] is False and 'Module FW run failed' in results[1][1]
+        assert results[2][0] is False and 'Module FW commit failed' in results[2][1]
+
+        phases = [state['phase'] for state in states[0]]
+        assert phases[0] == FW_UPGRADE_PHASE_QUEUED
+        assert phases[-1] == FW_UPGRADE_PHASE_DONE
+        downloads = [state for state in states[0] if state['phase'] == FW_UPGRADE_PHASE_DOWNLOAD]
+        assert [state['progress'] for state in downloads] == [0.0, 50.0, 100.0]
+        assert downloads[0]['eta'] is None and downloads[1]['eta'] > 0 and downloads[2]['eta'] == 0
+        assert states[1][-1]['phase'] == FW_UPGRADE_PHASE_FAILED
+        assert states[2][-1]['phase'] == FW_UPGRADE_PHASE_FAILED
+
+    def test_bad_image_path(self, tmp_path, clock):
+        api = FakeFwApi(0, 0, [], clock)
+        results = CdbFwUpgradeOrchestrator().upgrade([[(0, api)]], str(tmp_path / 'missing.bin'))
+        assert results[0][0] is False
+        assert 'incorrect' in results[0][1]
+        assert api.images == []
+
+    def test_per_port_images(self, tmp_path, clock):
+        paths = {}
+        for port in range(2):
+            path = tmp_path / ('fw%d.bin' % port)
+            path.write_bytes(bytes([port]) * 16)
+            paths[port] = str(path)
+        apis = [FakeFwApi(port, port, [], clock) for port in range(2)]
+        orchestrator = CdbFwUpgradeOrchestrator(commit_delay=0)
+        results = orchestrator.upgrade([[(api.port, api)] for api in apis], paths)
+        assert all(status for status, _ in results.values())
+        assert [api.images[0] for api in apis] == [bytes([0]) * 16, bytes([1]) * 16]
+        assert orchestrator.image_reads == 2
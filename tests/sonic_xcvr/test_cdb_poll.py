@@ -0,0 +1,128 @@
+import json
+
+import pytest
+from mock import patch
+
+from sonic_platform_base.sonic_xcvr.cdb.cdb import CdbCmdHandler
+from sonic_platform_base.sonic_xcvr.cdb.cdb_poll import CdbPollProfile
+from sonic_platform_base.sonic_xcvr.codes.public.cdb import CdbCodes
+from sonic_platform_base.sonic_xcvr.fields import cdb_consts
+from sonic_platform_base.sonic_xcvr.mem_maps.public.cmis.cdb import CdbMemMap
+
+CDB_STATUS_BUSY = 0x81
+CDB_STATUS_SUCCESS = 0x01
+CDB_STATUS_OFFSET = 37
+
+POLL_KEY = 'VENDOR/PN-1'
+
+
+class FakeCdbModule(object):
+    """
+    Module whose CDB completes each command latency msec after it is
+    triggered, on a clock advanced by the status polls' sleeps
+    """
+    def __init__(self, latency, poll_profile=None):
+        self.latency = latency
+        self.now = 0
+        self.done_at = None
+        self.status_reads = 0
+        self.handler = CdbCmdHandler(self.read, self.write, CdbMemMap(CdbCodes), poll_profile, POLL_KEY)
+
+    def sleep(self, seconds):
+        self.now += round(seconds * 1000)
+
+    def read(self, offset, size):
+        if offset != CDB_STATUS_OFFSET:
+            return bytearray([0])
+        self.status_reads += 1
+        return bytearray([CDB_STATUS_SUCCESS if self.now >= self.done_at else CDB_STATUS_BUSY])
+
+    def write(self, offset, size, data):
+        if offset == self.handler.mem_map.get_cdb_cmd(cdb_consts.CDB_QUERY_STATUS_CMD).getaddr():
+            self.done_at = self.now + self.latency
+        return True
+
+    def download(self, blocks):
+        """Write blocks LPL blocks, returning the msec spent waiting for them"""
+        with patch('sonic_platform_base.sonic_xcvr.cdb.cdb.time.sleep', self.sleep):
+            for block in range(blocks):
+                assert self.handler.write_lpl_block(block * 8, b'\x00' * 8) is True
+        return self.now
+
+
+class TestCdbPollProfile(object):
+    def test_ewma(self):
+        profile = CdbPollProfile(weight=0.5)
+        assert profile.get(POLL_KEY, cdb_consts.CDB_WRITE_FIRMWARE_LPL_CMD) is None
+        assert profile.update(POLL_KEY, cdb_consts.CDB_WRITE_FIRMWARE_LPL_CMD, 200) == 200
+        assert profile.update(POLL_KEY, cdb_consts.CDB_WRITE_FIRMWARE_LPL_CMD, 100) == 150
+        assert profile.get(POLL_KEY, cdb_consts.CDB_WRITE_FIRMWARE_LPL_CMD) == 150
+        assert profile.get('OTHER/PN', cdb_consts.CDB_WRITE_FIRMWARE_LPL_CMD) is None
+
+    def test_save_and_load(self, tmp_path):
+        path = str(tmp_path / 'cache' / 'profile.json')
+        profile = CdbPollProfile(path)
+        profile.update(POLL_KEY, cdb_consts.CDB_WRITE_FIRMWARE_EPL_CMD, 420)
+        assert profile.save()
+        with open(path) as f:
+            assert json.load(f) == {POLL_KEY: {str(cdb_consts.CDB_WRITE_FIRMWARE_EPL_CMD): 420.0}}
+
+        loaded = CdbPollProfile(path)
+        assert loaded.get(POLL_KEY, cdb_consts.CDB_WRITE_FIRMWARE_EPL_CMD) == 420
+
+    def test_load_corrupted(self, tmp_path):
+        path = tmp_path / 'profile.json'
+        path.write_text('not json')
+        profile = CdbPollProfile(str(path))
+        assert not profile.load()
+        assert profile.get(POLL_KEY, cdb_consts.CDB_WRITE_FIRMWARE_EPL_CMD) is None
+
+    def test_save_failure(self, tmp_path):
+        path = tmp_path / 'file'
+        path.write_text('')
+        profile = CdbPollProfile(str(path / 'profile.json'))
+        profile.update(POLL_KEY, cdb_consts.CDB_WRITE_FIRMWARE_EPL_CMD, 420)
+        assert not profile.save()
+
+
+class TestCdbAdaptivePolling(object):
+    def test_unlearned_backoff(self):
+        module = FakeCdbModule(latency=230)
+        assert module.download(1) == 250
+        # Polls at 100, 110, 130, 170 and 250 msec
+        assert module.status_reads == 5
+
+    def test_learned_delay(self):
+        profile = CdbPollProfile()
+        profile.update(POLL_KEY, cdb_consts.CDB_WRITE_FIRMWARE_LPL_CMD, 230)
+        module = FakeCdbModule(latency=230, poll_profile=profile)
+        assert module.download(1) == 230
+        assert module.status_reads == 1
+        # Completed on the first poll: the next command probes a shorter delay
+        assert profile.get(POLL_KEY, cdb_consts.CDB_WRITE_FIRMWARE_LPL_CMD) < 230
+
+    def test_delay_not_below_capture_time(self):
+        profile = CdbPollProfile()
+        profile.update(POLL_KEY, cdb_consts.CDB_WRITE_FIRMWARE_LPL_CMD, 20)
+        module = FakeCdbModule(latency=20, poll_profile=profile)
+        assert module.download(1) == cdb_consts.CDB_MAX_CAPTURE_TIME
+
+    def test_download_time(self):
+        blocks = 200
+        latency = 230
+        module = FakeCdbModule(latency=latency, poll_profile=CdbPollProfile())
+        # Polling every CDB_MAX_CAPTURE_TIME waited 300 msec per block
+        fixed_time = blocks * 300
+        adaptive_time = module.download(blocks)
+        assert adaptive_time < 0.85 * fixed_time
+        assert adaptive_time < blocks * (latency + 2 * cdb_consts.CDB_POLL_MIN_INTERVAL)
+        assert module.status_reads < 2 * blocks
+
+    def test_timeout(self):
+        module = FakeCdbModule(latency=100000)
+        module.done_at = module.latency
+        with patch('sonic_platform_base.sonic_xcvr.cdb.cdb.time.sleep', module.sleep):
+            ret, status = module.handler.wait_for_cdb_status(1000, cdb_consts.CDB_WRITE_FIRMWARE_LPL_CMD)
+        assert not ret
+        assert status[cdb_consts.CDB1_IS_BUSY]
+        assert module.now >= 1000
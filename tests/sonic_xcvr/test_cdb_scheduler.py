@@ -0,0 +1,200 @@
+import threading
+import time
+from concurrent.futures import wait
+
+import pytest
+
+from sonic_platform_base.sonic_xcvr.cdb.cdb import CdbCmdHandler
+from sonic_platform_base.sonic_xcvr.cdb.cdb_scheduler import CdbLatencyHistogram, CdbScheduler
+from sonic_platform_base.sonic_xcvr.codes.public.cdb import CdbCodes
+from sonic_platform_base.sonic_xcvr.fields import cdb_consts
+from sonic_platform_base.sonic_xcvr.mem_maps.public.cmis.cdb import CdbMemMap
+
+CDB_STATUS_OFFSET = 37
+CDB_TRIGGER_METHOD_OFFSET = 0x01 * 128 + 166
+CDB_STATUS_BUSY = 0x81
+CDB_STATUS_SUCCESS = 0x01
+CDB_STATUS_FAILED = 0x45
+
+
+class FakeCdbModule(object):
+    """
+    Module whose CDB completes each command latency seconds after it is
+    triggered, with the given final status byte
+    """
+    def __init__(self, latency=0.0, final_status=CDB_STATUS_SUCCESS, write_ok=True):
+        self.latency = latency
+        self.final_status = final_status
+        self.write_ok = write_ok
+        self.done_at = None
+        self.commands = []
+        self.status_reads = 0
+        self.handler = CdbCmdHandler(self.read, self.write, CdbMemMap(CdbCodes))
+
+    def read(self, offset, size):
+        if offset == CDB_TRIGGER_METHOD_OFFSET:
+            return bytearray([0])
+        assert offset == CDB_STATUS_OFFSET and size == 1
+        self.status_reads += 1
+        if self.done_at is None or time.monotonic() >= self.done_at:
+            return bytearray([self.final_status])
+        return bytearray([CDB_STATUS_BUSY])
+
+    def write(self, offset, size, data):
+        # Commands on one module must never overlap
+        assert self.done_at is None or time.monotonic() >= self.done_at
+        if offset == self.handler.mem_map.get_cdb_cmd(cdb_consts.CDB_QUERY_STATUS_CMD).getaddr():
+            self.commands.append((data[0] << 8) | data[1])
+            self.done_at = time.monotonic() + self.latency
+        return self.write_ok
+
+
+def drive(scheduler, futures, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not all(future.done() for future in futures):
+        assert time.monotonic() < deadline
+        wait_time = scheduler.poll()
+        if wait_time:
+            time.sleep(wait_time)
+
+
+def make_scheduler():
+    return CdbScheduler(capture_time=1, poll_min=1, poll_max=5)
+
+
+class TestCdbLatencyHistogram(object):
+    def test_record(self):
+        histogram = CdbLatencyHistogram(buckets=(10, 100))
+        assert histogram.percentile(50) is None
+        assert histogram.mean() is None
+        for latency in (5, 10, 50, 500):
+            histogram.record(latency)
+        assert histogram.to_dict() == {'10': 2, '100': 1, 'inf': 1}
+        assert histogram.count == 4
+        assert histogram.mean() == pytest.approx(141.25)
+        assert histogram.percentile(50) == 10
+        assert histogram.percentile(75) == 100
+        assert histogram.percentile(100) == 500
+
+
+class TestCdbScheduler(object):
+    def test_send_cmd_results(self):
+        scheduler = make_scheduler()
+        ok = FakeCdbModule()
+        failed = FakeCdbModule(final_status=CDB_STATUS_FAILED)
+        no_write = FakeCdbModule(write_ok=False)
+        futures = [scheduler.submit(module.handler, cdb_consts.CDB_GET_FIRMWARE_INFO_CMD)
+                   for module in (ok, failed, no_write)]
+        drive(scheduler, futures)
+        assert [future.result() for future in futures] == [True, False, None]
+        assert ok.handler.get_cmd_status_code()[cdb_consts.CDB1_STATUS] == 0x1
+        assert failed.handler.get_cmd_status_code()[cdb_consts.CDB1_HAS_FAILED]
+        assert no_write.status_reads == 0
+        assert scheduler.get_pending_count() == 0
+
+    def test_timeout(self):
+        scheduler = make_scheduler()
+        module = FakeCdbModule(latency=10)
+        future = scheduler.submit(module.handler, cdb_consts.CDB_ABORT_FIRMWARE_DOWNLOAD_CMD, timeout=20)
+        drive(scheduler, [future])
+        assert future.result() is None
+        assert module.handler.get_cmd_status_code()[cdb_consts.CDB1_IS_BUSY]
+        assert scheduler.get_latency_histogram(cdb_consts.CDB_ABORT_FIRMWARE_DOWNLOAD_CMD) is None
+
+    def test_commands_serialized_per_module_and_overlapped_across_modules(self):
+        scheduler = make_scheduler()
+        modules = [FakeCdbModule(latency=0.05) for _ in range(8)]
+        futures = []
+        for module in modules:
+            futures.append(scheduler.submit(module.handler, cdb_consts.CDB_GET_FIRMWARE_INFO_CMD))
+            futures.append(scheduler.submit(module.handler, cdb_consts.CDB_COMMIT_FIRMWARE_IMAGE_CMD))
+        assert scheduler.get_pending_count(modules[0].handler) == 2
+        start = time.monotonic()
+        drive(scheduler, futures)
+        elapsed = time.monotonic() - start
+        assert all(future.result() for future in futures)
+        for module in modules:
+            assert module.commands == [cdb_consts.CDB_GET_FIRMWARE_INFO_CMD,
+                                       cdb_consts.CDB_COMMIT_FIRMWARE_IMAGE_CMD]
+        # 16 commands of 50 ms, 2 per module: ~100 ms when overlapped, 800 ms serially
+        assert elapsed < 0.5
+        histogram = scheduler.get_latency_histogram(cdb_consts.CDB_GET_FIRMWARE_INFO_CMD)
+        assert histogram.count == 8
+        assert histogram.percentile(100) <= 100
+        assert set(scheduler.get_latency_histograms()) == {cdb_consts.CDB_GET_FIRMWARE_INFO_CMD,
+                                                           cdb_consts.CDB_COMMIT_FIRMWARE_IMAGE_CMD}
+
+    def test_backoff(self):
+        scheduler = CdbScheduler(capture_time=1, poll_min=1, poll_max=8)
+        module = FakeCdbModule(latency=0.1)
+        future = scheduler.submit(module.handler, cdb_consts.CDB_GET_FIRMWARE_INFO_CMD)
+        drive(scheduler, [future])
+        assert future.result() is True
+        # Polls at ~1, 2, 4, 8, 16, 24, ... 104 ms instead of every millisecond
+        assert module.status_reads < 25
+
+    def test_background_thread_and_callback(self):
+        scheduler = make_scheduler()
+        modules = [FakeCdbModule(latency=0.01) for _ in range(4)]
+        completed = []
+        scheduler.start()
+        try:
+            futures = [scheduler.submit(module.handler, cdb_consts.CDB_GET_FIRMWARE_INFO_CMD,
+                                        callback=completed.append)
+                       for module in modules]
+            done, not_done = wait(futures, timeout=5)
+        finally:
+            scheduler.stop()
+        assert not not_done
+        assert all(future.result() for future in futures)
+        assert sorted(completed, key=id) == sorted(futures, key=id)
+
+    def test_restart_after_stop_timeout(self):
+        scheduler = make_scheduler()
+        module = FakeCdbModule(latency=1)
+        polling = threading.Event()
+        release = threading.Event()
+        read = module.read
+
+        def blocking_read(offset, size):
+            if offset == CDB_STATUS_OFFSET:
+                polling.set()
+                release.wait(5)
+            return read(offset, size)
+        module.handler.reader = blocking_read
+
+        assert scheduler.start()
+        future = scheduler.submit(module.handler, cdb_consts.CDB_GET_FIRMWARE_INFO_CMD)
+        assert polling.wait(5)
+        # The thread is stuck in a status read, no second thread may start
+        assert not scheduler.stop(timeout=0.05)
+        assert not scheduler.start()
+        assert len([t for t in threading.enumerate() if t.name == "CdbScheduler"]) == 1
+        release.set()
+        assert scheduler.stop(timeout=5)
+        assert scheduler.start()
+        try:
+            future.result(timeout=5)
+        finally:
+            assert scheduler.stop(timeout=5)
+        assert not [t for t in threading.enumerate() if t.name == "CdbScheduler"]
+
+    def test_cancelled_command_not_sent(self):
+        scheduler = make_scheduler()
+        module = FakeCdbModule()
+        future = scheduler.submit(module.handler, cdb_consts.CDB_GET_FIRMWARE_INFO_CMD)
+        assert future.cancel()
+        assert scheduler.poll() is None
+        assert module.commands == []
+
+    def test_handler_exception(self):
+        scheduler = make_scheduler()
+        module = FakeCdbModule()
+
+        def read(offset, size):
+            raise IOError("i2c failure")
+        module.handler.reader = read
+        future = scheduler.submit(module.handler, cdb_consts.CDB_GET_FIRMWARE_INFO_CMD)
+        drive(scheduler, [future])
+        with pytest.raises(IOError):
+            future.result()
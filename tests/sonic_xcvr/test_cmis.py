@@ -1,5 +1,5 @@
 from unittest.mock import patch
-from mock import MagicMock
+from mock import MagicMock, call
 import pytest
 import traceback
 import random
@@ -1874,9 +1874,11 @@ class TestCmis(object):
         ([None, None, None], None)
     ])
     def test_get_module_level_flag(self, mock_response, expected):
-        self.api.xcvr_eeprom.read = MagicMock()
-        self.api.xcvr_eeprom.read.side_effect = mock_response
-        result = self.api.get_module_level_flag()
+        flag_fields = [consts.MODULE_FLAG_BYTE1, consts.MODULE_FLAG_BYTE2, consts.MODULE_FLAG_BYTE3]
+        with patch.object(self.api.xcvr_eeprom, 'read_many',
+                          return_value=dict(zip(flag_fields, mock_response))) as mock_read_many:
+            result = self.api.get_module_level_flag()
+        mock_read_many.assert_called_once_with(flag_fields)
         assert result == expected
 
     @patch('sonic_platform_base.sonic_xcvr.cdb.cdb_fw.CdbFwHandler.initFwHandler', MagicMock(return_value=True))
@@ -2290,7 +2292,7 @@ class TestCmis(object):
         mock_fw_hdlr.abort_fw_download.assert_called_once()
 
     @patch('sonic_platform_base.sonic_xcvr.api.public.cdb_fw.time.sleep')
-    def test_module_fw_download_start_password_retry_success(self, mock_sleep):
+    def test_module_fw_download_start_password_retry_success(self, mock_sleep, tmp_path):
         mock_fw_hdlr = self._setup_cdb_fw_hdlr()
         mock_fw_hdlr.start_fw_download.side_effect = [False, True]
         mock_fw_hdlr.get_cmd_status_code.return_value = {
@@ -2300,48 +2302,52 @@ class TestCmis(object):
         }
         mock_fw_hdlr.write_lpl_block.return_value = True
         mock_fw_hdlr.complete_fw_download.return_value = True
-        from unittest.mock import mock_open
-        m = mock_open(read_data=b'\x00' * 256)
-        m.return_value.seek = MagicMock()
-        m.return_value.tell = MagicMock(return_value=256)
-        with patch('builtins.open', m):
-            result = self.api.module_fw_download(112, 2048, True, True, 2048, '/tmp/fw.bin')
+        imagepath = tmp_path / 'fw.bin'
+        imagepath.write_bytes(b'\x00' * 256)
+        result = self.api.module_fw_download(112, 2048, True, True, 2048, str(imagepath))
         assert result[0] is True
         mock_fw_hdlr.enter_password.assert_called_once()
 
     @patch('sonic_platform_base.sonic_xcvr.api.public.cdb_fw.time.sleep')
-    def test_module_fw_download_lpl_success(self, mock_sleep):
+    def test_module_fw_download_lpl_success(self, mock_sleep, tmp_path):
         mock_fw_hdlr = self._setup_cdb_fw_hdlr()
         mock_fw_hdlr.start_fw_download.return_value = True
         mock_fw_hdlr.write_lpl_block.return_value = True
         mock_fw_hdlr.complete_fw_download.return_value = True
-        from unittest.mock import mock_open
-        m = mock_open(read_data=b'\x00' * 256)
-        m.return_value.seek = MagicMock()
-        m.return_value.tell = MagicMock(return_value=256)
-        with patch('builtins.open', m):
-            result = self.api.module_fw_download(112, 2048, True, True, 2048, '/tmp/fw.bin')
+        imagepath = tmp_path / 'fw.bin'
+        imagepath.write_bytes(b'\x00' * 256)
+        result = self.api.module_fw_download(112, 2048, True, True, 2048, str(imagepath))
         assert result[0] is True
         assert 'Success' in result[1]
 
     @patch('sonic_platform_base.sonic_xcvr.api.public.cdb_fw.time.sleep')
-    def test_module_fw_download_epl_success(self, mock_sleep):
+    def test_module_fw_download_epl_success(self, mock_sleep, tmp_path):
         mock_fw_hdlr = self._setup_cdb_fw_hdlr()
         mock_fw_hdlr.start_fw_download.return_value = True
         mock_fw_hdlr.write_epl_block.return_value = True
         mock_fw_hdlr.complete_fw_download.return_value = True
-        from unittest.mock import mock_open
-        m = mock_open(read_data=b'\x00' * 256)
-        m.return_value.seek = MagicMock()
-        m.return_value.tell = MagicMock(return_value=256)
-        with patch('builtins.open', m):
-            result = self.api.module_fw_download(112, 2048, False, True, 2048, '/tmp/fw.bin')
+        imagepath = tmp_path / 'fw.bin'
+        imagepath.write_bytes(b'\x00' * 256)
+        result = self.api.module_fw_download(112, 2048, False, True, 2048, str(imagepath))
         assert result[0] is True
         assert 'Success' in result[1]
         mock_fw_hdlr.write_epl_pages.assert_called()
+        # Auto paging is only enabled for the download
+        assert mock_fw_hdlr.set_epl_auto_paging.call_args_list == [call(True, 2048), call(False)]
+
+    @patch('sonic_platform_base.sonic_xcvr.api.public.cdb_fw.time.sleep')
+    def test_module_fw_download_epl_fail_resets_auto_paging(self, mock_sleep, tmp_path):
+        mock_fw_hdlr = self._setup_cdb_fw_hdlr()
+        mock_fw_hdlr.start_fw_download.return_value = True
+        mock_fw_hdlr.write_epl_pages.side_effect = AssertionError("Failed to write EPL at offset 0")
+        imagepath = tmp_path / 'fw.bin'
+        imagepath.write_bytes(b'\x00' * 256)
+        result = self.api.module_fw_download(112, 2048, False, True, 2048, str(imagepath))
+        assert result[0] is False
+        assert mock_fw_hdlr.set_epl_auto_paging.call_args_list == [call(True, 2048), call(False)]
 
     @patch('sonic_platform_base.sonic_xcvr.api.public.cdb_fw.time.sleep')
-    def test_module_fw_download_block_write_fail(self, mock_sleep):
+    def test_module_fw_download_block_write_fail(self, mock_sleep, tmp_path):
         mock_fw_hdlr = self._setup_cdb_fw_hdlr()
         mock_fw_hdlr.start_fw_download.return_value = True
         mock_fw_hdlr.write_lpl_block.return_value = False
@@ -2350,18 +2356,15 @@ class TestCmis(object):
             cdb_consts.CDB1_HAS_FAILED: True,
             cdb_consts.CDB1_STATUS: 0x04,
         }
-        from unittest.mock import mock_open
-        m = mock_open(read_data=b'\x00' * 256)
-        m.return_value.seek = MagicMock()
-        m.return_value.tell = MagicMock(return_value=256)
-        with patch('builtins.open', m):
-            result = self.api.module_fw_download(112, 2048, True, True, 2048, '/tmp/fw.bin')
+        imagepath = tmp_path / 'fw.bin'
+        imagepath.write_bytes(b'\x00' * 256)
+        result = self.api.module_fw_download(112, 2048, True, True, 2048, str(imagepath))
         assert result[0] is False
         assert 'CDB download failed' in result[1]
         mock_fw_hdlr.abort_fw_download.assert_called_once()
 
     @patch('sonic_platform_base.sonic_xcvr.api.public.cdb_fw.time.sleep')
-    def test_module_fw_download_complete_fail(self, mock_sleep):
+    def test_module_fw_download_complete_fail(self, mock_sleep, tmp_path):
         mock_fw_hdlr = self._setup_cdb_fw_hdlr()
         mock_fw_hdlr.start_fw_download.return_value = True
         mock_fw_hdlr.write_lpl_block.return_value = True
@@ -2371,15 +2374,38 @@ class TestCmis(object):
             cdb_consts.CDB1_HAS_FAILED: True,
             cdb_consts.CDB1_STATUS: 0x04,
         }
-        from unittest.mock import mock_open
-        m = mock_open(read_data=b'\x00' * 256)
-        m.return_value.seek = MagicMock()
-        m.return_value.tell = MagicMock(return_value=256)
-        with patch('builtins.open', m):
-            result = self.api.module_fw_download(112, 2048, True, True, 2048, '/tmp/fw.bin')
+        imagepath = tmp_path / 'fw.bin'
+        imagepath.write_bytes(b'\x00' * 256)
+        result = self.api.module_fw_download(112, 2048, True, True, 2048, str(imagepath))
         assert result[0] is False
         assert 'FW_complete_status' in result[1]
 
+    @patch('sonic_platform_base.sonic_xcvr.api.public.cdb_fw.time.sleep')
+    def test_module_fw_download_preloaded_image(self, mock_sleep):
+        mock_fw_hdlr = self._setup_cdb_fw_hdlr()
+        mock_fw_hdlr.start_payload_size = 4
+        mock_fw_hdlr.start_fw_download_data.return_value = True
+        mock_fw_hdlr.write_lpl_block.return_value = True
+        mock_fw_hdlr.complete_fw_download.return_value = True
+        image = bytes(range(4)) + b'\x55' * (cdb_consts.LPL_MAX_PAYLOAD_SIZE + 10)
+        progress = MagicMock()
+        with patch('builtins.open', side_effect=AssertionError("image read from file")):
+            result = self.api.module_fw_download(4, 2048, True, True, 2048, '/tmp/fw.bin',
+                                                 image=image, progress_callback=progress)
+        assert result[0] is True
+        mock_fw_hdlr.start_fw_download_data.assert_called_once_with(len(image), bytes(range(4)))
+        assert [args[0][:2] for args in progress.call_args_list] == \
+            [(cdb_consts.LPL_MAX_PAYLOAD_SIZE + 4, len(image)), (len(image), len(image))]
+        assert mock_fw_hdlr.write_lpl_block.call_args_list[1][0] == (cdb_consts.LPL_MAX_PAYLOAD_SIZE, b'\x55' * 10)
+
+    def test_module_fw_start_download_image_too_small(self):
+        mock_fw_hdlr = self._setup_cdb_fw_hdlr()
+        mock_fw_hdlr.start_payload_size = 112
+        result = self.api.module_fw_start_download('/tmp/fw.bin', image=b'\x00' * 10)
+        assert result[0] is False
+        assert 'too small' in result[1]
+        mock_fw_hdlr.start_fw_download_data.assert_not_called()
+
 
     @pytest.mark.parametrize("mock_response, expected", [
         ([0, 0, 0],
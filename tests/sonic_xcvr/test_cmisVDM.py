@@ -1,11 +1,15 @@
 from mock import MagicMock
 import pytest
 from collections import Counter
-from sonic_platform_base.sonic_xcvr.api.public.cmisVDM import CmisVdmApi, PAGE_SIZE, PAGE_OFFSET
+from sonic_platform_base.sonic_xcvr.api.public.cmisVDM import CmisVdmApi, PAGE_SIZE, PAGE_OFFSET, VDM_FREEZE, \
+    VDM_UNFREEZE
+from sonic_platform_base.sonic_xcvr.fields import consts
 from sonic_platform_base.sonic_xcvr.mem_maps.public.cmis import CmisMemMap
 from sonic_platform_base.sonic_xcvr.xcvr_eeprom import XcvrEeprom
 from sonic_platform_base.sonic_xcvr.codes.public.cmis import CmisCodes
 
+from .test_xcvr_eeprom import CountingEeprom
+
 class TestVDM(object):
     codes = CmisCodes
     mem_map = CmisMemMap(codes)
@@ -285,3 +289,109 @@ class TestVDM(object):
         self.api.get_vdm_page.side_effect = mock_response[3:]
         result = self.api.get_vdm_allpage()
         assert result == expected
+
+
+class TestVdmSampler(object):
+    """VDM sampler against an in-memory module: descriptor page 0x20 advertises
+    laser temperature (basic) on lanes 1-2 and Pre-FEC BER minimum (statistic)
+    on lane 1; descriptor page 0x21 advertises nothing."""
+
+    def setup_method(self, method):
+        self.mem = CountingEeprom(CmisMemMap(CmisCodes))
+        self.mem_map = self.mem.eeprom.mem_map
+        self.set_bit(consts.VDM_SUPPORTED, True)
+        self.memory[self.offset(consts.VDM_SUPPORTED_PAGE)] = 1  # pages 0x20-0x21
+        self.set_page(0x20, [0x10, 4, 0x11, 4, 0x20, 9])
+        self.set_page(0x24, [0x0a, 0x00, 0xf4, 0x00, 0x28, 0x01])
+        # threshold set 1: 80C, -5C, 70C, 0C; set 2: BER thresholds
+        self.set_page(0x28, [0] * 8 + [0x50, 0x00, 0xfb, 0x00, 0x46, 0x00, 0x00, 0x00] +
+                      [0x28, 0x05] * 4)
+        self.control_writes = []
+        reader = self.mem._reader
+        writer = self.mem._writer
+        control = self.offset(consts.VDM_CONTROL)
+        def vdm_writer(offset, size, data):
+            if offset == control:
+                self.control_writes.append(data[0])
+                # The module reports FreezeDone as soon as freeze is requested
+                self.set_bit(consts.VDM_FREEZE_DONE, data[0] == VDM_FREEZE)
+            return writer(offset, size, data)
+        self.mem.eeprom.writer = vdm_writer
+        self.api = CmisVdmApi(self.mem.eeprom)
+
+    @property
+    def memory(self):
+        return self.mem.memory
+
+    def offset(self, field_name):
+        return self.mem_map.get_field(field_name).get_offset()
+
+    def set_bit(self, field_name, value):
+        field = self.mem_map.get_field(field_name)
+        mask = 1 << (field.bitpos % 8)
+        if value:
+            self.memory[field.get_offset()] |= mask
+        else:
+            self.memory[field.get_offset()] &= ~mask
+
+    def set_page(self, page, data):
+        offset = page * PAGE_SIZE + PAGE_OFFSET
+        self.memory[offset:offset + len(data)] = bytes(data)
+
+    def test_layout_skips_empty_descriptor_pages(self):
+        layout = self.api.get_vdm_layout()
+        assert list(layout.type_ids) == [4, 4, 9]
+        assert list(layout.lanes) == [1, 2, 1]
+        assert list(layout.threshold_ids) == [1, 1, 2]
+        assert [(page, first, slots) for page, first, slots in layout.pages] == [(0x20, 0, [0, 1, 2])]
+        assert layout.has_statistic
+        assert self.api.get_vdm_layout() is layout
+
+    def test_sample_freezes_and_reads_populated_pages_only(self):
+        self.api.get_vdm_layout()
+        self.mem.reads = []
+        sample = self.api.get_vdm_sample()
+        assert list(sample) == [(4, 1, 10.0), (4, 2, -12.0), (9, 1, self.api.get_F16(0x2801))]
+        assert sample.frozen
+        assert sample.get(4, 2) == -12.0
+        assert sample.get(5, 1) is None
+        assert self.control_writes == [VDM_FREEZE, VDM_UNFREEZE]
+        value_reads = [offset for offset, size in self.mem.reads if size == PAGE_SIZE]
+        assert value_reads == [0x24 * PAGE_SIZE + PAGE_OFFSET]
+
+    def test_sample_without_statistic_does_not_freeze(self):
+        self.set_page(0x20, [0x10, 4, 0x11, 4, 0x00, 0])
+        sample = self.api.get_vdm_sample()
+        assert len(sample) == 2
+        assert not sample.frozen
+        assert self.control_writes == []
+
+    def test_sample_changes(self):
+        assert len(self.api.get_vdm_sample_changes()) == 3
+        assert self.api.get_vdm_sample_changes() == []
+        self.set_page(0x24, [0x0b, 0x00])
+        assert self.api.get_vdm_sample_changes() == [(4, 1, 11.0)]
+
+    def test_sample_read_failure(self):
+        value_page = 0x24 * PAGE_SIZE + PAGE_OFFSET
+        self.mem.eeprom.reader = lambda offset, size: None if offset == value_page else \
+            self.mem._reader(offset, size)
+        assert self.api.get_vdm_sample() is None
+        assert self.control_writes == [VDM_FREEZE, VDM_UNFREEZE]
+
+    def test_vdm_not_supported(self):
+        self.set_bit(consts.VDM_SUPPORTED, False)
+        assert self.api.get_vdm_layout() is None
+        assert self.api.get_vdm_sample() is None
+        assert self.api.get_vdm_threshold_sample() is None
+
+    def test_thresholds_read_once(self):
+        thresholds = self.api.get_vdm_threshold_sample()
+        assert list(thresholds['halarm'].values[:2]) == [80.0, 80.0]
+        assert list(thresholds['lalarm'].values[:2]) == [-5.0, -5.0]
+        assert thresholds['hwarn'].get(4, 1) == 70.0
+        assert thresholds['lwarn'].get(4, 1) == 0.0
+        assert thresholds['halarm'].get(9, 1) == self.api.get_F16(0x2805)
+        self.mem.reads = []
+        assert self.api.get_vdm_threshold_sample() is thresholds
+        assert self.mem.reads == []
@@ -0,0 +1,110 @@
+from mock import MagicMock
+import pytest
+
+from sonic_platform_base.sonic_xcvr.api.public.cmis import CmisApi
+from sonic_platform_base.sonic_xcvr.api.public.cmis_appl_index import CmisApplicationIndex, \
+    get_host_interface_speed
+
+APPL_ADVT = {
+    1: {'host_electrical_interface_id': '400GAUI-8 C2M (Annex 120E)',
+        'module_media_interface_id': '400GBASE-DR4 (Cl 124)',
+        'host_lane_count': 8, 'media_lane_count': 4,
+        'host_lane_assignment_options': 0x01, 'media_lane_assignment_options': 0x01},
+    2: {'host_electrical_interface_id': '100GAUI-2 C2M (Annex 135G)',
+        'module_media_interface_id': '100G-FR/100GBASE-FR1 (Cl 140)',
+        'host_lane_count': 2, 'media_lane_count': 1,
+        'host_lane_assignment_options': 0x55, 'media_lane_assignment_options': 0x0f},
+    3: {'host_electrical_interface_id': 'CAUI-4 C2M (Annex 83E)',
+        'module_media_interface_id': '100G-FR/100GBASE-FR1 (Cl 140)',
+        'host_lane_count': 4, 'media_lane_count': 1,
+        'host_lane_assignment_options': 0x11},
+}
+
+
+class TestCmisApplicationIndex(object):
+    @pytest.mark.parametrize("host_interface, speed", [
+        ('1.6TAUI-8', 1600000),
+        ('800GAUI-8 S C2M', 800000),
+        ('400GAUI-8 C2M (Annex 120E)', 400000),
+        ('100GAUI-2 C2M (Annex 135G)', 100000),
+        ('CAUI-4 C2M (Annex 83E)', 100000),
+        ('LAUI-2 C2M (Annex 135C)', 50000),
+        ('XLAUI C2M (Annex 83B)', 40000),
+        ('25GAUI C2M (Annex 109B)', 25000),
+        ('10GBASE-CX4 (Clause 54)', 10000),
+        ('SFI (SFF-8431)', 10000),
+        ('1000BASE -CX(Clause 39)', 1000),
+        ('Undefined', 0),
+    ])
+    def test_host_interface_speed(self, host_interface, speed):
+        assert get_host_interface_speed(host_interface) == speed
+
+    def test_index(self):
+        index = CmisApplicationIndex(APPL_ADVT)
+        assert len(index) == 3
+        assert 2 in index and 4 not in index
+        assert [appl.appsel for appl in index] == [1, 2, 3]
+        appl = index.get(2)
+        assert appl.host_speed == 100000
+        assert appl.host_lane_count == 2
+        assert appl.media_lane_assignment_options == 0x0f
+        assert appl.host_lane_masks == (0x03, 0x0c, 0x30, 0xc0)
+        assert index.get(3).media_lane_assignment_options is None
+        assert index.get(3).host_lane_masks == (0x0f, 0xf0)
+        assert index.get(4) is None
+
+    def test_reverse_lookups(self):
+        index = CmisApplicationIndex(APPL_ADVT)
+        assert [appl.appsel for appl in index.get_by_speed(100000)] == [2, 3]
+        assert index.get_by_speed(25000) == ()
+        assert [appl.appsel for appl in index.get_by_lane_mask(0xff)] == [1]
+        assert [appl.appsel for appl in index.get_by_lane_mask(0x30)] == [2]
+        assert [appl.appsel for appl in index.find(100000, 0xf0)] == [3]
+        assert [appl.appsel for appl in index.find(100000, 0xc0)] == [2]
+        assert index.find(400000, 0xf0) == ()
+
+    def test_immutable(self):
+        index = CmisApplicationIndex(APPL_ADVT)
+        with pytest.raises(AttributeError):
+            index._by_appsel = {}
+        with pytest.raises(TypeError):
+            index._by_appsel[4] = None
+        with pytest.raises(AttributeError):
+            index.get(1).host_lane_count = 4
+
+    def test_empty(self):
+        index = CmisApplicationIndex({})
+        assert len(index) == 0
+        assert index.get(1) is None
+        assert index.find(400000, 0xff) == ()
+
+
+class TestCmisApiApplicationIndex(object):
+    def setup_method(self):
+        self.api = CmisApi(MagicMock())
+        self.api.set_cache_enabled(True)
+        self.api.is_flat_memory = MagicMock(return_value=False)
+        self.api.get_application_advertisement = MagicMock(return_value=APPL_ADVT)
+
+    def test_built_once(self):
+        index = self.api.get_application_index()
+        assert self.api.get_application_index() is index
+        assert self.api.get_host_lane_count(1) == 8
+        assert self.api.get_media_lane_count(3) == 1
+        assert self.api.get_host_lane_assignment_option(2) == 0x55
+        assert self.api.get_media_lane_assignment_option(1) == 0x01
+        assert self.api.get_application_advertisement.call_count == 1
+
+    def test_rebuilt_after_reset(self):
+        index = self.api.get_application_index()
+        self.api.invalidate_cache()
+        self.api.get_application_advertisement.return_value = {1: APPL_ADVT[1]}
+        assert self.api.get_application_index() is not index
+        assert self.api.get_host_lane_count(2) == 0
+        assert self.api.get_host_lane_assignment_option(2) == 0
+
+    def test_empty_not_cached(self):
+        self.api.get_application_advertisement.return_value = {}
+        assert len(self.api.get_application_index()) == 0
+        self.api.get_application_advertisement.return_value = APPL_ADVT
+        assert len(self.api.get_application_index()) == 3
@@ -1,8 +1,10 @@
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from sonic_platform_base.sonic_xcvr.api.public.cmis import CmisApi
 from sonic_platform_base.sonic_xcvr.codes.public.sff8024 import Sff8024
 from sonic_platform_base.sonic_xcvr.fields import consts
+from sonic_platform_base.sonic_xcvr.utils.cache import cached_api_return, bump_cache_generation, get_cache_stats, \
+    reset_cache_stats
 
 class TestReadOnlyCacheDecorator:
     def setup_method(self):
@@ -216,3 +218,126 @@ class TestCacheDisabled:
         assert first == {}
         assert second == {}
         assert self.api.xcvr_eeprom.read.call_count == 2
+
+class TestCachedApiReturn:
+    class FakeApi:
+        cache_enabled = True
+
+        def __init__(self):
+            self.calls = 0
+
+        @cached_api_return(ttl=10)
+        def get_value(self, key):
+            self.calls += 1
+            return {'key': key}
+
+        @cached_api_return()
+        def get_static(self, key=1):
+            self.calls += 1
+            return key
+
+    def test_argument_keys(self):
+        api = self.FakeApi()
+        assert api.get_static(1) == 1
+        assert api.get_static(2) == 2
+        assert api.get_static(1) == 1
+        assert api.get_static(key=2) == 2
+        assert api.get_static(key=2) == 2
+        assert api.calls == 3
+        assert get_cache_stats(api) == {'get_static': {'hits': 2, 'misses': 3}}
+
+    def test_unhashable_arguments_not_cached(self):
+        api = self.FakeApi()
+        api.get_value([1])
+        api.get_value([1])
+        assert api.calls == 2
+        assert get_cache_stats(api) == {}
+
+    def test_ttl(self):
+        api = self.FakeApi()
+        with patch('sonic_platform_base.sonic_xcvr.utils.cache.time.monotonic', return_value=100):
+            api.get_value(1)
+            api.get_value(1)
+        assert api.calls == 1
+        with patch('sonic_platform_base.sonic_xcvr.utils.cache.time.monotonic', return_value=110):
+            api.get_value(1)
+        assert api.calls == 2
+
+    def test_generation(self):
+        api = self.FakeApi()
+        api.get_static(1)
+        api.get_value(1)
+        assert bump_cache_generation(api) == 1
+        api.get_static(1)
+        api.get_value(1)
+        assert api.calls == 4
+        api.get_static(1)
+        assert api.calls == 4
+        reset_cache_stats(api)
+        assert get_cache_stats(api) == {}
+
+
+class TestCmisGenerationCache:
+    APPL_ADVT = {
+        1: {'host_lane_count': 8, 'media_lane_count': 4,
+            'host_lane_assignment_options': 1, 'media_lane_assignment_options': 1},
+        2: {'host_lane_count': 2, 'media_lane_count': 1,
+            'host_lane_assignment_options': 85, 'media_lane_assignment_options': 15},
+    }
+
+    def setup_method(self):
+        eeprom = MagicMock()
+        self.api = CmisApi(eeprom)
+        self.api.set_cache_enabled(True)
+        self.api.is_flat_memory = MagicMock(return_value=False)
+        self.api.get_application_advertisement = MagicMock(return_value=self.APPL_ADVT)
+
+    def test_application_getters_cached_per_appl(self):
+        for _ in range(3):
+            assert self.api.get_host_lane_count(2) == 2
+            assert self.api.get_media_lane_count(1) == 4
+            assert self.api.get_media_lane_count(2) == 1
+            assert self.api.get_host_lane_assignment_option(2) == 85
+            assert self.api.get_media_lane_assignment_option(2) == 15
+        # The advertisement is decoded once into the application index
+        assert self.api.get_application_advertisement.call_count == 1
+        stats = self.api.get_cache_stats()
+        assert stats['get_media_lane_count'] == {'hits': 4, 'misses': 2}
+
+    @pytest.mark.parametrize("action", [
+        lambda api: api.set_application(0x1, 2),
+        lambda api: api.reset_module(True),
+        lambda api: api.invalidate_cache(),
+    ])
+    def test_invalidated_by_module_changes(self, action):
+        assert self.api.get_media_lane_count(1) == 4
+        self.api.xcvr_eeprom.write.return_value = True
+        action(self.api)
+        self.api.get_application_advertisement.return_value = {1: dict(self.APPL_ADVT[1], media_lane_count=2)}
+        assert self.api.get_media_lane_count(1) == 2
+
+    def test_advertisement_reread_after_invalidation(self):
+        del self.api.get_application_advertisement
+        self.api.is_flat_memory.return_value = True
+        advt = {consts.HOST_ELECTRICAL_INTERFACE + "_1": "400GAUI-8 C2M (Annex 120E)",
+                consts.MODULE_MEDIA_INTERFACE_SM + "_1": "400GBASE-DR4 (Cl 124)",
+                consts.HOST_LANE_COUNT + "_1": 8,
+                consts.MEDIA_LANE_COUNT + "_1": 4,
+                consts.HOST_LANE_ASSIGNMENT_OPTION + "_1": 1}
+        fields = {consts.APPLS_ADVT_FIELD: advt, consts.MEDIA_TYPE_FIELD: Sff8024.MODULE_MEDIA_TYPE[2]}
+        self.api.xcvr_eeprom.read.side_effect = lambda field: dict(fields[field]) \
+            if isinstance(fields[field], dict) else fields[field]
+        assert self.api.get_application_advertisement()[1]['host_lane_count'] == 8
+
+        # New firmware advertises another application
+        advt[consts.HOST_LANE_COUNT + "_1"] = 4
+        assert self.api.get_application_advertisement()[1]['host_lane_count'] == 8
+        self.api.invalidate_cache()
+        assert self.api.get_application_advertisement()[1]['host_lane_count'] == 4
+        assert self.api.get_application_index().get(1).host_lane_count == 4
+
+    def test_reset_module_noop_keeps_cache(self):
+        assert self.api.get_media_lane_count(1) == 4
+        self.api.reset_module(False)
+        self.api.get_application_advertisement.return_value = {}
+        assert self.api.get_media_lane_count(1) == 4
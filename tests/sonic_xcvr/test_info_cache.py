@@ -0,0 +1,178 @@
+import json
+import os
+
+import pytest
+from mock import MagicMock, patch
+
+from sonic_platform_base.sonic_xcvr.api.public.cmis import CmisApi
+from sonic_platform_base.sonic_xcvr.codes.public.cmis import CmisCodes
+from sonic_platform_base.sonic_xcvr.fields import consts
+from sonic_platform_base.sonic_xcvr.mem_maps.public.cmis import CmisMemMap
+from sonic_platform_base.sonic_xcvr.utils.info_cache import XcvrInfoCache
+
+from .test_xcvr_eeprom import CountingEeprom
+
+
+@pytest.fixture
+def info_cache(tmp_path):
+    info_cache = XcvrInfoCache(str(tmp_path / 'cache' / 'info.json'))
+    CmisApi.set_info_cache(info_cache)
+    yield info_cache
+    CmisApi.set_info_cache(None)
+
+
+class TestXcvrInfoCache(object):
+    def test_put_get(self):
+        cache = XcvrInfoCache()
+        fingerprint = XcvrInfoCache.make_fingerprint('CmisApi', ['VENDOR', 'PN', 'SN', 0x5a])
+        assert fingerprint == XcvrInfoCache.make_fingerprint('CmisApi', ['VENDOR', 'PN', 'SN', 0x5a])
+        assert fingerprint != XcvrInfoCache.make_fingerprint('CmisApi', ['VENDOR', 'PN', 'SN', 0x5b])
+        assert cache.get(fingerprint, 'info') is None
+        info = {'model': 'PN'}
+        assert cache.put(fingerprint, 'info', info)
+        info['model'] = 'changed'
+        cached = cache.get(fingerprint, 'info')
+        assert cached == {'model': 'PN'}
+        cached['model'] = 'changed'
+        assert cache.get(fingerprint, 'info') == {'model': 'PN'}
+
+    def test_persistence(self, tmp_path):
+        path = str(tmp_path / 'cache' / 'info.json')
+        cache = XcvrInfoCache(path)
+        assert cache.put('fp', 'info', {'cable_length': 1.0, 'vdm_supported': False})
+        assert XcvrInfoCache(path).get('fp', 'info') == {'cable_length': 1.0, 'vdm_supported': False}
+
+    def test_max_entries(self):
+        cache = XcvrInfoCache(max_entries=2)
+        for fingerprint in ('fp1', 'fp2', 'fp3'):
+            cache.put(fingerprint, 'info', fingerprint)
+        assert cache.get('fp1', 'info') is None
+        assert cache.get('fp3', 'info') == 'fp3'
+
+    def test_corrupted_file(self, tmp_path):
+        path = tmp_path / 'info.json'
+        path.write_text('not json')
+        cache = XcvrInfoCache(str(path))
+        assert not cache.load()
+        assert cache.get('fp', 'info') is None
+
+    def test_remove(self, tmp_path):
+        path = str(tmp_path / 'info.json')
+        cache = XcvrInfoCache(path)
+        cache.put('fp1', 'info', 1)
+        cache.put('fp2', 'info', 2)
+        assert cache.remove('fp1')
+        assert cache.remove('missing')
+        assert cache.get('fp1', 'info') is None
+        assert XcvrInfoCache(path).get('fp1', 'info') is None
+        assert XcvrInfoCache(path).get('fp2', 'info') == 2
+
+    def test_save_failure(self, tmp_path):
+        path = tmp_path / 'file'
+        path.write_text('')
+        cache = XcvrInfoCache(str(path / 'info.json'))
+        assert not cache.put('fp', 'info', {'model': 'PN'})
+        assert cache.get('fp', 'info') == {'model': 'PN'}
+
+
+class TestCmisInfoFingerprint(object):
+    def setup_method(self, method):
+        self.mem = CountingEeprom(CmisMemMap(CmisCodes))
+        self.mem_map = self.mem.eeprom.mem_map
+        self.mem.memory[0] = 0x18
+        self.set_string(consts.VENDOR_NAME_FIELD, 'VENDOR')
+        self.set_string(consts.VENDOR_PART_NO_FIELD, 'PN-1')
+        self.set_string(consts.VENDOR_SERIAL_NO_FIELD, 'SN1')
+
+    def set_string(self, field_name, value):
+        field = self.mem_map.get_field(field_name)
+        offset = field.get_offset()
+        self.mem.memory[offset:offset + field.get_size()] = value.ljust(field.get_size()).encode()
+
+    def set_byte(self, field_name, value):
+        self.mem.memory[self.mem_map.get_field(field_name).get_offset()] = value
+
+    def test_no_cache_by_default(self):
+        api = CmisApi(self.mem.eeprom)
+        assert api.info_cache is None
+        assert api.get_transceiver_info()['model'] == 'PN-1'
+
+    def test_info_served_from_cache(self, info_cache):
+        info = CmisApi(self.mem.eeprom).get_transceiver_info()
+        assert info['manufacturer'] == 'VENDOR'
+        full_reads = len(self.mem.reads)
+
+        # A new API object, as after a daemon restart
+        self.mem.reads = []
+        CmisApi.set_info_cache(XcvrInfoCache(info_cache.path))
+        self.set_byte(consts.ACTIVE_APSEL_CODE, 0x10)
+        cached = CmisApi(self.mem.eeprom).get_transceiver_info()
+        assert len(self.mem.reads) < full_reads / 2
+        # The active application is still read from the module
+        assert cached['active_apsel_hostlane1'] == 1
+        cached['active_apsel_hostlane1'] = 0
+        assert cached == info
+
+    def test_fingerprint_changes(self, info_cache):
+        api = CmisApi(self.mem.eeprom)
+        fingerprint = api.get_transceiver_info_fingerprint()
+        assert fingerprint is not None
+        for field_name in (consts.PAGE_00H_CHECKSUM, consts.PAGE_01H_CHECKSUM, consts.PAGE_02H_CHECKSUM,
+                           consts.ACTIVE_FW_MINOR_REV, consts.INACTIVE_FW_MAJOR_REV):
+            self.set_byte(field_name, 0x5a)
+            new_fingerprint = api.get_transceiver_info_fingerprint()
+            assert new_fingerprint != fingerprint
+            fingerprint = new_fingerprint
+        self.set_string(consts.VENDOR_SERIAL_NO_FIELD, 'SN2')
+        assert api.get_transceiver_info_fingerprint() != fingerprint
+
+    def test_new_module_reread(self, info_cache):
+        assert CmisApi(self.mem.eeprom).get_transceiver_info()['serial'] == 'SN1'
+        self.set_string(consts.VENDOR_SERIAL_NO_FIELD, 'SN2')
+        assert CmisApi(self.mem.eeprom).get_transceiver_info()['serial'] == 'SN2'
+
+    def test_read_failure_not_cached(self, info_cache):
+        api = CmisApi(self.mem.eeprom)
+        reader = self.mem.eeprom.reader
+        self.mem.eeprom.reader = lambda offset, size: None
+        assert api.get_transceiver_info_fingerprint() is None
+        assert api.get_transceiver_info() is None
+        self.mem.eeprom.reader = reader
+        assert not os.path.exists(info_cache.path)
+        assert api.get_transceiver_info() is not None
+        assert os.path.exists(info_cache.path)
+
+    def test_build_only_upgrade(self, info_cache):
+        # The CDB versions carry a build number no fingerprinted byte reflects
+        api = CmisApi(self.mem.eeprom)
+        fw_info = {'status': True, 'result': (None,) * 8 + ('1.2.3', '1.2.0')}
+        with patch.object(CmisApi, 'is_cdb_supported', return_value=True), \
+                patch.object(CmisApi, 'get_module_fw_info', return_value=fw_info):
+            assert api.get_transceiver_info_firmware_versions() == \
+                {'active_firmware': '1.2.3', 'inactive_firmware': '1.2.0'}
+            fingerprint = api.get_transceiver_info_fingerprint()
+            fw_info['result'] = (None,) * 8 + ('1.2.4', '1.2.3')
+            assert api.get_transceiver_info_fingerprint() == fingerprint
+            # Not served from a cache, also after a restart
+            CmisApi.set_info_cache(XcvrInfoCache(info_cache.path))
+            assert CmisApi(self.mem.eeprom).get_transceiver_info_firmware_versions() == \
+                {'active_firmware': '1.2.4', 'inactive_firmware': '1.2.3'}
+        assert not os.path.exists(info_cache.path)
+
+    @pytest.mark.parametrize("command, method", [
+        ('run_fw_image', 'module_fw_run'),
+        ('commit_fw_image', 'module_fw_commit'),
+    ])
+    def test_firmware_run_drops_entry(self, info_cache, command, method):
+        api = CmisApi(self.mem.eeprom)
+        assert api.get_transceiver_info() is not None
+        fingerprint = api.get_transceiver_info_fingerprint()
+        assert info_cache.get(fingerprint, 'transceiver_info') is not None
+
+        api._init_cdb_fw_handler = True
+        api._cdb_fw_hdlr = MagicMock()
+        getattr(api._cdb_fw_hdlr, command).return_value = True
+        assert getattr(api, method)()[0] is True
+        assert info_cache.get(fingerprint, 'transceiver_info') is None
+        with open(info_cache.path) as f:
+            assert fingerprint not in json.load(f)
@@ -0,0 +1,104 @@
+"""
+Syscall counts of optoe eeprom access through a persistent fd versus opening
+the sysfs file on every read, over DOM + status + info polls of one CMIS module.
+
+Opens are counted through os.open/builtins.open, read syscalls through
+/proc/self/io (skipped where unavailable); both include one open and read of
+/proc/self/io itself. The read syscalls saved are page select checks skipped
+while page 0 is known to be selected.
+"""
+import builtins
+import os
+import tempfile
+
+from mock import patch
+
+from sonic_platform_base.sonic_xcvr.api.public.cmis import CmisApi
+from sonic_platform_base.sonic_xcvr.codes.public.cmis import CmisCodes
+from sonic_platform_base.sonic_xcvr.mem_maps.public.cmis import CmisMemMap, CMIS_ARCH_PAGES, \
+    CMIS_EEPROM_PAGE_SIZE
+from sonic_platform_base.sonic_xcvr.optoe_eeprom_rw import SFP_OPTOE_UPPER_PAGE0_OFFSET, \
+    SFP_OPTOE_PAGE_SIZE
+from sonic_platform_base.sonic_xcvr.sfp_optoe_base import SfpOptoeBase
+from sonic_platform_base.sonic_xcvr.xcvr_eeprom import XcvrEeprom
+
+POLLS = 50
+
+
+class FakeOptoeSfp(SfpOptoeBase):
+    def __init__(self, path):
+        SfpOptoeBase.__init__(self)
+        self.path = path
+
+    def get_eeprom_path(self):
+        return self.path
+
+
+class LegacyOptoeSfp(FakeOptoeSfp):
+    """read_eeprom as it was before the persistent fd."""
+
+    def read_eeprom(self, offset, num_bytes):
+        try:
+            with open(self.get_eeprom_path(), mode='rb', buffering=0) as f:
+                if offset >= SFP_OPTOE_UPPER_PAGE0_OFFSET and \
+                    offset < (SFP_OPTOE_UPPER_PAGE0_OFFSET+SFP_OPTOE_PAGE_SIZE) and \
+                        self.get_optoe_current_page() != 0:
+                    self.set_page0()
+                f.seek(offset)
+                return bytearray(f.read(num_bytes))
+        except (OSError, IOError):
+            return None
+
+
+def read_syscalls():
+    try:
+        with open('/proc/self/io') as f:
+            for line in f:
+                if line.startswith('syscr:'):
+                    return int(line.split()[1])
+    except (OSError, IOError):
+        pass
+    return None
+
+
+def run_polls(api):
+    for _ in range(POLLS):
+        assert api.get_transceiver_dom_real_value() is not None
+        api.get_transceiver_status()
+        # Upper page 00h reads in a row (vendor info with the api cache disabled)
+        api.get_transceiver_info()
+
+
+def poll(sfp):
+    api = CmisApi(XcvrEeprom(sfp.read_eeprom, sfp.write_eeprom, CmisMemMap(CmisCodes)))
+    counts = {}
+    with patch.object(CmisApi, 'cache_enabled', False):
+        with patch("os.open", wraps=os.open) as os_open, \
+                patch("builtins.open", wraps=builtins.open) as py_open:
+            syscr = read_syscalls()
+            run_polls(api)
+            syscr_after = read_syscalls()
+            counts['opens'] = os_open.call_count + py_open.call_count
+    if syscr is not None:
+        counts['reads'] = syscr_after - syscr
+    return counts
+
+
+def test_persistent_fd_syscalls():
+    tmpdir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+    with tempfile.NamedTemporaryFile(dir=tmpdir) as eeprom:
+        image = bytearray((i * 7 + 3) & 0xff for i in range(CMIS_ARCH_PAGES * CMIS_EEPROM_PAGE_SIZE))
+        image[2] = 0x00    # paged memory
+        image[127] = 0x00  # page 0 selected
+        eeprom.write(image)
+        eeprom.flush()
+
+        legacy = poll(LegacyOptoeSfp(eeprom.name))
+        sfp = FakeOptoeSfp(eeprom.name)
+        pooled = poll(sfp)
+        sfp.close_eeprom()
+
+    assert pooled['opens'] <= 1 + 1  # the eeprom file, plus /proc/self/io
+    assert legacy['opens'] > POLLS
+    if 'reads' in pooled:
+        assert pooled['reads'] < legacy['reads']
@@ -1,10 +1,12 @@
+import os
 from unittest.mock import mock_open
 from mock import MagicMock
 from mock import patch
 from mock import PropertyMock
 import pytest
 from sonic_platform_base.sonic_xcvr.sfp_optoe_base import SfpOptoeBase
-from sonic_platform_base.sonic_xcvr.optoe_eeprom_rw import SFP_OPTOE_UPPER_PAGE0_OFFSET, SFP_OPTOE_PAGE_SELECT_OFFSET
+from sonic_platform_base.sonic_xcvr.optoe_eeprom_rw import SFP_OPTOE_UPPER_PAGE0_OFFSET, SFP_OPTOE_PAGE_SELECT_OFFSET, \
+    SFP_OPTOE_PAGE_SIZE
 from sonic_platform_base.sonic_xcvr.api.public.c_cmis import CCmisApi
 from sonic_platform_base.sonic_xcvr.api.public.cmis import CmisApi
 from sonic_platform_base.sonic_xcvr.mem_maps.public.cmis.c_cmis import CCmisMemMap
@@ -13,6 +15,12 @@ from sonic_platform_base.sonic_xcvr.codes.public.cmis import CmisCodes
 from sonic_platform_base.sonic_xcvr.api.public.sff8472 import Sff8472Api
 
 
+def make_eeprom_file(tmp_path, num_pages=8):
+    path = tmp_path / "eeprom"
+    path.write_bytes(bytes(i & 0xff for i in range(num_pages * SFP_OPTOE_PAGE_SIZE)))
+    return str(path)
+
+
 class TestSfpOptoeBase(object): 
  
     codes = CmisCodes 
@@ -315,16 +323,64 @@ class TestSfpOptoeBase(object):
         with pytest.raises(NotImplementedError):
             SfpOptoeBase().set_lpmode_via_pin(True)
  
-    def test_default_page(self):
-        with patch("builtins.open", mock_open(read_data=b'\x01')) as mocked_file:
-            self.sfp_optoe_api.write_eeprom =  MagicMock(return_value=True)
-            self.sfp_optoe_api.get_optoe_current_page = MagicMock(return_value=0x10)
-            self.sfp_optoe_api.get_eeprom_path = MagicMock(return_value='/sys/class/eeprom')
-            data = self.sfp_optoe_api.read_eeprom(SFP_OPTOE_UPPER_PAGE0_OFFSET, 1)
-            mocked_file.assert_called_once_with("/sys/class/eeprom", mode='rb', buffering=0)
-            assert data == b'\x01'
-            self.sfp_optoe_api.write_eeprom.assert_called_once_with(SFP_OPTOE_PAGE_SELECT_OFFSET, 1, b'\x00')
-            self.sfp_optoe_api.get_optoe_current_page.assert_called_once()
+    def test_default_page(self, tmp_path):
+        eeprom = make_eeprom_file(tmp_path)
+        sfp = SfpOptoeBase()
+        sfp.get_eeprom_path = MagicMock(return_value=eeprom)
+        sfp.write_eeprom = MagicMock(return_value=True)
+        sfp.get_optoe_current_page = MagicMock(return_value=0x10)
+        data = sfp.read_eeprom(SFP_OPTOE_UPPER_PAGE0_OFFSET, 1)
+        assert data == bytearray([SFP_OPTOE_UPPER_PAGE0_OFFSET])
+        sfp.write_eeprom.assert_called_once_with(SFP_OPTOE_PAGE_SELECT_OFFSET, 1, b'\x00')
+        sfp.get_optoe_current_page.assert_called_once()
+
+        # Page 0 is now known to be selected, so the page select is not checked again
+        sfp.read_eeprom(SFP_OPTOE_UPPER_PAGE0_OFFSET, 1)
+        sfp.get_optoe_current_page.assert_called_once()
+
+        # An access to a banked/paged offset makes the page unknown again
+        sfp.read_eeprom(SFP_OPTOE_PAGE_SIZE * 3, 1)
+        sfp.get_optoe_current_page.return_value = 0
+        sfp.read_eeprom(SFP_OPTOE_UPPER_PAGE0_OFFSET, 1)
+        assert sfp.get_optoe_current_page.call_count == 2
+        sfp.write_eeprom.assert_called_once()
+        sfp.close_eeprom()
+
+    def test_read_write_eeprom_persistent_fd(self, tmp_path):
+        eeprom = make_eeprom_file(tmp_path)
+        sfp = SfpOptoeBase()
+        sfp.get_eeprom_path = MagicMock(return_value=eeprom)
+        with patch("os.open", wraps=os.open) as mocked_open:
+            assert sfp.read_eeprom(3, 2) == bytearray([3, 4])
+            assert sfp.write_eeprom(5, 2, bytearray([0xaa, 0xbb, 0xcc]))
+            assert sfp.read_eeprom(4, 4) == bytearray([4, 0xaa, 0xbb, 7])
+            # Selecting page 0 through the page select byte is tracked as well
+            assert sfp.write_eeprom(SFP_OPTOE_PAGE_SELECT_OFFSET, 1, bytearray([0x00]))
+            assert sfp.read_eeprom(SFP_OPTOE_UPPER_PAGE0_OFFSET, 2) == bytearray([128, 129])
+            assert mocked_open.call_count == 1
+
+            # OIR drops the fd, which is reopened on the next access
+            sfp.remove_xcvr_api()
+            assert sfp._optoe_fd is None
+            assert sfp.read_eeprom(5, 1) == bytearray([0xaa])
+            assert mocked_open.call_count == 2
+        sfp.close_eeprom()
+
+    def test_read_write_eeprom_error(self, tmp_path):
+        sfp = SfpOptoeBase()
+        sfp.get_eeprom_path = MagicMock(return_value=str(tmp_path / "missing"))
+        assert sfp.read_eeprom(0, 1) is None
+        assert sfp.write_eeprom(0, 1, bytearray([0x00])) is False
+
+        # A failed access closes the fd so that it is reopened on the next one
+        eeprom = make_eeprom_file(tmp_path)
+        sfp.get_eeprom_path.return_value = eeprom
+        assert sfp.read_eeprom(1, 1) == bytearray([1])
+        with patch("os.pread", side_effect=OSError):
+            assert sfp.read_eeprom(1, 1) is None
+        assert sfp._optoe_fd is None
+        assert sfp.read_eeprom(1, 1) == bytearray([1])
+        sfp.close_eeprom()
 
     @patch("builtins.open", new_callable=mock_open)
     @patch.object(SfpOptoeBase, 'get_eeprom_path')
@@ -355,25 +411,3 @@ class TestSfpOptoeBase(object):
 
         assert sfp.get_optoe_current_page() == 0x10
         sfp.read_eeprom.assert_called_once_with(SFP_OPTOE_PAGE_SELECT_OFFSET, 1)
-
-    @patch("builtins.open", new_callable=mock_open)
-    @patch.object(SfpOptoeBase, 'get_eeprom_path')
-    def test_write_eeprom_success(self, mock_get_eeprom_path, mock_open):
-        mock_get_eeprom_path.return_value = "/sys/class/eeprom"
-
-        result = SfpOptoeBase().write_eeprom(5, 2, bytearray([0xaa, 0xbb, 0xcc]))
-
-        assert result is True
-        mock_open.assert_called_once_with("/sys/class/eeprom", mode='r+b', buffering=0)
-        mock_open().seek.assert_called_once_with(5)
-        mock_open().write.assert_called_once_with(bytearray([0xaa, 0xbb]))
-
-    @patch("builtins.open", new_callable=mock_open)
-    @patch.object(SfpOptoeBase, 'get_eeprom_path')
-    def test_write_eeprom_error(self, mock_get_eeprom_path, mock_open):
-        mock_get_eeprom_path.return_value = "/sys/class/eeprom"
-        mock_open.side_effect = IOError
-
-        result = SfpOptoeBase().write_eeprom(0, 1, bytearray([0x00]))
-
-        assert result is False
@@ -0,0 +1,93 @@
+"""
+Decode the VDM value and threshold pages of a fully populated module through
+VdmDecoder and check them against a per-word reference decoder.
+"""
+import struct
+
+from mock import MagicMock
+
+from sonic_platform_base.sonic_xcvr.api.public.cmisVDM import CmisVdmApi, VdmDecoder, \
+    PAGE_SIZE, PAGE_OFFSET, THRSH_SPACING, VDM_SIZE
+from sonic_platform_base.sonic_xcvr.codes.public.cmis import CmisCodes
+
+PORTS = 4
+PAGES = range(0x20, 0x24)
+TYPE_IDS = sorted(CmisCodes.VDM_TYPE)
+
+
+def make_image(port):
+    """Descriptor, value and threshold pages for every VDM descriptor page"""
+    pages = {}
+    for page in PAGES:
+        descriptor = bytearray()
+        for index in range(64):
+            type_id = TYPE_IDS[(index + page + port) % len(TYPE_IDS)]
+            descriptor += bytes([((index % 16) << 4) | (index % 8), type_id])
+        pages[page] = descriptor
+        pages[page + 4] = bytes((i * 37 + page * 11 + port) & 0xff for i in range(PAGE_SIZE))
+        pages[page + 8] = bytes((i * 53 + page * 7 + port) & 0xff for i in range(PAGE_SIZE))
+    return pages
+
+
+def make_api(pages):
+    api = CmisVdmApi(MagicMock())
+    api.xcvr_eeprom.mem_map.codes = CmisCodes
+
+    def read_raw(offset, size, return_raw=False):
+        data = pages[(offset - PAGE_OFFSET) // PAGE_SIZE][:size]
+        return data if return_raw else tuple(data)
+    api.xcvr_eeprom.read_raw = read_raw
+    return api
+
+
+def reference_decode(raw, vdm_format, scale):
+    """Decode a word the way get_vdm_page() did before VdmDecoder."""
+    if vdm_format == 'S16':
+        return struct.unpack('>h', raw)[0] * scale
+    if vdm_format == 'U16':
+        return struct.unpack('>H', raw)[0] * scale
+    return CmisVdmApi.get_F16(None, struct.unpack('>H', raw)[0])
+
+
+def reference_page(pages, page):
+    descriptor = pages[page]
+    result = {}
+    for index in range(64):
+        vdm_type, vdm_format, scale = CmisCodes.VDM_TYPE[descriptor[2 * index + 1]][:3]
+        value_raw = pages[page + 4][VDM_SIZE * index:VDM_SIZE * index + VDM_SIZE]
+        thrsh_offset = THRSH_SPACING * (descriptor[2 * index] >> 4)
+        thrsh_raw = pages[page + 8][thrsh_offset:thrsh_offset + VDM_SIZE * 4]
+        result.setdefault(vdm_type, {})[(descriptor[2 * index] & 0xf) + 1] = \
+            [reference_decode(value_raw, vdm_format, scale)] + \
+            [reference_decode(thrsh_raw[i:i + 2], vdm_format, scale) for i in range(0, 8, 2)]
+    return result
+
+
+def test_vdm_decoder_matches_reference():
+    images = [make_image(port) for port in range(PORTS)]
+    apis = [make_api(pages) for pages in images]
+    option = CmisVdmApi.VDM_REAL_VALUE | CmisVdmApi.VDM_THRESHOLD
+
+    expected = [[reference_page(pages, page) for page in PAGES] for pages in images]
+
+    # Descriptor pages and decoders are cached from the first pass on
+    for api in apis:
+        for page in PAGES:
+            api.get_vdm_page(page, None, option)
+    actual = [[api.get_vdm_page(page, None, option) for page in PAGES] for api in apis]
+
+    for port_expected, port_actual in zip(expected, actual):
+        for page_expected, page_actual in zip(port_expected, port_actual):
+            assert {vdm_type: {lane: values[:5] for lane, values in lanes.items()}
+                    for vdm_type, lanes in page_actual.items()} == page_expected
+
+
+def test_vdm_decoder_formats():
+    decoder = VdmDecoder([(0, 'S16', 1), (1, 'U16', 0.5), (2, 'F16', None),
+                          (3, 'F16', None), (0, 'X16', 1), (4, 'U16', 1)])
+    raw = struct.pack('>4H', 0xff38, 0x0003, (25 << 11) | 7, (3 << 11) | 0x7ff)
+    values = decoder.decode(raw)
+    assert values[:4] == [-200, 1.5, 70, CmisVdmApi.get_F16(None, (3 << 11) | 0x7ff)]
+    # Unknown format and word beyond the end of the page
+    assert values[4:] == [None, None]
+    assert len(decoder) == 6
@@ -13,6 +13,8 @@ from sonic_platform_base.sonic_xcvr.fields import consts
 from sonic_platform_base.sonic_xcvr.xcvr_api_factory import XcvrApiFactory
 from sonic_platform_base.sonic_xcvr.api.public.sff8636 import Sff8636Api
 from sonic_platform_base.sonic_xcvr.api.public.sff8436 import Sff8436Api
+from sonic_platform_base.sonic_xcvr.codes.public.cmis import CmisCodes
+from sonic_platform_base.sonic_xcvr.mem_maps.public.cmis import CmisMemMap
 
 def mock_reader_sff8636(start, length):
     return bytes([0x0d]) if start == 0 else bytes ([0x06])
@@ -56,6 +58,22 @@ class TestXcvrApiFactory(object):
         api = XcvrApiFactory(mock_reader_cmis, MagicMock())
         assert api.create_xcvr_api() is None
 
+    @pytest.mark.parametrize("reader", [mock_reader_cmis, mock_reader_sff8636])
+    def test_create_xcvr_api_shares_mem_map(self, reader):
+        api1 = XcvrApiFactory(reader, MagicMock()).create_xcvr_api()
+        api2 = XcvrApiFactory(reader, MagicMock()).create_xcvr_api()
+        assert api1.xcvr_eeprom is not api2.xcvr_eeprom
+        assert api1.xcvr_eeprom.mem_map is api2.xcvr_eeprom.mem_map
+
+    def test_get_shared_mem_map(self):
+        mem_map = CmisMemMap.get_shared(CmisCodes, bank=0)
+        assert CmisMemMap.get_shared(CmisCodes, bank=0) is mem_map
+        assert CmisMemMap.get_shared(CmisCodes, bank=1) is not mem_map
+        assert CmisMemMap(CmisCodes) is not mem_map
+        assert mem_map.get_field(consts.VENDOR_NAME_FIELD) is not None
+        with pytest.raises(AttributeError):
+            mem_map.codes = None
+
 class TestAmphBackplaneImpl:
     @pytest.fixture
     def amph_backplane(self, monkeypatch):
@@ -0,0 +1,155 @@
+from mock import MagicMock
+
+from sonic_platform_base.sonic_xcvr.codes.public.cmis import CmisCodes
+from sonic_platform_base.sonic_xcvr.codes.public.cdb import CdbCodes
+from sonic_platform_base.sonic_xcvr.fields import consts
+from sonic_platform_base.sonic_xcvr.fields import cdb_consts
+from sonic_platform_base.sonic_xcvr.mem_maps.public.cmis import CmisMemMap
+from sonic_platform_base.sonic_xcvr.mem_maps.public.cmis.pages import CmisPage
+from sonic_platform_base.sonic_xcvr.mem_maps.public.cmis.cdb import CdbMemMap
+from sonic_platform_base.sonic_xcvr.xcvr_eeprom import XcvrEeprom, EEPROM_PAGE_SIZE
+
+from .eeprom_utils import InMemoryEeprom
+
+
+class CountingEeprom(InMemoryEeprom):
+    """InMemoryEeprom that records every reader call."""
+
+    def __init__(self, mem_map):
+        super(CountingEeprom, self).__init__(mem_map)
+        self.reads = []
+
+    def _reader(self, offset, size):
+        self.reads.append((offset, size))
+        return super(CountingEeprom, self)._reader(offset, size)
+
+
+class TestXcvrEeprom(object):
+    mem_map = CmisMemMap(CmisCodes)
+
+    def test_plan_reads_merges_contiguous_fields(self):
+        eeprom = XcvrEeprom(MagicMock(), MagicMock(), self.mem_map)
+        plan = eeprom.plan_reads([consts.MODULE_FLAG_BYTE1,
+                                  consts.MODULE_FLAG_BYTE3,
+                                  consts.MODULE_FLAG_BYTE2])
+        assert plan == [(9, 3)]
+
+    def test_plan_reads_keeps_gaps_and_pages_apart(self):
+        eeprom = XcvrEeprom(MagicMock(), MagicMock(), self.mem_map)
+        plan = eeprom.plan_reads([consts.MODULE_FLAG_BYTE1, consts.TEMPERATURE_FIELD,
+                                  consts.TX_POWER_FIELD])
+        assert plan == [(9, 1), (14, 2), (CmisPage.linear_offset(0x11, 0, 154), 16)]
+
+    def test_plan_reads_splits_multi_page_group(self):
+        eeprom = XcvrEeprom(MagicMock(), MagicMock(), self.mem_map)
+        plan = eeprom.plan_reads([consts.ADVERTISING_FIELD])
+        assert len(plan) > 1
+        for offset, size in plan:
+            assert offset // EEPROM_PAGE_SIZE == (offset + size - 1) // EEPROM_PAGE_SIZE
+        pages = {offset // EEPROM_PAGE_SIZE for offset, _ in plan}
+        assert pages == {CmisPage.linear_offset(0x01, 0, 128) // EEPROM_PAGE_SIZE,
+                         CmisPage.linear_offset(0x11, 0, 128) // EEPROM_PAGE_SIZE}
+
+    def test_read_many_single_transaction(self):
+        mem = CountingEeprom(self.mem_map)
+        mem.memory[9:12] = bytes([0x01, 0x02, 0x03])
+        result = mem.eeprom.read_many([consts.MODULE_FLAG_BYTE1,
+                                       consts.MODULE_FLAG_BYTE2,
+                                       consts.MODULE_FLAG_BYTE3])
+        assert result == {consts.MODULE_FLAG_BYTE1: 1,
+                          consts.MODULE_FLAG_BYTE2: 2,
+                          consts.MODULE_FLAG_BYTE3: 3}
+        assert mem.reads == [(9, 3)]
+
+    def test_read_many_matches_read(self):
+        mem = CountingEeprom(self.mem_map)
+        for i in range(len(mem.memory)):
+            mem.memory[i] = (i * 7 + 3) & 0xff
+        fields = [consts.ADVERTISING_FIELD, consts.THRESHOLDS_FIELD, consts.ADMIN_INFO_FIELD,
+                  consts.TX_BIAS_FIELD, consts.RX_POWER_FIELD, consts.VOLTAGE_FIELD]
+        expected = {field: mem.eeprom.read(field) for field in fields}
+        num_single_reads = len(mem.reads)
+        mem.reads = []
+        assert mem.eeprom.read_many(fields) == expected
+        assert len(mem.reads) < num_single_reads
+
+    def test_read_coalesces_deps(self):
+        mem = CountingEeprom(CdbMemMap(CdbCodes))
+        # CDB1 status byte: busy, not failed, status 0x01
+        mem.memory[37] = 0x81
+        assert mem.eeprom.read(cdb_consts.CDB1_COMMAND_RESULT) != "Unknown"
+        assert mem.reads == [(37, 1)]
+
+    def test_read_many_failed_chunk(self):
+        def reader(offset, size):
+            return None if offset >= EEPROM_PAGE_SIZE else bytearray(size)
+        eeprom = XcvrEeprom(reader, MagicMock(), self.mem_map)
+        result = eeprom.read_many([consts.TEMPERATURE_FIELD, consts.TX_POWER_FIELD])
+        assert result[consts.TEMPERATURE_FIELD] == 0
+        assert result[consts.TX_POWER_FIELD] is None
+
+
+class TestXcvrEepromSnapshot(object):
+    def setup_method(self, method):
+        self.mem = CountingEeprom(CmisMemMap(CmisCodes))
+        self.page11 = CmisPage.linear_offset(0x11, 0, 128)
+
+    def test_get_page_offsets(self):
+        mem_map = CmisMemMap(CmisCodes, bank=1)
+        assert mem_map.get_page_offsets(0x00) == [0, 128]
+        assert mem_map.get_page_offsets(0x01) == [CmisPage.linear_offset(0x01, 1, 128)]
+        assert mem_map.get_page_offsets(0x11) == [CmisPage.linear_offset(0x11, 1, 128)]
+
+    def test_snapshot_reads_each_page_once(self):
+        self.mem.memory[14:16] = bytes([0x19, 0x00])
+        with self.mem.eeprom.snapshot(pages=[0x00, 0x11]):
+            assert self.mem.reads == [(0, 128), (128, 128), (self.page11, 128)]
+            for _ in range(3):
+                assert self.mem.eeprom.read(consts.TEMPERATURE_FIELD) == 25.0
+                self.mem.eeprom.read(consts.TX_POWER_FIELD)
+                self.mem.eeprom.read_raw(self.page11 + 6, 4)
+            assert len(self.mem.reads) == 3
+        self.mem.eeprom.read(consts.TEMPERATURE_FIELD)
+        assert self.mem.reads[-1] == (14, 2)
+
+    def test_snapshot_latched_flags_read_once(self):
+        # Emulate clear-on-read latched flags on page 11h
+        flag_offset = self.page11 + 139 - 128
+        self.mem.memory[flag_offset] = 0x01
+        reader = self.mem._reader
+        def clear_on_read(offset, size):
+            data = reader(offset, size)
+            if offset <= flag_offset < offset + size:
+                self.mem.memory[flag_offset] = 0
+            return data
+        self.mem.eeprom.reader = clear_on_read
+
+        with self.mem.eeprom.snapshot(pages=[0x11]):
+            first = self.mem.eeprom.read(consts.TX_POWER_ALARM_FLAGS_FIELD)
+            second = self.mem.eeprom.read(consts.TX_POWER_ALARM_FLAGS_FIELD)
+        assert first == second
+        assert first[consts.TX_POWER_HIGH_ALARM_FLAG]["%s1" % consts.TX_POWER_HIGH_ALARM_FLAG]
+        third = self.mem.eeprom.read(consts.TX_POWER_ALARM_FLAGS_FIELD)
+        assert not third[consts.TX_POWER_HIGH_ALARM_FLAG]["%s1" % consts.TX_POWER_HIGH_ALARM_FLAG]
+
+    def test_snapshot_write_through(self):
+        with self.mem.eeprom.snapshot(pages=[0x00]):
+            assert self.mem.eeprom.write_raw(26, 1, bytearray([0x10]))
+            assert self.mem.memory[26] == 0x10
+            assert self.mem.eeprom.read_raw(26, 1) == 0x10
+            assert len(self.mem.reads) == 2
+
+    def test_snapshot_failed_page_falls_back_to_reader(self):
+        eeprom = XcvrEeprom(MagicMock(return_value=None), MagicMock(), CmisMemMap(CmisCodes))
+        with eeprom.snapshot(pages=[0x11]):
+            assert eeprom.read(consts.TX_POWER_FIELD) is None
+        assert eeprom.reader.call_count == 2
+
+    def test_snapshot_nested(self):
+        with self.mem.eeprom.snapshot(pages=[0x00]):
+            with self.mem.eeprom.snapshot(pages=[0x00, 0x11]):
+                assert len(self.mem.reads) == 3
+            self.mem.eeprom.read(consts.TEMPERATURE_FIELD)
+            assert len(self.mem.reads) == 3
+            self.mem.eeprom.read(consts.TX_POWER_FIELD)
+            assert len(self.mem.reads) == 4
@@ -0,0 +1,214 @@
+"""
+    y_cable_broadcom_cmd_scheduler_test.py
+
+    Unit tests for the command scheduler polling the command status of the
+    Broadcom Y-Cables
+"""
+
+import sys
+import threading
+import time
+if sys.version_info.major == 3:
+    from unittest import mock
+else:
+    import mock
+
+import pytest
+
+from sonic_y_cable.broadcom.cmd_scheduler import CableCmdScheduler, CmdTimeoutError, get_cmd_scheduler
+from sonic_y_cable.broadcom.y_cable_broadcom import YCable
+
+
+class StatusPoll(object):
+    """Poll function completing on its done_after call, recording the calling threads and times"""
+
+    def __init__(self, done_after=None, value=0x11):
+        self.done_after = done_after
+        self.value = value
+        self.calls = 0
+        self.times = []
+        self.threads = set()
+
+    def __call__(self):
+        self.calls += 1
+        self.times.append(time.monotonic())
+        self.threads.add(threading.current_thread())
+        return self.calls == self.done_after, self.value
+
+
+class TestCableCmdScheduler(object):
+
+    def test_shared(self):
+        assert get_cmd_scheduler() is get_cmd_scheduler()
+        assert isinstance(get_cmd_scheduler(), CableCmdScheduler)
+
+    def test_completion(self):
+        scheduler = CableCmdScheduler(interval_min=0.0001, interval_max=0.001)
+        poll = StatusPoll(done_after=4)
+
+        future = scheduler.submit(poll, 5, bus=1)
+        assert future.result(5) == 0x11
+        assert poll.calls == 4
+        # Polled by the worker of the bus
+        assert poll.threads != {threading.current_thread()}
+
+    def test_worker_per_bus(self):
+        scheduler = CableCmdScheduler(interval_min=0.0001, interval_max=0.001)
+        polls = {port: StatusPoll(done_after=3) for port in range(4)}
+        futures = [scheduler.submit(poll, 5, bus=port % 2) for port, poll in polls.items()]
+        assert [future.result(5) for future in futures] == [0x11] * 4
+
+        # The cables of a bus share its worker
+        assert polls[0].threads == polls[2].threads
+        assert polls[1].threads == polls[3].threads
+        assert polls[0].threads != polls[1].threads
+        assert sorted(scheduler.get_active_buses()) == [0, 1]
+
+    def test_stuck_bus(self):
+        scheduler = CableCmdScheduler(interval_min=0.0001, interval_max=0.001)
+        release = threading.Event()
+
+        def stuck_poll():
+            release.wait(5)
+            return True, 0x22
+
+        stuck = scheduler.submit(stuck_poll, 5, bus='stuck')
+        try:
+            # Commands of other buses complete meanwhile
+            assert scheduler.submit(StatusPoll(done_after=2), 5, bus='other').result(1) == 0x11
+            assert not stuck.done()
+        finally:
+            release.set()
+        assert stuck.result(5) == 0x22
+
+    def test_timeout(self):
+        scheduler = CableCmdScheduler(interval_min=0.001, interval_max=0.004)
+        poll = StatusPoll()
+
+        with pytest.raises(CmdTimeoutError):
+            scheduler.submit(poll, 0.05).result(5)
+        # Backed off polls, still polled once the deadline passed
+        assert 2 < poll.calls < 50
+
+    def test_backoff(self):
+        scheduler = CableCmdScheduler(interval_min=0.002, interval_max=0.008)
+        poll = StatusPoll(done_after=6)
+        scheduler.submit(poll, 5).result(5)
+
+        gaps = [after - before for before, after in zip(poll.times, poll.times[1:])]
+        # The interval doubles after each poll, up to interval_max
+        for gap, interval in zip(gaps, [0.002, 0.004, 0.008, 0.008, 0.008]):
+            assert gap >= interval * 0.9
+
+    def test_poll_exception(self):
+        def poll():
+            raise IOError("bus error")
+
+        with pytest.raises(IOError):
+            CableCmdScheduler().submit(poll, 1).result(5)
+
+    def test_idle_worker_exits(self):
+        scheduler = CableCmdScheduler(interval_min=0.0001, interval_max=0.001, idle_timeout=0.01)
+        assert scheduler.submit(StatusPoll(done_after=1), 1, bus=1).result(5) == 0x11
+        deadline = time.monotonic() + 5
+        while scheduler.get_active_buses() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert scheduler.get_active_buses() == []
+        # Started again on the next command
+        assert scheduler.submit(StatusPoll(done_after=2), 1, bus=1).result(5) == 0x11
+
+    def test_latency_stats(self):
+        scheduler = CableCmdScheduler()
+        for ms in range(100, 0, -1):
+            scheduler.record_latency(1, "toggle_mux_to_tor_a", ms / 1000.0)
+        scheduler.record_latency(1, "toggle_mux_to_tor_b", 0.002)
+        scheduler.record_latency(2, "toggle_mux_to_tor_a", 0.5)
+
+        stats = scheduler.get_latency_stats(1)
+        assert sorted(stats) == ["toggle_mux_to_tor_a", "toggle_mux_to_tor_b"]
+        tor_a = stats["toggle_mux_to_tor_a"]
+        assert tor_a['count'] == 100
+        assert tor_a['max'] == pytest.approx(100)
+        assert tor_a['p50'] == pytest.approx(50)
+        assert tor_a['p90'] == pytest.approx(90)
+        assert tor_a['p99'] == pytest.approx(99)
+        tor_b = stats["toggle_mux_to_tor_b"]
+        assert tor_b['count'] == 1
+        assert tor_b['p50'] == tor_b['p99'] == tor_b['max'] == pytest.approx(2)
+
+        # nearest rank over 3 samples
+        scheduler.record_latency(3, "cmd", 0.001)
+        scheduler.record_latency(3, "cmd", 0.003)
+        scheduler.record_latency(3, "cmd", 0.002)
+        stats = scheduler.get_latency_stats(3, percentiles=(1, 34, 67, 100))
+        assert stats["cmd"]['p1'] == pytest.approx(1)
+        assert stats["cmd"]['p34'] == pytest.approx(2)
+        assert stats["cmd"]['p67'] == pytest.approx(3)
+        assert stats["cmd"]['p100'] == pytest.approx(3)
+
+        scheduler.clear_latency_stats(1)
+        assert scheduler.get_latency_stats(1) == {}
+        assert scheduler.get_latency_stats(2)["toggle_mux_to_tor_a"]['count'] == 1
+
+    def test_latency_samples_bounded(self):
+        scheduler = CableCmdScheduler(latency_samples=4)
+        for ms in range(1, 11):
+            scheduler.record_latency(1, "cmd", ms / 1000.0)
+
+        stats = scheduler.get_latency_stats(1, percentiles=(1,))["cmd"]
+        assert stats['count'] == 4
+        # only the latest samples are kept
+        assert stats['p1'] == pytest.approx(7)
+        assert stats['max'] == pytest.approx(10)
+
+
+class FakeSfp(object):
+    """Sfp clearing the fast command request bits after clear_after status reads"""
+
+    def __init__(self, clear_after):
+        self.clear_after = clear_after
+        self.fast_cmd = 0
+        self.reads = 0
+        self.read_threads = set()
+
+    def write_eeprom(self, offset, num_bytes, data):
+        self.fast_cmd = data[0]
+        return True
+
+    def read_eeprom(self, offset, num_bytes):
+        self.reads += 1
+        self.read_threads.add(threading.current_thread())
+        if self.clear_after is not None and self.reads >= self.clear_after:
+            self.fast_cmd = 0
+        return bytearray([self.fast_cmd, 0])
+
+
+class TestToggleMux(object):
+
+    def setup_method(self):
+        self.cable = YCable(1, mock.MagicMock())
+        self.sfp = FakeSfp(clear_after=3)
+        self.cable.platform_chassis = mock.MagicMock()
+        self.cable.platform_chassis.get_sfp.return_value = self.sfp
+        self.scheduler = CableCmdScheduler(interval_min=0.0001, interval_max=0.001)
+        self.patcher = mock.patch('sonic_y_cable.broadcom.y_cable_broadcom.get_cmd_scheduler',
+                                  return_value=self.scheduler)
+        self.patcher.start()
+
+    def teardown_method(self):
+        self.patcher.stop()
+
+    @pytest.mark.parametrize("bus, worker", [(None, ('port', 1)), (3, 3)])
+    def test_toggle(self, bus, worker):
+        self.cable.set_i2c_bus(bus)
+        assert self.cable.toggle_mux_to_tor_b() is True
+        assert self.sfp.reads == 3
+        # Polled by the worker of the cable's bus
+        assert self.scheduler.get_active_buses() == [worker]
+        assert threading.current_thread() not in self.sfp.read_threads
+        assert self.cable.get_cmd_latency_stats()["toggle_mux_to_tor_b"]['count'] == 1
+
+    def test_toggle_timeout(self):
+        self.sfp.clear_after = None
+        with mock.patch.object(YCable, 'TOGGLE_CMD_TIMEOUT_MS', 20):
+            assert self.cable.toggle_mux_to_tor_a() is False
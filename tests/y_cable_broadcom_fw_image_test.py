@@ -0,0 +1,202 @@
+"""
+    y_cable_broadcom_fw_image_test.py
+
+    Unit tests for the firmware bundle index of the Broadcom Y-Cable, over a
+    synthetic bundle
+"""
+
+import os
+import struct
+import sys
+if sys.version_info.major == 3:
+    from unittest import mock
+else:
+    import mock
+
+import pytest
+
+from sonic_y_cable.broadcom import fw_image
+from sonic_y_cable.broadcom.fw_image import FwImageIndex, FwImageHeader, get_fw_image_index, \
+    FW_IMAGE_HEADER, FW_IMAGE_HEADER_SIZE, FW_IMAGE_TOR_BANK1, FW_IMAGE_TOR_BANK2, FW_IMAGE_NIC_BANK1, \
+    FW_IMAGE_NIC_BANK2, FW_IMAGE_MUX_CHIP
+from sonic_y_cable.broadcom.y_cable_broadcom import YCable, cable_upgrade_head_s
+
+
+def make_header(image_size, version, compression=0, compressed_size=0):
+    return FwImageHeader(image_size, version, 1, 0, 2, 0x1000 + version, compression, compressed_size,
+                         0x2000 + version, 0, 0, 0x3000 + version)
+
+
+def make_payload(size, seed):
+    return bytes((seed + i) & 0xFF for i in range(size))
+
+
+# (header, payload) of each image of the bundle, in file order
+BUNDLE = [
+    # uncompressed
+    (make_header(16, 1), make_payload(16, 0x10)),
+    # compressed, followed by its compressed payload only
+    (make_header(1000, 2, compression=0x0201, compressed_size=24), make_payload(24, 0x20)),
+    # compression flag in the low byte only, other bytes do not compress
+    (make_header(12, 3, compression=0x0100, compressed_size=500), make_payload(12, 0x30)),
+    # size not a multiple of 4
+    (make_header(10, 4), make_payload(10, 0x40)),
+    # truncated
+    (make_header(64, 5), make_payload(20, 0x50)),
+]
+
+
+def make_bundle(images):
+    data = bytearray()
+    for header, payload in images:
+        data += FW_IMAGE_HEADER.pack(*header)
+        data += payload
+    return bytes(data)
+
+
+@pytest.fixture
+def fwfile(tmp_path):
+    path = tmp_path / 'bundle.bin'
+    path.write_bytes(make_bundle(BUNDLE))
+    return str(path)
+
+
+class TestFwImageIndex(object):
+
+    def test_header_walk(self, fwfile):
+        index = FwImageIndex(fwfile)
+        assert FW_IMAGE_HEADER.size == FW_IMAGE_HEADER_SIZE
+        assert len(index) == len(BUNDLE)
+        for image, (header, _) in enumerate(BUNDLE):
+            assert index.get_header(image) == header
+        assert index.get_header(len(BUNDLE)) is None
+        assert index.get_image(len(BUNDLE)) is None
+
+    def test_payload_size(self):
+        assert [header.payload_size for header, _ in BUNDLE] == [16, 24, 12, 10, 64]
+
+    def test_images(self, fwfile):
+        index = FwImageIndex(fwfile)
+        bundle = make_bundle(BUNDLE)
+        offset = 0
+        for image, (header, payload) in enumerate(BUNDLE[:-1]):
+            offset += FW_IMAGE_HEADER_SIZE
+            words = index.get_image(image)
+            assert words.itemsize == 4
+            # words over the bundle, the last one running into the next header
+            size = (len(payload) + 3) // 4 * 4
+            assert words.tobytes() == bundle[offset:offset + size]
+            assert words.tobytes()[:len(payload)] == payload
+            offset += len(payload)
+
+        # views of the bundle are cached
+        assert index.get_image(FW_IMAGE_TOR_BANK1) is index.get_image(FW_IMAGE_TOR_BANK1)
+
+    def test_padding(self, fwfile):
+        index = FwImageIndex(fwfile)
+
+        # truncated image zero padded to its size
+        words = index.get_image(FW_IMAGE_MUX_CHIP)
+        assert len(words) == 16
+        assert words.tobytes() == BUNDLE[FW_IMAGE_MUX_CHIP][1] + bytes(44)
+
+        # image shorter than min_size zero padded to it
+        words = index.get_image(FW_IMAGE_TOR_BANK1, 30)
+        assert len(words) == 8
+        assert words.tobytes() == BUNDLE[FW_IMAGE_TOR_BANK1][1] + bytes(16)
+        assert len(index.get_image(FW_IMAGE_TOR_BANK1)) == 4
+
+    def test_shared_index(self, fwfile):
+        index = get_fw_image_index(fwfile)
+        assert get_fw_image_index(fwfile) is index
+
+        # a changed bundle is indexed again
+        with open(fwfile, 'wb') as f:
+            f.write(make_bundle(BUNDLE[:2]))
+        stat = os.stat(fwfile)
+        os.utime(fwfile, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+        changed = get_fw_image_index(fwfile)
+        assert changed is not index
+        assert len(changed) == 2
+
+        assert get_fw_image_index(fwfile + '.missing') is None
+
+    def test_replaced_bundle(self, fwfile):
+        index = get_fw_image_index(fwfile)
+        stat = os.stat(fwfile)
+
+        # A bundle of the same size and mtime moved in place is indexed again
+        other = fwfile + '.new'
+        with open(other, 'wb') as f:
+            f.write(make_bundle(BUNDLE[:1]).ljust(stat.st_size, b'\0'))
+        os.utime(other, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(other, fwfile)
+        assert get_fw_image_index(fwfile) is not index
+
+    def test_rewritten_in_place(self, fwfile):
+        index = FwImageIndex(fwfile)
+        words = index.get_image(FW_IMAGE_TOR_BANK1)
+        payload = BUNDLE[FW_IMAGE_TOR_BANK1][1]
+
+        # The index holds its own copy of the bundle
+        with open(fwfile, 'r+b') as f:
+            f.truncate(0)
+        assert words.tobytes() == payload
+        assert index.get_image(FW_IMAGE_TOR_BANK2).tobytes()[:24] == BUNDLE[FW_IMAGE_TOR_BANK2][1]
+
+    def test_index_cache_bounded(self, tmp_path):
+        with mock.patch.object(fw_image, '_index_cache', fw_image.OrderedDict()):
+            for i in range(fw_image.FW_IMAGE_INDEX_CACHE_SIZE + 2):
+                path = tmp_path / 'bundle{}.bin'.format(i)
+                path.write_bytes(make_bundle(BUNDLE))
+                get_fw_image_index(str(path))
+            assert len(fw_image._index_cache) == fw_image.FW_IMAGE_INDEX_CACHE_SIZE
+
+
+class TestParseImage(object):
+
+    def setup_method(self):
+        self.cable = YCable(1, mock.MagicMock())
+
+    def parse(self, fwfile, destination, current_bank=0):
+        def get_status(upgrade_info, crc_check_version=False):
+            upgrade_info.status_info.current_bank = current_bank
+            return YCable.RR_SUCCESS
+
+        upgrade_head = cable_upgrade_head_s()
+        with mock.patch.object(self.cable, 'cable_fw_get_status', side_effect=get_status):
+            assert self.cable.parse_image(upgrade_head, destination, fwfile) == YCable.RR_SUCCESS
+        return upgrade_head
+
+    @pytest.mark.parametrize("destination, current_bank, image", [
+        (YCable.TOR_MCU_SELF, 0, FW_IMAGE_TOR_BANK1),
+        (YCable.TOR_MCU_SELF, 2, FW_IMAGE_TOR_BANK1),
+        (YCable.TOR_MCU_SELF, 1, FW_IMAGE_TOR_BANK2),
+        (YCable.TOR_MCU_PEER, 1, FW_IMAGE_TOR_BANK2),
+        (YCable.NIC_MCU, 2, FW_IMAGE_NIC_BANK1),
+        (YCable.NIC_MCU, 1, FW_IMAGE_NIC_BANK2),
+        (YCable.MUX_CHIP, 1, FW_IMAGE_MUX_CHIP),
+    ])
+    def test_bank_selection(self, fwfile, destination, current_bank, image):
+        upgrade_head = self.parse(fwfile, destination, current_bank)
+        header, payload = BUNDLE[image]
+        image_info = upgrade_head.cable_up_info.image_info
+        assert image_info.image_size == header.image_size
+        assert image_info.image_fw_version.image_version_minor == header.fw_version_minor
+        assert image_info.image_crc32 == header.image_crc32
+        assert upgrade_head.compression == header.compression
+        assert upgrade_head.compressed_size == header.compressed_size
+        assert upgrade_head.cable_up_info.destination == destination
+        # padded to the two packets the transfer reads at minimum
+        assert len(image_info.image_ptr) * 4 >= 2 * YCable.FW_UP_PACKET_SIZE
+        assert image_info.image_ptr.tobytes()[:len(payload)] == payload
+
+    def test_missing_image(self, tmp_path):
+        path = tmp_path / 'short.bin'
+        path.write_bytes(make_bundle(BUNDLE[:2]))
+        with mock.patch.object(self.cable, 'cable_fw_get_status', return_value=YCable.RR_SUCCESS):
+            assert self.cable.parse_image(cable_upgrade_head_s(), YCable.NIC_MCU, str(path)) == YCable.RR_ERROR
+
+    def test_missing_file(self, tmp_path):
+        assert self.cable.parse_image(cable_upgrade_head_s(), YCable.MUX_CHIP,
+                                      str(tmp_path / 'missing.bin')) == YCable.RR_ERROR
@@ -0,0 +1,228 @@
+"""
+    y_cable_credo_test.py
+
+    Unit tests for the VSC batching of the Credo Y-Cable, against a fake MCU
+    counting the eeprom transactions issued per API call
+"""
+
+import struct
+import sys
+if sys.version_info.major == 3:
+    from unittest import mock
+else:
+    import mock
+
+from sonic_y_cable.y_cable_base import YCableBase
+from sonic_y_cable.credo.y_cable_credo import YCable, VscOp
+
+VSC_BASE = YCable.MIS_PAGE_VSC * 128
+
+
+class FakeMcu(object):
+    """
+    Fake sfp/chassis emulating the eeprom of a Credo cable and the MCU
+    executing the tcm/register VSC commands written to page 0xFA, failing
+    the eeprom writes at the offsets of fail_writes
+    """
+
+    def __init__(self, fail_addrs=(), fail_writes=()):
+        self.eeprom = bytearray(YCable.MIS_PAGE_VSC * 128 + 256)
+        self.tcm = {}
+        self.regs = {}
+        self.fail_addrs = set(fail_addrs)
+        self.fail_writes = set(fail_writes)
+        self.reads = 0
+        self.writes = 0
+        self.commands = 0
+
+    def get_sfp(self, port):
+        return self
+
+    @property
+    def transactions(self):
+        return self.reads + self.writes
+
+    def reset_counts(self):
+        self.reads = self.writes = self.commands = 0
+
+    def read_eeprom(self, offset, num_bytes):
+        self.reads += 1
+        return bytearray(self.eeprom[offset:offset + num_bytes])
+
+    def write_eeprom(self, offset, num_bytes, write_buffer):
+        self.writes += 1
+        if offset in self.fail_writes:
+            return False
+        self.eeprom[offset:offset + num_bytes] = write_buffer[:num_bytes]
+        if offset == VSC_BASE + YCable.VSC_BYTE_OPCODE:
+            self._execute(self.eeprom[offset])
+        elif offset == YCable.OFFSET_INITIATE_EYE_MEASUREMENT:
+            # the measurement completes right away
+            self.eeprom[offset] = 1
+        return True
+
+    def _execute(self, opcode):
+        self.commands += 1
+        addr, data = struct.unpack_from('<II', self.eeprom, VSC_BASE + YCable.VSC_BYTE_ADDR0)
+        status = YCable.MCU_EC_NO_ERROR
+        if addr in self.fail_addrs:
+            status = YCable.MCU_EC_UNDEFINED_ERROR
+        elif opcode == YCable.VSC_OPCODE_TCM_READ:
+            struct.pack_into('<I', self.eeprom, VSC_BASE + YCable.VSC_BYTE_DATA0, self.tcm.get(addr, 0))
+        elif opcode == YCable.VSC_OPCODE_TCM_WRITE:
+            self.tcm[addr] = data
+        elif opcode == YCable.VSC_OPCODE_REG_READ:
+            struct.pack_into('<H', self.eeprom, VSC_BASE + YCable.VSC_BYTE_DATA0, self.regs.get(addr, 0))
+        elif opcode == YCable.VSC_OPCODE_REG_WRITE:
+            self.regs[addr] = data & 0xFFFF
+        self.eeprom[VSC_BASE + YCable.VSC_BYTE_STATUS] = status
+        self.eeprom[VSC_BASE + YCable.VSC_BYTE_OPCODE] = 0
+
+
+def make_cable(mcu):
+    cable = YCable(1, mock.MagicMock())
+    cable.platform_chassis = mcu
+    return cable
+
+
+class TestYCableCredoVscBatch(object):
+
+    def test_single_accesses(self):
+        mcu = FakeMcu()
+        cable = make_cable(mcu)
+
+        assert cable.tcm_write(0xA0018, 0x12345678) is True
+        assert cable.tcm_read(0xA0018) == 0x12345678
+        assert cable.reg_write(0x5448, 0xBEEF) is True
+        assert cable.reg_read(0x5448) == 0xBEEF
+        assert cable.tcm_read_atomic(0xA0018) == 0x12345678
+        assert cable.reg_write_atomic(0x48, 0x1) == 0
+        assert cable.reg_read_atomic(0x48) == 0x1
+
+        # request block write, opcode write, one poll, status/response read
+        mcu.reset_counts()
+        cable.tcm_read(0xA0018)
+        assert mcu.transactions == 4
+        mcu.reset_counts()
+        cable.reg_write(0x48, 0x2)
+        assert mcu.transactions == 4
+
+    def test_access_errors(self):
+        mcu = FakeMcu(fail_addrs=[0x10])
+        cable = make_cable(mcu)
+
+        assert cable.tcm_read(0x10) == -1
+        assert cable.reg_read(0x10) == -1
+        assert cable.tcm_write(0x10, 0) is False
+        assert cable.reg_write_atomic(0x10, 0) == YCable.EEPROM_ERROR
+
+    def test_write_errors(self):
+        # the address and data block write fails
+        mcu = FakeMcu(fail_writes=[VSC_BASE + YCable.VSC_BYTE_ADDR0])
+        cable = make_cable(mcu)
+        with mock.patch.object(cable, 'log_error') as log_error:
+            assert cable.tcm_read(0x10) == -1
+            assert cable.tcm_write(0x10, 0x1234) is False
+            assert cable.vsc_batch([VscOp(YCable.VSC_OPCODE_REG_READ, 0x30),
+                                    VscOp(YCable.VSC_OPCODE_REG_WRITE, 0x40, 1)]) == [-1, False]
+        messages = [call[0][0] for call in log_error.call_args_list]
+        assert 'Write Failed!  page:FA byte:82 len:8 value:1000000034120000' in messages
+        assert mcu.commands == 0
+        assert mcu.tcm == {}
+
+        # the opcode write fails
+        mcu = FakeMcu(fail_writes=[VSC_BASE + YCable.VSC_BYTE_OPCODE])
+        cable = make_cable(mcu)
+        assert cable.reg_read(0x10) == -1
+        assert cable.reg_write(0x10, 1) is False
+        assert mcu.commands == 0
+
+    def test_vsc_batch(self):
+        mcu = FakeMcu(fail_addrs=[0x30])
+        cable = make_cable(mcu)
+
+        result = cable.vsc_batch([VscOp(YCable.VSC_OPCODE_TCM_WRITE, 0x20, 7),
+                                  VscOp(YCable.VSC_OPCODE_TCM_READ, 0x20),
+                                  VscOp(YCable.VSC_OPCODE_REG_READ, 0x30),
+                                  VscOp(YCable.VSC_OPCODE_REG_WRITE, 0x40, 0x1FFFF)])
+        assert result == [True, 7, -1, True]
+        assert mcu.regs[0x40] == 0xFFFF
+        assert mcu.commands == 4
+        assert mcu.transactions == 16
+
+    def test_vsc_batch_no_chassis(self):
+        cable = make_cable(None)
+        assert cable.vsc_batch([VscOp(YCable.VSC_OPCODE_TCM_READ, 0x20)]) == YCable.EEPROM_ERROR
+
+    def test_get_pcs_stats(self):
+        mcu = FakeMcu()
+        cable = make_cable(mcu)
+        base = (4 << 20) + 0xa0000
+        mcu.tcm[base + 4 * (0x40 + 6)] = 100
+        mcu.tcm[base + 4 * (0xC + 5)] = 3
+
+        stats = cable.get_pcs_stats(YCableBase.TARGET_TOR_A)
+        assert len(stats) == 9
+        assert stats['Rx Frames OK'] == 100
+        assert stats['Tx Out Errs'] == 3
+        assert mcu.commands == 9
+        assert mcu.transactions == 9 * 4
+
+        assert cable.get_pcs_stats(0xFF) == {}
+
+    def test_get_fec_stats(self):
+        mcu = FakeMcu()
+        cable = make_cable(mcu)
+        base = (6 << 20) + 0xA2800
+        mcu.tcm[base + (8 << 2)] = 5
+        mcu.tcm[base + (0 << 2)] = 1
+        mcu.tcm[base + (11 << 2)] = 9
+        mcu.tcm[base + (26 << 2)] = 2
+
+        stats = cable.get_fec_stats(YCableBase.TARGET_TOR_B)
+        assert mcu.tcm[base + (3 << 2)] == 0x10000001
+        assert stats['Total recevied CW'] == (1 << 32) | 5
+        assert stats['Total uncorrectable CW'] == 9
+        assert stats['Corrected CW ( 3 sym err)'] == 0
+        assert stats['Corrected CW (15 sym err)'] == 2
+        assert len(stats) == 19
+        # one write, 19 counters and 5 latched msbs
+        assert mcu.commands == 25
+        assert mcu.transactions == 25 * 4
+
+    def test_get_anlt_stats(self):
+        mcu = FakeMcu()
+        cable = make_cable(mcu)
+        mcu.regs[0x0048] = 0x55
+        mcu.regs[0xB3 | 0x200 * 1] = 0x0102
+        mcu.regs[0xB4 | 0x200 * 1] = 0x0304
+
+        stats = cable.get_anlt_stats(YCableBase.TARGET_NIC)
+        assert stats['AN_StateMachine'] == 0x55
+        assert stats['LT_TX_lane1'] == [1, 2, 3, 4]
+        assert stats['LT_TX_lane3'] == [0, 0, 0, 0]
+        assert mcu.commands == 9
+        assert mcu.transactions == 9 * 4
+
+        assert cable.get_anlt_stats(0xFF) == {}
+
+    def test_get_eye_heights(self):
+        mcu = FakeMcu()
+        cable = make_cable(mcu)
+        mcu.eeprom[YCable.OFFSET_LANE_1_EYE_RESULT:YCable.OFFSET_LANE_1_EYE_RESULT + 8] = \
+            bytearray([0, 10, 1, 0, 0, 30, 0, 40])
+
+        assert cable.get_eye_heights(YCable.EYE_PRBS_LOOPBACK_TARGET_NIC) == [10, 256, 30, 40]
+        # target write, initiate write, one poll, lane results read
+        assert mcu.transactions == 4
+
+    def test_target_cursor_values(self):
+        mcu = FakeMcu()
+        cable = make_cable(mcu)
+
+        assert cable.set_target_cursor_values(2, [-1, 2, -3, 4, 5], YCableBase.TARGET_TOR_A) is True
+        assert mcu.transactions == 1
+
+        mcu.reset_counts()
+        assert cable.get_target_cursor_values(2, YCableBase.TARGET_TOR_A) == [-1, 2, -3, 4, 5]
+        assert mcu.transactions == 1
@@ -0,0 +1,210 @@
+"""
+    y_cable_fw_upgrade_scheduler_test.py
+
+    Unit tests for the scheduler upgrading the firmware of many Y-Cables,
+    against fake cables recording the phases they run
+"""
+
+import threading
+import time
+import sys
+if sys.version_info.major == 3:
+    from unittest import mock
+else:
+    import mock
+
+import pytest
+
+from sonic_y_cable.y_cable_base import YCableBase
+from sonic_y_cable.fw_upgrade_scheduler import YCableFwUpgradeScheduler, FW_PHASE_DOWNLOAD, \
+    FW_PHASE_ACTIVATE, FW_PHASE_ROLLBACK, FW_EVENT_START, FW_EVENT_DONE, FW_EVENT_SKIPPED
+
+PHASE_SECS = 0.02
+
+
+class Recorder(object):
+    """Records the phases run on the fake cables and the per-bus concurrency"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = []
+        self.running = {}
+        self.max_running = {}
+        self.max_total = 0
+
+    def run(self, cable, phase, result):
+        with self.lock:
+            self.calls.append((phase, cable.port))
+            self.running[cable.bus] = self.running.get(cable.bus, 0) + 1
+            self.max_running[cable.bus] = max(self.max_running.get(cable.bus, 0), self.running[cable.bus])
+            self.max_total = max(self.max_total, sum(self.running.values()))
+        time.sleep(PHASE_SECS)
+        with self.lock:
+            self.running[cable.bus] -= 1
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def ports(self, phase):
+        return [port for call_phase, port in self.calls if call_phase == phase]
+
+
+class FakeCable(YCableBase):
+
+    def __init__(self, recorder, port, bus=None, active=False, download=YCableBase.FIRMWARE_DOWNLOAD_SUCCESS,
+                 activate=YCableBase.FIRMWARE_ACTIVATE_SUCCESS):
+        super(FakeCable, self).__init__(port, mock.MagicMock())
+        self.recorder = recorder
+        self.bus = bus
+        self.active = active
+        self.download = download
+        self.activate = activate
+
+    def get_read_side(self):
+        return self.TARGET_TOR_A
+
+    def get_mux_direction(self):
+        return self.TARGET_TOR_A if self.active else self.TARGET_TOR_B
+
+    def download_firmware(self, fwfile):
+        return self.recorder.run(self, FW_PHASE_DOWNLOAD, self.download)
+
+    def activate_firmware(self, fwfile=None, hitless=False):
+        return self.recorder.run(self, FW_PHASE_ACTIVATE, self.activate)
+
+    def rollback_firmware(self, fwfile=None):
+        return self.recorder.run(self, FW_PHASE_ROLLBACK, YCableBase.FIRMWARE_ROLLBACK_SUCCESS)
+
+
+class TestYCableFwUpgradeScheduler(object):
+
+    def setup_method(self):
+        self.recorder = Recorder()
+        self.events = []
+
+    def make_scheduler(self, cables, **kwargs):
+        scheduler = YCableFwUpgradeScheduler(event_callback=self.events.append, **kwargs)
+        for cable in cables:
+            scheduler.add(cable, "fw.bin", cable.bus)
+        return scheduler
+
+    def test_per_bus_bounds(self):
+        cables = [FakeCable(self.recorder, port, bus=port % 3) for port in range(12)]
+        scheduler = self.make_scheduler(cables, max_workers=4, max_per_bus=2)
+
+        results = scheduler.run()
+        assert all(result[FW_PHASE_DOWNLOAD] == YCableBase.FIRMWARE_DOWNLOAD_SUCCESS and
+                   result[FW_PHASE_ACTIVATE] == YCableBase.FIRMWARE_ACTIVATE_SUCCESS
+                   for result in results.values())
+        assert sorted(results) == list(range(12))
+        assert max(self.recorder.max_running.values()) == 2
+        assert self.recorder.max_total == 4
+
+    def test_workers_not_held_by_busy_bus(self):
+        # one bus of many cables and one of a single cable: the single cable
+        # is dispatched right away instead of queueing behind the busy bus
+        cables = [FakeCable(self.recorder, port, bus=0) for port in range(4)]
+        cables.append(FakeCable(self.recorder, 4, bus=1))
+        scheduler = self.make_scheduler(cables, max_workers=2, max_per_bus=1)
+
+        scheduler.run()
+        assert self.recorder.ports(FW_PHASE_DOWNLOAD)[:2] in ([0, 4], [4, 0])
+        assert self.recorder.max_running == {0: 1, 1: 1}
+
+    def test_standby_then_active(self):
+        cables = [FakeCable(self.recorder, port, active=port % 2 == 0) for port in range(6)]
+        barrier_calls = []
+
+        def peer_barrier():
+            barrier_calls.append(list(self.recorder.ports(FW_PHASE_ACTIVATE)))
+
+        scheduler = self.make_scheduler(cables, max_workers=6, peer_barrier=peer_barrier)
+        scheduler.run()
+
+        activated = self.recorder.ports(FW_PHASE_ACTIVATE)
+        assert sorted(activated[:3]) == [1, 3, 5]
+        assert sorted(activated[3:]) == [0, 2, 4]
+        # the barrier runs once, between the standby and the active waves
+        assert len(barrier_calls) == 1
+        assert sorted(barrier_calls[0]) == [1, 3, 5]
+        # all the downloads complete before any activation
+        assert [phase for phase, _ in self.recorder.calls[:6]] == [FW_PHASE_DOWNLOAD] * 6
+
+    def test_unknown_side_activated_last(self):
+        cables = [FakeCable(self.recorder, 0), FakeCable(self.recorder, 1)]
+        cables[0].get_read_side = mock.MagicMock(side_effect=IOError("read failed"))
+        scheduler = self.make_scheduler(cables)
+        scheduler.run()
+        assert self.recorder.ports(FW_PHASE_ACTIVATE) == [1, 0]
+
+    def test_failed_download_skipped(self):
+        cables = [FakeCable(self.recorder, 0, download=YCableBase.FIRMWARE_DOWNLOAD_FAILURE),
+                  FakeCable(self.recorder, 1, download=IOError("bus error"))]
+        results = self.make_scheduler(cables).run()
+
+        assert results[0] == {FW_PHASE_DOWNLOAD: YCableBase.FIRMWARE_DOWNLOAD_FAILURE}
+        assert results[1] == {FW_PHASE_DOWNLOAD: YCableBase.FIRMWARE_DOWNLOAD_FAILURE}
+        assert self.recorder.ports(FW_PHASE_ACTIVATE) == []
+        skipped = [event['port'] for event in self.events if event['event'] == FW_EVENT_SKIPPED]
+        assert sorted(skipped) == [0, 1]
+        error = [event for event in self.events if event['port'] == 1 and event['event'] == FW_EVENT_DONE]
+        assert 'bus error' in error[0]['error']
+
+    @pytest.mark.parametrize("rollback_on_failure", [True, False])
+    def test_rollback(self, rollback_on_failure):
+        cables = [FakeCable(self.recorder, 0),
+                  FakeCable(self.recorder, 1, activate=YCableBase.FIRMWARE_ACTIVATE_FAILURE),
+                  FakeCable(self.recorder, 2, activate=IOError("bus error")),
+                  FakeCable(self.recorder, 3, download=YCableBase.FIRMWARE_DOWNLOAD_FAILURE)]
+        results = self.make_scheduler(cables, rollback_on_failure=rollback_on_failure).run()
+
+        if rollback_on_failure:
+            assert sorted(self.recorder.ports(FW_PHASE_ROLLBACK)) == [1, 2]
+            assert results[1][FW_PHASE_ROLLBACK] == YCableBase.FIRMWARE_ROLLBACK_SUCCESS
+            assert results[2][FW_PHASE_ACTIVATE] == YCableBase.FIRMWARE_ACTIVATE_FAILURE
+        else:
+            assert self.recorder.ports(FW_PHASE_ROLLBACK) == []
+        assert FW_PHASE_ROLLBACK not in results[0]
+        assert FW_PHASE_ROLLBACK not in results[3]
+
+    def test_progress_events(self):
+        cables = [FakeCable(self.recorder, port) for port in range(3)]
+        self.make_scheduler(cables).run()
+
+        done = [event for event in self.events if event['event'] == FW_EVENT_DONE]
+        # callbacks of concurrent jobs may be reported out of order
+        assert sorted((event['phase'] == FW_PHASE_ACTIVATE, event['completed'], event['total']) for event in done) == \
+            [(False, n, 3) for n in (1, 2, 3)] + [(True, n, 3) for n in (1, 2, 3)]
+        assert all(event['result'] == 0 and event['elapsed'] >= 0 for event in done)
+        assert len([event for event in self.events if event['event'] == FW_EVENT_START]) == 6
+
+    def test_estimate(self):
+        cables = [FakeCable(self.recorder, port, bus=port % 2) for port in range(6)]
+        scheduler = self.make_scheduler(cables, max_workers=4, max_per_bus=1)
+
+        estimate = scheduler.estimate(lambda cable: (10, 1))
+        # 3 cables per bus, one at a time on each of the 2 buses
+        assert estimate[FW_PHASE_DOWNLOAD] == 30
+        assert estimate[FW_PHASE_ACTIVATE] == 3
+        assert estimate['total'] == 33
+        assert estimate['sequential'] == 66
+        # a dry run does not touch the cables
+        assert self.recorder.calls == []
+
+    def test_estimate_worker_bound(self):
+        cables = [FakeCable(self.recorder, port) for port in range(5)]
+        scheduler = self.make_scheduler(cables, max_workers=2)
+
+        estimate = scheduler.estimate()
+        assert estimate[FW_PHASE_DOWNLOAD] == 3 * 240
+        assert estimate[FW_PHASE_ACTIVATE] == 3 * 30
+        assert YCableFwUpgradeScheduler().estimate()['total'] == 0
+
+    def test_estimate_uneven_buses(self):
+        # the single cable of bus 1 runs next to the bus 0 cables
+        cables = [FakeCable(self.recorder, port, bus=0) for port in range(3)]
+        cables.append(FakeCable(self.recorder, 3, bus=1))
+        scheduler = self.make_scheduler(cables, max_workers=2, max_per_bus=1)
+
+        durations = {0: (5, 0), 1: (5, 0), 2: (5, 0), 3: (12, 0)}
+        assert scheduler.estimate(lambda cable: durations[cable.port])[FW_PHASE_DOWNLOAD] == 15
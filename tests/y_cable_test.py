@@ -0,0 +1,145 @@
+"""
+    y_cable_test.py
+
+    Unit tests for the bulk mux state read of the Y-Cable APIs, checked
+    against the single register APIs
+"""
+
+import itertools
+import struct
+import sys
+if sys.version_info.major == 3:
+    from unittest import mock
+else:
+    import mock
+
+try:
+    from sonic_py_common import logger
+except ImportError:
+    sys.modules['sonic_py_common'] = mock.MagicMock()
+    sys.modules['sonic_py_common.logger'] = mock.MagicMock()
+
+from sonic_y_cable import y_cable
+
+
+class FakeChassis(object):
+    """
+    Fake chassis whose sfps share an eeprom per port, failing the reads of
+    fail_ports
+    """
+
+    def __init__(self, fail_ports=()):
+        self.eeproms = {}
+        self.fail_ports = set(fail_ports)
+        self.reads = []
+
+    def get_sfp(self, port):
+        chassis = self
+
+        class Sfp(object):
+            def read_eeprom(self, offset, num_bytes):
+                chassis.reads.append((port, offset, num_bytes))
+                if port in chassis.fail_ports:
+                    return None
+                return bytearray(chassis.eeprom(port)[offset:offset + num_bytes])
+
+        return Sfp()
+
+    def eeprom(self, port):
+        if port not in self.eeproms:
+            self.eeproms[port] = bytearray(1024)
+        return self.eeproms[port]
+
+    def set_registers(self, port, read_side, link_active, mux_direction, active_tor, auto_switch,
+                      manual_count, auto_count):
+        eeprom = self.eeprom(port)
+        eeprom[y_cable.OFFSET_DETERMINE_CABLE_READ_SIDE] = read_side
+        eeprom[y_cable.OFFSET_CHECK_LINK_ACTIVE] = link_active
+        eeprom[y_cable.OFFSET_MUX_DIRECTION] = mux_direction
+        eeprom[y_cable.OFFSET_ACTIVE_TOR_INDICATOR] = active_tor
+        eeprom[y_cable.OFFSET_ENABLE_AUTO_SWITCH] = auto_switch
+        struct.pack_into(">I", eeprom, y_cable.OFFSET_MANUAL_SWITCH_COUNT, manual_count)
+        struct.pack_into(">I", eeprom, y_cable.OFFSET_AUTO_SWITCH_COUNT, auto_count)
+
+
+def single_register_state(port):
+    return {
+        "read_side": y_cable.check_read_side(port),
+        "mux_direction": y_cable.check_mux_direction(port),
+        "active_linked_tor_side": y_cable.check_active_linked_tor_side(port),
+        "link_active_nic": y_cable.check_if_link_is_active_for_NIC(port),
+        "link_active_torA": y_cable.check_if_link_is_active_for_torA(port),
+        "link_active_torB": y_cable.check_if_link_is_active_for_torB(port),
+        "switching_mode": y_cable.get_switching_mode(port),
+        "switch_count_manual": y_cable.get_switch_count(port, y_cable.SWITCH_COUNT_MANUAL),
+        "switch_count_auto": y_cable.get_switch_count(port, y_cable.SWITCH_COUNT_AUTO),
+    }
+
+
+class TestMuxStateBulk(object):
+
+    def setup_method(self):
+        self.chassis = FakeChassis()
+        self.patcher = mock.patch.object(y_cable, 'platform_chassis', self.chassis)
+        self.patcher.start()
+
+    def teardown_method(self):
+        self.patcher.stop()
+
+    def test_block_covers_registers(self):
+        for offset in (y_cable.OFFSET_DETERMINE_CABLE_READ_SIDE, y_cable.OFFSET_CHECK_LINK_ACTIVE,
+                       y_cable.OFFSET_MUX_DIRECTION, y_cable.OFFSET_ACTIVE_TOR_INDICATOR,
+                       y_cable.OFFSET_ENABLE_AUTO_SWITCH, y_cable.OFFSET_MANUAL_SWITCH_COUNT + 3,
+                       y_cable.OFFSET_AUTO_SWITCH_COUNT + 3):
+            assert 0 <= offset - y_cable.OFFSET_MUX_STATE_BLOCK < y_cable.MUX_STATE_BLOCK_SIZE
+
+    def test_decode_matches_single_registers(self):
+        # every decode branch of each register
+        values = itertools.product([0, 1, 2, 4, 6, 8],     # read side
+                                   [0, 1, 2, 4, 7],        # link active
+                                   [0, 1, 2],              # mux direction
+                                   [0, 1, 2, 3, 4],        # active tor
+                                   [0, 1, 2])              # auto switch
+        ports = []
+        for port, (read_side, link_active, mux_direction, active_tor, auto_switch) in enumerate(values):
+            self.chassis.set_registers(port, read_side, link_active, mux_direction, active_tor, auto_switch,
+                                       port * 0x01010101 & 0xFFFFFFFF, 0xFFFFFFFF - port)
+            ports.append(port)
+
+        bulk = y_cable.get_mux_state_bulk(ports)
+        for port in ports:
+            assert bulk[port] == single_register_state(port), port
+
+    def test_one_read_per_port(self):
+        self.chassis.set_registers(1, 4, 7, 1, 1, 1, 3, 5)
+        state = y_cable.get_mux_state_bulk([1])[1]
+        assert state["switch_count_manual"] == 3
+        assert state["switch_count_auto"] == 5
+        assert self.chassis.reads == [(1, y_cable.OFFSET_MUX_STATE_BLOCK, y_cable.MUX_STATE_BLOCK_SIZE)]
+
+    def test_segments(self):
+        ports = list(range(8))
+        for port in ports:
+            self.chassis.set_registers(port, 4, 7, 1, 1, 0, port, 0)
+
+        def get_i2c_segment(port):
+            return port % 2
+
+        bulk = y_cable.get_mux_state_bulk(ports, get_i2c_segment, max_workers=2)
+        order = {}
+        for port, _, _ in self.chassis.reads:
+            order.setdefault(get_i2c_segment(port), []).append(port)
+        assert [bulk[port]["switch_count_manual"] for port in ports] == ports
+        # ports of a segment are read in order by one thread
+        assert order == {0: [0, 2, 4, 6], 1: [1, 3, 5, 7]}
+
+    def test_read_failure(self):
+        self.chassis.fail_ports.add(2)
+        self.chassis.set_registers(1, 4, 7, 1, 1, 0, 0, 0)
+        bulk = y_cable.get_mux_state_bulk([1, 2])
+        assert bulk[1]["read_side"] == 1
+        assert bulk[2] == y_cable.EEPROM_ERROR
+
+    def test_no_chassis(self):
+        with mock.patch.object(y_cable, 'platform_chassis', None):
+            assert y_cable.get_mux_state_bulk([1]) == -1